@@ -0,0 +1,103 @@
+"""Benchmark matching of wildcard subscriptions in the data stream.
+
+Usage: python -m scripts.benchmark.data_stream
+"""
+import argparse
+import fnmatch
+import sys
+import timeit
+
+from viseron.components.data_stream import TopicTrie
+
+ZONE_PATTERN = "{camera}/zone/*/objects"
+EVENT_PATTERN = "event/{camera}/camera_event/*/*"
+
+
+def _patterns(count: int) -> list[str]:
+    """Return count wildcard patterns shaped like the ones used by Viseron."""
+    patterns = []
+    for index in range(count):
+        template = ZONE_PATTERN if index % 2 else EVENT_PATTERN
+        patterns.append(template.format(camera=f"camera_{index}"))
+    return patterns
+
+
+def _topics(count: int, iteration: int) -> list[str]:
+    """Return concrete topics published at frame rate.
+
+    The iteration is part of each topic so that no topic is published twice and
+    TopicTrie has to walk the trie instead of returning a cached match.
+    """
+    topics = []
+    for index in range(count):
+        topics.append(f"camera_{index}/zone/zone_{iteration}/objects")
+        topics.append(f"event/camera_{index}/camera_event/recorder_{iteration}/start")
+        topics.append(f"camera_{index}/frame_bytes_{iteration}")
+    return topics
+
+
+def benchmark(subscribers: int, number: int) -> tuple[float, float, float]:
+    """Return microseconds per published topic.
+
+    The times are for fnmatch, for an uncached TopicTrie match and for a cached
+    TopicTrie match.
+    """
+    patterns = _patterns(subscribers)
+    topics = [
+        topic for iteration in range(number) for topic in _topics(16, iteration)
+    ]
+
+    def run_fnmatch() -> None:
+        for topic in topics:
+            for pattern in patterns:
+                fnmatch.fnmatch(topic, pattern)
+
+    topic_trie = TopicTrie()
+    for pattern in patterns:
+        topic_trie.add(pattern)
+
+    def run_trie() -> None:
+        for topic in topics:
+            topic_trie.match(topic)
+
+    fnmatch_time = timeit.timeit(run_fnmatch, number=1) / len(topics) * 1e6
+    trie_time = timeit.timeit(run_trie, number=1) / len(topics) * 1e6
+
+    # Publish the same topics again to time matches served from the cache
+    cached_topics = _topics(16, 0)
+    for topic in cached_topics:
+        topic_trie.match(topic)
+
+    def run_cached() -> None:
+        for topic in cached_topics:
+            topic_trie.match(topic)
+
+    cached_time = (
+        timeit.timeit(run_cached, number=number) / (number * len(cached_topics)) * 1e6
+    )
+    return fnmatch_time, trie_time, cached_time
+
+
+def main() -> int:
+    """Run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "-n", "--number", type=int, default=200, help="Iterations per measurement"
+    )
+    args = parser.parse_args()
+
+    print(
+        f"{'subscribers':>12} {'fnmatch (us)':>14} {'trie (us)':>12} "
+        f"{'cached (us)':>12}"
+    )
+    for subscribers in (1, 10, 100, 1000):
+        fnmatch_time, trie_time, cached_time = benchmark(subscribers, args.number)
+        print(
+            f"{subscribers:>12} {fnmatch_time:>14.2f} {trie_time:>12.2f} "
+            f"{cached_time:>12.2f}"
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
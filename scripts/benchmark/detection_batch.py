@@ -0,0 +1,93 @@
+"""Benchmark detection post-processing and label filtering.
+
+Usage: python -m scripts.benchmark.detection_batch
+"""
+import argparse
+import sys
+import timeit
+
+import numpy as np
+
+from viseron.domains.object_detector.detected_object import DetectedObject
+from viseron.domains.object_detector.detection_batch import DetectionBatch
+from viseron.helpers.filter import Filter
+
+FRAME_RES = (1920, 1080)
+MODEL_RES = (640, 640)
+LABELS = np.asarray(["person", "car", "dog", "bicycle", "truck"], dtype=object)
+
+
+def _filter(label: str) -> Filter:
+    """Return a label filter like the default one."""
+    return Filter(
+        FRAME_RES,
+        {
+            "label": label,
+            "confidence": 0.8,
+            "width_min": 0,
+            "width_max": 1,
+            "height_min": 0,
+            "height_max": 1,
+            "trigger_event_recording": True,
+            "require_motion": False,
+            "store": True,
+            "store_interval": 60,
+        },
+        [],
+    )
+
+
+def benchmark(detections: int, number: int) -> tuple[float, float]:
+    """Return microseconds per frame for per object and batched processing."""
+    rng = np.random.default_rng(0)
+    classes = rng.integers(0, len(LABELS), detections)
+    confidences = rng.uniform(0.3, 1.0, detections)
+    top_left = rng.uniform(0, 500, (detections, 2))
+    boxes = np.concatenate(
+        [top_left, top_left + rng.uniform(5, 140, (detections, 2))], 1
+    )
+    filters = {"person": _filter("person"), "car": _filter("car")}
+
+    def run_objects() -> None:
+        objects = [
+            DetectedObject.from_absolute(
+                LABELS[cls], confidence, *box, frame_res=FRAME_RES, model_res=MODEL_RES
+            )
+            for cls, confidence, box in zip(classes, confidences, boxes)
+        ]
+        for obj in objects:
+            if filters.get(obj.label):
+                filters[obj.label].filter_object(obj)
+
+    def run_batch() -> None:
+        batch = DetectionBatch.from_absolute(
+            LABELS[classes],
+            confidences,
+            boxes,
+            frame_res=FRAME_RES,
+            model_res=MODEL_RES,
+        )
+        batch.select(batch.filter_mask(list(filters.values()))).to_objects()
+
+    objects_time = timeit.timeit(run_objects, number=number) / number * 1e6
+    batch_time = timeit.timeit(run_batch, number=number) / number * 1e6
+    return objects_time, batch_time
+
+
+def main() -> int:
+    """Run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "-n", "--number", type=int, default=500, help="Iterations per measurement"
+    )
+    args = parser.parse_args()
+
+    print(f"{'detections':>12} {'objects (us)':>14} {'batch (us)':>12}")
+    for detections in (1, 10, 100, 300):
+        objects_time, batch_time = benchmark(detections, args.number)
+        print(f"{detections:>12} {objects_time:>14.2f} {batch_time:>12.2f}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
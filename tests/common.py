@@ -2,7 +2,11 @@
 from __future__ import annotations
 
 import datetime
+import json
+import threading
+import time
 from collections.abc import Callable, Generator
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
 from typing import TYPE_CHECKING, Any
 from unittest.mock import MagicMock
 
@@ -34,6 +38,68 @@ class MockComponent:
             self.setup_component = setup_component
 
 
+class StubHTTPServer(ThreadingHTTPServer):
+    """Local HTTP/1.1 server that answers remote inference requests offline.
+
+    POST requests to any path in responses get the JSON body mapped to it,
+    other paths get a 404. Each request sleeps for delay seconds before
+    responding. The client address of every request is recorded in
+    client_ports, which shows whether keep-alive connections are reused.
+    """
+
+    daemon_threads = True
+
+    def __init__(
+        self, responses: dict[str, Any] | None = None, delay: float = 0
+    ) -> None:
+        super().__init__(("127.0.0.1", 0), _StubHTTPRequestHandler)
+        self.responses = responses or {}
+        self.delay = delay
+        self.client_ports: list[int] = []
+        self._thread = threading.Thread(target=self.serve_forever, daemon=True)
+
+    @property
+    def url(self) -> str:
+        """Return the base url of the server."""
+        return f"http://127.0.0.1:{self.server_address[1]}"
+
+    def __enter__(self) -> StubHTTPServer:
+        """Start serving."""
+        self._thread.start()
+        return self
+
+    def __exit__(self, *args) -> None:
+        """Stop serving."""
+        self.shutdown()
+        self.server_close()
+
+
+class _StubHTTPRequestHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    server: StubHTTPServer
+
+    def do_POST(self) -> None:  # pylint: disable=invalid-name
+        """Respond to a POST request."""
+        self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        self.server.client_ports.append(self.client_address[1])
+        time.sleep(self.server.delay)
+
+        if self.path not in self.server.responses:
+            self.send_response(404)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+        body = json.dumps(self.server.responses[self.path]).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args) -> None:  # pylint: disable=redefined-builtin
+        """Silence request logging."""
+
+
 class MockCamera(MagicMock):
     """Representation of a fake camera."""
 
@@ -1,5 +1,6 @@
 """CodeProjectAI object detector tests."""
 from unittest.mock import Mock, patch
+from urllib.parse import urlsplit
 
 import numpy as np
 import pytest
@@ -8,13 +9,14 @@ from viseron import Viseron
 from viseron.components.codeprojectai import CONFIG_SCHEMA
 from viseron.components.codeprojectai.const import COMPONENT
 from viseron.components.codeprojectai.object_detector import (
+    CodeProjectAIObject,
     ObjectDetector,
     setup as cpai_setup,
 )
 from viseron.domains.object_detector.const import DOMAIN as OBJECT_DETECTOR_DOMAIN
 from viseron.domains.object_detector.detected_object import DetectedObject
 
-from tests.common import MockCamera, MockComponent
+from tests.common import MockCamera, MockComponent, StubHTTPServer
 from tests.conftest import MockViseron
 
 CAMERA_IDENTIFIER = "test_camera"
@@ -194,6 +196,21 @@ def test_return_objects_exception(mock_detect, vis: Viseron, config):
     assert len(objects) == 0
 
 
+def test_detect_stub_server():
+    """Test that CodeProjectAIObject sends requests over the shared client."""
+    predictions = [{"label": "person", "confidence": 0.9}]
+    with StubHTTPServer() as server:
+        host, port = server.server_address
+        detector = CodeProjectAIObject(host, port, 5, 0.5, "ipcam-general", 1)
+        server.responses[
+            urlsplit(detector._url_detect).path  # pylint: disable=protected-access
+        ] = {"success": True, "predictions": predictions}
+        assert detector.detect(b"image") == predictions
+        assert detector.detect(b"image") == predictions
+
+    assert len(set(server.client_ports)) == 1
+
+
 def test_object_detector_init_no_image_size(vis: Viseron, config, mock_detected_object):
     """
     Test the initialization of the ObjectDetector class when image_size is not set.
@@ -0,0 +1,292 @@
+"""Tests for data_stream component."""
+from __future__ import annotations
+
+import logging
+import threading
+import time
+import uuid
+from queue import Queue
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from viseron.components.data_stream import (
+    DEFAULT_WORKERS,
+    PRIORITY_EVENT,
+    PRIORITY_FRAME,
+    CallbackDispatcher,
+    DataStream,
+    DataStreamLane,
+    TopicTrie,
+    _get_workers,
+)
+
+
+def _wait_for(condition, timeout: float = 5) -> None:
+    """Wait for condition to become True."""
+    start = time.time()
+    while not condition():
+        if time.time() - start > timeout:
+            raise TimeoutError
+        time.sleep(0.01)
+
+
+@pytest.fixture(name="dispatcher")
+def fixture_dispatcher():
+    """Return a CallbackDispatcher with two workers."""
+    dispatcher = CallbackDispatcher(2, lane_maxsize=5)
+    yield dispatcher
+    dispatcher.stop()
+
+
+class TestCallbackDispatcher:
+    """Test the CallbackDispatcher class."""
+
+    def test_order_per_subscriber(self, dispatcher: CallbackDispatcher):
+        """Test that callbacks of a subscriber run serially in publish order."""
+        received: list[int] = []
+        running = threading.Lock()
+
+        def callback(data):
+            assert running.acquire(blocking=False)
+            time.sleep(0.001)
+            received.append(data)
+            running.release()
+
+        subscriber_id = uuid.uuid4()
+        for value in range(1, 6):
+            dispatcher.dispatch(subscriber_id, callback, value)
+
+        _wait_for(lambda: len(received) == 5)
+        assert received == list(range(1, 6))
+        _wait_for(lambda: dispatcher.statistics.active_lanes == 0)
+        assert dispatcher.statistics.dispatched == 5
+
+    def test_slow_subscriber_drops_oldest(self, dispatcher: CallbackDispatcher):
+        """Test that a slow subscriber only delays and drops its own invocations."""
+        block = threading.Event()
+        slow_received: list[int] = []
+        fast = MagicMock()
+
+        def slow_callback(data):
+            block.wait()
+            slow_received.append(data)
+
+        slow_id = uuid.uuid4()
+        dispatcher.dispatch(slow_id, slow_callback, 1)
+        _wait_for(lambda: dispatcher.statistics.busy_workers == 1)
+        for value in range(2, 9):
+            dispatcher.dispatch(slow_id, slow_callback, value)
+
+        dispatcher.dispatch(uuid.uuid4(), fast, "data")
+        _wait_for(lambda: fast.called)
+        fast.assert_called_once_with("data")
+
+        statistics = dispatcher.statistics
+        assert statistics.dropped == 2
+        assert statistics.pending == 5
+        assert statistics.max_pending == 6
+
+        block.set()
+        _wait_for(lambda: len(slow_received) == 6)
+        assert slow_received == [1, 4, 5, 6, 7, 8]
+
+    def test_callback_exception(self, dispatcher: CallbackDispatcher):
+        """Test that a failing callback does not stop its lane."""
+        callback = MagicMock(side_effect=[ValueError, None])
+        subscriber_id = uuid.uuid4()
+        dispatcher.dispatch(subscriber_id, callback, 1)
+        dispatcher.dispatch(subscriber_id, callback, None)
+        _wait_for(lambda: callback.call_count == 2)
+        assert callback.call_args.args == ()
+
+
+@pytest.mark.parametrize(
+    "env_value, expected",
+    [
+        (None, DEFAULT_WORKERS),
+        ("4", 4),
+        ("0", DEFAULT_WORKERS),
+        ("many", DEFAULT_WORKERS),
+    ],
+)
+def test_get_workers(monkeypatch, env_value, expected):
+    """Test that the number of workers is read from the environment."""
+    if env_value is None:
+        monkeypatch.delenv("VISERON_DATA_STREAM_WORKERS", raising=False)
+    else:
+        monkeypatch.setenv("VISERON_DATA_STREAM_WORKERS", env_value)
+    assert _get_workers() == expected
+
+
+def test_run_callbacks_stage():
+    """Test that stage callbacks get a thread of their own tagged with the stage."""
+    data_stream = DataStream(MagicMock(), workers=1)
+    callback = MagicMock()
+    with patch(
+        "viseron.components.data_stream.RestartableThread"
+    ) as mock_thread, patch.object(data_stream, "_dispatcher") as mock_dispatcher:
+        data_stream.run_callbacks(
+            {uuid.uuid4(): {"callback": callback, "ioloop": None, "stage": "test"}},
+            "data",
+        )
+        mock_dispatcher.dispatch.assert_not_called()
+        mock_thread.assert_called_once()
+        assert mock_thread.call_args.kwargs["stage"] == "test"
+        assert mock_thread.call_args.kwargs["daemon"] is False
+        assert mock_thread.call_args.kwargs["args"] == ("data",)
+    data_stream.stop()
+
+
+@pytest.mark.parametrize(
+    "pattern, topic, expected",
+    [
+        ("event/*", "event/camera_one", True),
+        ("event/*", "event/camera_one/objects", True),
+        ("*/zone/*/objects", "camera_one/zone/zone_one/objects", True),
+        ("*/zone/*/objects", "camera_one/zone/zone_one/motion", False),
+        ("camera_one/*/objects", "camera_two/zone/objects", False),
+        ("event/camera_*/objects", "event/camera_one/objects", True),
+        ("event/camera_?/objects", "event/camera_1/objects", True),
+        ("event/camera_*", "event/other", False),
+    ],
+)
+def test_topic_trie_matches_fnmatch(pattern, topic, expected):
+    """Test that the trie gives the same result as fnmatch."""
+    topic_trie = TopicTrie()
+    topic_trie.add(pattern)
+    assert (pattern in topic_trie.match(topic)) is expected
+
+
+def test_topic_trie_cache_invalidation():
+    """Test that cached matches are invalidated when patterns change."""
+    topic_trie = TopicTrie()
+    topic_trie.add("camera_one/*")
+    assert topic_trie.match("camera_one/frame") == ("camera_one/*",)
+
+    topic_trie.add("*/frame")
+    assert sorted(topic_trie.match("camera_one/frame")) == ["*/frame", "camera_one/*"]
+
+    topic_trie.remove("camera_one/*")
+    assert topic_trie.match("camera_one/frame") == ("*/frame",)
+    topic_trie.remove("*/frame")
+    assert topic_trie.match("camera_one/frame") == ()
+    assert not topic_trie._root.children
+    assert topic_trie._root.wildcard is None
+
+
+def test_wildcard_subscriptions():
+    """Test that wildcard subscribers are found through the index."""
+    data_stream = DataStream(MagicMock(), workers=1)
+    queue: Queue = Queue()
+    unique_id = DataStream.subscribe_data("*/zone/*/objects", queue)
+    data_stream.wildcard_subscriptions(
+        {"data_topic": "camera_one/zone/zone_one/objects", "data": "data"}
+    )
+    assert queue.get_nowait() == "data"
+
+    DataStream.unsubscribe_data("*/zone/*/objects", unique_id)
+    assert "*/zone/*/objects" not in DataStream._wildcard_subscribers
+    data_stream.wildcard_subscriptions(
+        {"data_topic": "camera_one/zone/zone_one/objects", "data": "data"}
+    )
+    assert queue.empty()
+    data_stream.stop()
+
+
+def test_lane_drops_oldest():
+    """Test that a full lane drops the oldest item and counts it."""
+    lane = DataStreamLane("test", PRIORITY_FRAME, maxsize=2)
+    for value in range(3):
+        lane.put({"data_topic": "test", "data": value})
+    assert lane.queue.get_nowait()["data"] == 1
+    statistics = lane.statistics
+    assert statistics.published == 3
+    assert statistics.dropped == 1
+    assert statistics.queued == 1
+
+
+def test_publish_data_priority():
+    """Test that frames and events are published to separate lanes."""
+    lanes = {
+        PRIORITY_FRAME: [DataStreamLane("frame.0", PRIORITY_FRAME, maxsize=1)],
+        PRIORITY_EVENT: [DataStreamLane("event.0", PRIORITY_EVENT, maxsize=10)],
+    }
+    with patch.object(DataStream, "_lanes", lanes):
+        DataStream.publish_data("event/camera_one/recorder/start", "event")
+        for _ in range(5):
+            DataStream.publish_data("camera_one/camera/frame_bytes", "frame")
+        DataStream.publish_data("viseron/signal/shutdown")
+        DataStream.publish_data("camera_one/frame", "event", priority=PRIORITY_EVENT)
+
+    assert lanes[PRIORITY_FRAME][0].statistics.dropped == 4
+    assert lanes[PRIORITY_EVENT][0].statistics.dropped == 0
+    assert [
+        lanes[PRIORITY_EVENT][0].queue.get_nowait()["data_topic"] for _ in range(3)
+    ] == [
+        "event/camera_one/recorder/start",
+        "viseron/signal/shutdown",
+        "camera_one/frame",
+    ]
+
+
+def test_publish_data_event_order():
+    """Test that events of a camera share a lane, keeping them in order."""
+    lanes = {
+        PRIORITY_FRAME: [DataStreamLane("frame.0", PRIORITY_FRAME, maxsize=10)],
+        PRIORITY_EVENT: [
+            DataStreamLane(f"event.{index}", PRIORITY_EVENT, maxsize=10)
+            for index in range(8)
+        ],
+    }
+    topics = [
+        "event/camera_one/recorder/start",
+        "event/file_created/camera_one/recorder/segments",
+        "event/camera_one/recorder/stop",
+        "event/file_deleted/camera_one/recorder/segments",
+    ]
+    with patch.object(DataStream, "_lanes", lanes):
+        for topic in topics:
+            DataStream.publish_data(topic)
+
+    used_lanes = [lane for lane in lanes[PRIORITY_EVENT] if lane.queue.qsize()]
+    assert len(used_lanes) == 1
+    assert [
+        used_lanes[0].queue.get_nowait()["data_topic"] for _ in range(len(topics))
+    ] == topics
+
+
+def test_subscriber_presence():
+    """Test presence queries and notifications for static and wildcard topics."""
+    topic = "camera_one/nvr/processed_frame"
+    callback = MagicMock()
+    presence_id = DataStream.subscribe_presence(topic, callback)
+    callback.assert_called_once_with(False)
+    assert not DataStream.has_subscribers(topic)
+
+    unique_id = DataStream.subscribe_data(topic, Queue())
+    wildcard_id = DataStream.subscribe_data("*/nvr/*", Queue())
+    assert DataStream.has_subscribers(topic)
+    DataStream.unsubscribe_data(topic, unique_id)
+    assert callback.call_count == 2
+    callback.assert_called_with(True)
+
+    DataStream.unsubscribe_data("*/nvr/*", wildcard_id)
+    callback.assert_called_with(False)
+    assert callback.call_count == 3
+
+    DataStream.unsubscribe_presence(topic, presence_id)
+    DataStream.subscribe_data(topic, Queue())
+    assert callback.call_count == 3
+    DataStream.remove_all_subscriptions()
+
+
+def test_log_statistics(caplog: pytest.LogCaptureFixture):
+    """Test that the dispatcher and lane counters are logged."""
+    data_stream = DataStream(MagicMock(), workers=1)
+    with caplog.at_level(logging.DEBUG, logger="viseron.components.data_stream"):
+        data_stream.log_statistics()
+    assert "Callback dispatcher" in caplog.text
+    for lane in data_stream.lane_statistics:
+        assert f"Data stream lane {lane.name}:" in caplog.text
+    data_stream.stop()
@@ -0,0 +1 @@
+"""NVR tests."""
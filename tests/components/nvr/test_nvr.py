@@ -0,0 +1,44 @@
+"""Tests for the NVR."""
+from __future__ import annotations
+
+import logging
+import time
+from unittest.mock import MagicMock
+
+from viseron.components.data_stream import COMPONENT as DATA_STREAM_COMPONENT
+from viseron.components.nvr.const import IN_FLIGHT_DEADLINE_MARGIN
+from viseron.components.nvr.nvr import FrameIntervalCalculator
+
+
+def _frame_scanner(max_frame_age: float) -> FrameIntervalCalculator:
+    vis = MagicMock()
+    vis.data = {DATA_STREAM_COMPONENT: MagicMock()}
+    frame_scanner = FrameIntervalCalculator(
+        vis,
+        "test",
+        "object_detector",
+        logging.getLogger(__name__),
+        output_fps=1,
+        scan_fps=1,
+        topic_scan="scan",
+        topic_result="result",
+        domain_instance=MagicMock(max_in_flight=2, max_frame_age=max_frame_age),
+    )
+    frame_scanner.scan = True
+    return frame_scanner
+
+
+def test_dropped_frames_leave_in_flight() -> None:
+    """Test that frames that never return a result expire after their deadline."""
+    frame_scanner = _frame_scanner(max_frame_age=1)
+    dropped_at = time.time() - 1 - IN_FLIGHT_DEADLINE_MARGIN - 0.1
+    assert frame_scanner.check_scan_interval(MagicMock(capture_time=dropped_at))
+    assert frame_scanner.check_scan_interval(MagicMock(capture_time=time.time()))
+    assert frame_scanner.in_flight == 2
+
+    frame_scanner.collect_results()
+    assert frame_scanner.in_flight == 1
+
+    frame_scanner.result_queue.put(None)
+    frame_scanner.collect_results()
+    assert frame_scanner.in_flight == 0
@@ -1,13 +1,20 @@
 """Test the query functions."""
 import datetime
+import errno
+import os
+from pathlib import Path
+from unittest.mock import Mock, patch
 
+import pytest
 from sqlalchemy import update
 
 from viseron.components.storage.check_tier import (
+    copy_file,
     get_files_to_move,
     get_recordings_to_move,
     load_recordings,
     load_tier,
+    move_file,
 )
 from viseron.components.storage.models import Recordings
 
@@ -409,3 +416,68 @@ class TestCheckTier(BaseTestWithRecordings):
         )
 
         assert len(files_to_move) == 8
+
+
+def test_copy_file(tmp_path: Path) -> None:
+    """Test that copy_file copies the content and permission bits."""
+    src = tmp_path / "src.m4s"
+    src.write_bytes(os.urandom(1024 * 1024))
+    src.chmod(0o640)
+    dst = tmp_path / "dst.m4s"
+
+    copy_file(str(src), str(dst))
+
+    assert dst.read_bytes() == src.read_bytes()
+    assert dst.stat().st_mode == src.stat().st_mode
+
+
+def test_move_file_same_device(tmp_path: Path) -> None:
+    """Test that move_file renames files on the same filesystem."""
+    src = tmp_path / "tier1" / "src.m4s"
+    src.parent.mkdir()
+    src.write_bytes(b"data")
+    dst = tmp_path / "tier2" / "camera" / "src.m4s"
+
+    with patch("viseron.components.storage.check_tier.copy_file") as mock_copy_file:
+        move_file(Mock(), str(src), str(dst), Mock())
+
+    mock_copy_file.assert_not_called()
+    assert not src.exists()
+    assert dst.read_bytes() == b"data"
+
+
+def test_move_file_cross_device(tmp_path: Path) -> None:
+    """Test that move_file copies the file if rename fails with EXDEV."""
+    src = tmp_path / "tier1" / "src.m4s"
+    src.parent.mkdir()
+    src.write_bytes(b"data")
+    dst = tmp_path / "tier2" / "camera" / "src.m4s"
+    get_session = Mock()
+
+    with patch(
+        "viseron.components.storage.check_tier.os.rename",
+        side_effect=OSError(errno.EXDEV, "Invalid cross-device link"),
+    ):
+        move_file(get_session, str(src), str(dst), Mock())
+
+    get_session.assert_not_called()
+    assert not src.exists()
+    assert dst.read_bytes() == b"data"
+
+
+def test_move_file_rename_failed(tmp_path: Path) -> None:
+    """Test that move_file keeps the file if rename fails for other reasons."""
+    src = tmp_path / "tier1" / "src.m4s"
+    src.parent.mkdir()
+    src.write_bytes(b"data")
+    dst = tmp_path / "tier2" / "camera" / "src.m4s"
+    get_session = Mock()
+
+    with patch(
+        "viseron.components.storage.check_tier.os.rename",
+        side_effect=OSError(errno.EACCES, "Permission denied"),
+    ), pytest.raises(OSError):
+        move_file(get_session, str(src), str(dst), Mock())
+
+    get_session.assert_not_called()
+    assert src.read_bytes() == b"data"
@@ -9,8 +9,10 @@ import voluptuous as vol
 from viseron.components.storage import CONFIG_SCHEMA, validate_tiers
 from viseron.components.storage.config import _check_path_exists
 from viseron.components.storage.const import (
+    DEFAULT_EVENT_JOURNAL_FLUSH_INTERVAL,
     DEFAULT_TIER_CHECK_BATCH_SIZE,
     DEFAULT_TIER_CHECK_CPU_LIMIT,
+    DEFAULT_TIER_CHECK_MOVER_WORKERS,
     DEFAULT_TIER_CHECK_SLEEP_BETWEEN_BATCHES,
     DEFAULT_TIER_CHECK_WORKERS,
 )
@@ -103,7 +105,9 @@ DEFAULT_CONFIG = {
         "tier_check_cpu_limit": DEFAULT_TIER_CHECK_CPU_LIMIT,
         "tier_check_batch_size": DEFAULT_TIER_CHECK_BATCH_SIZE,
         "tier_check_sleep_between_batches": DEFAULT_TIER_CHECK_SLEEP_BETWEEN_BATCHES,
+        "event_journal_flush_interval": DEFAULT_EVENT_JOURNAL_FLUSH_INTERVAL,
         "tier_check_workers": DEFAULT_TIER_CHECK_WORKERS,
+        "tier_check_mover_workers": DEFAULT_TIER_CHECK_MOVER_WORKERS,
         "recorder": {"tiers": [create_tier(events={"max_age": {"days": 7}})]},
         "snapshots": {
             "tiers": [
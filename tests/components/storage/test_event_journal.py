@@ -0,0 +1,135 @@
+"""Test the EventJournal class."""
+from __future__ import annotations
+
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from dataclasses import dataclass
+from unittest.mock import Mock
+
+import pytest
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from viseron.components.storage.const import EVENT_JOURNAL_MAX_ATTEMPTS
+from viseron.components.storage.event_journal import EventJournal
+from viseron.components.storage.models import Events
+from viseron.events import Event, EventData
+
+
+@dataclass
+class MockEventData(EventData):
+    """Mock event data."""
+
+    value: int
+
+
+class NotSerializableEventData(EventData):
+    """Event data that can not be serialized."""
+
+    def as_dict(self) -> dict[str, object]:
+        """Return a dict with a value that can not be serialized."""
+        return {"value": object()}
+
+
+def _create_journal(
+    get_db_session: Callable[[], Session], max_queue: int = 100
+) -> EventJournal:
+    storage = Mock()
+    storage.get_session = get_db_session
+    return EventJournal(storage, flush_interval=3600, max_queue=max_queue)
+
+
+def test_flush(get_db_session: Callable[[], Session]) -> None:
+    """Test that queued events are written in batches."""
+    journal = _create_journal(get_db_session)
+    for i in range(3):
+        journal.put(Event(f"event_{i}", MockEventData(i), 0))
+    journal.put(Event("not_serializable", NotSerializableEventData(), 0))
+    assert journal.statistics.queued == 4
+    journal.stop()
+
+    with get_db_session() as session:
+        names = session.execute(select(Events.name).order_by(Events.id)).scalars()
+        assert list(names) == ["event_0", "event_1", "event_2"]
+    statistics = journal.statistics
+    assert statistics.queued == 0
+    assert statistics.max_queued == 4
+    assert statistics.written == 3
+    assert statistics.failed == 1
+
+
+def test_queue_full(get_db_session: Callable[[], Session]) -> None:
+    """Test that events are dropped when the queue is full."""
+    journal = _create_journal(get_db_session, max_queue=2)
+    for i in range(3):
+        journal.put(Event(f"event_{i}", MockEventData(i), 0))
+    assert journal.statistics.dropped == 1
+    journal.stop()
+
+    with get_db_session() as session:
+        assert len(session.execute(select(Events)).scalars().all()) == 2
+
+
+def test_failed_batch_retried(get_db_session: Callable[[], Session]) -> None:
+    """Test that a batch that fails to be written is retried on the next flush."""
+    journal = _create_journal(get_db_session)
+    journal.put(Event("event_0", MockEventData(0), 0))
+    journal._storage.get_session = Mock(side_effect=RuntimeError("Unavailable"))
+    with pytest.raises(RuntimeError):
+        journal.flush()
+    statistics = journal.statistics
+    assert statistics.retrying == 1
+    assert statistics.written == 0
+
+    journal._storage.get_session = get_db_session
+    journal.put(Event("event_1", MockEventData(1), 0))
+    journal.stop()
+
+    with get_db_session() as session:
+        names = session.execute(select(Events.name).order_by(Events.id)).scalars()
+        assert list(names) == ["event_0", "event_1"]
+    statistics = journal.statistics
+    assert statistics.retrying == 0
+    assert statistics.written == 2
+    assert statistics.failed == 0
+
+
+def test_failing_row_isolated(get_db_session: Callable[[], Session]) -> None:
+    """Test that a row that always fails is dropped without blocking the others."""
+
+    @contextmanager
+    def get_session() -> Iterator[Session]:
+        with get_db_session() as session:
+            execute = session.execute
+
+            def _execute(statement, params=None, **kwargs):
+                if params and any(row["name"] == "bad" for row in params):
+                    raise ValueError("Invalid row")
+                return execute(statement, params, **kwargs)
+
+            session.execute = _execute  # type: ignore[method-assign]
+            yield session
+
+    journal = _create_journal(get_db_session)
+    journal._storage.get_session = get_session
+    journal.put(Event("event_0", MockEventData(0), 0))
+    journal.put(Event("bad", MockEventData(0), 0))
+    journal.put(Event("event_1", MockEventData(1), 0))
+    for attempt in range(1, EVENT_JOURNAL_MAX_ATTEMPTS + 1):
+        journal.put(Event(f"event_{attempt + 1}", MockEventData(attempt), 0))
+        with pytest.raises(ValueError):
+            journal.flush()
+        assert journal.statistics.retrying == int(
+            attempt < EVENT_JOURNAL_MAX_ATTEMPTS
+        )
+    journal.stop()
+
+    with get_db_session() as session:
+        names = session.execute(select(Events.name).order_by(Events.id)).scalars()
+        assert list(names) == [
+            f"event_{i}" for i in range(EVENT_JOURNAL_MAX_ATTEMPTS + 2)
+        ]
+    statistics = journal.statistics
+    assert statistics.queued == 0
+    assert statistics.written == EVENT_JOURNAL_MAX_ATTEMPTS + 2
+    assert statistics.failed == 1
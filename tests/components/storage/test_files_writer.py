@@ -0,0 +1,192 @@
+"""Test the FilesWriter class."""
+from __future__ import annotations
+
+from collections.abc import Callable
+from pathlib import Path
+from typing import Any
+from unittest.mock import Mock
+
+import pytest
+from sqlalchemy import insert, select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from viseron.components.storage.const import FILES_WRITER_MAX_ATTEMPTS
+from viseron.components.storage.files_writer import FilesWriter
+from viseron.components.storage.models import Files
+from viseron.helpers import utcnow
+
+
+def _values() -> dict[str, Any]:
+    return {
+        "tier_id": 0,
+        "tier_path": "/tmp/",
+        "camera_identifier": "test",
+        "category": "recorder",
+        "subcategory": "segments",
+        "directory": "/tmp",
+        "filename": "file",
+        "orig_ctime": utcnow(),
+        "duration": None,
+    }
+
+
+def _create_writer(
+    get_db_session: Callable[[], Session], storage: Mock | None = None
+) -> FilesWriter:
+    storage = storage or Mock()
+    storage.get_session = get_db_session
+    return FilesWriter(storage, flush_interval=3600)
+
+
+def test_flush(get_db_session: Callable[[], Session], tmp_path: Path) -> None:
+    """Test that events are coalesced and written in one flush."""
+    created = tmp_path / "created.m4s"
+    created.write_bytes(b"0" * 10)
+    modified = tmp_path / "modified.m4s"
+    modified.write_bytes(b"0" * 20)
+    deleted = tmp_path / "deleted.m4s"
+    with get_db_session() as session:
+        for path in (modified, deleted):
+            session.execute(
+                insert(Files).values(**_values(), path=str(path), size=1)
+            )
+        session.commit()
+
+    handler = Mock()
+    storage = Mock()
+    writer = _create_writer(get_db_session, storage)
+    writer.file_created(handler, str(created), _values())
+    writer.file_modified(handler, str(created))
+    writer.file_modified(handler, str(modified))
+    writer.file_modified(handler, str(modified))
+    writer.file_deleted(handler, str(deleted))
+    writer.flush()
+    writer.stop()
+
+    with get_db_session() as session:
+        files = {
+            row.path: row.size for row in session.execute(select(Files)).scalars()
+        }
+    assert files == {str(created): 10, str(modified): 20}
+    handler.files_created.assert_called_once_with([str(created)])
+    handler.files_deleted.assert_called_once_with([str(deleted)])
+    handler.check_tier.assert_called_once()
+
+    changes = storage.tier_check_worker_send_command.call_args[0][0]
+    assert [created_file.file.path for created_file in changes.created] == [
+        str(created)
+    ]
+    assert changes.modified == [(str(modified), 20)]
+    assert changes.deleted == [str(deleted)]
+
+
+def test_created_then_deleted(
+    get_db_session: Callable[[], Session], tmp_path: Path
+) -> None:
+    """Test that a file deleted before the flush is never inserted."""
+    path = tmp_path / "file.m4s"
+    path.write_bytes(b"0")
+
+    handler = Mock()
+    writer = _create_writer(get_db_session)
+    writer.file_created(handler, str(path), _values())
+    writer.file_deleted(handler, str(path))
+    writer.stop()
+
+    with get_db_session() as session:
+        assert session.execute(select(Files)).scalars().all() == []
+    handler.files_created.assert_not_called()
+    handler.files_deleted.assert_called_once_with([str(path)])
+    handler.check_tier.assert_not_called()
+
+
+def test_already_exists(get_db_session: Callable[[], Session], tmp_path: Path) -> None:
+    """Test that an existing row does not fail the rest of the batch."""
+    existing = tmp_path / "existing.m4s"
+    existing.write_bytes(b"0")
+    new = tmp_path / "new.m4s"
+    new.write_bytes(b"0")
+    with get_db_session() as session:
+        session.execute(insert(Files).values(**_values(), path=str(existing), size=1))
+        session.commit()
+
+    handler = Mock()
+    writer = _create_writer(get_db_session)
+    writer.file_created(handler, str(existing), _values())
+    writer.file_created(handler, str(new), _values())
+    writer.stop()
+
+    handler.files_created.assert_called_once_with([str(new)])
+
+
+def test_failed_write_requeued(
+    get_db_session: Callable[[], Session], tmp_path: Path
+) -> None:
+    """Test that a failed write is retried without overwriting newer events."""
+    created = tmp_path / "created.m4s"
+    created.write_bytes(b"0" * 10)
+    recreated = tmp_path / "recreated.m4s"
+    with get_db_session() as session:
+        session.execute(insert(Files).values(**_values(), path=str(recreated), size=1))
+        session.commit()
+
+    handler = Mock()
+    writer = _create_writer(get_db_session)
+    writer.file_created(handler, str(created), _values())
+    writer.file_deleted(handler, str(recreated))
+
+    def failing_session() -> Session:
+        # Events that arrive while the write is failing
+        writer.file_modified(handler, str(created))
+        recreated.write_bytes(b"0" * 5)
+        writer.file_created(handler, str(recreated), _values())
+        raise RuntimeError("Database unavailable")
+
+    writer._storage.get_session = failing_session
+    with pytest.raises(RuntimeError):
+        writer.flush()
+    handler.files_created.assert_not_called()
+
+    writer._storage.get_session = get_db_session
+    writer.stop()
+
+    with get_db_session() as session:
+        files = {
+            row.path: row.size for row in session.execute(select(Files)).scalars()
+        }
+    assert files == {str(created): 10, str(recreated): 5}
+    handler.files_deleted.assert_called_once_with([str(recreated)])
+    assert sorted(handler.files_created.call_args[0][0]) == sorted(
+        [str(created), str(recreated)]
+    )
+
+
+def test_failing_row_isolated(
+    get_db_session: Callable[[], Session], tmp_path: Path
+) -> None:
+    """Test that a row that always fails is dropped without blocking other rows."""
+    good = tmp_path / "good.m4s"
+    good.write_bytes(b"0" * 10)
+    bad = tmp_path / "bad.m4s"
+    bad.write_bytes(b"0" * 10)
+
+    handler = Mock()
+    writer = _create_writer(get_db_session)
+    writer.file_created(handler, str(good), _values())
+    writer.file_created(handler, str(bad), {**_values(), "tier_id": None})
+
+    with pytest.raises(IntegrityError):
+        writer.flush()
+    handler.files_created.assert_called_once_with([str(good)])
+    assert list(writer._pending) == [str(bad)]
+
+    for _ in range(FILES_WRITER_MAX_ATTEMPTS - 1):
+        with pytest.raises(IntegrityError):
+            writer.flush()
+    assert not writer._pending
+    writer.stop()
+
+    with get_db_session() as session:
+        paths = [row.path for row in session.execute(select(Files)).scalars()]
+    assert paths == [str(good)]
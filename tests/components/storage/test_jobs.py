@@ -0,0 +1,92 @@
+"""Test the storage cleanup jobs."""
+from __future__ import annotations
+
+import os
+import time
+from collections.abc import Callable
+from pathlib import Path
+from typing import Any
+from unittest.mock import Mock, patch
+
+import pytest
+from sqlalchemy import insert
+from sqlalchemy.orm import Session
+
+from viseron.components.storage.jobs import (
+    ORPHANED_FILES_MIN_AGE,
+    OperationBudget,
+    OrphanedFilesCleanup,
+)
+from viseron.components.storage.models import Files
+from viseron.helpers import utcnow
+
+
+def _values(path: Path) -> dict[str, Any]:
+    return {
+        "tier_id": 0,
+        "tier_path": str(path.parent),
+        "camera_identifier": "test",
+        "category": "recorder",
+        "subcategory": "segments",
+        "path": str(path),
+        "directory": str(path.parent),
+        "filename": path.name,
+        "size": 1,
+        "orig_ctime": utcnow(),
+        "duration": None,
+    }
+
+
+def _create_file(path: Path, age: float) -> None:
+    path.write_bytes(b"0")
+    mtime = time.time() - age
+    os.utime(path, (mtime, mtime))
+
+
+def test_operation_budget() -> None:
+    """Test that spend waits once the budget is exceeded."""
+    wait = Mock()
+    with patch(
+        "viseron.components.storage.jobs.time.monotonic",
+        side_effect=[100.0, 100.5, 100.5],
+    ):
+        budget = OperationBudget(10, wait)
+        # 5 operations are allowed after 0.5 seconds
+        budget.spend(5)
+        wait.assert_not_called()
+        budget.spend(1)
+    wait.assert_called_once()
+    assert wait.call_args[0][0] == pytest.approx(0.1)
+
+
+def test_delete_orphaned(
+    get_db_session: Callable[[], Session], tmp_path: Path
+) -> None:
+    """Test that a chunk of files without rows in the Files table is deleted."""
+    old_age = ORPHANED_FILES_MIN_AGE + 60
+    known = tmp_path / "known.m4s"
+    _create_file(known, old_age)
+    orphans = [tmp_path / f"orphan_{i}.m4s" for i in range(3)]
+    for orphan in orphans:
+        _create_file(orphan, old_age)
+    new = tmp_path / "new.m4s"
+    _create_file(new, 0)
+    with get_db_session() as session:
+        session.execute(insert(Files).values(**_values(known)))
+        session.commit()
+
+    job = OrphanedFilesCleanup(Mock(), Mock(), Mock())
+    io_budget = Mock()
+    db_budget = Mock()
+    with os.scandir(tmp_path) as entries, get_db_session() as session:
+        deleted_count = job._delete_orphaned(
+            session, list(entries), io_budget, db_budget
+        )
+
+    assert deleted_count == len(orphans)
+    assert not any(orphan.exists() for orphan in orphans)
+    assert known.exists()
+    # Files newer than ORPHANED_FILES_MIN_AGE might not be in the database yet
+    assert new.exists()
+    db_budget.spend.assert_called_once()
+    assert io_budget.spend.call_count == len(orphans)
@@ -1,12 +1,13 @@
 """Test the query functions."""
 import datetime
 
-from sqlalchemy import insert
+from sqlalchemy import delete, insert
 
 from viseron.components.storage.models import Files
 from viseron.components.storage.queries import (
     get_recording_fragments,
     get_time_period_fragments,
+    get_time_period_runs,
 )
 
 from tests.common import BaseTestWithRecordings
@@ -106,3 +107,81 @@ class TestQueries(BaseTestWithRecordings):
         assert len(files) == 15
         assert files[4].tier_id == 0
         assert files[5].tier_id == 1
+
+    def test_get_time_period_fragments_deleted_copy(self):
+        """Test that the previous tier copy is used when the latest is deleted."""
+        with self._get_db_session() as session:
+            created_at = self._now + datetime.timedelta(seconds=55)
+            timestamp = self._now + datetime.timedelta(seconds=25)
+            filename = f"{int(timestamp.timestamp())}.m4s"
+            session.execute(
+                insert(Files).values(
+                    tier_id=1,
+                    tier_path="/tier2/",
+                    camera_identifier="test",
+                    category="recorder",
+                    subcategory="segments",
+                    path=f"/tier2/{filename}",
+                    directory="tier2",
+                    filename=filename,
+                    size=10,
+                    orig_ctime=timestamp,
+                    duration=5,
+                    created_at=created_at,
+                )
+            )
+            session.commit()
+            session.execute(delete(Files).where(Files.path == f"/tier2/{filename}"))
+            session.commit()
+
+        files = get_time_period_fragments(
+            ["test"],
+            0,
+            None,
+            self._get_db_session,
+            self._now + datetime.timedelta(days=365),
+        )
+        assert len(files) == 15
+        assert files[5].tier_id == 0
+        assert files[5].path == f"/test/{filename}"
+
+        with self._get_db_session() as session:
+            session.execute(delete(Files).where(Files.path == f"/test/{filename}"))
+            session.commit()
+
+        files = get_time_period_fragments(
+            ["test"],
+            0,
+            None,
+            self._get_db_session,
+            self._now + datetime.timedelta(days=365),
+        )
+        assert len(files) == 14
+
+    def test_get_time_period_runs(self):
+        """Test get_time_period_runs."""
+        with self._get_db_session() as session:
+            session.execute(
+                delete(Files).where(
+                    Files.orig_ctime.in_(
+                        [
+                            self._now + datetime.timedelta(seconds=35),
+                            self._now + datetime.timedelta(seconds=40),
+                        ]
+                    )
+                )
+            )
+            session.commit()
+
+        runs = get_time_period_runs(
+            ["test"],
+            0,
+            None,
+            self._get_db_session,
+            self._now + datetime.timedelta(days=365),
+        )
+        assert len(runs) == 2
+        assert runs[0].start == self._now
+        assert runs[0].end == self._now + datetime.timedelta(seconds=35)
+        assert runs[1].start == self._now + datetime.timedelta(seconds=45)
+        assert runs[1].end == self._now + datetime.timedelta(seconds=75)
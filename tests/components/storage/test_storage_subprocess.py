@@ -0,0 +1,56 @@
+"""Test the storage subprocess."""
+from __future__ import annotations
+
+import threading
+from pathlib import Path
+from queue import Queue
+from unittest.mock import Mock
+
+from viseron.components.storage.storage_subprocess import (
+    MOVER_QUEUED_PER_WORKER,
+    DataItemMoveFile,
+    FileMover,
+    get_device,
+)
+
+
+def test_file_mover_bounded(tmp_path: Path) -> None:
+    """Test that moves are bounded per device and duplicates are skipped."""
+    move_started = threading.Event()
+    finish_move = threading.Event()
+
+    def work_input(_job: DataItemMoveFile) -> None:
+        move_started.set()
+        finish_move.wait(5)
+
+    worker = Mock()
+    worker.work_input = work_input
+    output_queue: Queue[DataItemMoveFile] = Queue()
+    mover = FileMover(worker, output_queue, 1)
+    dst = tmp_path / "tier2" / "file.m4s"
+    device = get_device(str(dst.parent))
+
+    for i in range(MOVER_QUEUED_PER_WORKER + 1):
+        mover.submit(
+            DataItemMoveFile(
+                cmd="move_file", src=str(tmp_path / f"{i}.m4s"), dst=str(dst)
+            )
+        )
+    # Already queued
+    mover.submit(
+        DataItemMoveFile(cmd="move_file", src=str(tmp_path / "0.m4s"), dst=str(dst))
+    )
+    assert move_started.wait(5)
+
+    statistics = mover.statistics[device]
+    assert statistics.queued == MOVER_QUEUED_PER_WORKER
+    assert statistics.in_flight == 1
+    assert statistics.skipped == 2
+    assert output_queue.qsize() == 2
+
+    finish_move.set()
+    for _ in range(MOVER_QUEUED_PER_WORKER + 2):
+        output_queue.get(timeout=5)
+    statistics = mover.statistics[device]
+    assert statistics.queued == 0
+    assert statistics.files == MOVER_QUEUED_PER_WORKER
@@ -0,0 +1,82 @@
+"""Test the TierIndex class."""
+import numpy as np
+import pytest
+
+from viseron.components.storage.check_tier import get_files_to_move
+from viseron.components.storage.tier_index import FILES_DTYPE, IndexedFile, TierIndex
+
+
+def _files(amount: int) -> list[IndexedFile]:
+    rng = np.random.default_rng(0)
+    return [
+        IndexedFile(
+            i, int(rng.integers(1, 100)), 1000 + i * 5, f"/tmp/{i}.m4s", "/tmp/"
+        )
+        for i in range(amount)
+    ]
+
+
+def _load(files: list[IndexedFile]) -> TierIndex:
+    tier_index = TierIndex()
+    tier_index.load(files)
+    return tier_index
+
+
+@pytest.mark.parametrize(
+    "max_bytes, min_age_timestamp, min_bytes, max_age_timestamp",
+    [
+        (1000, 2000, 0, 0),
+        (1000, 1200, 0, 0),
+        (0, 0, 0, 1300),
+        (0, 0, 2000, 1300),
+        (1000, 2000, 500, 1100),
+        (0, 0, 0, 0),
+    ],
+)
+def test_files_to_move(
+    max_bytes: int, min_age_timestamp: int, min_bytes: int, max_age_timestamp: int
+) -> None:
+    """Test that files_to_move matches get_files_to_move."""
+    files = _files(100)
+    tier_index = _load(files)
+
+    expected = get_files_to_move(
+        np.array(files, dtype=FILES_DTYPE),
+        max_bytes,
+        min_age_timestamp,
+        min_bytes,
+        max_age_timestamp,
+    )
+    result = tier_index.files_to_move(
+        max_bytes, min_age_timestamp, min_bytes, max_age_timestamp
+    )
+    assert result["id"].tolist() == expected["id"].tolist()
+    assert result["path"].tolist() == expected["path"].tolist()
+
+
+def test_deltas() -> None:
+    """Test that deltas keep the running total and age order up to date."""
+    files = _files(10)
+    tier_index = _load(files[:5])
+    assert tier_index.total_bytes == sum(file.size for file in files[:5])
+
+    for file in files[5:]:
+        tier_index.upsert(file)
+    tier_index.update_size(files[9].path, 1000)
+    tier_index.remove(files[0].path)
+    tier_index.remove("/tmp/unknown.m4s")
+
+    assert len(tier_index) == 9
+    assert tier_index.total_bytes == sum(file.size for file in files[1:9]) + 1000
+    assert tier_index.files_to_move(1001, 2000, 0, 0)["id"].tolist() == list(
+        range(1, 9)
+    )
+    assert tier_index.to_array()["id"].tolist() == list(range(1, 10))
+
+
+def test_upsert_before_load() -> None:
+    """Test that deltas are ignored until the index is loaded."""
+    tier_index = TierIndex()
+    tier_index.upsert(_files(1)[0])
+    assert len(tier_index) == 0
+    assert tier_index.needs_reload
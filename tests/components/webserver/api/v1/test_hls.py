@@ -3,12 +3,19 @@ from __future__ import annotations
 
 import datetime
 import json
-from unittest.mock import patch
+from unittest.mock import Mock, patch
 
 from sqlalchemy import delete, insert, update
 
+from viseron.components.storage.const import COMPONENT as STORAGE_COMPONENT
 from viseron.components.storage.models import Files, Recordings
-from viseron.components.webserver.api.v1.hls import count_files_removed
+from viseron.components.webserver.api.v1.hls import (
+    HlsAPIHandler,
+    count_files_removed,
+    touch_hls_client,
+    update_hls_client,
+)
+from viseron.components.webserver.const import HLS_CLIENT_TIMEOUT
 from viseron.domains.camera.const import CONFIG_LOOKBACK, CONFIG_RECORDER
 from viseron.domains.camera.fragmenter import Fragment
 from viseron.helpers import utcnow
@@ -245,6 +252,71 @@ class TestHlsApiHandler(TestAppBaseNoAuth, BaseTestWithRecordings):
         """Test getting HLS playlist for a specific time period with date not today."""
         self._get_hls_playlist_time_period(0, None, "2023-10-01", 0, 1)
 
+    def test_get_hls_playlist_time_period_etag(self):
+        """Test that an unchanged live playlist returns 304."""
+        start_timestamp = int(self._now.timestamp())
+        url = f"/api/v1/hls/test/index.m3u8?start_timestamp={start_timestamp}"
+        mocked_camera = MockCamera(identifier="test")
+        with patch(
+            (
+                "viseron.components.webserver.request_handler.ViseronRequestHandler."
+                "_get_camera"
+            ),
+            return_value=mocked_camera,
+        ), patch(
+            (
+                "viseron.components.webserver.request_handler.ViseronRequestHandler"
+                "._get_session"
+            ),
+            return_value=self._get_db_session(),
+        ), patch(
+            "viseron.components.webserver.api.v1.hls._get_init_file",
+            return_value="/test/init.mp4",
+        ), patch(
+            "viseron.components.storage.queries.utcnow",
+            return_value=self._simulated_now,
+        ):
+            # First request loads the live playlist cache
+            response = self.fetch(url)
+            assert response.code == 200
+            response = self.fetch(url)
+            assert response.code == 200
+            etag = response.headers["Etag"]
+
+            response = self.fetch(url, headers={"If-None-Match": etag})
+            assert response.code == 304
+
+            live_playlist = self.webserver.hls_playlist_cache.get("test")
+            with self._get_db_session() as session:
+                session.execute(delete(Files).where(Files.id == 29))
+                session.commit()
+            with patch.dict(
+                self.vis.data,
+                {STORAGE_COMPONENT: Mock(get_session=self._get_db_session)},
+            ):
+                live_playlist._refresh(  # pylint: disable=protected-access
+                    f"{int(self._simulated_now.timestamp())}.m4s"
+                )
+            response = self.fetch(url, headers={"If-None-Match": etag})
+        assert response.code == 200
+        assert response.body.decode().count("#EXTINF") == 14
+
+
+def test_touch_hls_client():
+    """Test that a client polling an unchanged playlist is not evicted."""
+    hls_clients = HlsAPIHandler.hls_client_ids
+    update_hls_client("polling", [])
+    update_hls_client("gone", [])
+    hls_clients["polling"].last_seen -= HLS_CLIENT_TIMEOUT + 1
+    hls_clients["gone"].last_seen -= HLS_CLIENT_TIMEOUT + 1
+
+    touch_hls_client("polling")
+    update_hls_client("other", [])
+    assert "polling" in hls_clients
+    assert "gone" not in hls_clients
+    for client_id in ("polling", "other"):
+        hls_clients.pop(client_id, None)
+
 
 def test_count_files_removed_no_files_removed():
     """Test count_files_removed with no files removed."""
@@ -0,0 +1 @@
+"""WebSocket API tests."""
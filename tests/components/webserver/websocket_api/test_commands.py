@@ -0,0 +1,42 @@
+"""Test the WebSocket API commands."""
+from __future__ import annotations
+
+import asyncio
+import json
+from unittest.mock import AsyncMock, Mock
+
+from viseron.components.webserver.const import WS_ERROR_UNKNOWN_ERROR
+from viseron.components.webserver.websocket_api.commands import _forward_event
+from viseron.events import Event
+
+
+def _mock_connection() -> Mock:
+    """Return a mocked connection that runs executor jobs inline."""
+    connection = Mock()
+    connection.run_in_executor = AsyncMock(
+        side_effect=lambda func, *args: func(*args)
+    )
+    connection.async_send_message = AsyncMock()
+    return connection
+
+
+def test_forward_event() -> None:
+    """Test that events are forwarded as subscription results."""
+    connection = _mock_connection()
+    asyncio.run(_forward_event(connection, 1, Event("test", {"value": 1}, 0.0)))
+
+    message = json.loads(connection.async_send_message.call_args.args[0])
+    assert message["command_id"] == 1
+    assert message["success"] is True
+    assert message["result"]["data"] == {"value": 1}
+
+
+def test_forward_event_invalid_json() -> None:
+    """Test that an event that cannot be serialized sends an error message."""
+    connection = _mock_connection()
+    asyncio.run(_forward_event(connection, 1, Event("test", object(), 0.0)))
+
+    message = connection.async_send_message.call_args.args[0]
+    assert message["command_id"] == 1
+    assert message["success"] is False
+    assert message["error"]["code"] == WS_ERROR_UNKNOWN_ERROR
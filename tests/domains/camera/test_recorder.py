@@ -8,11 +8,12 @@ from typing import TYPE_CHECKING, Literal
 from unittest.mock import MagicMock, Mock, patch
 
 import pytest
-from sqlalchemy import insert
+from sqlalchemy import insert, select
 from sqlalchemy.orm import Session
 
-from viseron.components.storage.models import Files, Recordings
+from viseron.components.storage.models import Files, Recordings, TriggerTypes
 from viseron.domains.camera import AbstractCamera
+from viseron.domains.camera.const import EVENT_RECORDER_START, EVENT_RECORDER_STOP
 from viseron.domains.camera.recorder import (
     AbstractRecorder,
     RecorderBase,
@@ -349,19 +350,28 @@ def fixture_add_segment_to_session(
     return _add_segment
 
 
-@pytest.fixture(name="recorder")
-def fixture_patched_recorder(vis: Viseron):
-    """Fixture to create a test recorder with mocked vis.add_entity."""
+def _create_recorder(vis: Viseron) -> ConcreteTestRecorder:
+    """Create a test recorder with mocked vis.add_entity."""
     with patch.object(vis, "add_entity") as mock_add_entity:
         config = MagicMock()
-        nested_dict = {"filename_pattern": "%H-%M-%S"}
+        nested_dict = {
+            "filename_pattern": "%H-%M-%S",
+            "thumbnail": {"save_to_disk": True},
+            "create_event_clip": False,
+        }
         config.__getitem__.return_value.__getitem__.side_effect = nested_dict.get
         recorder = ConcreteTestRecorder(vis, config, MockCamera())
         # pylint: disable=protected-access
         recorder._logger = MagicMock()
         assert mock_add_entity.call_count == 2
+    return recorder
 
-        yield recorder
+
+@pytest.fixture(name="recorder")
+def fixture_patched_recorder(vis: Viseron):
+    """Fixture to create a test recorder that does not reserve recording ids."""
+    with patch.object(ConcreteTestRecorder, "_prefetch_recording_id"):
+        yield _create_recorder(vis)
 
 
 @pytest.fixture(name="recording_params")
@@ -438,6 +448,56 @@ class TestAbstractRecorder:
         )
         assert recorder.active_recording is None
 
+    def test_first_recording_id_reserved(self, vis: Viseron):
+        """Test that the first recording id is reserved before start is called."""
+        # pylint: disable=protected-access
+        with patch.object(
+            ConcreteTestRecorder, "_reserve_recording_id", side_effect=[5, 6]
+        ) as mock_reserve_recording_id:
+            recorder = _create_recorder(vis)
+            recorder._persist_executor.submit(lambda: None).result()
+            assert mock_reserve_recording_id.call_count == 1
+
+            assert recorder._take_recording_id() == 5
+            recorder._shutdown()
+            assert mock_reserve_recording_id.call_count == 2
+
+    def test_start_stop(
+        self,
+        get_db_session: Callable[[], Session],
+        recorder: ConcreteTestRecorder,
+    ):
+        """Test that start and stop are written in order by the worker."""
+        # pylint: disable=protected-access
+        shared_frame = MagicMock()
+        camera_identifier = recorder._camera.identifier
+        with patch.object(
+            recorder._storage, "get_session", get_db_session
+        ), patch.object(recorder._camera, "thumbnails_folder", "/tmp"), patch.object(
+            recorder, "create_thumbnail", return_value=(None, "/tmp/1.jpg")
+        ), patch.object(
+            recorder._vis, "dispatch_event"
+        ) as mock_dispatch_event:
+            recording = recorder.start(shared_frame, [], TriggerTypes.OBJECT)
+            assert recorder.is_recording
+            assert recorder.active_recording is recording
+            recorder.stop(recording)
+            assert not recorder.is_recording
+            recorder._shutdown()
+
+        with get_db_session() as session:
+            row = session.execute(
+                select(Recordings).where(Recordings.id == recording.id)
+            ).scalar_one()
+        assert row.thumbnail_path == "/tmp/1.jpg"
+        assert row.end_time == recording.end_time
+        assert [call.args[0] for call in mock_dispatch_event.call_args_list] == [
+            EVENT_RECORDER_START.format(camera_identifier=camera_identifier),
+            EVENT_RECORDER_STOP.format(camera_identifier=camera_identifier),
+        ]
+        shared_frame.acquire.assert_called_once()
+        shared_frame.release.assert_called_once()
+
     @pytest.mark.parametrize(  # start of segments relative to start of recording
         "segment_offsets, expected",
         [
@@ -0,0 +1,259 @@
+"""Tests for shared frames."""
+from __future__ import annotations
+
+import time
+from functools import partial
+from unittest.mock import MagicMock
+
+import numpy as np
+import pytest
+
+from viseron.domains.camera.shared_frames import (
+    FRAME_POOL_SWEEP_INTERVAL,
+    PIXEL_FORMAT_NV12,
+    DerivedFrameCacheStatistics,
+    FramePool,
+    FramePoolStatistics,
+    SharedFrame,
+    SharedFrameRingBuffer,
+    SharedFrames,
+)
+
+WIDTH = 4
+HEIGHT = 4
+FRAME_SIZE = int(WIDTH * HEIGHT * 1.5)
+
+
+def _readinto(value: int, size: int = FRAME_SIZE):
+    """Return a readinto function that fills the buffer with value."""
+
+    def readinto(buffer: memoryview) -> int:
+        buffer[:size] = bytes([value]) * size
+        return size
+
+    return readinto
+
+
+@pytest.fixture(name="ring_buffer")
+def fixture_ring_buffer():
+    """Return a ring buffer with three slots."""
+    ring_buffer = SharedFrameRingBuffer(FRAME_SIZE, 3)
+    yield ring_buffer
+    ring_buffer.close()
+
+
+class TestSharedFrameRingBuffer:
+    """Test the SharedFrameRingBuffer class."""
+
+    def test_write_claim_release(self, ring_buffer: SharedFrameRingBuffer):
+        """Test that a slot is reused only after it has been released."""
+        slot = ring_buffer.write(_readinto(1))
+        assert slot == 0
+        sequence = ring_buffer.sequence(slot)
+        view = ring_buffer.claim(slot, sequence)
+        assert view is not None
+        assert bytes(view) == bytes([1]) * FRAME_SIZE
+        # Claiming twice is not allowed
+        assert ring_buffer.claim(slot, sequence) is None
+
+        assert ring_buffer.write(_readinto(2)) == 1
+        assert ring_buffer.write(_readinto(3)) == 2
+        assert ring_buffer.slots_in_use == 3
+
+        ring_buffer.release(slot)
+        assert ring_buffer.write(_readinto(4)) == 0
+        assert ring_buffer.sequence(0) > sequence
+        view.release()
+
+    def test_overrun(self, ring_buffer: SharedFrameRingBuffer):
+        """Test that frames are dropped when all slots are in use."""
+        for value in range(3):
+            assert ring_buffer.write(_readinto(value)) is not None
+        assert ring_buffer.write(_readinto(9)) is None
+        assert ring_buffer.overruns == 1
+        for slot in range(3):
+            assert bytes([9]) not in bytes(ring_buffer._slot_view(slot))
+
+    def test_incomplete_read(self, ring_buffer: SharedFrameRingBuffer):
+        """Test that an incomplete read does not occupy a slot."""
+        assert ring_buffer.write(_readinto(1, FRAME_SIZE - 1)) is None
+        assert ring_buffer.overruns == 0
+        assert ring_buffer.slots_in_use == 0
+
+    def test_reclaim(self, ring_buffer: SharedFrameRingBuffer):
+        """Test that slots of a previous writer are reclaimed by the consumer."""
+        claimed = ring_buffer.write(_readinto(1))
+        assert claimed is not None
+        view = ring_buffer.claim(claimed, ring_buffer.sequence(claimed))
+        unclaimed = ring_buffer.write(_readinto(2))
+        assert unclaimed is not None
+        stale_sequence = ring_buffer.sequence(unclaimed)
+
+        ring_buffer.restart()
+        assert ring_buffer.generation == 1
+        # Written by the new writer, must not be freed
+        current = ring_buffer.write(_readinto(3))
+        assert current is not None
+        ring_buffer.reclaim()
+        assert ring_buffer.slots_in_use == 2
+        assert ring_buffer.write(_readinto(4)) == unclaimed
+        assert ring_buffer.claim(unclaimed, stale_sequence) is None
+        assert ring_buffer.claim(current, ring_buffer.sequence(current)) is not None
+        assert view is not None
+        view.release()
+
+
+def test_shared_frames_zero_copy(ring_buffer: SharedFrameRingBuffer):
+    """Test that frames created from a slot are views that release the slot."""
+    shared_frames = SharedFrames(MagicMock(shutdown_stage="shutdown"))
+    slot = ring_buffer.write(_readinto(7))
+    assert slot is not None
+    view = ring_buffer.claim(slot, ring_buffer.sequence(slot))
+    assert view is not None
+    shared_frame = SharedFrame(
+        WIDTH, int(HEIGHT * 1.5), PIXEL_FORMAT_NV12, (WIDTH, HEIGHT), "test"
+    )
+    shared_frames.create(shared_frame, view, release=partial(ring_buffer.release, slot))
+
+    frame = shared_frames.get_decoded_frame(shared_frame)
+    assert np.shares_memory(frame, np.frombuffer(view, np.uint8))
+    assert not frame.flags.writeable
+    del frame
+
+    shared_frames.remove(shared_frame, None)
+    assert ring_buffer.slots_in_use == 0
+    view.release()
+
+
+def test_shared_frames_dropped_frames_release_slots(
+    ring_buffer: SharedFrameRingBuffer,
+):
+    """Test that frames that are never consumed give their slot back."""
+    shared_frames = SharedFrames(MagicMock(shutdown_stage=None))
+    shared_frames.pool._grace_period = 0
+    camera = MagicMock(current_frame=None)
+    for value in range(3):
+        slot = ring_buffer.write(_readinto(value))
+        assert slot is not None
+        view = ring_buffer.claim(slot, ring_buffer.sequence(slot))
+        assert view is not None
+        shared_frame = SharedFrame(
+            WIDTH, int(HEIGHT * 1.5), PIXEL_FORMAT_NV12, (WIDTH, HEIGHT), "test"
+        )
+        shared_frames.create(
+            shared_frame, view, release=partial(ring_buffer.release, slot)
+        )
+        # Scheduled by the camera on creation, the frame is then dropped
+        shared_frames.remove(shared_frame, camera)
+        camera.current_frame = shared_frame
+    assert ring_buffer.slots_in_use == 3
+
+    camera.current_frame = None
+    for _ in range(20):
+        if ring_buffer.slots_in_use == 0:
+            break
+        time.sleep(FRAME_POOL_SWEEP_INTERVAL)
+    assert ring_buffer.slots_in_use == 0
+    assert ring_buffer.write(_readinto(9)) is not None
+    assert ring_buffer.overruns == 0
+    shared_frames.remove_all()
+
+
+def _shared_frame() -> SharedFrame:
+    """Return a small NV12 shared frame."""
+    return SharedFrame(
+        WIDTH, int(HEIGHT * 1.5), PIXEL_FORMAT_NV12, (WIDTH, HEIGHT), "test"
+    )
+
+
+class TestFramePool:
+    """Test the FramePool class."""
+
+    def test_buffers_reused_after_last_release(self):
+        """Test that buffers are returned to the free list by the last holder."""
+        on_free = MagicMock()
+        pool = FramePool(on_free, grace_period=0)
+        shared_frame = _shared_frame()
+        pool.add(shared_frame)
+        buffer = pool.get_buffer(shared_frame, (HEIGHT, WIDTH, 3))
+
+        shared_frame.acquire()
+        pool.release_owner(shared_frame, immediate=True)
+        assert pool.statistics.live_frames == 1
+        on_free.assert_not_called()
+
+        shared_frame.release()
+        on_free.assert_called_once_with(shared_frame)
+        assert pool.statistics == FramePoolStatistics(
+            hits=0, misses=1, live_frames=0, free_buffers=1
+        )
+
+        next_frame = _shared_frame()
+        pool.add(next_frame)
+        assert pool.get_buffer(next_frame, (HEIGHT, WIDTH, 3)) is buffer
+        assert pool.statistics.hits == 1
+        pool.release_all()
+
+    def test_sweeper_keeps_frame(self):
+        """Test that the sweeper postpones release while keep returns True."""
+        on_free = MagicMock()
+        pool = FramePool(on_free, grace_period=0)
+        shared_frame = _shared_frame()
+        pool.add(shared_frame)
+        keep = MagicMock(side_effect=[True, False])
+        pool.release_owner(shared_frame, keep=keep)
+
+        for _ in range(20):
+            if on_free.called:
+                break
+            time.sleep(FRAME_POOL_SWEEP_INTERVAL)
+        on_free.assert_called_once_with(shared_frame)
+        assert keep.call_count == 2
+        pool.release_all()
+
+    def test_shared_frames_color_convert(self):
+        """Test that color converted frames use pooled buffers."""
+        shared_frames = SharedFrames(MagicMock(shutdown_stage="shutdown"))
+        shared_frame = _shared_frame()
+        shared_frames.create(shared_frame, bytes(FRAME_SIZE))
+        rgb = shared_frames.get_decoded_frame_rgb(shared_frame)
+        gray = shared_frames.get_decoded_frame_gray(shared_frame)
+        assert rgb.shape == (HEIGHT, WIDTH, 3)
+        assert gray.shape == (HEIGHT, WIDTH)
+        assert shared_frames.pool.statistics.misses == 2
+
+        shared_frames.remove(shared_frame, None)
+        assert shared_frames.pool.statistics.live_frames == 0
+        assert shared_frames.pool.statistics.free_buffers == 2
+        with pytest.raises(KeyError):
+            shared_frames.get_decoded_frame(shared_frame)
+
+    def test_shared_frames_derived_frames(self):
+        """Test that derived frames are cached read-only until the frame is freed."""
+        shared_frames = SharedFrames(MagicMock(shutdown_stage="shutdown"))
+        shared_frame = _shared_frame()
+        shared_frames.create(shared_frame, bytes([128]) * FRAME_SIZE)
+        mask = np.zeros((HEIGHT, WIDTH), dtype=np.uint8)
+
+        masked = shared_frames.get_frame(shared_frame, mask=mask)
+        assert not masked.any()
+        with pytest.raises(ValueError):
+            masked[0, 0] = 1
+        assert shared_frames.get_frame(shared_frame, mask=mask) is masked
+        resized = shared_frames.get_frame(shared_frame, size=(2, 2), mask=mask)
+        assert resized.shape == (2, 2, 3)
+        letterboxed = shared_frames.get_frame(
+            shared_frame, size=(8, 2), letterbox=True
+        )
+        assert letterboxed.shape == (2, 8, 3)
+        assert not letterboxed[:, :3].any()
+        assert letterboxed[:, 3:5].all()
+        assert shared_frames.derived_frame_statistics == DerivedFrameCacheStatistics(
+            hits=3, misses=4, entries=4, hit_rate=3 / 7
+        )
+
+        shared_frames.remove(shared_frame, None)
+        assert shared_frames.derived_frame_statistics.entries == 0
+        assert shared_frames.pool.statistics.free_buffers == 4
+        with pytest.raises(KeyError):
+            shared_frames.get_frame(shared_frame)
@@ -0,0 +1,45 @@
+"""Tests for the snapshot writer."""
+from __future__ import annotations
+
+import threading
+from pathlib import Path
+from unittest.mock import MagicMock
+
+import numpy as np
+
+from viseron.domains.camera.snapshot_writer import SnapshotJob, SnapshotWriter
+
+
+def test_submit(tmp_path: Path) -> None:
+    """Test that snapshots of the same frame share one decoded frame."""
+    decoding = threading.Event()
+    proceed = threading.Event()
+
+    def get_decoded_frame_rgb(_shared_frame):
+        decoding.set()
+        proceed.wait(5)
+        return np.zeros((480, 640, 3), dtype=np.uint8)
+
+    shared_frames = MagicMock()
+    shared_frames.get_decoded_frame_rgb.side_effect = get_decoded_frame_rgb
+    shared_frame = MagicMock()
+    writer = SnapshotWriter(shared_frames, 90, "test")
+
+    paths = [tmp_path / "object" / f"{index}.jpg" for index in range(3)]
+    writer.submit(shared_frame, SnapshotJob(str(paths[0])))
+    assert decoding.wait(5)
+    writer.submit(
+        shared_frame,
+        SnapshotJob(str(paths[1]), zoom_coordinates=(10, 10, 100, 100)),
+    )
+    writer.submit(
+        shared_frame,
+        SnapshotJob(str(paths[2]), bbox=(10, 10, 100, 100), text="text"),
+    )
+    proceed.set()
+    writer.stop()
+
+    assert all(path.exists() for path in paths)
+    shared_frames.get_decoded_frame_rgb.assert_called_once_with(shared_frame)
+    shared_frame.acquire.assert_called_once()
+    shared_frame.release.assert_called_once()
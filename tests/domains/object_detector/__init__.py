@@ -0,0 +1 @@
+"""Object detector tests."""
@@ -0,0 +1,125 @@
+"""Tests for the object detector batch scheduler."""
+from __future__ import annotations
+
+import threading
+from queue import Empty, Queue
+
+import pytest
+
+from viseron.domains.object_detector.batch_scheduler import (
+    BatchScheduler,
+    WorkerBatchRunner,
+)
+
+
+@pytest.fixture(name="blocked_scheduler")
+def fixture_blocked_scheduler():
+    """Return a scheduler whose first batch blocks until released."""
+    release = threading.Event()
+    batches: list[list[int]] = []
+
+    def run_batch(items: list[int]) -> list[int]:
+        batches.append(items)
+        release.wait()
+        return [item * 10 for item in items]
+
+    scheduler = BatchScheduler("test", run_batch, batch_size=3, batch_timeout=0)
+    yield scheduler, batches, release
+    release.set()
+    scheduler.stop()
+
+
+def test_results_scattered_in_batches(blocked_scheduler):
+    """Test that requests queued while a batch runs are batched together."""
+    scheduler, batches, release = blocked_scheduler
+    result_queues: list[Queue] = [Queue(maxsize=1) for _ in range(5)]
+
+    request_ids = [scheduler.submit(0, result_queues[0])]
+    for _ in range(100):
+        if batches:
+            break
+        threading.Event().wait(0.01)
+    for item in range(1, 5):
+        request_ids.append(scheduler.submit(item, result_queues[item]))
+    release.set()
+
+    assert [queue.get(timeout=2) for queue in result_queues] == list(
+        zip(request_ids, [0, 10, 20, 30, 40])
+    )
+    assert batches == [[0], [1, 2, 3], [4]]
+
+    statistics = scheduler.statistics
+    assert statistics.batches == 3
+    assert statistics.frames == 5
+    assert statistics.occupancy == pytest.approx(5 / 9)
+    assert statistics.max_queue_latency >= statistics.queue_latency > 0
+
+
+def test_batch_timeout():
+    """Test that a batch that is not full waits for the timeout."""
+    batches: list[list[str]] = []
+    barrier = threading.Event()
+
+    def run_batch(items: list[str]) -> list[str]:
+        batches.append(items)
+        barrier.set()
+        return items
+
+    scheduler = BatchScheduler("test", run_batch, batch_size=2, batch_timeout=0.5)
+    result_queue: Queue = Queue(maxsize=2)
+    scheduler.submit("a", result_queue)
+    scheduler.submit("b", result_queue)
+    assert barrier.wait(2)
+    assert batches == [["a", "b"]]
+    scheduler.stop()
+
+
+def test_request_discards_late_results():
+    """Test that a result that arrives after its request timed out is discarded."""
+    release = threading.Event()
+
+    def run_batch(items: list[str]) -> list[str]:
+        if items == ["slow"]:
+            release.wait(2)
+        return items
+
+    scheduler = BatchScheduler("test", run_batch, batch_size=1, batch_timeout=0)
+    result_queue: Queue = Queue(maxsize=1)
+    with pytest.raises(Empty):
+        scheduler.request("slow", result_queue, timeout=0.1)
+    release.set()
+    assert scheduler.request("fast", result_queue) == "fast"
+    scheduler.stop()
+
+
+def test_result_count_mismatch():
+    """Test that a batch with a missing result fails for all its requests."""
+
+    def run_batch(items: list[str]) -> list[str]:
+        return items[:1] if "drop" in items else items
+
+    scheduler = BatchScheduler("test", run_batch, batch_size=2, batch_timeout=0.5)
+    result_queues: list[Queue] = [Queue(maxsize=1) for _ in range(2)]
+    scheduler.submit("first", result_queues[0])
+    scheduler.submit("drop", result_queues[1])
+    for result_queue in result_queues:
+        with pytest.raises(Empty):
+            result_queue.get(timeout=1)
+    assert scheduler.request("ok", result_queues[0]) == "ok"
+    scheduler.stop()
+
+
+def test_worker_batch_runner_discards_stale_results():
+    """Test that results of previous batches are discarded."""
+    input_queue: Queue = Queue()
+    runner = WorkerBatchRunner(input_queue)
+
+    def worker():
+        item = input_queue.get(timeout=2)
+        runner.put_result({"batch_id": item["batch_id"] - 1, "results": ["stale"]})
+        runner.put_result({"batch_id": item["batch_id"], "results": ["fresh"]})
+
+    thread = threading.Thread(target=worker)
+    thread.start()
+    assert runner(["frame"]) == ["fresh"]
+    thread.join()
@@ -0,0 +1,124 @@
+"""Tests for the columnar detection batch."""
+from __future__ import annotations
+
+import numpy as np
+import pytest
+
+from viseron.domains.motion_detector.const import CONFIG_TRIGGER_EVENT_RECORDING
+from viseron.domains.object_detector.const import (
+    CONFIG_LABEL_CONFIDENCE,
+    CONFIG_LABEL_HEIGHT_MAX,
+    CONFIG_LABEL_HEIGHT_MIN,
+    CONFIG_LABEL_LABEL,
+    CONFIG_LABEL_REQUIRE_MOTION,
+    CONFIG_LABEL_STORE,
+    CONFIG_LABEL_STORE_INTERVAL,
+    CONFIG_LABEL_WIDTH_MAX,
+    CONFIG_LABEL_WIDTH_MIN,
+)
+from viseron.domains.object_detector.detected_object import DetectedObject
+from viseron.domains.object_detector.detection_batch import DetectionBatch
+from viseron.helpers.filter import Filter
+
+FRAME_RES = (1920, 1080)
+MODEL_RES = (416, 416)
+
+LABELS = ["person", "car", "person", "dog"]
+CONFIDENCES = [0.91234, 0.5, 0.75, 0.99]
+ABSOLUTE_BOXES = [
+    (10, 100, 110, 300),
+    (200, 150, 400, 260),
+    (0, 60, 30, 90),
+    (300, 300, 415, 350),
+]
+
+
+def _filter(label: str, confidence: float, width_min: float = 0) -> Filter:
+    """Return a label filter."""
+    return Filter(
+        FRAME_RES,
+        {
+            CONFIG_LABEL_LABEL: label,
+            CONFIG_LABEL_CONFIDENCE: confidence,
+            CONFIG_LABEL_WIDTH_MIN: width_min,
+            CONFIG_LABEL_WIDTH_MAX: 1,
+            CONFIG_LABEL_HEIGHT_MIN: 0,
+            CONFIG_LABEL_HEIGHT_MAX: 1,
+            CONFIG_TRIGGER_EVENT_RECORDING: True,
+            CONFIG_LABEL_REQUIRE_MOTION: False,
+            CONFIG_LABEL_STORE: True,
+            CONFIG_LABEL_STORE_INTERVAL: 10,
+        },
+        [],
+    )
+
+
+def _formatted(objects: list[DetectedObject]) -> list[dict]:
+    return [obj.formatted | {"abs": obj.abs_coordinates} for obj in objects]
+
+
+@pytest.mark.parametrize(
+    "batch_constructor, object_constructor, boxes",
+    [
+        (
+            DetectionBatch.from_absolute,
+            DetectedObject.from_absolute,
+            ABSOLUTE_BOXES,
+        ),
+        (
+            DetectionBatch.from_absolute_letterboxed,
+            DetectedObject.from_absolute_letterboxed,
+            ABSOLUTE_BOXES,
+        ),
+        (
+            DetectionBatch.from_relative_letterboxed,
+            DetectedObject.from_relative_letterboxed,
+            [np.array(box) / MODEL_RES[0] for box in ABSOLUTE_BOXES],
+        ),
+    ],
+)
+def test_matches_detected_object(batch_constructor, object_constructor, boxes):
+    """Test that the batch produces the same objects as DetectedObject."""
+    batch = batch_constructor(
+        LABELS, CONFIDENCES, boxes, frame_res=FRAME_RES, model_res=MODEL_RES
+    )
+    expected = [
+        object_constructor(
+            label, confidence, *box, frame_res=FRAME_RES, model_res=MODEL_RES
+        )
+        for label, confidence, box in zip(LABELS, CONFIDENCES, boxes)
+    ]
+    assert len(batch) == len(LABELS)
+    assert _formatted(batch.to_objects()) == _formatted(expected)
+
+
+def test_filter_mask_matches_filter_object():
+    """Test that the vectorized filters agree with Filter.filter_object."""
+    batch = DetectionBatch.from_absolute(
+        LABELS, CONFIDENCES, ABSOLUTE_BOXES, frame_res=FRAME_RES, model_res=MODEL_RES
+    )
+    filters = [_filter("person", 0.8), _filter("person", 0.5, width_min=0.1)]
+
+    mask = batch.filter_mask(filters)
+    expected = [
+        any(
+            object_filter.label == obj.label and object_filter.filter_object(obj)
+            for object_filter in filters
+        )
+        for obj in batch.to_objects()
+    ]
+    assert mask.tolist() == expected == [True, False, False, False]
+
+    survivors = batch.select(mask)
+    assert len(survivors) == 1
+    assert [obj.label for obj in survivors.to_objects()] == ["person"]
+
+
+def test_empty_batch():
+    """Test that an empty batch is handled."""
+    batch = DetectionBatch.from_absolute(
+        [], [], [], frame_res=FRAME_RES, model_res=MODEL_RES
+    )
+    assert len(batch) == 0
+    assert batch.filter_mask([_filter("person", 0.5)]).tolist() == []
+    assert batch.to_objects() == []
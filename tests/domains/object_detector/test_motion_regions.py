@@ -0,0 +1,88 @@
+"""Tests for object detection on motion regions."""
+from __future__ import annotations
+
+import numpy as np
+import pytest
+
+from viseron.domains.object_detector.detected_object import DetectedObject
+from viseron.domains.object_detector.motion_regions import (
+    deduplicate_objects,
+    motion_regions,
+    remap_objects,
+)
+
+FRAME_RES = (1000, 1000)
+
+
+def _contour(x1: float, y1: float, x2: float, y2: float) -> np.ndarray:
+    """Return a rectangular contour in relative coordinates."""
+    return np.array([[[x1, y1]], [[x2, y1]], [[x2, y2]], [[x1, y2]]])
+
+
+def test_motion_regions_padded_and_clipped():
+    """Test that small motion is padded to the min size and kept inside the frame."""
+    regions = motion_regions([_contour(0.0, 0.0, 0.05, 0.05)], FRAME_RES)
+    assert regions == [(0, 0, 200, 200)]
+
+
+@pytest.mark.parametrize(
+    "contours, expected",
+    [
+        (
+            [_contour(0.1, 0.1, 0.15, 0.15), _contour(0.15, 0.15, 0.2, 0.2)],
+            [(25, 25, 275, 275)],
+        ),
+        (
+            [_contour(0.1, 0.1, 0.15, 0.15), _contour(0.8, 0.8, 0.85, 0.85)],
+            [(25, 25, 225, 225), (725, 725, 925, 925)],
+        ),
+    ],
+)
+def test_motion_regions_merge_overlapping(contours, expected):
+    """Test that overlapping regions are merged."""
+    assert motion_regions(contours, FRAME_RES) == expected
+
+
+def test_motion_regions_max_regions():
+    """Test that the closest regions are merged until max_regions is met."""
+    contours = [
+        _contour(0.0, 0.0, 0.01, 0.01),
+        _contour(0.3, 0.0, 0.31, 0.01),
+        _contour(0.9, 0.9, 0.91, 0.91),
+    ]
+    regions = motion_regions(contours, FRAME_RES, max_regions=2)
+    assert regions == [(0, 0, 405, 200), (800, 800, 1000, 1000)]
+
+
+def test_motion_regions_full_frame_fallback():
+    """Test that no regions are returned when motion covers most of the frame."""
+    assert motion_regions([_contour(0.1, 0.1, 0.7, 0.7)], FRAME_RES) == []
+    assert motion_regions([], FRAME_RES) == []
+
+
+def test_remap_objects():
+    """Test that objects are mapped from the region to the full frame."""
+    region = (100, 200, 300, 400)
+    obj = DetectedObject("person", 0.9, 0.5, 0.5, 1.0, 1.0, (200, 200))
+    remapped = remap_objects([obj], region, FRAME_RES)
+    assert len(remapped) == 1
+    assert remapped[0].label == "person"
+    assert remapped[0].confidence == 0.9
+    assert (
+        remapped[0].rel_x1,
+        remapped[0].rel_y1,
+        remapped[0].rel_x2,
+        remapped[0].rel_y2,
+    ) == (0.2, 0.3, 0.3, 0.4)
+
+
+def test_deduplicate_objects():
+    """Test that the most confident of overlapping objects is kept."""
+    person_a = DetectedObject("person", 0.7, 0.1, 0.1, 0.3, 0.5, FRAME_RES)
+    # Same person cut in half by the edge of another region
+    person_b = DetectedObject("person", 0.9, 0.1, 0.1, 0.2, 0.5, FRAME_RES)
+    car = DetectedObject("car", 0.8, 0.1, 0.1, 0.3, 0.5, FRAME_RES)
+    other_person = DetectedObject("person", 0.6, 0.6, 0.6, 0.8, 0.8, FRAME_RES)
+
+    objects = deduplicate_objects([person_a, person_b, car, other_person])
+    assert objects == [person_b, car, other_person]
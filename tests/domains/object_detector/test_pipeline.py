@@ -0,0 +1,64 @@
+"""Tests for the detection pipeline."""
+from __future__ import annotations
+
+import time
+from unittest.mock import MagicMock
+
+from viseron.domains.object_detector.pipeline import DetectionPipeline
+
+
+def _shared_frame(index: int, age: float = 0) -> MagicMock:
+    return MagicMock(index=index, capture_time=time.time() - age)
+
+
+def test_results_published_in_order() -> None:
+    """Test that results are published in submission order."""
+    published = []
+
+    def detect(shared_frame):
+        # Earlier frames take longer, so they finish last
+        time.sleep(0.05 * (4 - shared_frame.index))
+        return shared_frame.index
+
+    pipeline = DetectionPipeline(
+        "test",
+        detect,
+        lambda shared_frame, result: published.append(result),
+        max_in_flight=4,
+        max_frame_age=5,
+    )
+    shared_frames = [_shared_frame(index) for index in range(4)]
+    for shared_frame in shared_frames:
+        assert pipeline.submit(shared_frame)
+    assert pipeline.statistics.in_flight == 4
+    pipeline.stop()
+
+    assert published == [0, 1, 2, 3]
+    for shared_frame in shared_frames:
+        shared_frame.acquire.assert_called_once()
+        shared_frame.release.assert_called_once()
+    statistics = pipeline.statistics
+    assert statistics.in_flight == 0
+    assert statistics.published == 4
+
+
+def test_old_frames_dropped() -> None:
+    """Test that old frames and results are dropped."""
+    publish = MagicMock()
+
+    def detect(shared_frame):
+        if shared_frame.index == 1:
+            return None
+        time.sleep(0.2)
+        return shared_frame.index
+
+    pipeline = DetectionPipeline("test", detect, publish, 2, max_frame_age=0.1)
+    assert not pipeline.submit(_shared_frame(0, age=1))
+    assert pipeline.submit(_shared_frame(1))
+    assert pipeline.submit(_shared_frame(2))
+    pipeline.stop()
+
+    publish.assert_not_called()
+    statistics = pipeline.statistics
+    assert statistics.dropped == 2
+    assert statistics.failed == 1
@@ -2,9 +2,11 @@
 from contextlib import nullcontext
 from datetime import datetime, timedelta, timezone
 
+import numpy as np
 import pytest
 
 from viseron import helpers
+from viseron.domains.object_detector.detected_object import DetectedObject
 
 
 @pytest.mark.parametrize(
@@ -84,6 +86,46 @@ def test_convert_letterboxed_bbox(
         assert str(exception.value) == message
 
 
+def test_apply_mask():
+    """Test that the mask is applied in place to color and gray frames."""
+    mask = [np.array([[0, 0], [4, 0], [4, 4], [0, 4]])]
+    mask_image = helpers.generate_mask_image(mask, (10, 10))
+    assert mask_image.shape == (10, 10)
+
+    color_frame = np.full((10, 10, 3), 200, np.uint8)
+    helpers.apply_mask(color_frame, mask_image)
+    assert not color_frame[:5, :5].any()
+    assert (color_frame[5:, 5:] == 200).all()
+
+    gray_frame = np.full((10, 10), 200, np.uint8)
+    helpers.apply_mask(gray_frame, mask_image)
+    assert np.array_equal(gray_frame, color_frame[:, :, 0])
+
+
+def test_objects_in_zone_map():
+    """Test that zone lookups agree with object_in_polygon."""
+    resolution = (100, 100)
+    zones = [
+        np.array([[0, 0], [60, 0], [60, 60], [0, 60]]),
+        np.array([[40, 40], [99, 40], [99, 99], [40, 99]]),
+    ]
+    zone_map = helpers.generate_zone_map(zones, resolution)
+    objects = [
+        DetectedObject("person", 0.9, 0.1, 0.1, 0.2, 0.2, resolution),
+        DetectedObject("person", 0.9, 0.4, 0.3, 0.6, 0.5, resolution),
+        DetectedObject("person", 0.9, 0.7, 0.7, 0.9, 0.9, resolution),
+        DetectedObject("person", 0.9, 0.7, 0.1, 0.9, 0.2, resolution),
+        DetectedObject("person", 0.9, -0.1, 0.5, 0.1, 1.0, resolution),
+    ]
+
+    zone_bits = helpers.objects_in_zone_map(zone_map, objects, resolution)
+    for index, coordinates in enumerate(zones):
+        assert ((zone_bits >> index) & 1 == 1).tolist() == [
+            helpers.object_in_polygon(resolution, obj, coordinates) for obj in objects
+        ]
+    assert helpers.objects_in_zone_map(zone_map, [], resolution).tolist() == []
+
+
 def test_basic_conversion_zero_offset():
     """Test with zero UTC offset."""
     date = "2024-01-01"
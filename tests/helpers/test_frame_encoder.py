@@ -0,0 +1,63 @@
+"""Test the frame encoder."""
+from __future__ import annotations
+
+from unittest.mock import MagicMock
+
+import cv2
+import numpy as np
+import pytest
+
+from viseron.helpers import letterbox_resize
+from viseron.helpers.frame_encoder import (
+    FRAME_FORMATS,
+    FrameEncoder,
+    get_encoded_frame_cache_statistics,
+)
+
+
+@pytest.mark.parametrize("shape", [(720, 1280, 3), (1280, 720, 3), (400, 400, 3)])
+def test_letterbox(shape: tuple[int, int, int]) -> None:
+    """Test that letterbox matches letterbox_resize, also when reusing the canvas."""
+    rng = np.random.default_rng(0)
+    encoder = FrameEncoder()
+    for _ in range(2):
+        frame = rng.integers(0, 255, shape, dtype=np.uint8)
+        np.testing.assert_array_equal(
+            encoder.letterbox(frame, 320, 320), letterbox_resize(frame, 320, 320)
+        )
+
+
+@pytest.mark.parametrize("frame_format", FRAME_FORMATS)
+def test_encode(frame_format: str) -> None:
+    """Test that frames are encoded in the configured format."""
+    frame = np.full((64, 64, 3), 128, dtype=np.uint8)
+    decoded = cv2.imdecode(
+        np.frombuffer(FrameEncoder(frame_format, 90).encode(frame), np.uint8),
+        cv2.IMREAD_COLOR,
+    )
+    assert decoded.shape == frame.shape
+
+
+def test_encode_crop_cached() -> None:
+    """Test that the same crop of a frame is only encoded once."""
+    frame = np.zeros((480, 640, 3), dtype=np.uint8)
+    shared_frame = MagicMock()
+    first = FrameEncoder()
+    second = FrameEncoder()
+    before = get_encoded_frame_cache_statistics()
+
+    image = first.encode_crop(shared_frame, frame, (10, 10, 110, 60))
+    assert second.encode_crop(shared_frame, frame, (10, 10, 110, 60)) == image
+    first.encode_crop(shared_frame, frame, (10, 10, 110, 60), letterbox=(100, 100))
+    FrameEncoder("png").encode_crop(shared_frame, frame, (10, 10, 110, 60))
+
+    # Frames of the same SharedFrame with a different mask are cached separately
+    mask = np.zeros((480, 640), dtype=np.uint8)
+    masked_frame = np.full((480, 640, 3), 255, dtype=np.uint8)
+    masked = first.encode_crop(shared_frame, masked_frame, (10, 10, 110, 60), mask=mask)
+    assert masked != image
+    assert first.encode_crop(shared_frame, frame, (10, 10, 110, 60)) == image
+
+    statistics = get_encoded_frame_cache_statistics()
+    assert statistics.hits - before.hits == 2
+    assert statistics.misses - before.misses == 4
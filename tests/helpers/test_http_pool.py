@@ -0,0 +1,109 @@
+"""Test the shared HTTP client pool."""
+from __future__ import annotations
+
+from concurrent.futures import ThreadPoolExecutor
+from typing import TYPE_CHECKING
+from unittest.mock import patch
+
+import pytest
+
+from viseron.const import VISERON_SIGNAL_SHUTDOWN
+
+from viseron.exceptions import HTTPRequestError
+from viseron.helpers.http_pool import (
+    HTTPClient,
+    close_http_clients,
+    get_http_client,
+    get_http_clients_statistics,
+    setup_http_clients,
+)
+
+from tests.common import StubHTTPServer
+
+if TYPE_CHECKING:
+    from tests.conftest import MockViseron
+
+DETECTION_RESPONSE = {"success": True, "predictions": [{"label": "person"}]}
+
+
+def test_post_json_keep_alive() -> None:
+    """Test that sequential requests reuse one connection."""
+    with StubHTTPServer({"/v1/vision/detection": DETECTION_RESPONSE}) as server:
+        client = HTTPClient()
+        for _ in range(3):
+            assert (
+                client.post_json(
+                    f"{server.url}/v1/vision/detection",
+                    5,
+                    files={"image": b"image"},
+                    data={"min_confidence": 0.5},
+                )
+                == DETECTION_RESPONSE
+            )
+        client.close()
+
+    assert len(server.client_ports) == 3
+    assert len(set(server.client_ports)) == 1
+    statistics = client.statistics
+    assert statistics.requests == 3
+    assert statistics.errors == 0
+    assert statistics.in_flight == 0
+    assert sum(statistics.latency_histogram.values()) == 3
+
+
+def test_max_connections() -> None:
+    """Test that concurrent requests are limited to max_connections."""
+    with StubHTTPServer(
+        {"/v1/vision/detection": DETECTION_RESPONSE}, delay=0.1
+    ) as server:
+        client = HTTPClient(max_connections=2)
+        with ThreadPoolExecutor(max_workers=6) as executor:
+            list(
+                executor.map(
+                    lambda _: client.post_json(
+                        f"{server.url}/v1/vision/detection", 5
+                    ),
+                    range(6),
+                )
+            )
+        client.close()
+
+    assert len(set(server.client_ports)) == 2
+
+
+def test_errors() -> None:
+    """Test that failed requests raise HTTPRequestError."""
+    with StubHTTPServer(delay=0.5) as server:
+        client = HTTPClient()
+        with pytest.raises(HTTPRequestError, match="Bad url"):
+            client.post_json(f"{server.url}/missing", 5)
+        with pytest.raises(HTTPRequestError, match="Timeout"):
+            client.post_json(f"{server.url}/missing", 0.1)
+        client.close()
+
+    assert client.statistics.requests == 2
+    assert client.statistics.errors == 1
+
+
+def test_get_http_client() -> None:
+    """Test that clients are shared per host."""
+    close_http_clients()
+    with StubHTTPServer() as server:
+        client = get_http_client(f"{server.url}/v1/vision/detection")
+        assert get_http_client(f"{server.url}/v1/vision/face") is client
+        assert get_http_client(server.url, verify=False) is not client
+        assert server.url in get_http_clients_statistics()
+        close_http_clients()
+        assert get_http_clients_statistics() == {}
+
+
+def test_setup_http_clients(vis: MockViseron) -> None:
+    """Test that the clients are closed on shutdown and set up only once."""
+    with patch.object(vis, "register_signal_handler") as register_signal_handler:
+        setup_http_clients(vis)
+        setup_http_clients(vis)
+
+    register_signal_handler.assert_called_once_with(
+        VISERON_SIGNAL_SHUTDOWN, close_http_clients
+    )
+    assert vis.background_scheduler.get_job("http_clients_statistics")
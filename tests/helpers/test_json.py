@@ -0,0 +1,59 @@
+"""Test the JSON helpers."""
+import datetime
+import json
+from dataclasses import dataclass
+from enum import Enum
+
+import numpy as np
+
+from viseron.events import Event
+from viseron.helpers.json import _stdlib_dumps, dumps
+
+
+class _Color(Enum):
+    RED = "red"
+
+
+@dataclass
+class _Data:
+    value: int
+
+
+@dataclass
+class _EventData:
+    json_serializable = True
+
+    value: int
+
+    def as_dict(self) -> dict[str, int]:
+        """Return as dict."""
+        return {"as_dict": self.value}
+
+
+def test_dumps() -> None:
+    """Test that dumps gives the same output as the stdlib encoder."""
+    obj = {
+        "datetime": datetime.datetime(2024, 1, 1, 12, 0, 0),
+        "timedelta": datetime.timedelta(seconds=5),
+        "enum": _Color.RED,
+        "array": np.array([[1, 2], [3, 4]]),
+        "dataclass": _Data(1),
+        "as_dict": _EventData(2),
+        "list": [1, 2.5, None, True, "text", "åäö"],
+    }
+    assert dumps(obj) == _stdlib_dumps(obj)
+    assert dumps({"a": [1, 2]}) == '{"a":[1,2]}'
+
+
+def test_event_as_json() -> None:
+    """Test that an event is serialized once and then reused."""
+    event = Event("test", _EventData(1), 1.5)
+    result = event.as_json()
+    assert json.loads(result) == {
+        "name": "test",
+        "data": {"as_dict": 1},
+        "timestamp": 1.5,
+    }
+    event.data.value = 2
+    assert event.as_json() is result
+    assert event.data_as_json() == '{"as_dict":1}'
@@ -0,0 +1,93 @@
+"""Tests for the states registry."""
+from __future__ import annotations
+
+import logging
+import time
+from typing import TYPE_CHECKING
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from viseron.const import EVENT_STATE_CHANGED
+from viseron.helpers.entity import Entity
+from viseron.states import States
+
+if TYPE_CHECKING:
+    from viseron import Viseron
+
+
+class MockEntity(Entity):
+    """Entity with a settable state."""
+
+    domain = "sensor"
+    name = "Test"
+
+    def __init__(self, coalesce_interval: float = 0, store: bool = True) -> None:
+        self.state_coalesce_interval = coalesce_interval
+        self.store_state_history = store
+        self.value = 0
+
+    @property
+    def state(self):
+        """Return state."""
+        return self.value
+
+
+def _add_entity(vis: Viseron, entity: Entity) -> tuple[States, MagicMock]:
+    states = States(vis)
+    component = MagicMock()
+    with patch.object(vis, "dispatch_event") as mock_dispatch_event:
+        states.add_entity(component, entity)
+    mock_dispatch_event.reset_mock()
+    return states, mock_dispatch_event
+
+
+def test_set_state_unchanged(vis: Viseron) -> None:
+    """Test that updates that do not change the state are suppressed."""
+    entity = MockEntity(store=False)
+    states, _ = _add_entity(vis, entity)
+
+    with patch.object(vis, "dispatch_event") as mock_dispatch_event:
+        states.set_state(entity)
+        mock_dispatch_event.assert_not_called()
+
+        entity.value = 1
+        states.set_state(entity)
+        mock_dispatch_event.assert_called_once()
+        assert mock_dispatch_event.call_args.args[0] == EVENT_STATE_CHANGED
+        assert mock_dispatch_event.call_args.kwargs["store"] is False
+
+    assert states.current[entity.entity_id].state == 1
+    statistics = states.statistics
+    assert statistics.dispatched == 2
+    assert statistics.suppressed == 1
+
+
+def test_set_state_coalesce(vis: Viseron) -> None:
+    """Test that rapid changes are merged into the latest one."""
+    entity = MockEntity(coalesce_interval=0.2)
+    states, _ = _add_entity(vis, entity)
+
+    with patch.object(vis, "dispatch_event") as mock_dispatch_event:
+        for value in range(1, 4):
+            entity.value = value
+            states.set_state(entity)
+        mock_dispatch_event.assert_not_called()
+        time.sleep(0.4)
+        mock_dispatch_event.assert_called_once()
+
+    data = mock_dispatch_event.call_args.args[1]
+    assert data.previous_state.state == 0
+    assert data.current_state.state == 3
+    assert states.statistics.coalesced == 2
+
+
+def test_log_statistics(vis: Viseron, caplog: pytest.LogCaptureFixture) -> None:
+    """Test that the update counters are logged."""
+    entity = MockEntity()
+    states, _ = _add_entity(vis, entity)
+    states.set_state(entity)
+
+    with caplog.at_level(logging.DEBUG, logger="viseron.states"):
+        states.log_statistics()
+    assert "1 dispatched, 1 suppressed, 0 coalesced" in caplog.text
@@ -2,7 +2,6 @@
 from __future__ import annotations
 
 import concurrent.futures
-import json
 import logging
 import multiprocessing.process
 import os
@@ -11,7 +10,6 @@ import threading
 import time
 import tracemalloc
 from collections.abc import Callable
-from functools import partial
 from logging.handlers import RotatingFileHandler
 from timeit import default_timer as timer
 from typing import TYPE_CHECKING, Any, Literal, overload
@@ -20,7 +18,6 @@ import voluptuous as vol
 from apscheduler.schedulers.background import BackgroundScheduler
 from apscheduler.schedulers.base import SchedulerNotRunningError
 from jinja2 import BaseLoader, Environment, StrictUndefined
-from sqlalchemy import insert
 
 from viseron.components import (
     CriticalComponentsConfigStore,
@@ -40,7 +37,6 @@ from viseron.components.nvr.const import (
 )
 from viseron.components.storage import Storage
 from viseron.components.storage.const import COMPONENT as STORAGE_COMPONENT
-from viseron.components.storage.models import Events
 from viseron.config import load_config
 from viseron.const import (
     DOMAIN_FAILED,
@@ -57,6 +53,7 @@ from viseron.const import (
     LOADED,
     LOADING,
     REGISTERED_DOMAINS,
+    STATISTICS_LOG_INTERVAL,
     VISERON_LOG_PATH,
     VISERON_SIGNAL_LAST_WRITE,
     VISERON_SIGNAL_SHUTDOWN,
@@ -66,7 +63,6 @@ from viseron.domains.camera.const import DOMAIN as CAMERA_DOMAIN
 from viseron.events import Event, EventData
 from viseron.exceptions import DataStreamNotLoaded, DomainNotRegisteredError
 from viseron.helpers import memory_usage_profiler, parse_size_to_bytes, utcnow
-from viseron.helpers.json import JSONEncoder
 from viseron.helpers.logs import (
     LOG_DATE_FORMAT,
     LOG_FORMAT,
@@ -280,6 +276,16 @@ class Viseron:
             self._thread_watchdog = ThreadWatchDog(self.background_scheduler)
             self._subprocess_watchdog = SubprocessWatchDog(self)
             self._process_watchdog = ProcessWatchDog(self)
+            self.background_scheduler.add_job(
+                self.states.log_statistics,
+                "interval",
+                id="states_statistics",
+                name="states_statistics",
+                seconds=STATISTICS_LOG_INTERVAL,
+                max_instances=1,
+                coalesce=True,
+                replace_existing=True,
+            )
 
         self.storage: Storage | None = None
         self.jinja_env = Environment(loader=BaseLoader(), undefined=StrictUndefined)
@@ -353,27 +359,9 @@ class Viseron:
         return unsubscribe
 
     def _insert_event(self, event: Event[EventData]) -> None:
-        """Insert event into database."""
+        """Queue event for insertion into the database."""
         if self.storage:
-            event_data_json = "{}"
-            if event.data and event.data.json_serializable:
-                try:
-                    event_data_json = partial(
-                        json.dumps, cls=JSONEncoder, allow_nan=False
-                    )(event.data)
-                except (TypeError, ValueError, json.JSONDecodeError) as error:
-                    LOGGER.warning(
-                        f"Failed to decode event {event.name} to JSON: {error}"
-                    )
-                    return
-
-            with self.storage.get_session() as session:
-                stmt = insert(Events).values(
-                    name=event.name,
-                    data=event_data_json,
-                )
-                session.execute(stmt)
-                session.commit()
+            self.storage.event_journal.put(event)
 
     def dispatch_event(self, event: str, data: EventData, store: bool = True) -> None:
         """Dispatch an event."""
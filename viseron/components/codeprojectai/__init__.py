@@ -14,9 +14,11 @@ from viseron.domains.license_plate_recognition import (
 )
 from viseron.domains.motion_detector.const import DOMAIN as MOTION_DETECTOR_DOMAIN
 from viseron.domains.object_detector import (
-    BASE_CONFIG_SCHEMA as OBJECT_DETECTOR_BASE_CONFIG_SCHEMA,
+    PIPELINED_BASE_CONFIG_SCHEMA as OBJECT_DETECTOR_BASE_CONFIG_SCHEMA,
 )
 from viseron.domains.object_detector.const import CONFIG_CAMERAS
+from viseron.helpers.frame_encoder import FRAME_FORMATS
+from viseron.helpers.http_pool import setup_http_clients
 from viseron.helpers.schemas import FLOAT_MIN_ZERO_MAX_ONE
 from viseron.helpers.validators import Maybe
 
@@ -25,15 +27,21 @@ from .const import (
     CONFIG_CUSTOM_MODEL,
     CONFIG_FACE_RECOGNITION,
     CONFIG_HOST,
+    CONFIG_IMAGE_FORMAT,
+    CONFIG_IMAGE_QUALITY,
     CONFIG_IMAGE_SIZE,
     CONFIG_LICENSE_PLATE_RECOGNITION,
+    CONFIG_MAX_CONNECTIONS,
     CONFIG_MIN_CONFIDENCE,
     CONFIG_OBJECT_DETECTOR,
     CONFIG_PORT,
     CONFIG_TIMEOUT,
     CONFIG_TRAIN,
     DEFAULT_CUSTOM_MODEL,
+    DEFAULT_IMAGE_FORMAT,
+    DEFAULT_IMAGE_QUALITY,
     DEFAULT_IMAGE_SIZE,
+    DEFAULT_MAX_CONNECTIONS,
     DEFAULT_MIN_CONFIDENCE,
     DEFAULT_PORT,
     DEFAULT_TIMEOUT,
@@ -42,8 +50,11 @@ from .const import (
     DESC_CUSTOM_MODEL,
     DESC_FACE_RECOGNITION,
     DESC_HOST,
+    DESC_IMAGE_FORMAT,
+    DESC_IMAGE_QUALITY,
     DESC_IMAGE_SIZE,
     DESC_LICENSE_PLATE_RECOGNITION,
+    DESC_MAX_CONNECTIONS,
     DESC_MIN_CONFIDENCE,
     DESC_OBJECT_DETECTOR,
     DESC_PORT,
@@ -90,6 +101,21 @@ CONFIG_SCHEMA = vol.Schema(
                 vol.Optional(
                     CONFIG_TIMEOUT, default=DEFAULT_TIMEOUT, description=DESC_TIMEOUT
                 ): int,
+                vol.Optional(
+                    CONFIG_MAX_CONNECTIONS,
+                    default=DEFAULT_MAX_CONNECTIONS,
+                    description=DESC_MAX_CONNECTIONS,
+                ): vol.All(int, vol.Range(min=1)),
+                vol.Optional(
+                    CONFIG_IMAGE_FORMAT,
+                    default=DEFAULT_IMAGE_FORMAT,
+                    description=DESC_IMAGE_FORMAT,
+                ): vol.In(FRAME_FORMATS),
+                vol.Optional(
+                    CONFIG_IMAGE_QUALITY,
+                    default=DEFAULT_IMAGE_QUALITY,
+                    description=DESC_IMAGE_QUALITY,
+                ): vol.All(int, vol.Range(min=1, max=100)),
                 vol.Optional(
                     CONFIG_OBJECT_DETECTOR, description=DESC_OBJECT_DETECTOR
                 ): OBJECT_DETECTOR_SCHEMA,
@@ -110,6 +136,7 @@ CONFIG_SCHEMA = vol.Schema(
 def setup(vis: Viseron, config) -> bool:
     """Set up the edgetpu component."""
     config = config[COMPONENT]
+    setup_http_clients(vis)
 
     if config.get(CONFIG_OBJECT_DETECTOR, None):
         for camera_identifier in config[CONFIG_OBJECT_DETECTOR][CONFIG_CAMERAS].keys():
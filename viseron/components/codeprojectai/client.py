@@ -0,0 +1,36 @@
+"""Requests to CodeProject.AI over the shared HTTP client pool."""
+from __future__ import annotations
+
+from typing import Any
+
+import codeprojectai.core as cpai
+
+from viseron.exceptions import HTTPRequestError
+from viseron.helpers.http_pool import HTTPClient
+
+
+def post_request(
+    http_client: HTTPClient, url: str, timeout: float, **kwargs: Any
+) -> Any:
+    """Send a POST request to CodeProject.AI and return the decoded response."""
+    try:
+        return http_client.post_json(url, timeout, **kwargs)
+    except HTTPRequestError as error:
+        raise cpai.CodeProjectAIException(str(error)) from error
+
+
+def process_image(
+    http_client: HTTPClient,
+    url: str,
+    image_bytes: bytes,
+    min_confidence: float,
+    timeout: float,
+) -> Any:
+    """Send an image to CodeProject.AI and return the decoded response."""
+    return post_request(
+        http_client,
+        url,
+        timeout,
+        files={"image": image_bytes},
+        data={"min_confidence": min_confidence},
+    )
@@ -8,7 +8,6 @@ from typing import TYPE_CHECKING
 import codeprojectai.core as cpai
 import cv2
 import numpy as np
-import requests
 
 from viseron.domains.face_recognition import AbstractFaceRecognition
 from viseron.domains.face_recognition.const import CONFIG_FACE_RECOGNITION_PATH
@@ -17,11 +16,17 @@ from viseron.helpers import (
     get_image_files_in_folder,
     letterbox_resize,
 )
+from viseron.helpers.frame_encoder import FrameEncoder
+from viseron.helpers.http_pool import get_http_client
 
+from .client import post_request, process_image
 from .const import (
     COMPONENT,
     CONFIG_FACE_RECOGNITION,
     CONFIG_HOST,
+    CONFIG_IMAGE_FORMAT,
+    CONFIG_IMAGE_QUALITY,
+    CONFIG_MAX_CONNECTIONS,
     CONFIG_MIN_CONFIDENCE,
     CONFIG_PORT,
     CONFIG_TIMEOUT,
@@ -56,6 +61,10 @@ class FaceRecognition(AbstractFaceRecognition):
             port=config[CONFIG_PORT],
             timeout=config[CONFIG_TIMEOUT],
             min_confidence=config[CONFIG_FACE_RECOGNITION][CONFIG_MIN_CONFIDENCE],
+            max_connections=config[CONFIG_MAX_CONNECTIONS],
+        )
+        self._encoder = FrameEncoder(
+            config[CONFIG_IMAGE_FORMAT], config[CONFIG_IMAGE_QUALITY]
         )
 
     def preprocess(self, frame) -> np.ndarray:
@@ -75,15 +84,18 @@ class FaceRecognition(AbstractFaceRecognition):
             ),
             self._camera.resolution,
         )
-        cropped_frame = post_processor_frame.frame[y1:y2, x1:x2].copy()
-        width, height, _ = cropped_frame.shape
+        height, width = post_processor_frame.frame[y1:y2, x1:x2].shape[:2]
         max_dimension = max(width, height)
-        cropped_frame = letterbox_resize(cropped_frame, max_dimension, max_dimension)
+        image = self._encoder.encode_crop(
+            post_processor_frame.shared_frame,
+            post_processor_frame.frame,
+            (x1, y1, x2, y2),
+            letterbox=(max_dimension, max_dimension),
+            mask=self.mask_image,
+        )
 
         try:
-            result = self._cpai.recognize(
-                cv2.imencode(".jpg", cropped_frame)[1].tobytes()
-            )
+            result = self._cpai.recognize(image)
         except cpai.CodeProjectAIException as error:
             self._logger.error("Error calling CodeProject.AI: %s", error)
             return
@@ -129,6 +141,7 @@ class CodeProjectAITrain:
             port=config[CONFIG_PORT],
             timeout=config[CONFIG_TIMEOUT],
             min_confidence=config[CONFIG_FACE_RECOGNITION][CONFIG_MIN_CONFIDENCE],
+            max_connections=config[CONFIG_MAX_CONNECTIONS],
         )
         self.train()
 
@@ -193,41 +206,21 @@ class CodeProjectAITrain:
                     self._cpai.register(face_dir, face_image_jpg)
 
 
-HTTP_OK = 200
-BAD_URL = 404
-
-
 class CodeProjectAIFace(cpai.CodeProjectAIFace):
-    """Custom CodeProjectAIFace to add list and delete function."""
+    """Custom CodeProjectAIFace to add list and delete function.
 
-    @staticmethod
-    def post_request(url, timeout=None, data: dict | None = None):
-        """Send post req to CodeProject.AI."""
-        try:
-            response = requests.post(url, data=data, timeout=timeout)
-        except requests.exceptions.Timeout:
-            raise cpai.CodeProjectAIException(  # pylint: disable=raise-missing-from
-                "Timeout connecting to CodeProject.AI, "
-                f"the current timeout is {timeout} "
-                "seconds, try increasing this value"
-            )
-        except (
-            requests.exceptions.ConnectionError,
-            requests.exceptions.MissingSchema,
-        ) as exc:
-            raise cpai.CodeProjectAIException(
-                f"CodeProject.AI connection error, check your IP and port: {exc}"
-            )
+    Requests are sent over the shared HTTP client pool.
+    """
 
-        if response.status_code == HTTP_OK:
-            return response.json()
-        if response.status_code == BAD_URL:
-            raise cpai.CodeProjectAIException(
-                f"Bad url supplied, url {url} raised error {BAD_URL}"
-            )
-        raise cpai.CodeProjectAIException(
-            f"Error from CodeProject.AI request, status code: {response.status_code}"
+    def __init__(self, ip, port, timeout, min_confidence, max_connections) -> None:
+        super().__init__(
+            ip=ip, port=port, timeout=timeout, min_confidence=min_confidence
         )
+        self._http_client = get_http_client(self._url_base, max_connections)
+
+    def post_request(self, url, timeout=None, data: dict | None = None):
+        """Send post req to CodeProject.AI."""
+        return post_request(self._http_client, url, timeout, data=data)
 
     def list_faces(self):
         """List taught faces."""
@@ -250,7 +243,8 @@ class CodeProjectAIFace(cpai.CodeProjectAIFace):
 
     def recognize(self, image_bytes: bytes):
         """Process image_bytes, performing recognition."""
-        response = cpai.process_image(
+        response = process_image(
+            self._http_client,
             url=self._url_recognize,
             image_bytes=image_bytes,
             min_confidence=self.min_confidence,
@@ -5,7 +5,6 @@ import logging
 from typing import TYPE_CHECKING
 
 import codeprojectai.core as cpai
-import cv2
 import numpy as np
 
 from viseron.domains.license_plate_recognition import (
@@ -16,13 +15,18 @@ from viseron.helpers import (
     calculate_absolute_coords,
     calculate_relative_coords,
     convert_letterboxed_bbox,
-    letterbox_resize,
 )
+from viseron.helpers.frame_encoder import FrameEncoder
+from viseron.helpers.http_pool import get_http_client
 
+from .client import process_image
 from .const import (
     COMPONENT,
     CONFIG_HOST,
+    CONFIG_IMAGE_FORMAT,
+    CONFIG_IMAGE_QUALITY,
     CONFIG_LICENSE_PLATE_RECOGNITION,
+    CONFIG_MAX_CONNECTIONS,
     CONFIG_MIN_CONFIDENCE,
     CONFIG_PORT,
     CONFIG_TIMEOUT,
@@ -31,6 +35,7 @@ from .const import (
 
 if TYPE_CHECKING:
     from viseron import Viseron
+    from viseron.domains.camera.shared_frames import SharedFrame
     from viseron.domains.object_detector.detected_object import DetectedObject
     from viseron.domains.post_processor import PostProcessorFrame
 
@@ -60,6 +65,10 @@ class LicensePlateRecognition(AbstractLicensePlateRecognition):
             min_confidence=config[CONFIG_LICENSE_PLATE_RECOGNITION][
                 CONFIG_MIN_CONFIDENCE
             ],
+            max_connections=config[CONFIG_MAX_CONNECTIONS],
+        )
+        self._encoder = FrameEncoder(
+            config[CONFIG_IMAGE_FORMAT], config[CONFIG_IMAGE_QUALITY]
         )
 
     def preprocess(self, frame) -> np.ndarray:
@@ -67,7 +76,10 @@ class LicensePlateRecognition(AbstractLicensePlateRecognition):
         return frame
 
     def _process_frame(
-        self, frame: np.ndarray, detected_object: DetectedObject
+        self,
+        shared_frame: SharedFrame,
+        frame: np.ndarray,
+        detected_object: DetectedObject,
     ) -> list[DetectedLicensePlate]:
         """Process frame."""
         detections: list[DetectedLicensePlate] = []
@@ -80,13 +92,18 @@ class LicensePlateRecognition(AbstractLicensePlateRecognition):
             ),
             self._camera.resolution,
         )
-        cropped_frame = frame[y1:y2, x1:x2].copy()
-        height, width, _ = cropped_frame.shape
+        height, width = frame[y1:y2, x1:x2].shape[:2]
         max_dimension = max(width, height)
-        cropped_frame = letterbox_resize(cropped_frame, max_dimension, max_dimension)
+        image = self._encoder.encode_crop(
+            shared_frame,
+            frame,
+            (x1, y1, x2, y2),
+            letterbox=(max_dimension, max_dimension),
+            mask=self.mask_image,
+        )
 
         try:
-            result = self._cpai.detect(cv2.imencode(".jpg", cropped_frame)[1].tobytes())
+            result = self._cpai.detect(image)
         except cpai.CodeProjectAIException as error:
             self._logger.error("Error calling CodeProject.AI: %s", error)
             return detections
@@ -143,7 +160,9 @@ class LicensePlateRecognition(AbstractLicensePlateRecognition):
         detections = []
         for detected_object in post_processor_frame.filtered_objects:
             detections += self._process_frame(
-                post_processor_frame.frame, detected_object
+                post_processor_frame.shared_frame,
+                post_processor_frame.frame,
+                detected_object,
             )
         return detections
 
@@ -157,16 +176,19 @@ class CodeProjectAIALPR:
         port: int,
         timeout: int,
         min_confidence: float,
+        max_connections: int,
     ) -> None:
         self.port = port
         self.timeout = timeout
         self.min_confidence = min_confidence
 
         self._url_base = PLATE_RECOGNITION_URL_BASE.format(host=host, port=port)
+        self._http_client = get_http_client(self._url_base, max_connections)
 
     def detect(self, image_bytes: bytes):
         """Process image_bytes and detect."""
-        response = cpai.process_image(
+        response = process_image(
+            self._http_client,
             url=self._url_base,
             image_bytes=image_bytes,
             min_confidence=self.min_confidence,
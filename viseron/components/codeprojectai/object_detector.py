@@ -2,18 +2,22 @@
 import logging
 
 import codeprojectai.core as cpai
-import cv2
 
 from viseron import Viseron
 from viseron.domains.object_detector import AbstractObjectDetector
 from viseron.domains.object_detector.detected_object import DetectedObject
-from viseron.helpers import letterbox_resize
+from viseron.helpers.frame_encoder import FrameEncoder
+from viseron.helpers.http_pool import get_http_client
 
+from .client import process_image
 from .const import (
     COMPONENT,
     CONFIG_CUSTOM_MODEL,
     CONFIG_HOST,
+    CONFIG_IMAGE_FORMAT,
+    CONFIG_IMAGE_QUALITY,
     CONFIG_IMAGE_SIZE,
+    CONFIG_MAX_CONNECTIONS,
     CONFIG_OBJECT_DETECTOR,
     CONFIG_PORT,
     CONFIG_TIMEOUT,
@@ -44,6 +48,10 @@ class ObjectDetector(AbstractObjectDetector):
             timeout=config[CONFIG_TIMEOUT],
             min_confidence=self.min_confidence,
             custom_model=self._config[CONFIG_CUSTOM_MODEL],
+            max_connections=config[CONFIG_MAX_CONNECTIONS],
+        )
+        self._encoder = FrameEncoder(
+            config[CONFIG_IMAGE_FORMAT], config[CONFIG_IMAGE_QUALITY]
         )
 
         self._image_resolution = (
@@ -58,18 +66,25 @@ class ObjectDetector(AbstractObjectDetector):
     def preprocess(self, frame):
         """Preprocess frame before detection."""
         if self._config[CONFIG_IMAGE_SIZE]:
-            frame = letterbox_resize(
+            frame = self._encoder.letterbox(
                 frame,
                 self._config[CONFIG_IMAGE_SIZE],
                 self._config[CONFIG_IMAGE_SIZE],
             )
-        return cv2.imencode(".jpg", frame)[1].tobytes()
+        return self._encoder.encode(frame)
+
+    @property
+    def _model_resolution(self) -> tuple[int, int]:
+        """Return resolution of the image sent to CodeProject.AI."""
+        if self._config[CONFIG_IMAGE_SIZE]:
+            return self._image_resolution
+        return self.frame_resolution
 
     def postprocess(self, detections):
         """Return CodeProject.AI detections as DetectedObject."""
         objects = []
         for detection in detections:
-            if self._image_resolution[0] == self._image_resolution[1]:
+            if self._config[CONFIG_IMAGE_SIZE]:
                 objects.append(
                     DetectedObject.from_absolute_letterboxed(
                         detection["label"],
@@ -78,8 +93,8 @@ class ObjectDetector(AbstractObjectDetector):
                         detection["y_min"],
                         detection["x_max"],
                         detection["y_max"],
-                        frame_res=self._camera.resolution,
-                        model_res=self._image_resolution,
+                        frame_res=self.frame_resolution,
+                        model_res=self._model_resolution,
                     )
                 )
                 continue
@@ -91,8 +106,8 @@ class ObjectDetector(AbstractObjectDetector):
                     detection["y_min"],
                     detection["x_max"],
                     detection["y_max"],
-                    frame_res=self._camera.resolution,
-                    model_res=self._image_resolution,
+                    frame_res=self.frame_resolution,
+                    model_res=self._model_resolution,
                 )
             )
         return objects
@@ -109,14 +124,18 @@ class ObjectDetector(AbstractObjectDetector):
 
 
 class CodeProjectAIObject(cpai.CodeProjectAIObject):
-    """CodeProject.AI object detection."""
+    """CodeProject.AI object detection over the shared HTTP client pool."""
 
-    def __init__(self, ip, port, timeout, min_confidence, custom_model):
+    def __init__(
+        self, ip, port, timeout, min_confidence, custom_model, max_connections
+    ):
         super().__init__(ip, port, timeout, min_confidence, custom_model)
+        self._http_client = get_http_client(self._url_detect, max_connections)
 
     def detect(self, image_bytes: bytes):
         """Process image_bytes and detect."""
-        response = cpai.process_image(
+        response = process_image(
+            self._http_client,
             url=self._url_detect,
             image_bytes=image_bytes,
             min_confidence=self.min_confidence,
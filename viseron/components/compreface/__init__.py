@@ -14,6 +14,7 @@ from viseron.domains.face_recognition import (
     BASE_CONFIG_SCHEMA as FACE_RECOGNITION_BASE_CONFIG_SCHEMA,
 )
 from viseron.domains.face_recognition.const import CONFIG_CAMERAS
+from viseron.helpers.frame_encoder import FRAME_FORMATS
 from viseron.helpers.schemas import FLOAT_MIN_ZERO_MAX_ONE
 from viseron.helpers.validators import Maybe
 
@@ -24,6 +25,8 @@ from .const import (
     CONFIG_FACE_PLUGINS,
     CONFIG_FACE_RECOGNITION,
     CONFIG_HOST,
+    CONFIG_IMAGE_FORMAT,
+    CONFIG_IMAGE_QUALITY,
     CONFIG_LIMIT,
     CONFIG_PORT,
     CONFIG_PREDICTION_COUNT,
@@ -33,6 +36,8 @@ from .const import (
     CONFIG_USE_SUBJECTS,
     DEFAULT_DET_PROB_THRESHOLD,
     DEFAULT_FACE_PLUGINS,
+    DEFAULT_IMAGE_FORMAT,
+    DEFAULT_IMAGE_QUALITY,
     DEFAULT_LIMIT,
     DEFAULT_PREDICTION_COUNT,
     DEFAULT_SIMILARITTY_THRESHOLD,
@@ -45,6 +50,8 @@ from .const import (
     DESC_FACE_PLUGINS,
     DESC_FACE_RECOGNITION,
     DESC_HOST,
+    DESC_IMAGE_FORMAT,
+    DESC_IMAGE_QUALITY,
     DESC_LIMIT,
     DESC_PORT,
     DESC_PREDICTION_COUNT,
@@ -94,6 +101,16 @@ FACE_RECOGNITION_SCHEMA = FACE_RECOGNITION_BASE_CONFIG_SCHEMA.extend(
             default=DEFAULT_USE_SUBJECTS,
             description=DESC_USE_SUBJECTS,
         ): bool,
+        vol.Optional(
+            CONFIG_IMAGE_FORMAT,
+            default=DEFAULT_IMAGE_FORMAT,
+            description=DESC_IMAGE_FORMAT,
+        ): vol.In(FRAME_FORMATS),
+        vol.Optional(
+            CONFIG_IMAGE_QUALITY,
+            default=DEFAULT_IMAGE_QUALITY,
+            description=DESC_IMAGE_QUALITY,
+        ): vol.All(int, vol.Range(min=1, max=100)),
     }
 )
 
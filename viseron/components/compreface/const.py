@@ -26,6 +26,8 @@ CONFIG_PREDICTION_COUNT = "prediction_count"
 CONFIG_FACE_PLUGINS = "face_plugins"
 CONFIG_STATUS = "status"
 CONFIG_USE_SUBJECTS = "use_subjects"
+CONFIG_IMAGE_FORMAT = "image_format"
+CONFIG_IMAGE_QUALITY = "image_quality"
 
 DEFAULT_TRAIN = False
 DEFAULT_DET_PROB_THRESHOLD = 0.8
@@ -35,6 +37,8 @@ DEFAULT_PREDICTION_COUNT = 1
 DEFAULT_FACE_PLUGINS: Final = None
 DEFAULT_STATUS = False
 DEFAULT_USE_SUBJECTS = False
+DEFAULT_IMAGE_FORMAT = "jpg"
+DEFAULT_IMAGE_QUALITY = 95
 
 DESC_TRAIN = (
     "Train CompreFace to recognize faces on Viseron start. "
@@ -72,3 +76,13 @@ DESC_USE_SUBJECTS = (
     "inside compreface. User can then call the api/v1/compreface/update_subjects "
     "endpoint to update entities if new subjects are added into compreface."
 )
+DESC_IMAGE_FORMAT = (
+    "Format that images are encoded in before they are sent to your CompreFace "
+    "server.<br><code>bmp</code> is uncompressed and the cheapest to encode, "
+    "<code>png</code> is lossless and <code>jpg</code> and <code>webp</code> are the "
+    "smallest."
+)
+DESC_IMAGE_QUALITY = (
+    "Quality of <code>jpg</code> and <code>webp</code> images, from 1 to 100. Lower "
+    "values are faster to encode and send, but can reduce accuracy."
+)
@@ -14,6 +14,7 @@ from viseron.domains.face_recognition import AbstractFaceRecognition
 from viseron.domains.face_recognition.binary_sensor import FaceDetectionBinarySensor
 from viseron.domains.face_recognition.const import CONFIG_FACE_RECOGNITION_PATH
 from viseron.helpers import calculate_absolute_coords, get_image_files_in_folder
+from viseron.helpers.frame_encoder import FrameEncoder
 
 from .const import (
     COMPONENT,
@@ -22,6 +23,8 @@ from .const import (
     CONFIG_FACE_PLUGINS,
     CONFIG_FACE_RECOGNITION,
     CONFIG_HOST,
+    CONFIG_IMAGE_FORMAT,
+    CONFIG_IMAGE_QUALITY,
     CONFIG_LIMIT,
     CONFIG_PORT,
     CONFIG_PREDICTION_COUNT,
@@ -68,6 +71,11 @@ class FaceRecognition(AbstractFaceRecognition):
             CONFIG_FACE_RECOGNITION
         ]
 
+        self._encoder = FrameEncoder(
+            config[CONFIG_FACE_RECOGNITION][CONFIG_IMAGE_FORMAT],
+            config[CONFIG_FACE_RECOGNITION][CONFIG_IMAGE_QUALITY],
+        )
+
         if config[CONFIG_FACE_RECOGNITION][CONFIG_USE_SUBJECTS]:
             self.update_subject_entities()
 
@@ -116,12 +124,15 @@ class FaceRecognition(AbstractFaceRecognition):
             ),
             self._camera.resolution,
         )
-        cropped_frame = post_processor_frame.frame[y1:y2, x1:x2].copy()
+        image = self._encoder.encode_crop(
+            post_processor_frame.shared_frame,
+            post_processor_frame.frame,
+            (x1, y1, x2, y2),
+            mask=self.mask_image,
+        )
 
         try:
-            detections = self.recognition_service.recognize(
-                cv2.imencode(".jpg", cropped_frame)[1].tobytes(),
-            )
+            detections = self.recognition_service.recognize(image)
         except Exception as error:  # pylint: disable=broad-except
             self._logger.error("Error calling compreface: %s", error, exc_info=True)
             return
@@ -18,11 +18,19 @@ from viseron import Viseron
 from viseron.const import ENV_CUDA_SUPPORTED, ENV_OPENCL_SUPPORTED
 from viseron.domains import OptionalDomain, RequireDomain, setup_domain
 from viseron.domains.motion_detector.const import DOMAIN as MOTION_DETECTOR_DOMAIN
-from viseron.domains.object_detector import BASE_CONFIG_SCHEMA
-from viseron.domains.object_detector.const import CONFIG_CAMERAS
-from viseron.domains.object_detector.detected_object import DetectedObject
+from viseron.domains.object_detector import BATCHED_BASE_CONFIG_SCHEMA
+from viseron.domains.object_detector.batch_scheduler import (
+    BatchScheduler,
+    WorkerBatchRunner,
+)
+from viseron.domains.object_detector.const import (
+    CONFIG_BATCH_SIZE,
+    CONFIG_BATCH_TIMEOUT,
+    CONFIG_CAMERAS,
+)
+from viseron.domains.object_detector.detection_batch import DetectionBatch
 from viseron.exceptions import ComponentNotReady, ViseronError
-from viseron.helpers import letterbox_resize, pop_if_full
+from viseron.helpers import letterbox_resize
 from viseron.helpers.child_process_worker import ChildProcessWorker
 from viseron.helpers.logs import CTypesLogPipe
 from viseron.helpers.schemas import FLOAT_MIN_ZERO_MAX_ONE
@@ -72,7 +80,7 @@ CONFIG_SCHEMA = vol.Schema(
             {
                 vol.Required(
                     CONFIG_OBJECT_DETECTOR, description=DESC_OBJECT_DETECTOR
-                ): BASE_CONFIG_SCHEMA.extend(
+                ): BATCHED_BASE_CONFIG_SCHEMA.extend(
                     {
                         vol.Optional(
                             CONFIG_MODEL_PATH,
@@ -184,9 +192,26 @@ class BaseDarknet(ABC):
         )
 
         self.labels = self.load_labels(config[CONFIG_LABEL_PATH])
+        self._label_array = np.asarray(self.labels, dtype=object)
 
         self._nms = config[CONFIG_SUPPRESSION]
-        self._result_queues: dict[str, Queue] = {}
+        self._batch_runner: WorkerBatchRunner
+        self.scheduler: BatchScheduler
+
+    def start_scheduler(self, input_queue: Queue) -> None:
+        """Start scheduler that batches frames from all cameras to the worker."""
+        self._batch_runner = WorkerBatchRunner(input_queue)
+        self.scheduler = BatchScheduler(
+            f"{COMPONENT}.{CONFIG_OBJECT_DETECTOR}",
+            self._batch_runner,
+            self._config[CONFIG_BATCH_SIZE],
+            self._config[CONFIG_BATCH_TIMEOUT],
+        )
+
+    def stop(self) -> None:
+        """Stop batch scheduler and worker."""
+        self.scheduler.stop()
+        super().stop()  # type: ignore[misc]
 
     def load_labels(self, labels: str) -> list[str]:
         """Load labels from file."""
@@ -213,12 +238,28 @@ class BaseDarknet(ABC):
     def preprocess(self, frame):
         """Pre process frame before detection."""
 
-    @abstractmethod
-    def detect(self, frame, camera_identifier, result_queue, min_confidence):
-        """Perform detection."""
+    def detect(
+        self,
+        frame,
+        camera_identifier: str,
+        result_queue: Queue,
+        min_confidence: float,
+    ):
+        """Perform detection.
+
+        The frame is batched together with frames from other cameras.
+        """
+        try:
+            return self.scheduler.request(
+                {"frame": frame, "min_confidence": min_confidence, "nms": self._nms},
+                result_queue,
+            )
+        except Empty:
+            LOGGER.debug(f"Timed out waiting for detection on {camera_identifier}")
+            return None
 
     @abstractmethod
-    def post_process(self, detections, camera_resolution):
+    def post_process(self, detections, camera_resolution) -> DetectionBatch:
         """Post process detections."""
 
 
@@ -239,6 +280,7 @@ class DarknetDNN(BaseDarknet, SubProcessWorker):
         self._process_initialization_done = mp.Event()
         self._process_initialization_error = mp.Event()
         SubProcessWorker.__init__(self, vis, f"{COMPONENT}.{CONFIG_OBJECT_DETECTOR}")
+        self.start_scheduler(self.input_queue)
 
         if cv2.ocl.haveOpenCL():
             LOGGER.debug("Enabling OpenCL")
@@ -281,21 +323,6 @@ class DarknetDNN(BaseDarknet, SubProcessWorker):
             interpolation=cv2.INTER_LINEAR,
         )
 
-    def detect(self, frame, camera_identifier, result_queue, min_confidence):
-        """Run detection on frame."""
-        self._result_queues[camera_identifier] = result_queue
-        pop_if_full(
-            self.input_queue,
-            {
-                "frame": frame,
-                "camera_identifier": camera_identifier,
-                "min_confidence": min_confidence,
-                "nms": self._nms,
-            },
-        )
-        item = result_queue.get()
-        return item["result"]
-
     def work_output(self, item) -> None:
         """Put result into queue."""
         if item == "init_done":
@@ -308,28 +335,21 @@ class DarknetDNN(BaseDarknet, SubProcessWorker):
             self._process_initialization_error.set()
             self._process_initialization_done.set()
             return
-        pop_if_full(self._result_queues[item["camera_identifier"]], item)
+        self._batch_runner.put_result(item)
 
-    def post_process(self, detections, camera_resolution):
+    def post_process(self, detections, camera_resolution) -> DetectionBatch:
         """Post process detections."""
-        _detections = []
-        for (label, confidence, box) in zip(
-            detections[0], detections[1], detections[2]
-        ):
-            _detections.append(
-                DetectedObject.from_absolute(
-                    self.labels[int(label)],
-                    confidence,
-                    box[0],
-                    box[1],
-                    box[0] + box[2],
-                    box[1] + box[3],
-                    frame_res=camera_resolution,
-                    model_res=self.model_res,
-                )
-            )
-
-        return _detections
+        classes = np.asarray(detections[0], dtype=int).reshape(-1)
+        boxes = np.asarray(detections[2], dtype=np.float64).reshape(-1, 4)
+        # Boxes are returned as x, y, width, height
+        boxes[:, 2:] += boxes[:, :2]
+        return DetectionBatch.from_absolute(
+            self._label_array[classes],
+            detections[1],
+            boxes,
+            frame_res=camera_resolution,
+            model_res=self.model_res,
+        )
 
     @property
     def dnn_preferable_backend(self) -> int:
@@ -375,6 +395,7 @@ class DarknetNative(BaseDarknet, ChildProcessWorker):
 
         self._process_initialization_done = mp.Event()
         ChildProcessWorker.__init__(self, vis, f"{COMPONENT}.{CONFIG_OBJECT_DETECTOR}")
+        self.start_scheduler(self.input_queue)
         if not self._process_initialization_done.wait(timeout=15):
             raise LoadDarknetError("Failed to load Darknet network in child process")
 
@@ -414,59 +435,36 @@ class DarknetNative(BaseDarknet, ChildProcessWorker):
         return detections
 
     def work_input(self, item):
-        """Perform object detection."""
-        item["result"] = self._detect(item["frame"], item["min_confidence"])
-        return item
+        """Perform object detection on a batch of frames.
+
+        The network is loaded with a batch size of 1, so the frames are run one by
+        one.
+        """
+        return {
+            "batch_id": item["batch_id"],
+            "results": [
+                self._detect(batch_item["frame"], batch_item["min_confidence"])
+                for batch_item in item["items"]
+            ],
+        }
 
     def work_output(self, item) -> None:
         """Put result into queue."""
-        pop_if_full(self._result_queues[item["camera_identifier"]], item)
+        self._batch_runner.put_result(item)
 
     def preprocess(self, frame) -> bytes:
         """Pre process frame before detection."""
         return letterbox_resize(frame, self.model_width, self.model_height).tobytes()
 
-    def detect(
-        self,
-        frame: np.ndarray,
-        camera_identifier: str,
-        result_queue,
-        min_confidence: float,
-    ):
-        """Perform detection."""
-        self._result_queues[camera_identifier] = result_queue
-        pop_if_full(
-            self.input_queue,
-            {
-                "frame": frame,
-                "camera_identifier": camera_identifier,
-                "min_confidence": min_confidence,
-            },
-        )
-        try:
-            item = result_queue.get(timeout=3)
-        except Empty:
-            return None
-        return item["result"]
-
-    def post_process(self, detections, camera_resolution):
+    def post_process(self, detections, camera_resolution) -> DetectionBatch:
         """Post process detections."""
-        _detections = []
-        for label, confidence, box in detections:
-            _detections.append(
-                DetectedObject.from_absolute_letterboxed(
-                    str(label),
-                    confidence,
-                    box[0],
-                    box[1],
-                    box[2],
-                    box[3],
-                    frame_res=camera_resolution,
-                    model_res=self.model_res,
-                )
-            )
-
-        return _detections
+        return DetectionBatch.from_absolute_letterboxed(
+            [str(label) for label, _, _ in detections],
+            [confidence for _, confidence, _ in detections],
+            [box for _, _, box in detections],
+            frame_res=camera_resolution,
+            model_res=self.model_res,
+        )
 
     @property
     def model_width(self) -> int:
@@ -60,13 +60,15 @@ class DarknetDNN:
         )
 
     def work_input(self, item):
-        """Perform object detection."""
-        objs = self._model.detect(
-            cv2.UMat(item["frame"]),
-            item["min_confidence"],
-            item["nms"],
-        )
-        item["result"] = objs
+        """Perform object detection on a batch of frames."""
+        item["results"] = [
+            self._model.detect(
+                cv2.UMat(batch_item["frame"]),
+                batch_item["min_confidence"],
+                batch_item["nms"],
+            )
+            for batch_item in item.pop("items")
+        ]
 
 
 def setup_logger(loglevel: str) -> None:
@@ -15,6 +15,7 @@ if TYPE_CHECKING:
     from viseron.components.darknet import BaseDarknet
     from viseron.domains.camera.shared_frames import SharedFrame
     from viseron.domains.object_detector.detected_object import DetectedObject
+    from viseron.domains.object_detector.detection_batch import DetectionBatch
 
 
 LOGGER = logging.getLogger(__name__)
@@ -39,7 +40,7 @@ class ObjectDetector(AbstractObjectDetector):
         """Return preprocessed frame before performing object detection."""
         return self._darknet.preprocess(frame)
 
-    def return_objects(self, frame: SharedFrame) -> list[DetectedObject] | None:
+    def return_objects(self, frame: SharedFrame) -> DetectionBatch | None:
         """Perform object detection."""
         detections = self._darknet.detect(
             frame,
@@ -49,7 +50,7 @@ class ObjectDetector(AbstractObjectDetector):
         )
         if detections is None:
             return None
-        return self._darknet.post_process(detections, self._camera.resolution)
+        return self._darknet.post_process(detections, self.frame_resolution)
 
     @property
     def model_width(self) -> int:
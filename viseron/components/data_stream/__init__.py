@@ -5,22 +5,47 @@ import fnmatch
 import inspect
 import logging
 import multiprocessing as mp
-import subprocess
+import os
 import threading
-import time
 import uuid
+from collections import deque
 from collections.abc import Callable
-from queue import Empty, Queue
+from dataclasses import dataclass
+from queue import Empty, Full, Queue
 from typing import Any, TypedDict
 
 from tornado.ioloop import IOLoop
 from tornado.queues import Queue as tornado_queue
 
 from viseron import helpers
+from viseron.const import ENV_DATA_STREAM_WORKERS, STATISTICS_LOG_INTERVAL
 from viseron.watchdog.thread_watchdog import RestartableThread
 
 COMPONENT = "data_stream"
 
+DEFAULT_WORKERS = 32
+# Max number of pending callback invocations per subscriber
+LANE_MAXSIZE = 1000
+# Max number of concrete topics to cache wildcard matches for
+MATCH_CACHE_MAXSIZE = 10000
+
+PRIORITY_FRAME = "frame"
+PRIORITY_EVENT = "event"
+# Topics with these prefixes are published with PRIORITY_EVENT by default
+EVENT_TOPIC_PREFIXES = ("event/", "viseron/")
+# Number of consumer lanes and max size of each lane per priority
+LANES = {
+    PRIORITY_FRAME: 4,
+    PRIORITY_EVENT: 2,
+}
+LANE_QUEUE_MAXSIZE = {
+    PRIORITY_FRAME: 1000,
+    PRIORITY_EVENT: 10000,
+}
+# Event topics that start with the kind of event, followed by the camera
+# identifier, eg file_created/<camera_identifier>/<category>/<subcategory>
+CAMERA_SECOND_EVENT_TOPICS = ("file_created", "file_deleted", "check_tier")
+
 LOGGER = logging.getLogger(__name__)
 
 
@@ -52,6 +77,372 @@ def setup(vis, _) -> bool:
     return True
 
 
+def _event_ordering_key(data_topic: str) -> str:
+    """Return the key that events are sharded over the event lanes by.
+
+    This is the camera identifier for camera events, eg
+    event/<camera_identifier>/recorder/start and
+    event/file_created/<camera_identifier>/..., and the first segment of the topic
+    after the prefix otherwise.
+    """
+    for prefix in EVENT_TOPIC_PREFIXES:
+        if data_topic.startswith(prefix):
+            data_topic = data_topic[len(prefix) :]
+            break
+    segments = data_topic.split("/", 2)
+    if segments[0] in CAMERA_SECOND_EVENT_TOPICS and len(segments) > 1:
+        return segments[1]
+    return segments[0]
+
+
+def _get_workers() -> int:
+    """Return number of callback workers, configurable by environment variable."""
+    env_workers = os.getenv(ENV_DATA_STREAM_WORKERS)
+    if env_workers is None:
+        return DEFAULT_WORKERS
+
+    try:
+        workers = int(env_workers)
+    except ValueError:
+        workers = 0
+    if workers < 1:
+        LOGGER.error(
+            f"Failed to parse {ENV_DATA_STREAM_WORKERS} as a positive int, "
+            f"using default value {DEFAULT_WORKERS}"
+        )
+        return DEFAULT_WORKERS
+    return workers
+
+
+@dataclass
+class DispatcherStatistics:
+    """Statistics of a CallbackDispatcher."""
+
+    workers: int
+    busy_workers: int
+    pending: int
+    max_pending: int
+    active_lanes: int
+    dispatched: int
+    dropped: int
+
+
+class _Lane:
+    """Pending invocations of a single subscriber."""
+
+    __slots__ = ("callback", "items", "scheduled")
+
+    def __init__(self, callback: Callable) -> None:
+        self.callback = callback
+        self.items: deque[Any] = deque()
+        self.scheduled = False
+
+
+class CallbackDispatcher:
+    """Run subscriber callbacks on a bounded pool of worker threads.
+
+    Every subscriber has a serial lane. A lane is run by at most one worker at a time,
+    so callbacks of a subscriber are invoked in the order the data was published.
+    Workers take turns between lanes one item at a time, so a slow subscriber only
+    delays its own lane.
+
+    If a lane has LANE_MAXSIZE pending invocations the oldest one is dropped.
+    """
+
+    def __init__(self, workers: int, lane_maxsize: int = LANE_MAXSIZE) -> None:
+        self._workers = workers
+        self._lane_maxsize = lane_maxsize
+        self._lock = threading.Lock()
+        self._lanes: dict[uuid.UUID, _Lane] = {}
+        self._ready: Queue[uuid.UUID] = Queue()
+
+        self._pending = 0
+        self._max_pending = 0
+        self._busy_workers = 0
+        self._dispatched = 0
+        self._dropped = 0
+
+        self._kill_received = False
+        self._threads = [
+            RestartableThread(
+                name=f"data_stream.worker.{index}",
+                target=self._worker,
+                daemon=True,
+                register=True,
+            )
+            for index in range(workers)
+        ]
+        for thread in self._threads:
+            thread.start()
+
+    def dispatch(self, subscriber_id: uuid.UUID, callback: Callable, data: Any) -> None:
+        """Queue an invocation of callback in the lane of the subscriber."""
+        with self._lock:
+            lane = self._lanes.get(subscriber_id)
+            if lane is None:
+                lane = self._lanes[subscriber_id] = _Lane(callback)
+
+            if len(lane.items) >= self._lane_maxsize:
+                lane.items.popleft()
+                self._pending -= 1
+                self._dropped += 1
+                if self._dropped % self._lane_maxsize == 1:
+                    LOGGER.warning(
+                        f"Callback {callback} is not keeping up, "
+                        f"{self._dropped} invocations dropped in total"
+                    )
+
+            lane.items.append(data)
+            self._pending += 1
+            self._max_pending = max(self._max_pending, self._pending)
+            if lane.scheduled:
+                return
+            lane.scheduled = True
+        self._ready.put(subscriber_id)
+
+    def _worker(self) -> None:
+        """Run lanes that are ready."""
+        while not self._kill_received:
+            try:
+                subscriber_id = self._ready.get(timeout=1)
+            except Empty:
+                continue
+
+            with self._lock:
+                lane = self._lanes[subscriber_id]
+                data = lane.items.popleft()
+                self._pending -= 1
+                self._busy_workers += 1
+
+            try:
+                if data:
+                    lane.callback(data)
+                else:
+                    lane.callback()
+            except Exception:  # pylint: disable=broad-except
+                LOGGER.exception(f"Error running callback {lane.callback}")
+
+            with self._lock:
+                self._busy_workers -= 1
+                self._dispatched += 1
+                if not lane.items:
+                    lane.scheduled = False
+                    del self._lanes[subscriber_id]
+                    continue
+            # Put the lane at the back of the line to let other lanes run
+            self._ready.put(subscriber_id)
+
+    def stop(self) -> None:
+        """Stop the workers."""
+        self._kill_received = True
+        for thread in self._threads:
+            thread.stop()
+
+    @property
+    def statistics(self) -> DispatcherStatistics:
+        """Return dispatcher statistics."""
+        with self._lock:
+            return DispatcherStatistics(
+                workers=self._workers,
+                busy_workers=self._busy_workers,
+                pending=self._pending,
+                max_pending=self._max_pending,
+                active_lanes=len(self._lanes),
+                dispatched=self._dispatched,
+                dropped=self._dropped,
+            )
+
+
+class _TopicTrieNode:
+    """Node in a TopicTrie."""
+
+    __slots__ = ("children", "wildcard", "patterns")
+
+    def __init__(self) -> None:
+        self.children: dict[str, _TopicTrieNode] = {}
+        self.wildcard: _TopicTrieNode | None = None
+        self.patterns: set[str] = set()
+
+
+class TopicTrie:
+    """Index of wildcard patterns split into '/' separated segments.
+
+    A '*' segment matches one or more segments, which is the same as what fnmatch
+    does for a '*' between two separators. Patterns that use '*' inside a segment or
+    any other fnmatch syntax fall back to fnmatch.
+
+    Matches are cached per concrete topic. The cache is cleared when a pattern is
+    added or removed.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._root = _TopicTrieNode()
+        self._fallback_patterns: set[str] = set()
+        self._cache: dict[str, tuple[str, ...]] = {}
+
+    @staticmethod
+    def _is_segment_pattern(pattern: str) -> bool:
+        """Return True if the pattern can be indexed in the trie."""
+        if "?" in pattern or "[" in pattern:
+            return False
+        return all(
+            segment == "*" or "*" not in segment for segment in pattern.split("/")
+        )
+
+    def add(self, pattern: str) -> None:
+        """Add a pattern."""
+        with self._lock:
+            self._cache.clear()
+            if not self._is_segment_pattern(pattern):
+                self._fallback_patterns.add(pattern)
+                return
+
+            node = self._root
+            for segment in pattern.split("/"):
+                if segment == "*":
+                    if node.wildcard is None:
+                        node.wildcard = _TopicTrieNode()
+                    node = node.wildcard
+                    continue
+                node = node.children.setdefault(segment, _TopicTrieNode())
+            node.patterns.add(pattern)
+
+    def remove(self, pattern: str) -> None:
+        """Remove a pattern."""
+        with self._lock:
+            self._cache.clear()
+            if not self._is_segment_pattern(pattern):
+                self._fallback_patterns.discard(pattern)
+                return
+
+            path: list[tuple[_TopicTrieNode, str]] = []
+            node = self._root
+            for segment in pattern.split("/"):
+                path.append((node, segment))
+                next_node = (
+                    node.wildcard if segment == "*" else node.children.get(segment)
+                )
+                if next_node is None:
+                    return
+                node = next_node
+            node.patterns.discard(pattern)
+
+            # Prune nodes that no longer lead to any pattern
+            for parent, segment in reversed(path):
+                if node.patterns or node.children or node.wildcard:
+                    break
+                if segment == "*":
+                    parent.wildcard = None
+                else:
+                    del parent.children[segment]
+                node = parent
+
+    def clear(self) -> None:
+        """Remove all patterns."""
+        with self._lock:
+            self._root = _TopicTrieNode()
+            self._fallback_patterns.clear()
+            self._cache.clear()
+
+    def _collect(
+        self,
+        node: _TopicTrieNode,
+        segments: list[str],
+        index: int,
+        matches: set[str],
+    ) -> None:
+        """Collect patterns matching segments[index:] starting from node."""
+        if index == len(segments):
+            matches.update(node.patterns)
+            return
+
+        child = node.children.get(segments[index])
+        if child is not None:
+            self._collect(child, segments, index + 1, matches)
+        if node.wildcard is not None:
+            for end in range(index + 1, len(segments) + 1):
+                self._collect(node.wildcard, segments, end, matches)
+
+    def match(self, topic: str) -> tuple[str, ...]:
+        """Return all patterns matching topic."""
+        with self._lock:
+            cached = self._cache.get(topic)
+            if cached is not None:
+                return cached
+
+            matches: set[str] = set()
+            self._collect(self._root, topic.split("/"), 0, matches)
+            for pattern in self._fallback_patterns:
+                if fnmatch.fnmatch(topic, pattern):
+                    matches.add(pattern)
+
+            if len(self._cache) >= MATCH_CACHE_MAXSIZE:
+                self._cache.clear()
+            result = self._cache[topic] = tuple(matches)
+            return result
+
+
+@dataclass
+class DataStreamLaneStatistics:
+    """Statistics of a DataStreamLane."""
+
+    name: str
+    priority: str
+    queued: int
+    published: int
+    dropped: int
+
+
+class DataStreamLane:
+    """Queue of published data consumed by a thread of its own.
+
+    If the lane is full the oldest item is dropped and counted.
+    """
+
+    def __init__(self, name: str, priority: str, maxsize: int) -> None:
+        self.name = name
+        self.priority = priority
+        self.queue: Queue[dict[str, Any]] = Queue(maxsize=maxsize)
+        self._lock = threading.Lock()
+        self._published = 0
+        self._dropped = 0
+
+    def put(self, data_item: dict[str, Any]) -> None:
+        """Put data item in the lane, dropping the oldest item if full."""
+        with self._lock:
+            self._published += 1
+            while True:
+                try:
+                    self.queue.put_nowait(data_item)
+                    return
+                except Full:
+                    pass
+                try:
+                    dropped_item = self.queue.get_nowait()
+                except Empty:
+                    continue
+                self._dropped += 1
+                if self._dropped % self.queue.maxsize == 1:
+                    LOGGER.warning(
+                        f"Data stream lane {self.name} is full, dropped data on topic "
+                        f"{dropped_item['data_topic']}. "
+                        f"{self._dropped} items dropped in total"
+                    )
+
+    @property
+    def statistics(self) -> DataStreamLaneStatistics:
+        """Return lane statistics."""
+        with self._lock:
+            return DataStreamLaneStatistics(
+                name=self.name,
+                priority=self.priority,
+                queued=self.queue.qsize(),
+                published=self._published,
+                dropped=self._dropped,
+            )
+
+
 class DataStream:
     """Class that enables a publisher/subscriber mechanism.
 
@@ -60,50 +451,117 @@ class DataStream:
     A data topic can have any value.
     You can subscribe to wildcard topics using '*', eg topic/*/event_name
 
-    Data is published to topics using a thread.
+    Data is published to topics using consumer lanes, each with a thread of its own.
+    Frame and event traffic use separate lanes so that a burst of frames can never
+    drop events, see publish_data.
+    Frame topics are sharded over the frame lanes by topic, so data on a topic is
+    always delivered in order. Events are sharded over the event lanes by camera
+    identifier, or by the first segment of the topic for events that do not
+    belong to a camera, see _event_ordering_key. A subscriber therefore receives
+    the events of one camera in the order they were published, also across
+    topics, eg recorder start before recorder stop and file created before file
+    deleted.
+    Callbacks are run by a bounded pool of workers, see CallbackDispatcher.
+    Callbacks subscribed with a stage, such as signal handlers, are run in a thread
+    of their own that is joined during that stage of the shutdown.
     """
 
     _subscribers: dict[str, Any] = {}
     _wildcard_subscribers: dict[str, Any] = {}
-    _data_queue: Queue = Queue(maxsize=1000)
+    _wildcard_index = TopicTrie()
+    _presence_lock = threading.RLock()
+    _presence_listeners: dict[str, dict[uuid.UUID, Callable[[bool], None]]] = {}
+    _presence: dict[str, bool] = {}
+    _lanes: dict[str, list[DataStreamLane]] = {
+        priority: [
+            DataStreamLane(
+                f"{priority}.{index}", priority, LANE_QUEUE_MAXSIZE[priority]
+            )
+            for index in range(lanes)
+        ]
+        for priority, lanes in LANES.items()
+    }
 
-    def __init__(self, vis) -> None:
+    def __init__(self, vis, workers: int | None = None) -> None:
         self._vis = vis
-        self._max_threads = self._get_max_threads()
-        LOGGER.debug(f"Max threads: {self._max_threads}")
+        self._dispatcher = CallbackDispatcher(workers or _get_workers())
+        LOGGER.debug(f"Callback workers: {self._dispatcher.statistics.workers}")
 
         self._kill_received = False
-        self._data_consumer = RestartableThread(
-            name="data_stream", target=self.consume_data, daemon=True, register=True
+        self._data_consumers = [
+            RestartableThread(
+                name=f"data_stream.{lane.name}",
+                target=self.consume_data,
+                args=(lane,),
+                daemon=True,
+                register=True,
+            )
+            for lanes in self._lanes.values()
+            for lane in lanes
+        ]
+        for data_consumer in self._data_consumers:
+            data_consumer.start()
+
+        vis.background_scheduler.add_job(
+            self.log_statistics,
+            "interval",
+            id="data_stream_statistics",
+            name="data_stream_statistics",
+            seconds=STATISTICS_LOG_INTERVAL,
+            max_instances=1,
+            coalesce=True,
+            replace_existing=True,
         )
-        self._data_consumer.start()
 
-    def _get_max_threads(self) -> int:
-        """Get the maximum number of threads allowed."""
-        command = ["ulimit", "-u"]
-        result = subprocess.run(
-            command, shell=True, capture_output=True, text=True, check=False
+    @property
+    def dispatcher_statistics(self) -> DispatcherStatistics:
+        """Return statistics of the callback dispatcher."""
+        return self._dispatcher.statistics
+
+    @property
+    def lane_statistics(self) -> list[DataStreamLaneStatistics]:
+        """Return statistics of all consumer lanes."""
+        return [lane.statistics for lanes in self._lanes.values() for lane in lanes]
+
+    def log_statistics(self) -> None:
+        """Log the callback dispatcher and lane statistics at debug level."""
+        statistics = self.dispatcher_statistics
+        LOGGER.debug(
+            f"Callback dispatcher: {statistics.busy_workers}/{statistics.workers} "
+            f"workers busy, {statistics.pending} pending "
+            f"({statistics.max_pending} max) in {statistics.active_lanes} lanes, "
+            f"{statistics.dispatched} dispatched, {statistics.dropped} dropped"
         )
-
-        # Check if the command executed successfully
-        if result.returncode == 0:
-            ulimit_output = result.stdout.strip()
-            LOGGER.debug(f"ulimit -u output: {ulimit_output}")
-        else:
-            LOGGER.error(f"Error executing ulimit -u command: {result.stderr}")
-            return 999999
-
-        try:
-            return int(ulimit_output)
-        except ValueError:
-            return 999999
+        for lane in self.lane_statistics:
+            LOGGER.debug(
+                f"Data stream lane {lane.name}: {lane.queued} queued, "
+                f"{lane.published} published, {lane.dropped} dropped"
+            )
 
     @staticmethod
-    def publish_data(data_topic: str, data: Any = None) -> None:
-        """Publish data to topic."""
+    def publish_data(
+        data_topic: str, data: Any = None, priority: str | None = None
+    ) -> None:
+        """Publish data to topic.
+
+        If priority is not given, topics starting with any of EVENT_TOPIC_PREFIXES are
+        published with PRIORITY_EVENT and all other topics with PRIORITY_FRAME.
+        """
         # LOGGER.debug(f"Publishing to data topic {data_topic}, {data}")
-        helpers.pop_if_full(
-            DataStream._data_queue, {"data_topic": data_topic, "data": data}
+        if priority is None:
+            priority = (
+                PRIORITY_EVENT
+                if data_topic.startswith(EVENT_TOPIC_PREFIXES)
+                else PRIORITY_FRAME
+            )
+        lanes = DataStream._lanes[priority]
+        shard_key = (
+            _event_ordering_key(data_topic)
+            if priority == PRIORITY_EVENT
+            else data_topic
+        )
+        lanes[hash(shard_key) % len(lanes)].put(
+            {"data_topic": data_topic, "data": data}
         )
 
     @staticmethod
@@ -121,13 +579,15 @@ class DataStream:
         unique_id = uuid.uuid4()
 
         if "*" in data_topic:
-            DataStream._wildcard_subscribers.setdefault(data_topic, {})[
-                unique_id
-            ] = DataSubscriber(
+            if data_topic not in DataStream._wildcard_subscribers:
+                DataStream._wildcard_subscribers[data_topic] = {}
+                DataStream._wildcard_index.add(data_topic)
+            DataStream._wildcard_subscribers[data_topic][unique_id] = DataSubscriber(
                 callback=callback,
                 ioloop=ioloop,
                 stage=stage,
             )
+            DataStream._update_presence()
             return unique_id
 
         DataStream._subscribers.setdefault(data_topic, {})[unique_id] = DataSubscriber(
@@ -135,6 +595,7 @@ class DataStream:
             ioloop=ioloop,
             stage=stage,
         )
+        DataStream._update_presence()
         return unique_id
 
     @staticmethod
@@ -143,15 +604,79 @@ class DataStream:
         LOGGER.debug(f"Unsubscribing from data topic {data_topic}, {unique_id}")
         if "*" in data_topic:
             DataStream._wildcard_subscribers[data_topic].pop(unique_id)
+            if not DataStream._wildcard_subscribers[data_topic]:
+                del DataStream._wildcard_subscribers[data_topic]
+                DataStream._wildcard_index.remove(data_topic)
+            DataStream._update_presence()
             return
 
         DataStream._subscribers[data_topic].pop(unique_id)
+        DataStream._update_presence()
 
     @staticmethod
     def remove_all_subscriptions() -> None:
         """Remove all subscriptions."""
         DataStream._subscribers.clear()
         DataStream._wildcard_subscribers.clear()
+        DataStream._wildcard_index.clear()
+        DataStream._update_presence()
+
+    @staticmethod
+    def has_subscribers(data_topic: str) -> bool:
+        """Return True if anyone subscribes to the concrete topic."""
+        if DataStream._subscribers.get(data_topic):
+            return True
+        return any(
+            DataStream._wildcard_subscribers.get(pattern)
+            for pattern in DataStream._wildcard_index.match(data_topic)
+        )
+
+    @staticmethod
+    def subscribe_presence(
+        data_topic: str, callback: Callable[[bool], None]
+    ) -> uuid.UUID:
+        """Get notified when a topic gets its first or loses its last subscriber.
+
+        The callback is called with the current presence right away, and then every
+        time it changes. It is called from the thread that subscribes/unsubscribes,
+        so it should return quickly.
+        Returns a Unique ID which can be used to unsubscribe later.
+        """
+        unique_id = uuid.uuid4()
+        with DataStream._presence_lock:
+            DataStream._presence_listeners.setdefault(data_topic, {})[
+                unique_id
+            ] = callback
+            present = DataStream._presence[data_topic] = DataStream.has_subscribers(
+                data_topic
+            )
+            callback(present)
+        return unique_id
+
+    @staticmethod
+    def unsubscribe_presence(data_topic: str, unique_id: uuid.UUID) -> None:
+        """Unsubscribe using the Unique ID returned from subscribe_presence."""
+        with DataStream._presence_lock:
+            listeners = DataStream._presence_listeners.get(data_topic, {})
+            listeners.pop(unique_id, None)
+            if not listeners:
+                DataStream._presence_listeners.pop(data_topic, None)
+                DataStream._presence.pop(data_topic, None)
+
+    @staticmethod
+    def _update_presence() -> None:
+        """Notify presence listeners of topics where presence has changed."""
+        with DataStream._presence_lock:
+            for data_topic, listeners in DataStream._presence_listeners.copy().items():
+                present = DataStream.has_subscribers(data_topic)
+                if DataStream._presence.get(data_topic) == present:
+                    continue
+                DataStream._presence[data_topic] = present
+                for callback in listeners.values():
+                    try:
+                        callback(present)
+                    except Exception:  # pylint: disable=broad-except
+                        LOGGER.exception(f"Error running presence callback {callback}")
 
     async def run_callback_in_ioloop(
         self, callback: Callable, data: Any, ioloop: IOLoop
@@ -179,48 +704,20 @@ class DataStream:
         data: Any,
     ) -> None:
         """Run callbacks or put to queues."""
-        for callback in callbacks.copy().values():
+        for subscriber_id, callback in callbacks.copy().items():
             if callable(callback["callback"]) and callback["ioloop"] is None:
-                name = f"data_stream.callback.{callback['callback']}"
-                daemon = bool(callback["stage"] is None)
-                if data:
-                    thread = RestartableThread(
-                        name=name,
-                        target=callback["callback"],
-                        args=(data,),
-                        daemon=daemon,
-                        register=False,
-                        stage=callback["stage"],
-                    )
-                else:
-                    thread = RestartableThread(
-                        name=name,
-                        target=callback["callback"],
-                        daemon=daemon,
-                        register=False,
-                        stage=callback["stage"],
-                    )
-
-                while True:
-                    # Check if we can start a new thread
-                    active_threads = threading.active_count()
-                    if active_threads > self._max_threads:
-                        time.sleep(0.01)
-                        continue
-
-                    try:
-                        thread.start()
-                    except RuntimeError as err:
-                        if "can't start new thread" in str(err):
-                            LOGGER.debug(
-                                "Unable to start new thread, "
-                                "Max threads: %s, Active threads: %s",
-                                self._max_threads,
-                                active_threads,
-                            )
-                            self._max_threads = int(active_threads * 0.95)
-                            continue
-                    break
+                if callback["stage"] is None:
+                    self._dispatcher.dispatch(subscriber_id, callback["callback"], data)
+                    continue
+
+                RestartableThread(
+                    name=f"data_stream.callback.{callback['callback']}",
+                    target=callback["callback"],
+                    args=(data,) if data else (),
+                    daemon=False,
+                    register=False,
+                    stage=callback["stage"],
+                ).start()
                 continue
 
             if callable(callback["callback"]) and callback["ioloop"] is not None:
@@ -261,8 +758,9 @@ class DataStream:
 
     def wildcard_subscriptions(self, data_item: dict[str, Any]) -> None:
         """Run callbacks for wildcard subscriptions."""
-        for data_topic, callbacks in DataStream._wildcard_subscribers.copy().items():
-            if fnmatch.fnmatch(data_item["data_topic"], data_topic):
+        for data_topic in DataStream._wildcard_index.match(data_item["data_topic"]):
+            callbacks = DataStream._wildcard_subscribers.get(data_topic)
+            if callbacks:
                 # LOGGER.debug(
                 #     f"Got data on topic {data_item['data_topic']} "
                 #     f"matching with subscriber on topic {data_topic}"
@@ -270,22 +768,24 @@ class DataStream:
 
                 self.run_callbacks(callbacks, data_item["data"])
 
-    def consume_data(self) -> None:
-        """Publish data to topics."""
+    def consume_data(self, lane: DataStreamLane) -> None:
+        """Publish data from lane to topics."""
         while not self._kill_received:
             try:
-                data_item = self._data_queue.get(timeout=0.1)
+                data_item = lane.queue.get(timeout=0.1)
             except Empty:
                 continue
 
             self.static_subscriptions(data_item)
             self.wildcard_subscriptions(data_item)
-        LOGGER.debug("Data stream stopped")
+        LOGGER.debug(f"Data stream lane {lane.name} stopped")
 
     def join(self) -> None:
         """Join the data stream."""
-        self._data_consumer.join()
+        for data_consumer in self._data_consumers:
+            data_consumer.join()
 
     def stop(self) -> None:
         """Stop the data stream."""
         self._kill_received = True
+        self._dispatcher.stop()
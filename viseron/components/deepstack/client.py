@@ -0,0 +1,46 @@
+"""Requests to DeepStack over the shared HTTP client pool."""
+from __future__ import annotations
+
+from typing import Any
+
+import deepstack.core as ds
+
+from viseron.exceptions import HTTPRequestError
+from viseron.helpers.http_pool import HTTPClient
+
+
+def post_request(
+    http_client: HTTPClient,
+    url: str,
+    api_key: str | None,
+    timeout: float,
+    data: dict[str, Any] | None = None,
+    **kwargs: Any,
+) -> Any:
+    """Send a POST request to DeepStack and return the decoded response."""
+    data = dict(data or {})
+    if api_key is not None:
+        data["api_key"] = api_key
+    try:
+        return http_client.post_json(url, timeout, data=data, **kwargs)
+    except HTTPRequestError as error:
+        raise ds.DeepstackException(str(error)) from error
+
+
+def process_image(
+    http_client: HTTPClient,
+    url: str,
+    image_bytes: bytes,
+    api_key: str | None,
+    min_confidence: float,
+    timeout: float,
+) -> Any:
+    """Send an image to DeepStack and return the decoded response."""
+    return post_request(
+        http_client,
+        url,
+        api_key,
+        timeout,
+        data={"min_confidence": min_confidence},
+        files={"image": image_bytes},
+    )
@@ -11,9 +11,15 @@ CONFIG_HOST = "host"
 CONFIG_PORT = "port"
 CONFIG_API_KEY = "api_key"
 CONFIG_TIMEOUT = "timeout"
+CONFIG_MAX_CONNECTIONS = "max_connections"
+CONFIG_IMAGE_FORMAT = "image_format"
+CONFIG_IMAGE_QUALITY = "image_quality"
 
 DEFAULT_API_KEY: Final = None
 DEFAULT_TIMEOUT = 10
+DEFAULT_MAX_CONNECTIONS = 4
+DEFAULT_IMAGE_FORMAT = "jpg"
+DEFAULT_IMAGE_QUALITY = 95
 
 DESC_COMPONENT = "DeepStack configuration."
 DESC_OBJECT_DETECTOR = "Object detector domain config."
@@ -22,6 +28,20 @@ DESC_HOST = "IP or hostname to your DeepStack server."
 DESC_PORT = "Port to your DeepStack server."
 DESC_API_KEY = "API key to your DeepStack server, if you have one set."
 DESC_TIMEOUT = "Timeout for requests to your DeepStack server."
+DESC_MAX_CONNECTIONS = (
+    "Maximum number of concurrent keep-alive connections to your DeepStack server, "
+    "shared by all cameras."
+)
+DESC_IMAGE_FORMAT = (
+    "Format that images are encoded in before they are sent to your DeepStack "
+    "server.<br><code>bmp</code> is uncompressed and the cheapest to encode, "
+    "<code>png</code> is lossless and <code>jpg</code> and <code>webp</code> are the "
+    "smallest."
+)
+DESC_IMAGE_QUALITY = (
+    "Quality of <code>jpg</code> and <code>webp</code> images, from 1 to 100. Lower "
+    "values are faster to encode and send, but can reduce accuracy."
+)
 
 # OBJECT_DETECTOR_SCHEMA constants
 CONFIG_IMAGE_WIDTH = "image_width"
@@ -8,17 +8,22 @@ from typing import TYPE_CHECKING
 import cv2
 import deepstack.core as ds
 import numpy as np
-import requests
 
 from viseron.domains.face_recognition import AbstractFaceRecognition
 from viseron.domains.face_recognition.const import CONFIG_FACE_RECOGNITION_PATH
 from viseron.helpers import calculate_absolute_coords, get_image_files_in_folder
+from viseron.helpers.frame_encoder import FrameEncoder
+from viseron.helpers.http_pool import get_http_client
 
+from .client import post_request, process_image
 from .const import (
     COMPONENT,
     CONFIG_API_KEY,
     CONFIG_FACE_RECOGNITION,
     CONFIG_HOST,
+    CONFIG_IMAGE_FORMAT,
+    CONFIG_IMAGE_QUALITY,
+    CONFIG_MAX_CONNECTIONS,
     CONFIG_MIN_CONFIDENCE,
     CONFIG_PORT,
     CONFIG_TIMEOUT,
@@ -54,6 +59,10 @@ class FaceRecognition(AbstractFaceRecognition):
             api_key=config[CONFIG_API_KEY],
             timeout=config[CONFIG_TIMEOUT],
             min_confidence=config[CONFIG_FACE_RECOGNITION][CONFIG_MIN_CONFIDENCE],
+            max_connections=config[CONFIG_MAX_CONNECTIONS],
+        )
+        self._encoder = FrameEncoder(
+            config[CONFIG_IMAGE_FORMAT], config[CONFIG_IMAGE_QUALITY]
         )
 
     def preprocess(self, frame) -> np.ndarray:
@@ -73,12 +82,15 @@ class FaceRecognition(AbstractFaceRecognition):
             ),
             self._camera.resolution,
         )
-        cropped_frame = post_processor_frame.frame[y1:y2, x1:x2].copy()
+        image = self._encoder.encode_crop(
+            post_processor_frame.shared_frame,
+            post_processor_frame.frame,
+            (x1, y1, x2, y2),
+            mask=self.mask_image,
+        )
 
         try:
-            detections = self._ds.recognize(
-                cv2.imencode(".jpg", cropped_frame)[1].tobytes()
-            )
+            detections = self._ds.recognize(image)
         except ds.DeepstackException as error:
             self._logger.error("Error calling deepstack: %s", error)
 
@@ -120,6 +132,7 @@ class DeepstackTrain:
             api_key=config[CONFIG_API_KEY],
             timeout=config[CONFIG_TIMEOUT],
             min_confidence=config[CONFIG_FACE_RECOGNITION][CONFIG_MIN_CONFIDENCE],
+            max_connections=config[CONFIG_MAX_CONNECTIONS],
         )
         self.train()
 
@@ -179,42 +192,39 @@ class DeepstackTrain:
                     self._ds.register(face_dir, face_image)
 
 
-HTTP_OK = 200
-BAD_URL = 404
+class DeepstackFace(ds.DeepstackFace):
+    """Custom DeepstackFace to add list and delete function.
 
+    Requests are sent over the shared HTTP client pool.
+    """
 
-class DeepstackFace(ds.DeepstackFace):
-    """Custom DeepstackFace to add list and delete function."""
+    def __init__(
+        self, ip, port, api_key, timeout, min_confidence, max_connections
+    ) -> None:
+        super().__init__(
+            ip=ip,
+            port=port,
+            api_key=api_key,
+            timeout=timeout,
+            min_confidence=min_confidence,
+        )
+        self._http_client = get_http_client(self._url_base, max_connections)
 
-    # pylint: disable=dangerous-default-value
-    @staticmethod
-    def post_request(url, api_key=None, timeout=None, data: dict = {}):
+    def post_request(self, url, api_key=None, timeout=None, data: dict | None = None):
         """Send post req to DeepStack."""
-        data["api_key"] = api_key
-        try:
-            response = requests.post(url, data=data, timeout=timeout)
-        except requests.exceptions.Timeout:
-            raise ds.DeepstackException(  # pylint: disable=raise-missing-from
-                f"Timeout connecting to Deepstack, the current timeout is {timeout} "
-                "seconds, try increasing this value"
-            )
-        except (
-            requests.exceptions.ConnectionError,
-            requests.exceptions.MissingSchema,
-        ) as exc:
-            raise ds.DeepstackException(
-                f"Deepstack connection error, check your IP and port: {exc}"
-            )
-
-        if response.status_code == HTTP_OK:
-            return response.json()
-        if response.status_code == BAD_URL:
-            raise ds.DeepstackException(
-                f"Bad url supplied, url {url} raised error {BAD_URL}"
-            )
-        raise ds.DeepstackException(
-            f"Error from Deepstack request, status code: {response.status_code}"
+        return post_request(self._http_client, url, api_key, timeout, data=data)
+
+    def recognize(self, image_bytes: bytes):
+        """Process image_bytes, performing recognition."""
+        response = process_image(
+            self._http_client,
+            url=self._url_recognize,
+            image_bytes=image_bytes,
+            api_key=self._api_key,
+            min_confidence=self._min_confidence,
+            timeout=self._timeout,
         )
+        return response["predictions"]
 
     def list_faces(self):
         """List taught faces."""
@@ -7,14 +7,20 @@ import deepstack.core as ds
 from viseron import Viseron
 from viseron.domains.object_detector import AbstractObjectDetector
 from viseron.domains.object_detector.detected_object import DetectedObject
+from viseron.helpers.frame_encoder import FrameEncoder
+from viseron.helpers.http_pool import get_http_client
 
+from .client import process_image
 from .const import (
     COMPONENT,
     CONFIG_API_KEY,
     CONFIG_CUSTOM_MODEL,
     CONFIG_HOST,
+    CONFIG_IMAGE_FORMAT,
     CONFIG_IMAGE_HEIGHT,
+    CONFIG_IMAGE_QUALITY,
     CONFIG_IMAGE_WIDTH,
+    CONFIG_MAX_CONNECTIONS,
     CONFIG_OBJECT_DETECTOR,
     CONFIG_PORT,
     CONFIG_TIMEOUT,
@@ -39,13 +45,17 @@ class ObjectDetector(AbstractObjectDetector):
         )
 
         self._ds_config = config
-        self._detector = ds.DeepstackObject(
+        self._detector = DeepstackObject(
             ip=config[CONFIG_HOST],
             port=config[CONFIG_PORT],
             api_key=config[CONFIG_API_KEY],
             timeout=config[CONFIG_TIMEOUT],
             min_confidence=self.min_confidence,
             custom_model=self._config[CONFIG_CUSTOM_MODEL],
+            max_connections=config[CONFIG_MAX_CONNECTIONS],
+        )
+        self._encoder = FrameEncoder(
+            config[CONFIG_IMAGE_FORMAT], config[CONFIG_IMAGE_QUALITY]
         )
 
         self._image_resolution = (
@@ -65,7 +75,14 @@ class ObjectDetector(AbstractObjectDetector):
                 (self._config[CONFIG_IMAGE_WIDTH], self._config[CONFIG_IMAGE_HEIGHT]),
                 interpolation=cv2.INTER_LINEAR,
             )
-        return cv2.imencode(".jpg", frame)[1].tobytes()
+        return self._encoder.encode(frame)
+
+    @property
+    def _model_resolution(self) -> tuple[int, int]:
+        """Return resolution of the image sent to Deepstack."""
+        if self._config[CONFIG_IMAGE_WIDTH] and self._config[CONFIG_IMAGE_HEIGHT]:
+            return self._image_resolution
+        return self.frame_resolution
 
     def postprocess(self, detections):
         """Return deepstack detections as DetectedObject."""
@@ -79,8 +96,8 @@ class ObjectDetector(AbstractObjectDetector):
                     detection["y_min"],
                     detection["x_max"],
                     detection["y_max"],
-                    frame_res=self._camera.resolution,
-                    model_res=self._image_resolution,
+                    frame_res=self.frame_resolution,
+                    model_res=self._model_resolution,
                 )
             )
         return objects
@@ -94,3 +111,32 @@ class ObjectDetector(AbstractObjectDetector):
             return []
 
         return self.postprocess(detections)
+
+
+class DeepstackObject(ds.DeepstackObject):
+    """Deepstack object detection over the shared HTTP client pool."""
+
+    def __init__(
+        self, ip, port, api_key, timeout, min_confidence, custom_model, max_connections
+    ) -> None:
+        super().__init__(
+            ip=ip,
+            port=port,
+            api_key=api_key,
+            timeout=timeout,
+            min_confidence=min_confidence,
+            custom_model=custom_model,
+        )
+        self._http_client = get_http_client(self._url_detect, max_connections)
+
+    def detect(self, image_bytes: bytes):
+        """Process image_bytes and detect."""
+        response = process_image(
+            self._http_client,
+            url=self._url_detect,
+            image_bytes=image_bytes,
+            api_key=self._api_key,
+            min_confidence=self._min_confidence,
+            timeout=self._timeout,
+        )
+        return response["predictions"]
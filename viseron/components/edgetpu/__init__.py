@@ -20,7 +20,7 @@ from viseron.domains.image_classification import (
 from viseron.domains.motion_detector.const import DOMAIN as MOTION_DETECTOR_DOMAIN
 from viseron.domains.object_detector import BASE_CONFIG_SCHEMA
 from viseron.domains.object_detector.const import CONFIG_CAMERAS
-from viseron.domains.object_detector.detected_object import DetectedObject
+from viseron.domains.object_detector.detection_batch import DetectionBatch
 from viseron.exceptions import ViseronError
 from viseron.helpers import pop_if_full
 from viseron.helpers.subprocess_worker import SubProcessWorker
@@ -379,21 +379,21 @@ class EdgeTPUDetection(EdgeTPU):
 
     def post_process(self, item):
         """Post process detections."""
-        processed_objects = []
-        for obj in item["result"]:
-            processed_objects.append(
-                DetectedObject.from_absolute(
-                    self.labels.get(obj["label"], obj["label"]),
-                    float(obj["score"]),
+        item["result"] = DetectionBatch.from_absolute(
+            [self.labels.get(obj["label"], obj["label"]) for obj in item["result"]],
+            [obj["score"] for obj in item["result"]],
+            [
+                (
                     obj["bbox"]["xmin"],
                     obj["bbox"]["ymin"],
                     obj["bbox"]["xmax"],
                     obj["bbox"]["ymax"],
-                    frame_res=item["frame_resolution"],
-                    model_res=(self.model_width, self.model_height),
                 )
-            )
-        item["result"] = processed_objects
+                for obj in item["result"]
+            ],
+            frame_res=item["frame_resolution"],
+            model_res=(self.model_width, self.model_height),
+        )
 
 
 class EdgeTPUClassification(EdgeTPU):
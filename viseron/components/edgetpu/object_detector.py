@@ -10,6 +10,7 @@ from viseron import Viseron
 from viseron.domains.object_detector import AbstractObjectDetector
 from viseron.domains.object_detector.const import DOMAIN
 from viseron.domains.object_detector.detected_object import DetectedObject
+from viseron.domains.object_detector.detection_batch import DetectionBatch
 from viseron.exceptions import DomainNotReady
 
 from . import EdgeTPUDetection, MakeInterpreterError
@@ -58,13 +59,13 @@ class ObjectDetector(AbstractObjectDetector):
         )
         return np.expand_dims(frame, axis=0)
 
-    def return_objects(self, frame) -> list[DetectedObject]:
+    def return_objects(self, frame) -> DetectionBatch:
         """Perform object detection."""
         return self._edgetpu.invoke(
             frame,
             self._camera_identifier,
             self._object_result_queue,
-            self._camera.resolution,
+            self.frame_resolution,
         )
 
     def result_failed_callback(self):
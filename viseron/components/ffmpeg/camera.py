@@ -4,6 +4,7 @@ from __future__ import annotations
 import multiprocessing as mp
 import os
 import time
+from functools import partial
 from queue import Empty, Full
 from typing import TYPE_CHECKING, Any
 
@@ -12,14 +13,18 @@ import setproctitle
 import voluptuous as vol
 
 from viseron import Viseron
-from viseron.const import ENV_CUDA_SUPPORTED, ENV_VAAPI_SUPPORTED
+from viseron.const import (
+    ENV_CUDA_SUPPORTED,
+    ENV_VAAPI_SUPPORTED,
+    VISERON_SIGNAL_SHUTDOWN,
+)
 from viseron.domains.camera import AbstractCamera
 from viseron.domains.camera.config import (
     BASE_CONFIG_SCHEMA as BASE_CAMERA_CONFIG_SCHEMA,
     DEFAULT_RECORDER,
     RECORDER_SCHEMA as BASE_RECORDER_SCHEMA,
 )
-from viseron.domains.camera.shared_frames import SharedFrame
+from viseron.domains.camera.shared_frames import SharedFrame, SharedFrameRingBuffer
 from viseron.exceptions import DomainNotReady, FFprobeError, FFprobeTimeout
 from viseron.helpers import escape_string, utcnow
 from viseron.helpers.logs import SensitiveInformationFilter
@@ -130,6 +135,8 @@ from .const import (
     DESC_VIDEO_FILTERS,
     DESC_WIDTH,
     FFMPEG_LOGLEVELS,
+    FRAME_BUFFER_MIN_SLOTS,
+    FRAME_BUFFER_SECONDS,
     HWACCEL_VAAPI,
     STREAM_FORMAT_MAP,
 )
@@ -341,8 +348,9 @@ class Camera(AbstractCamera):
         self.stream = Stream(config, self, identifier, attempt)
 
         super().__init__(vis, COMPONENT, config, identifier)
+        self._frame_buffer: SharedFrameRingBuffer | None = None
         self._frame_queue: mp.Queue[  # pylint: disable=unsubscriptable-object
-            bytes
+            tuple[int, int]
         ] = mp.Queue(maxsize=2)
         self._capture_frames = mp.Event()
         self._thread_stuck = False
@@ -353,14 +361,29 @@ class Camera(AbstractCamera):
             cv2.ocl.setUseOpenCL(True)
         vis.data[COMPONENT][self.identifier] = self
         self._recorder = Recorder(vis, config, self)
+        vis.register_signal_handler(VISERON_SIGNAL_SHUTDOWN, self._close_frame_buffer)
 
         self.initialize_camera()
 
+    def _create_frame_buffer(self) -> SharedFrameRingBuffer:
+        """Return a shared memory ring buffer sized for the output FPS."""
+        slots = max(int(self.output_fps * FRAME_BUFFER_SECONDS), FRAME_BUFFER_MIN_SLOTS)
+        self._logger.debug(
+            f"Creating frame buffer with {slots} slots of "
+            f"{self.stream.frame_bytes_size} bytes"
+        )
+        return SharedFrameRingBuffer(self.stream.frame_bytes_size, slots)
+
+    def _close_frame_buffer(self) -> None:
+        """Unlink the shared memory frame buffer."""
+        if self._frame_buffer:
+            self._frame_buffer.close()
+
     def _create_frame_reader(self):
         """Return a frame reader thread."""
         return RestartableProcess(
             name="viseron.camera." + self.identifier,
-            args=(self._frame_queue,),
+            args=(self._frame_queue, self._frame_buffer),
             target=self.read_frames,
             daemon=True,
             register=True,
@@ -417,14 +440,23 @@ class Camera(AbstractCamera):
 
     def read_frames(
         self,
-        frame_queue: mp.Queue[bytes],  # pylint: disable=unsubscriptable-object
+        frame_queue: mp.Queue[  # pylint: disable=unsubscriptable-object
+            tuple[int, int]
+        ],
+        frame_buffer: SharedFrameRingBuffer,
     ) -> None:
-        """Read frames from camera."""
+        """Read frames from camera.
+
+        Frames are read straight into a slot of the shared memory frame buffer and
+        only the slot index and sequence number are put on the frame queue.
+        """
         setproctitle.setproctitle("viseron.camera." + self.identifier + ".read_frames")
         self.decode_error.clear()
         empty_frames = 0
+        overruns = frame_buffer.overruns
         self._thread_stuck = False
 
+        frame_buffer.restart()
         self.stream.start_pipe()
 
         while self._capture_frames.is_set():
@@ -436,14 +468,25 @@ class Camera(AbstractCamera):
                 self.decode_error.clear()
                 empty_frames = 0
 
-            frame_bytes = self.stream.read()
-            if frame_bytes:
+            slot = frame_buffer.write(self.stream.readinto)
+            if slot is not None:
                 empty_frames = 0
                 # Dont queue frames if consumer is not ready
                 try:
-                    frame_queue.put_nowait(frame_bytes)
+                    frame_queue.put_nowait((slot, frame_buffer.sequence(slot)))
                 except Full:
-                    pass
+                    frame_buffer.release(slot)
+                continue
+
+            if frame_buffer.overruns != overruns:
+                # A frame was read but all slots are still referenced
+                empty_frames = 0
+                if frame_buffer.overruns - overruns >= self.stream.output_fps:
+                    self._logger.warning(
+                        "Frame buffer is full, dropped "
+                        f"{frame_buffer.overruns - overruns} frames"
+                    )
+                    overruns = frame_buffer.overruns
                 continue
 
             if self._thread_stuck:
@@ -465,32 +508,49 @@ class Camera(AbstractCamera):
     def relay_frame(self):
         """Read from the frame queue and create a SharedFrame."""
         self._poll_timer = utcnow().timestamp()
+        generation = None
         while self._capture_frames.is_set():
+            # Free the slots a restarted frame reader never sent to us
+            if self._frame_buffer and self._frame_buffer.generation != generation:
+                generation = self._frame_buffer.generation
+                self._frame_buffer.reclaim()
+
             if self.decode_error.is_set():
                 self.connected = False
                 self.still_image_available = self.still_image_configured
 
             try:
-                frame_bytes = self._frame_queue.get(timeout=1)
+                slot, sequence = self._frame_queue.get(timeout=1)
             except Empty:
                 continue
 
             self.connected = True
             self.still_image_available = True
 
-            if len(frame_bytes) == self.stream.frame_bytes_size:
-                shared_frame = SharedFrame(
-                    self.stream.color_plane_width,
-                    self.stream.color_plane_height,
-                    self.stream.pixel_format,
-                    (self.stream.width, self.stream.height),
-                    self.identifier,
-                )
-            else:
+            # The slot might have been reclaimed by a restarted frame reader
+            if (
+                self._frame_buffer is None
+                or (frame_view := self._frame_buffer.claim(slot, sequence)) is None
+            ):
                 continue
 
+            shared_frame = SharedFrame(
+                self.stream.color_plane_width,
+                self.stream.color_plane_height,
+                self.stream.pixel_format,
+                (self.stream.width, self.stream.height),
+                self.identifier,
+            )
+
             self._poll_timer = utcnow().timestamp()
-            self.shared_frames.create(shared_frame, frame_bytes)
+            self.shared_frames.create(
+                shared_frame,
+                frame_view,
+                release=partial(self._frame_buffer.release, slot),
+            )
+            # Released by the pool even if the frame is dropped before the NVR
+            # sees it, so that the slot always goes back to the frame reader
+            self.shared_frames.remove(shared_frame, self)
             self.current_frame = shared_frame
             self._data_stream.publish_data(self.frame_bytes_topic, self.current_frame)
 
@@ -540,6 +600,8 @@ class Camera(AbstractCamera):
         self._capture_frames.set()
         if not self._frame_reader or not self._frame_reader.is_alive():
             self._logger.debug("Creating new frame reader")
+            if self._frame_buffer is None:
+                self._frame_buffer = self._create_frame_buffer()
             self._frame_reader, self._frame_relay = self._create_frame_reader()
             self._frame_reader.start()
             self._frame_relay.start()
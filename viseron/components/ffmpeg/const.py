@@ -48,6 +48,10 @@ FFMPEG_LOGLEVELS = {
 FFPROBE_LOGLEVELS = FFMPEG_LOGLEVELS
 FFPROBE_TIMEOUT = 15
 
+# Number of seconds of frames the shared memory frame buffer can hold
+FRAME_BUFFER_SECONDS = 3
+FRAME_BUFFER_MIN_SLOTS = 4
+
 # Hardware acceleration constands
 HWACCEL_VAAPI = ["-hwaccel", "vaapi", "-vaapi_device", "/dev/dri/renderD128"]
 HWACCEL_CUDA_DECODER_CODEC_MAP = {
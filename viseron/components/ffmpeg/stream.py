@@ -555,6 +555,18 @@ class Stream:
             self._logger.error(f"Error reading frame from pipe: {err}")
         return None
 
+    def readinto(self, buffer: memoryview) -> int | None:
+        """Read a single frame from FFmpeg pipe into buffer.
+
+        Returns the number of bytes read.
+        """
+        try:
+            if self._pipe and self._pipe.stdout:
+                return self._pipe.stdout.readinto(buffer)  # type: ignore[attr-defined]
+        except Exception as err:  # pylint: disable=broad-except
+            self._logger.error(f"Error reading frame from pipe: {err}")
+        return None
+
     def record_only(self):
         """Record only the stream."""
         self._logger.debug(f"Recording only stream: {' '.join(self.build_command())}")
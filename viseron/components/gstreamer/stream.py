@@ -276,6 +276,7 @@ class Stream(FFmpegStream):
                         self._camera_identifier,
                     )
                     self._camera.shared_frames.create(shared_frame, frame_bytes)
+                    self._camera.shared_frames.remove(shared_frame, self._camera)
                     return shared_frame
         except Exception as err:  # pylint: disable=broad-except
             self._logger.error(f"Error reading frame from pipe: {err}")
@@ -23,12 +23,20 @@ from viseron.components.hailo.utils import (
 )
 from viseron.domains import RequireDomain, setup_domain
 from viseron.domains.object_detector import (
-    BASE_CONFIG_SCHEMA as OBJECT_DETECTOR_BASE_CONFIG_SCHEMA,
+    BATCHED_BASE_CONFIG_SCHEMA as OBJECT_DETECTOR_BASE_CONFIG_SCHEMA,
 )
-from viseron.domains.object_detector.const import CONFIG_CAMERAS
-from viseron.domains.object_detector.detected_object import DetectedObject
+from viseron.domains.object_detector.batch_scheduler import (
+    BatchScheduler,
+    WorkerBatchRunner,
+)
+from viseron.domains.object_detector.const import (
+    CONFIG_BATCH_SIZE,
+    CONFIG_BATCH_TIMEOUT,
+    CONFIG_CAMERAS,
+)
+from viseron.domains.object_detector.detection_batch import DetectionBatch
 from viseron.exceptions import ComponentNotReady, ViseronError
-from viseron.helpers import letterbox_resize, pop_if_full
+from viseron.helpers import letterbox_resize
 from viseron.helpers.child_process_worker import ChildProcessWorker
 from viseron.helpers.validators import Maybe, PathExists, Url
 
@@ -130,8 +138,9 @@ class Hailo8Detector(ChildProcessWorker):
 
         self.model_path = get_model(config[CONFIG_MODEL_PATH], hailo_arch)
         self.labels = load_labels(config[CONFIG_LABEL_PATH])
+        self._label_array = np.asarray(self.labels, dtype=object)
+        self._batch_size = config[CONFIG_BATCH_SIZE]
 
-        self._result_queues: dict[str, Queue] = {}
         self._process_initialization_done = mp.Event()
         self._process_initialization_error = mp.Event()
         self._hailo_inference: HailoInfer
@@ -140,6 +149,13 @@ class Hailo8Detector(ChildProcessWorker):
 
         self._process_initialization_done = mp.Event()
         super().__init__(vis, f"{COMPONENT}.{CONFIG_OBJECT_DETECTOR}")
+        self._batch_runner = WorkerBatchRunner(self.input_queue)
+        self.scheduler = BatchScheduler(
+            f"{COMPONENT}.{CONFIG_OBJECT_DETECTOR}",
+            self._batch_runner,
+            self._batch_size,
+            config[CONFIG_BATCH_TIMEOUT],
+        )
         self.initialize()
 
     def initialize(self) -> None:
@@ -167,7 +183,9 @@ class Hailo8Detector(ChildProcessWorker):
     def process_initialization(self) -> None:
         """Load network inside the child process."""
         try:
-            self._hailo_inference = HailoInfer(self.model_path)
+            self._hailo_inference = HailoInfer(
+                self.model_path, batch_size=self._batch_size
+            )
             (
                 self._model_height,
                 self._model_width,
@@ -189,11 +207,12 @@ class Hailo8Detector(ChildProcessWorker):
                 }
             }
 
-        # Run async inference
-        inference_callback_fn = partial(inference_callback, item=item)
-        async_job = self._hailo_inference.run([item["frame"]], inference_callback_fn)
+        # Run async inference on the whole batch
+        results: list[Any] = []
+        inference_callback_fn = partial(inference_callback, results=results)
+        async_job = self._hailo_inference.run(item["items"], inference_callback_fn)
         async_job.wait(3000)
-        return item
+        return {"batch_id": item["batch_id"], "results": results}
 
     def work_output(self, item) -> None:
         """Put result into queue."""
@@ -203,7 +222,7 @@ class Hailo8Detector(ChildProcessWorker):
             self._model_size_event.set()
             return
 
-        pop_if_full(self._result_queues[item["camera_identifier"]], item)
+        self._batch_runner.put_result(item)
 
     def preprocess(self, frame):
         """Pre process frame before detection."""
@@ -215,20 +234,20 @@ class Hailo8Detector(ChildProcessWorker):
         camera_identifier: str,
         result_queue: Queue,
     ):
-        """Perform detection."""
-        self._result_queues[camera_identifier] = result_queue
-        pop_if_full(
-            self.input_queue,
-            {
-                "frame": frame,
-                "camera_identifier": camera_identifier,
-            },
-        )
+        """Perform detection.
+
+        The frame is batched together with frames from other cameras.
+        """
         try:
-            item = result_queue.get(timeout=3)
+            return self.scheduler.request(frame, result_queue)
         except Empty:
+            LOGGER.debug(f"Timed out waiting for detection on {camera_identifier}")
             return None
-        return item["result"]
+
+    def stop(self) -> None:
+        """Stop batch scheduler and detection process."""
+        self.scheduler.stop()
+        super().stop()
 
     def post_process(
         self,
@@ -236,36 +255,35 @@ class Hailo8Detector(ChildProcessWorker):
         camera_resolution: tuple[int, int],
         min_confidence: float,
         max_boxes: int = 50,
-    ) -> list[DetectedObject]:
+    ) -> DetectionBatch:
         """Post process detections."""
-        all_detections = []
-        for class_id, detection in enumerate(detections):
-            for det in detection:
-                bbox, score = det[:4], det[4]
-                if score >= min_confidence:
-                    all_detections.append((class_id, score, bbox))
-
-        # Sort all detections by score descending
-        all_detections.sort(reverse=True, key=lambda x: x[1])
-
-        # Filter to max_boxes highest scoring detections
-        top_detections = all_detections[:max_boxes]
-        _detections = []
-        for class_id, score, bbox in top_detections:
-            _detections.append(
-                DetectedObject.from_relative_letterboxed(
-                    self.labels[int(class_id)],
-                    score,
-                    bbox[1],
-                    bbox[0],
-                    bbox[3],
-                    bbox[2],
-                    frame_res=camera_resolution,
-                    model_res=self.model_res,
-                )
-            )
+        class_ids = np.concatenate(
+            [
+                np.full(len(detection), class_id, dtype=int)
+                for class_id, detection in enumerate(detections)
+            ]
+            or [np.empty(0, dtype=int)]
+        )
+        all_detections = np.concatenate(
+            [np.asarray(detection).reshape(-1, 5) for detection in detections]
+            or [np.empty((0, 5))]
+        )
 
-        return _detections
+        keep = all_detections[:, 4] >= min_confidence
+        class_ids, all_detections = class_ids[keep], all_detections[keep]
+
+        # Keep the max_boxes highest scoring detections, sorted by score descending
+        top = np.argsort(-all_detections[:, 4], kind="stable")[:max_boxes]
+        class_ids, all_detections = class_ids[top], all_detections[top]
+
+        # Boxes are returned as y1, x1, y2, x2
+        return DetectionBatch.from_relative_letterboxed(
+            self._label_array[class_ids],
+            all_detections[:, 4],
+            all_detections[:, [1, 0, 3, 2]],
+            frame_res=camera_resolution,
+            model_res=self.model_res,
+        )
 
     @property
     def model_width(self) -> int:
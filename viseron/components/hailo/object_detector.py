@@ -13,6 +13,7 @@ if TYPE_CHECKING:
     from viseron import Viseron
     from viseron.components.hailo import Hailo8Detector
     from viseron.domains.object_detector.detected_object import DetectedObject
+    from viseron.domains.object_detector.detection_batch import DetectionBatch
 
 
 LOGGER = logging.getLogger(__name__)
@@ -39,7 +40,7 @@ class ObjectDetector(AbstractObjectDetector):
         """Preprocess frame before detection."""
         return self._hailo8.preprocess(frame)
 
-    def return_objects(self, frame) -> list[DetectedObject] | None:
+    def return_objects(self, frame) -> DetectionBatch | None:
         """Perform object detection."""
         detections = self._hailo8.detect(
             frame,
@@ -49,5 +50,5 @@ class ObjectDetector(AbstractObjectDetector):
         if detections is None:
             return None
         return self._hailo8.post_process(
-            detections, self._camera.resolution, self.min_confidence
+            detections, self.frame_resolution, self.min_confidence
         )
@@ -65,9 +65,12 @@ def get_model_size(process_queue: mp.Queue):
 def inference_callback(
     completion_info,
     bindings_list: list,
-    item: dict[str, Any],
+    results: list[Any],
 ) -> None:
-    """Inference callback to handle inference results."""
+    """Inference callback to handle inference results.
+
+    The result of each frame in the batch is appended to results.
+    """
     if completion_info.exception:
         LOGGER.error(f"Inference error: {completion_info.exception}")
         return
@@ -80,7 +83,7 @@ def inference_callback(
                 name: np.expand_dims(bindings.output(name).get_buffer(), axis=0)
                 for name in bindings._output_names  # pylint: disable=protected-access
             }
-        item["result"] = result
+        results.append(result)
 
 
 def is_url(value: str) -> bool:
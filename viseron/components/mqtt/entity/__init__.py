@@ -1,14 +1,12 @@
 """MQTT entity."""
 from __future__ import annotations
 
-import json
-from functools import partial
 from typing import TYPE_CHECKING, Generic, TypeVar
 
 from viseron.components.mqtt.const import COMPONENT as MQTT_COMPONENT, CONFIG_CLIENT_ID
 from viseron.components.mqtt.helpers import PublishPayload
 from viseron.helpers.entity import Entity
-from viseron.helpers.json import JSONEncoder
+from viseron.helpers.json import dumps
 
 if TYPE_CHECKING:
     from viseron import Viseron
@@ -48,7 +46,7 @@ class MQTTEntity(Generic[T]):
         self._mqtt.publish(
             PublishPayload(
                 self.state_topic,
-                partial(json.dumps, cls=JSONEncoder, allow_nan=False)(payload),
+                dumps(payload),
                 retain=True,
             )
         )
@@ -12,6 +12,9 @@ NO_DETECTOR: Final = "no_detector"
 NO_DETECTOR_FPS: Final = 1
 
 SCANNER_RESULT_RETRIES: Final = 5
+# Seconds past max_frame_age of a scanner after which a frame in flight is
+# considered dropped, allowing for the result to travel through the data stream
+IN_FLIGHT_DEADLINE_MARGIN: Final = 1
 
 # Data stream topic constants
 DATA_PROCESSED_FRAME_TOPIC = "{camera_identifier}/nvr/processed_frame"
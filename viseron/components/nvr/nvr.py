@@ -8,8 +8,8 @@ from __future__ import annotations
 
 import datetime
 import logging
-import threading
 import time
+from collections import deque
 from dataclasses import dataclass
 from queue import Empty, Queue
 from typing import TYPE_CHECKING, Literal
@@ -43,6 +43,7 @@ from .const import (
     DATA_PROCESSED_FRAME_TOPIC,
     EVENT_OPERATION_STATE,
     EVENT_SCAN_FRAMES,
+    IN_FLIGHT_DEADLINE_MARGIN,
     MOTION_DETECTOR,
     NO_DETECTOR,
     NO_DETECTOR_FPS,
@@ -55,7 +56,7 @@ if TYPE_CHECKING:
     from viseron import Viseron
     from viseron.components.data_stream import DataStream
     from viseron.domains.camera import AbstractCamera
-    from viseron.domains.camera.shared_frames import SharedFrame
+    from viseron.domains.camera.shared_frames import SharedFrame, SharedFrames
     from viseron.domains.motion_detector import AbstractMotionDetector, Contours
     from viseron.domains.object_detector import AbstractObjectDetector
     from viseron.domains.post_processor import AbstractPostProcessor
@@ -93,12 +94,34 @@ def setup(vis: Viseron, config, identifier) -> bool:
 
 @dataclass
 class DataProcessedFrame:
-    """Processed frame that is sent on DATA_PROCESSED_FRAME_TOPIC."""
+    """Processed frame that is sent on DATA_PROCESSED_FRAME_TOPIC.
 
-    frame: np.ndarray
+    The frame is only decoded when accessed by a subscriber.
+    """
+
+    shared_frame: SharedFrame
+    shared_frames: SharedFrames
     objects_in_fov: list[DetectedObject] | None
     motion_contours: Contours | None
 
+    @property
+    def frame(self) -> np.ndarray | None:
+        """Return a copy of the frame in RGB, or None if it has been released."""
+        return self.get_frame()
+
+    def get_frame(self, size: tuple[int, int] | None = None) -> np.ndarray | None:
+        """Return a copy of the frame in RGB resized to size (width, height).
+
+        The resized frame is shared by all subscribers asking for the same size, so
+        only the copy is made per subscriber. Returns None if the frame has been
+        released.
+        """
+        with self.shared_frame:
+            try:
+                return self.shared_frames.get_frame(self.shared_frame, size=size).copy()
+            except KeyError:
+                return None
+
 
 @dataclass
 class EventOperationState(EventData):
@@ -154,7 +177,15 @@ class FrameIntervalCalculator:
         self._scan_error: bool = False
 
         self._frame_number = 0
-        self.result_queue: Queue = Queue(maxsize=1)
+        # Scanners that detect several frames concurrently expose max_in_flight.
+        # Frames they drop never return a result, so each frame in flight has a
+        # deadline based on the max_frame_age of the scanner, if it has one
+        self.max_in_flight: int = getattr(domain_instance, "max_in_flight", 1)
+        self._max_frame_age: float | None = getattr(
+            domain_instance, "max_frame_age", None
+        )
+        self._in_flight: deque[float] = deque()
+        self.result_queue: Queue = Queue(maxsize=self.max_in_flight)
 
         self._data_stream: DataStream = vis.data[DATA_STREAM_COMPONENT]
         self._data_stream.subscribe_data(topic_result, self.result_queue)
@@ -167,12 +198,51 @@ class FrameIntervalCalculator:
             if self._frame_number % self._scan_interval == 0:
                 self._frame_number = 1
                 self._data_stream.publish_data(self._topic_scan, shared_frame)
+                deadline = float("inf")
+                if self._max_frame_age is not None:
+                    deadline = (
+                        shared_frame.capture_time
+                        + self._max_frame_age
+                        + IN_FLIGHT_DEADLINE_MARGIN
+                    )
+                self._in_flight.append(deadline)
                 return True
             self._frame_number += 1
         else:
             self._frame_number = 0
         return False
 
+    @property
+    def in_flight(self) -> int:
+        """Return number of scanned frames that have not returned a result."""
+        return len(self._in_flight)
+
+    def result_received(self) -> None:
+        """Count a result of the oldest frame in flight."""
+        if self._in_flight:
+            self._in_flight.popleft()
+
+    def clear_in_flight(self) -> None:
+        """Forget all frames in flight."""
+        self._in_flight.clear()
+
+    def collect_results(self) -> None:
+        """Count the results that have arrived without waiting for more.
+
+        Frames that are past their deadline have been dropped by the scanner and are
+        no longer counted as in flight.
+        """
+        while self._in_flight:
+            try:
+                self.result_queue.get_nowait()
+            except Empty:
+                break
+            self._in_flight.popleft()
+
+        now = time.time()
+        while self._in_flight and self._in_flight[0] < now:
+            self._in_flight.popleft()
+
     def calculate_scan_interval(self, output_fps) -> None:
         """Calculate the frame scan interval."""
         self._scan_interval = round(output_fps / self.scan_fps)
@@ -246,7 +316,6 @@ class NVR:
         self._seconds_left = 0
         self._kill_received = False
         self._data_stream: DataStream = vis.data[DATA_STREAM_COMPONENT]
-        self._removal_timers: list[threading.Timer] = []
         self._operation_state = None
 
         self._frame_scanners: dict[str, FrameIntervalCalculator] = {}
@@ -255,6 +324,7 @@ class NVR:
         self._topic_processed_frame = DATA_PROCESSED_FRAME_TOPIC.format(
             camera_identifier=camera_identifier
         )
+        self._publish_processed_frame = False
 
         self._motion_only_frames = 0
         self._motion_recorder_keepalive_reached = False
@@ -344,6 +414,9 @@ class NVR:
         self._data_stream.subscribe_data(
             self._camera.frame_bytes_topic, self._frame_queue
         )
+        self._processed_frame_presence = self._data_stream.subscribe_presence(
+            self._topic_processed_frame, self._set_publish_processed_frame
+        )
         self._nvr_thread = RestartableThread(
             name=str(self),
             target=self.run,
@@ -434,6 +507,10 @@ class NVR:
         self._frame_scanner_errors = []
         for name, frame_scanner in self._current_frame_scanners.items():
             frame_scanner.scan_error = False
+            # Only wait when the scanner has as many frames in flight as it allows
+            frame_scanner.collect_results()
+            if frame_scanner.in_flight < frame_scanner.max_in_flight:
+                continue
             retry_count = 0
             while retry_count < SCANNER_RESULT_RETRIES and not self._kill_received:
                 try:
@@ -441,11 +518,13 @@ class NVR:
                     # We dont care about the result since its referenced directly
                     # from the scanner instead of storing it locally
                     frame_scanner.result_queue.get(timeout=1)
+                    frame_scanner.result_received()
                     break
                 except Empty:  # Make sure we dont wait forever
                     retry_count += 1
                     if retry_count == SCANNER_RESULT_RETRIES:
                         self._logger.error(f"Failed to retrieve result for {name}")
+                        frame_scanner.clear_in_flight()
                         frame_scanner.scan_error = True
                         self._frame_scanner_errors.append(name)
                         if frame_scanner.domain_instance and hasattr(
@@ -705,25 +784,9 @@ class NVR:
         else:
             self._stop_recorder_at = None
 
-    def remove_frame(self, shared_frame: SharedFrame) -> None:
-        """Remove frame after a delay.
-
-        This makes sure all frames are cleaned up eventually.
-        """
-
-        def _remove():
-            self._camera.shared_frames.remove(shared_frame, self._camera)
-            self._removal_timers.remove(timer)
-
-        timer = threading.Timer(
-            2,
-            _remove,
-            args=(),
-        )
-        timer.name = f"{str(self)}.remove_frame.{shared_frame.name}"
-        timer.daemon = True
-        self._removal_timers.append(timer)
-        timer.start()
+    def _set_publish_processed_frame(self, has_subscribers: bool) -> None:
+        """Publish processed frames only while someone subscribes to them."""
+        self._publish_processed_frame = has_subscribers
 
     def run(self) -> None:
         """Read frames from camera."""
@@ -743,32 +806,36 @@ class NVR:
 
             if (frame_age := time.time() - shared_frame.capture_time) > 1:
                 self._logger.debug(f"Frame is {frame_age} seconds old. Discarding")
-                self.remove_frame(shared_frame)
                 continue
 
-            self.process_frame(shared_frame)
-            self.process_recorder(shared_frame)
-            self._data_stream.publish_data(
-                self._topic_processed_frame,
-                DataProcessedFrame(
-                    frame=self._camera.shared_frames.get_decoded_frame_rgb(
-                        shared_frame
-                    ).copy(),
-                    objects_in_fov=self._object_detector.objects_in_fov
-                    if self._object_detector
-                    else None,
-                    motion_contours=self._motion_detector.motion_contours
-                    if self._motion_detector
-                    else None,
-                ),
-            )
-            self.remove_frame(shared_frame)
+            # The camera has already scheduled the release of the frame, hold it
+            # while it is handed to the scanners
+            with shared_frame:
+                self.process_frame(shared_frame)
+                self.process_recorder(shared_frame)
+                if self._publish_processed_frame:
+                    self._data_stream.publish_data(
+                        self._topic_processed_frame,
+                        DataProcessedFrame(
+                            shared_frame=shared_frame,
+                            shared_frames=self._camera.shared_frames,
+                            objects_in_fov=self._object_detector.objects_in_fov
+                            if self._object_detector
+                            else None,
+                            motion_contours=self._motion_detector.motion_contours
+                            if self._motion_detector
+                            else None,
+                        ),
+                    )
         self._logger.debug("NVR thread stopped")
 
     def stop(self) -> None:
         """Stop processing of events."""
         self._logger.info("Stopping NVR thread")
         self._kill_received = True
+        self._data_stream.unsubscribe_presence(
+            self._topic_processed_frame, self._processed_frame_presence
+        )
 
         # Stop frame grabber
         self._camera.stop_camera()
@@ -779,9 +846,6 @@ class NVR:
         if self._camera.is_recording:
             self._camera.stop_recorder()
 
-        for timer in self._removal_timers:
-            timer.cancel()
-
     @property
     def camera(self) -> AbstractCamera:
         """Return camera."""
@@ -26,12 +26,14 @@ from viseron.components.storage.const import (
     COMPONENT,
     CONFIG_CONTINUOUS,
     CONFIG_EVENTS,
+    CONFIG_EVENT_JOURNAL_FLUSH_INTERVAL,
     CONFIG_PATH,
     CONFIG_RECORDER,
     CONFIG_SNAPSHOTS,
     CONFIG_TIER_CHECK_BATCH_SIZE,
     CONFIG_TIER_CHECK_CPU_LIMIT,
     CONFIG_TIER_CHECK_SLEEP_BETWEEN_BATCHES,
+    CONFIG_TIER_CHECK_MOVER_WORKERS,
     CONFIG_TIER_CHECK_WORKERS,
     CONFIG_TIERS,
     CONFIG_TIMELAPSE,
@@ -50,6 +52,8 @@ from viseron.components.storage.const import (
     TIER_SUBCATEGORY_THUMBNAILS,
     TIER_SUBCATEGORY_TIMELAPSE,
 )
+from viseron.components.storage.event_journal import EventJournal
+from viseron.components.storage.files_writer import FilesWriter
 from viseron.components.storage.jobs import CleanupManager
 from viseron.components.storage.models import Base, FilesMeta, Motion, Recordings
 from viseron.components.storage.storage_subprocess import TierCheckWorker
@@ -68,7 +72,11 @@ from viseron.components.storage.util import (
     get_thumbnails_path,
     get_timelapse_path,
 )
-from viseron.const import EVENT_DOMAIN_REGISTERED, VISERON_SIGNAL_STOPPING
+from viseron.const import (
+    EVENT_DOMAIN_REGISTERED,
+    STATISTICS_LOG_INTERVAL,
+    VISERON_SIGNAL_STOPPING,
+)
 from viseron.domains.camera.const import CONFIG_STORAGE, DOMAIN as CAMERA_DOMAIN
 from viseron.helpers import utcnow
 from viseron.helpers.logs import StreamToLogger
@@ -80,6 +88,7 @@ if TYPE_CHECKING:
     from viseron.components.storage.storage_subprocess import (
         DataItem,
         DataItemDeleteFile,
+        DataItemFilesChanged,
         DataItemMoveFile,
     )
     from viseron.domains.camera import AbstractCamera
@@ -231,12 +240,19 @@ class Storage:
         self._get_session: Callable[[], Session] | None = None
 
         self.temporary_files_meta: dict[str, FilesMeta] = {}
+        self._files_writer = FilesWriter(self)
+        self._event_journal = EventJournal(
+            self, config[CONFIG_EVENT_JOURNAL_FLUSH_INTERVAL]
+        )
 
         self.cleanup_manager = CleanupManager(vis, self)
         self.cleanup_manager.start()
 
         self.tier_check_worker = TierCheckWorker(
-            vis, config[CONFIG_TIER_CHECK_CPU_LIMIT], config[CONFIG_TIER_CHECK_WORKERS]
+            vis,
+            config[CONFIG_TIER_CHECK_CPU_LIMIT],
+            config[CONFIG_TIER_CHECK_WORKERS],
+            config[CONFIG_TIER_CHECK_MOVER_WORKERS],
         )
 
     @property
@@ -244,6 +260,16 @@ class Storage:
         """Return camera tier handlers."""
         return self._camera_tier_handlers
 
+    @property
+    def files_writer(self) -> FilesWriter:
+        """Return the write-behind buffer for the Files table."""
+        return self._files_writer
+
+    @property
+    def event_journal(self) -> EventJournal:
+        """Return the background writer for the Events table."""
+        return self._event_journal
+
     @property
     def file_batch_size(self) -> int:
         """Return the number of files to process in a single batch."""
@@ -264,6 +290,16 @@ class Storage:
             self._camera_registered,
         )
         self._vis.register_signal_handler(VISERON_SIGNAL_STOPPING, self._shutdown)
+        self._vis.background_scheduler.add_job(
+            self._event_journal.log_statistics,
+            "interval",
+            id="event_journal_statistics",
+            name="event_journal_statistics",
+            seconds=STATISTICS_LOG_INTERVAL,
+            max_instances=1,
+            coalesce=True,
+            replace_existing=True,
+        )
 
     def _get_alembic_config(self) -> Config:
         base_path = pathlib.Path(__file__).parent.resolve()
@@ -626,9 +662,17 @@ class Storage:
     ) -> None:
         ...
 
+    @overload
+    def tier_check_worker_send_command(
+        self,
+        item: DataItemFilesChanged,
+        callback: None = None,
+    ) -> None:
+        ...
+
     def tier_check_worker_send_command(
         self,
-        item: DataItem | DataItemMoveFile | DataItemDeleteFile,
+        item: DataItem | DataItemMoveFile | DataItemDeleteFile | DataItemFilesChanged,
         callback: Callable[[Any], None] | None = None,
     ) -> None:
         """Send command to tier check worker."""
@@ -636,6 +680,8 @@ class Storage:
 
     def _shutdown(self) -> None:
         """Shutdown."""
+        self._files_writer.stop()
+        self._event_journal.stop()
         if self.engine:
             self.engine.dispose()
 
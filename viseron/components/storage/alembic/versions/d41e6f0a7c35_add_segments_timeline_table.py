@@ -0,0 +1,87 @@
+# pylint: disable=invalid-name
+"""Add segments timeline table.
+
+Revision ID: d41e6f0a7c35
+Revises: a6397b8c2fc9
+Create Date: 2026-10-16 09:12:41.503118
+
+"""
+from __future__ import annotations
+
+import sqlalchemy as sa
+from alembic import op
+
+from viseron.components.storage.models import SEGMENTS_TRIGGERS_DDL
+
+# revision identifiers, used by Alembic.
+revision: str | None = "d41e6f0a7c35"
+down_revision: str | None = "a6397b8c2fc9"
+branch_labels: str | None = None
+depends_on: str | None = None
+
+
+def upgrade() -> None:
+    """Run the upgrade migrations."""
+    op.create_index(
+        "idx_files_camera_filename",
+        "files",
+        ["camera_identifier", "filename"],
+        unique=False,
+    )
+    op.create_table(
+        "segments",
+        sa.Column("id", sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column("file_id", sa.Integer(), nullable=False),
+        sa.Column("camera_identifier", sa.String(), nullable=False),
+        sa.Column("tier_id", sa.Integer(), nullable=False),
+        sa.Column("path", sa.String(), nullable=False),
+        sa.Column("filename", sa.String(), nullable=False),
+        sa.Column("duration", sa.Float(), nullable=False),
+        sa.Column("orig_ctime", sa.DateTime(), nullable=False),
+        sa.Column("end_time", sa.DateTime(), nullable=False),
+        sa.Column("created_at", sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint(
+            "camera_identifier", "filename", name="uq_segments_camera_filename"
+        ),
+    )
+    op.create_index(
+        "idx_segments_camera_time",
+        "segments",
+        ["camera_identifier", "orig_ctime"],
+        unique=False,
+    )
+    op.create_index("idx_segments_file_id", "segments", ["file_id"], unique=False)
+
+    # Backfill with the latest tier copy of each segment
+    op.execute(
+        """
+        INSERT INTO segments (
+            file_id, camera_identifier, tier_id, path, filename, duration,
+            orig_ctime, end_time, created_at
+        )
+        SELECT DISTINCT ON (f.camera_identifier, f.filename)
+            f.id, f.camera_identifier, f.tier_id, f.path, f.filename, f.duration,
+            f.orig_ctime, f.orig_ctime + make_interval(secs => f.duration),
+            f.created_at
+        FROM files f
+        WHERE f.category = 'recorder'
+            AND f.subcategory = 'segments'
+            AND f.duration IS NOT NULL
+        ORDER BY f.camera_identifier, f.filename, f.created_at DESC NULLS LAST
+        """
+    )
+    for statement in SEGMENTS_TRIGGERS_DDL:
+        op.execute(statement)
+
+
+def downgrade() -> None:
+    """Run the downgrade migrations."""
+    op.execute("DROP TRIGGER IF EXISTS segments_files_deleted ON files")
+    op.execute("DROP TRIGGER IF EXISTS segments_files_inserted ON files")
+    op.execute("DROP FUNCTION IF EXISTS segments_files_deleted()")
+    op.execute("DROP FUNCTION IF EXISTS segments_files_inserted()")
+    op.drop_index("idx_segments_file_id", table_name="segments")
+    op.drop_index("idx_segments_camera_time", table_name="segments")
+    op.drop_table("segments")
+    op.drop_index("idx_files_camera_filename", table_name="files")
@@ -3,6 +3,7 @@
 from __future__ import annotations
 
 import datetime
+import errno
 import logging
 import os
 import shutil
@@ -16,6 +17,7 @@ from sqlalchemy.orm import scoped_session, sessionmaker
 
 from viseron.components.storage.const import ENGINE
 from viseron.components.storage.models import Files, Recordings
+from viseron.components.storage.tier_index import FILES_DTYPE, IndexedFile, TierIndex
 from viseron.const import CAMERA_SEGMENT_DURATION
 from viseron.helpers import utcnow
 
@@ -25,19 +27,19 @@ if TYPE_CHECKING:
     from viseron.components.storage.storage_subprocess import (
         DataItem,
         DataItemDeleteFile,
+        DataItemFilesChanged,
         DataItemMoveFile,
     )
 
 LOGGER = logging.getLogger(__name__)
 
-FILES_DTYPE = np.dtype(
-    [
-        ("id", np.int64),
-        ("size", np.int64),
-        ("orig_ctime", np.int64),
-        ("path", "U512"),
-        ("tier_path", "U512"),
-    ]
+# Errors from copy_file_range that mean it can't be used for the given files
+COPY_FILE_RANGE_UNSUPPORTED = (
+    errno.EXDEV,
+    errno.ENOSYS,
+    errno.EINVAL,
+    errno.EOPNOTSUPP,
+    errno.ETXTBSY,
 )
 
 RECORDINGS_DTYPE = np.dtype(
@@ -74,6 +76,8 @@ class Worker:
         self._last_call: dict[str, float] = {}
         self._check_locks: dict[str, threading.Lock] = {}
         self._checks_in_progress: dict[str, bool] = {}
+        self._tier_indexes: dict[tuple[str, int, str, tuple[str, ...]], TierIndex] = {}
+        self._tier_indexes_lock = threading.Lock()
 
     def _check_tier(self, item: DataItem) -> None:
         if item.cmd == "check_tier" and item.files_enabled:
@@ -176,22 +180,59 @@ class Worker:
 
     def move_file(self, item: DataItemMoveFile) -> None:
         """Move file from source to destination."""
-        move_file(
-            self._get_session,
-            item.src,
-            item.dst,
-            LOGGER,
-        )
+        try:
+            move_file(
+                self._get_session,
+                item.src,
+                item.dst,
+                LOGGER,
+            )
+        finally:
+            self._remove_from_tier_indexes(item.src)
 
     def delete_file(self, item: DataItemDeleteFile) -> None:
         """Delete file."""
-        delete_file(
-            self._get_session,
-            item.src,
-            LOGGER,
-        )
-
-    def work_input(self, item: DataItem | DataItemMoveFile | DataItemDeleteFile):
+        try:
+            delete_file(
+                self._get_session,
+                item.src,
+                LOGGER,
+            )
+        finally:
+            self._remove_from_tier_indexes(item.src)
+
+    def files_changed(self, item: DataItemFilesChanged) -> None:
+        """Apply the deltas of a files writer flush to the loaded tier indexes."""
+        with self._tier_indexes_lock:
+            tier_indexes = list(self._tier_indexes.items())
+
+        for key, tier_index in tier_indexes:
+            camera_identifier, tier_id, category, subcategories = key
+            with tier_index.lock:
+                for path in item.deleted:
+                    tier_index.remove(path)
+                for created in item.created:
+                    if (
+                        created.camera_identifier == camera_identifier
+                        and created.tier_id == tier_id
+                        and created.category == category
+                        and created.subcategory in subcategories
+                    ):
+                        tier_index.upsert(created.file)
+                for path, size in item.modified:
+                    tier_index.update_size(path, size)
+
+    def _remove_from_tier_indexes(self, path: str) -> None:
+        with self._tier_indexes_lock:
+            tier_indexes = list(self._tier_indexes.values())
+        for tier_index in tier_indexes:
+            with tier_index.lock:
+                tier_index.remove(path)
+
+    def work_input(
+        self,
+        item: DataItem | DataItemMoveFile | DataItemDeleteFile | DataItemFilesChanged,
+    ):
         """Perform work on input item from child process."""
         try:
             if item.cmd == "check_tier":
@@ -200,6 +241,8 @@ class Worker:
                 self.move_file(item)
             if item.cmd == "delete_file":
                 self.delete_file(item)
+            if item.cmd == "files_changed":
+                self.files_changed(item)
         except Exception as e:  # pylint: disable=broad-except
             LOGGER.error(
                 "Error processing command: %s, error: %s",
@@ -208,20 +251,41 @@ class Worker:
             )
             item.error = str(e)
 
-    def load_tier(self, item: DataItem):
-        """Load the tier data for the camera."""
-        data = load_tier(
-            self._get_session,
-            item.category,
-            item.subcategories,
-            item.tier_id,
+    def get_tier_index(self, item: DataItem) -> TierIndex:
+        """Return the tier index for the camera, loading it if needed."""
+        key = (
             item.camera_identifier,
+            item.tier_id,
+            item.category,
+            tuple(item.subcategories),
         )
-        LOGGER.debug(
-            "Loaded %d files into numpy array",
-            len(data),
-        )
-        return data
+        with self._tier_indexes_lock:
+            tier_index = self._tier_indexes.setdefault(key, TierIndex())
+
+        # Deltas are applied under the same lock, so they are never applied to a
+        # partially loaded index
+        with tier_index.lock:
+            if tier_index.needs_reload:
+                tier_index.load(
+                    load_tier_files(
+                        self._get_session,
+                        item.category,
+                        item.subcategories,
+                        item.tier_id,
+                        item.camera_identifier,
+                    )
+                )
+                LOGGER.debug(
+                    "Loaded %d files into tier index",
+                    len(tier_index),
+                )
+        return tier_index
+
+    def load_tier(self, item: DataItem):
+        """Load the tier data for the camera from the tier index."""
+        tier_index = self.get_tier_index(item)
+        with tier_index.lock:
+            return tier_index.to_array()
 
     def load_recordings(self, item: DataItem):
         """Load the recordings data for the camera."""
@@ -236,8 +300,7 @@ class Worker:
         return data
 
     def check_tier_files(self, item: DataItem):
-        """Check the tier using the loaded numpy array."""
-        data = self.load_tier(item)
+        """Check the tier using the tier index."""
         now = utcnow()
 
         # If min_age is not set, we want to ignore recent files.
@@ -269,15 +332,14 @@ class Worker:
             max_age_timestamp,
         )
 
-        rows_to_move = get_files_to_move(
-            data,
-            item.max_bytes,
-            min_age_timestamp,
-            item.min_bytes,
-            max_age_timestamp,
-        )
-
-        return rows_to_move
+        tier_index = self.get_tier_index(item)
+        with tier_index.lock:
+            return tier_index.files_to_move(
+                item.max_bytes,
+                min_age_timestamp,
+                item.min_bytes,
+                max_age_timestamp,
+            )
 
     def check_tier_recordings(
         self,
@@ -352,14 +414,14 @@ class Worker:
         return rows_to_move
 
 
-def load_tier(
+def load_tier_files(
     get_session: Callable[..., Session],
     category: str,
     subcategories: list[str],
     tier_id: int,
     camera_identifier: str,
-):
-    """Load the tier files data for the camera."""
+) -> list[IndexedFile]:
+    """Load the tier files for the camera."""
     with get_session() as session:
         stmt = select(
             Files.id, Files.size, Files.orig_ctime, Files.path, Files.tier_path
@@ -370,8 +432,8 @@ def load_tier(
             Files.subcategory.in_(subcategories),
         )
         result = session.execute(stmt).yield_per(1000)
-        data = [
-            (
+        return [
+            IndexedFile(
                 row.id,
                 row.size,
                 int(row.orig_ctime.timestamp()),
@@ -380,10 +442,22 @@ def load_tier(
             )
             for row in result
         ]
-        return np.array(
-            data,
-            dtype=FILES_DTYPE,
-        )
+
+
+def load_tier(
+    get_session: Callable[..., Session],
+    category: str,
+    subcategories: list[str],
+    tier_id: int,
+    camera_identifier: str,
+):
+    """Load the tier files data for the camera."""
+    return np.array(
+        load_tier_files(
+            get_session, category, subcategories, tier_id, camera_identifier
+        ),
+        dtype=FILES_DTYPE,
+    )
 
 
 def load_recordings(
@@ -633,6 +707,34 @@ def delete_file(
         raise error
 
 
+def copy_file(src: str, dst: str) -> None:
+    """Copy file contents and permission bits from src to dst.
+
+    copy_file_range lets the kernel copy the data, which also allows filesystems to
+    clone the file or do a server side copy over NFS. If it is not supported,
+    shutil.copy is used, which uses sendfile on Linux.
+    """
+    if hasattr(os, "copy_file_range"):
+        try:
+            with open(src, "rb") as fsrc, open(dst, "wb") as fdst:
+                size = os.fstat(fsrc.fileno()).st_size
+                offset = 0
+                while offset < size:
+                    copied = os.copy_file_range(
+                        fsrc.fileno(), fdst.fileno(), size - offset, offset, offset
+                    )
+                    if copied == 0:
+                        break
+                    offset += copied
+            shutil.copymode(src, dst)
+            return
+        except OSError as error:
+            if error.errno not in COPY_FILE_RANGE_UNSUPPORTED:
+                raise
+
+    shutil.copy(src, dst)
+
+
 def move_file(
     get_session: Callable[..., Session],
     src: str,
@@ -641,14 +743,27 @@ def move_file(
 ) -> None:
     """Move file from src to dst.
 
-    To avoid race conditions where a file is referenced at the same time as it is being
-    moved, causing a 404 in the browser, we copy the file to the new location and then
-    delete the old one.
+    The file is renamed first, which is atomic. If src and dst are on different
+    mounts the rename fails with EXDEV, even if the mounts share a device. To avoid
+    race conditions where a file is referenced at the same time as it is being moved,
+    causing a 404 in the browser, we then copy the file to the new location and
+    delete the old one. If the rename fails for any other reason the file is left
+    in place.
     """
     logger.debug("Moving file from %s to %s", src, dst)
     try:
         os.makedirs(os.path.dirname(dst), exist_ok=True)
-        shutil.copy(src, dst)
+        os.rename(src, dst)
+        return
+    except FileNotFoundError:
+        pass
+    except OSError as error:
+        if error.errno != errno.EXDEV:
+            logger.error(f"Failed to move file {src} to {dst}: {error}")
+            raise
+
+    try:
+        copy_file(src, dst)
         os.remove(src)
     except FileNotFoundError as error:
         logger.debug(f"Failed to move file {src} to {dst}: {error}")
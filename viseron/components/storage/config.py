@@ -12,6 +12,7 @@ from viseron.components.storage.const import (
     CONFIG_CONTINUOUS,
     CONFIG_DAYS,
     CONFIG_EVENTS,
+    CONFIG_EVENT_JOURNAL_FLUSH_INTERVAL,
     CONFIG_FACE_RECOGNITION,
     CONFIG_GB,
     CONFIG_HOURS,
@@ -34,6 +35,7 @@ from viseron.components.storage.const import (
     CONFIG_TIER_CHECK_BATCH_SIZE,
     CONFIG_TIER_CHECK_CPU_LIMIT,
     CONFIG_TIER_CHECK_SLEEP_BETWEEN_BATCHES,
+    CONFIG_TIER_CHECK_MOVER_WORKERS,
     CONFIG_TIER_CHECK_WORKERS,
     CONFIG_TIERS,
     CONFIG_TIMELAPSE,
@@ -45,6 +47,7 @@ from viseron.components.storage.const import (
     DEFAULT_CONTINUOUS,
     DEFAULT_DAYS,
     DEFAULT_EVENTS,
+    DEFAULT_EVENT_JOURNAL_FLUSH_INTERVAL,
     DEFAULT_FACE_RECOGNITION,
     DEFAULT_GB,
     DEFAULT_HOURS,
@@ -68,6 +71,7 @@ from viseron.components.storage.const import (
     DEFAULT_TIER_CHECK_BATCH_SIZE,
     DEFAULT_TIER_CHECK_CPU_LIMIT,
     DEFAULT_TIER_CHECK_SLEEP_BETWEEN_BATCHES,
+    DEFAULT_TIER_CHECK_MOVER_WORKERS,
     DEFAULT_TIER_CHECK_WORKERS,
     DEFAULT_TIMELAPSE,
     DESC_CHECK_INTERVAL,
@@ -78,6 +82,7 @@ from viseron.components.storage.const import (
     DESC_CONTINUOUS,
     DESC_DOMAIN_TIERS,
     DESC_EVENTS,
+    DESC_EVENT_JOURNAL_FLUSH_INTERVAL,
     DESC_FACE_RECOGNITION,
     DESC_INTERVAL,
     DESC_LICENSE_PLATE_RECOGNITION,
@@ -107,6 +112,7 @@ from viseron.components.storage.const import (
     DESC_TIER_CHECK_BATCH_SIZE,
     DESC_TIER_CHECK_CPU_LIMIT,
     DESC_TIER_CHECK_SLEEP_BETWEEN_BATCHES,
+    DESC_TIER_CHECK_MOVER_WORKERS,
     DESC_TIER_CHECK_WORKERS,
     DESC_TIMELAPSE,
     DESC_TIMELAPSE_TIERS,
@@ -456,6 +462,11 @@ STORAGE_SCHEMA = vol.Schema(
             default=DEFAULT_TIER_CHECK_WORKERS,
             description=DESC_TIER_CHECK_WORKERS,
         ): Maybe(vol.All(vol.Coerce(int), vol.Range(min=1))),
+        vol.Optional(
+            CONFIG_TIER_CHECK_MOVER_WORKERS,
+            default=DEFAULT_TIER_CHECK_MOVER_WORKERS,
+            description=DESC_TIER_CHECK_MOVER_WORKERS,
+        ): vol.All(vol.Coerce(int), vol.Range(min=1)),
         vol.Optional(
             CONFIG_TIER_CHECK_BATCH_SIZE,
             default=DEFAULT_TIER_CHECK_BATCH_SIZE,
@@ -466,6 +477,11 @@ STORAGE_SCHEMA = vol.Schema(
             default=DEFAULT_TIER_CHECK_SLEEP_BETWEEN_BATCHES,
             description=DESC_TIER_CHECK_SLEEP_BETWEEN_BATCHES,
         ): Maybe(vol.Coerce(float)),
+        vol.Optional(
+            CONFIG_EVENT_JOURNAL_FLUSH_INTERVAL,
+            default=DEFAULT_EVENT_JOURNAL_FLUSH_INTERVAL,
+            description=DESC_EVENT_JOURNAL_FLUSH_INTERVAL,
+        ): vol.All(vol.Coerce(float), vol.Range(min=0.1)),
         vol.Optional(
             CONFIG_RECORDER,
             default=DEFAULT_RECORDER,
@@ -32,6 +32,21 @@ EVENT_FILE_CREATED = "file_created/{camera_identifier}/{category}/{subcategory}"
 EVENT_FILE_DELETED = "file_deleted/{camera_identifier}/{category}/{subcategory}"
 EVENT_CHECK_TIER = "check_tier/{camera_identifier}/{tier_id}/{category}/{subcategory}"
 
+# Seconds between flushes of buffered Files table writes
+FILES_WRITER_FLUSH_INTERVAL: Final = 1.0
+# Number of buffered paths that triggers an immediate flush
+FILES_WRITER_MAX_PENDING: Final = 500
+# Number of flushes a path that fails to be written is tried in before it is dropped
+FILES_WRITER_MAX_ATTEMPTS: Final = 3
+# Seconds before a tier index in the storage subprocess is reloaded from the database
+TIER_INDEX_RELOAD_INTERVAL: Final = 3600
+# Maximum number of events waiting to be written to the Events table
+EVENT_JOURNAL_MAX_QUEUE: Final = 10000
+# Number of events written to the Events table in one INSERT
+EVENT_JOURNAL_BATCH_SIZE: Final = 500
+# Number of flushes an event that fails to be written is tried in before it is dropped
+EVENT_JOURNAL_MAX_ATTEMPTS: Final = 3
+
 # Tier categories
 TIER_CATEGORY_RECORDER: Final = "recorder"
 TIER_CATEGORY_SNAPSHOTS: Final = "snapshots"
@@ -53,8 +68,10 @@ DESC_COMPONENT = "Storage configuration."
 DEFAULT_COMPONENT: dict[str, Any] = {}
 CONFIG_TIER_CHECK_CPU_LIMIT: Final = "tier_check_cpu_limit"
 CONFIG_TIER_CHECK_WORKERS: Final = "tier_check_workers"
+CONFIG_TIER_CHECK_MOVER_WORKERS: Final = "tier_check_mover_workers"
 CONFIG_TIER_CHECK_BATCH_SIZE: Final = "tier_check_batch_size"
 CONFIG_TIER_CHECK_SLEEP_BETWEEN_BATCHES: Final = "tier_check_sleep_between_batches"
+CONFIG_EVENT_JOURNAL_FLUSH_INTERVAL: Final = "event_journal_flush_interval"
 CONFIG_PATH: Final = "path"
 CONFIG_POLL: Final = "poll"
 CONFIG_MOVE_ON_SHUTDOWN: Final = "move_on_shutdown"
@@ -84,8 +101,10 @@ CONFIG_INTERVAL: Final = "interval"
 
 DEFAULT_TIER_CHECK_CPU_LIMIT: Final = 10
 DEFAULT_TIER_CHECK_WORKERS: Final = 4
+DEFAULT_TIER_CHECK_MOVER_WORKERS: Final = 2
 DEFAULT_TIER_CHECK_BATCH_SIZE: Final = 5
 DEFAULT_TIER_CHECK_SLEEP_BETWEEN_BATCHES: Final = 0.5
+DEFAULT_EVENT_JOURNAL_FLUSH_INTERVAL: Final = 1.0
 DEFAULT_RECORDER: dict[str, Any] = {}
 DEFAULT_RECORDER_TIERS = [
     {
@@ -147,6 +166,11 @@ DESC_TIER_CHECK_WORKERS = (
     "This can be used to speed up the tier check process by using multiple threads "
     "to check for files to move or delete."
 )
+DESC_TIER_CHECK_MOVER_WORKERS = (
+    "The number of files that are moved at the same time to each storage device. "
+    "Moves to a slow device, like a network share, do not hold back moves to other "
+    "devices."
+)
 DESC_TIER_CHECK_BATCH_SIZE = (
     "The number of files to move/delete in each batch. "
     "This can be used to limit the number of files moved/deleted at once, reducing "
@@ -156,6 +180,11 @@ DESC_TIER_CHECK_SLEEP_BETWEEN_BATCHES = (
     "The number of seconds to sleep between batches. "
     "This can be used to reduce the load on the system by sleeping between batches. "
 )
+DESC_EVENT_JOURNAL_FLUSH_INTERVAL = (
+    "The number of seconds between writes of dispatched events to the database. "
+    "Events are written in batches in the background, so a higher value reduces "
+    "the load on the database."
+)
 DESC_RECORDER = "Configuration for recordings."
 DESC_TYPE = (
     "<code>continuous</code>: Will save everything but highlight Events.<br>"
@@ -0,0 +1,234 @@
+"""Background writer for the Events table."""
+from __future__ import annotations
+
+import logging
+import queue
+import threading
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any
+
+from sqlalchemy import insert
+
+from viseron.components.storage.const import (
+    DEFAULT_EVENT_JOURNAL_FLUSH_INTERVAL,
+    EVENT_JOURNAL_BATCH_SIZE,
+    EVENT_JOURNAL_MAX_ATTEMPTS,
+    EVENT_JOURNAL_MAX_QUEUE,
+)
+from viseron.components.storage.models import Events
+from viseron.const import VISERON_SIGNAL_STOPPING
+from viseron.watchdog.thread_watchdog import RestartableThread
+
+if TYPE_CHECKING:
+    from viseron.components.storage import Storage
+    from viseron.events import Event, EventData
+
+LOGGER = logging.getLogger(__name__)
+
+
+@dataclass
+class EventJournalStatistics:
+    """Event journal statistics.
+
+    retrying is the number of events that failed to be written and are retried on
+    the next flush. failed counts events that could not be serialized, that failed
+    to be written EVENT_JOURNAL_MAX_ATTEMPTS times, or that failed to be written
+    when there was no room left to retry them.
+    """
+
+    queued: int
+    max_queued: int
+    written: int
+    dropped: int
+    failed: int
+    retrying: int
+
+
+class EventJournal:
+    """Write dispatched events to the Events table in the background.
+
+    Events are put in a bounded queue without blocking the dispatching thread.
+    A writer thread serializes them and inserts them in multi-row batches every
+    flush_interval seconds, or as soon as EVENT_JOURNAL_BATCH_SIZE events are
+    queued. If the queue is full the event is dropped. If a batch fails to be
+    written its rows are inserted one at a time, so that a single bad row does not
+    hold back the others. Rows that still fail are retried on the next flushes, up
+    to the size of the queue, and dropped after EVENT_JOURNAL_MAX_ATTEMPTS attempts.
+    """
+
+    def __init__(
+        self,
+        storage: Storage,
+        flush_interval: float = DEFAULT_EVENT_JOURNAL_FLUSH_INTERVAL,
+        max_queue: int = EVENT_JOURNAL_MAX_QUEUE,
+        batch_size: int = EVENT_JOURNAL_BATCH_SIZE,
+    ) -> None:
+        self._storage = storage
+        self._flush_interval = flush_interval
+        self._batch_size = batch_size
+
+        self._queue: queue.Queue[Event[EventData]] = queue.Queue(maxsize=max_queue)
+        # Rows that failed to be written along with the number of attempts made
+        self._retry_rows: list[tuple[dict[str, Any], int]] = []
+        self._flush_event = threading.Event()
+        self._flush_lock = threading.Lock()
+        self._kill_received = False
+
+        self._max_queued = 0
+        self._written = 0
+        self._dropped = 0
+        self._failed = 0
+        self._write_failed = 0
+
+        self._thread = RestartableThread(
+            target=self._run,
+            daemon=True,
+            name="storage.event_journal",
+            stage=VISERON_SIGNAL_STOPPING,
+        )
+        self._thread.start()
+
+    def put(self, event: Event[EventData]) -> None:
+        """Queue an event for insertion."""
+        try:
+            self._queue.put_nowait(event)
+        except queue.Full:
+            self._dropped += 1
+            if self._dropped % self._queue.maxsize == 1:
+                LOGGER.warning(
+                    "Event journal is not keeping up, "
+                    f"{self._dropped} events dropped in total"
+                )
+            return
+
+        queued = self._queue.qsize()
+        self._max_queued = max(self._max_queued, queued)
+        if queued >= self._batch_size:
+            self._flush_event.set()
+
+    def _run(self) -> None:
+        while not self._kill_received:
+            self._flush_event.wait(self._flush_interval)
+            self._flush_event.clear()
+            try:
+                self.flush()
+            except Exception as error:  # pylint: disable=broad-except
+                LOGGER.error("Failed to write events to database: %s", error)
+
+    def flush(self) -> None:
+        """Write the rows kept for retry and all queued events to the database.
+
+        The queue is always emptied, the last insert error is raised afterwards.
+        """
+        with self._flush_lock:
+            error: Exception | None = None
+            write_failed = self._write_failed
+            retry_rows, self._retry_rows = self._retry_rows, []
+            for start in range(0, len(retry_rows), self._batch_size):
+                error = (
+                    self._insert(retry_rows[start : start + self._batch_size])
+                    or error
+                )
+            while events := self._take(self._batch_size):
+                if rows := self._serialize(events):
+                    error = self._insert([(row, 0) for row in rows]) or error
+            if self._write_failed > write_failed:
+                LOGGER.warning(
+                    f"Dropped {self._write_failed - write_failed} events that failed "
+                    "to be written to the database"
+                )
+            if error:
+                raise error
+
+    def _insert(self, rows: list[tuple[dict[str, Any], int]]) -> Exception | None:
+        """Insert rows, falling back to one row at a time if the batch fails.
+
+        Rows that still fail are kept for the next flush. Returns the last error.
+        """
+        try:
+            self._execute([row for row, _attempts in rows])
+            return None
+        except Exception as error:  # pylint: disable=broad-except
+            if len(rows) == 1:
+                self._keep_for_retry(*rows[0])
+                return error
+
+        last_error = None
+        for row, attempts in rows:
+            try:
+                self._execute([row])
+            except Exception as error:  # pylint: disable=broad-except
+                self._keep_for_retry(row, attempts)
+                last_error = error
+        return last_error
+
+    def _execute(self, rows: list[dict[str, Any]]) -> None:
+        with self._storage.get_session() as session:
+            session.execute(insert(Events), rows)
+            session.commit()
+        self._written += len(rows)
+
+    def _keep_for_retry(self, row: dict[str, Any], attempts: int) -> None:
+        attempts += 1
+        if (
+            attempts >= EVENT_JOURNAL_MAX_ATTEMPTS
+            or len(self._retry_rows) >= self._queue.maxsize
+        ):
+            self._failed += 1
+            self._write_failed += 1
+            return
+        self._retry_rows.append((row, attempts))
+
+    def _take(self, count: int) -> list[Event[EventData]]:
+        events: list[Event[EventData]] = []
+        while len(events) < count:
+            try:
+                events.append(self._queue.get_nowait())
+            except queue.Empty:
+                break
+        return events
+
+    def _serialize(self, events: list[Event[EventData]]) -> list[dict[str, Any]]:
+        rows = []
+        for event in events:
+            event_data_json = "{}"
+            if event.data and event.data.json_serializable:
+                try:
+                    event_data_json = event.data_as_json()
+                except (TypeError, ValueError) as error:
+                    self._failed += 1
+                    LOGGER.warning(
+                        f"Failed to decode event {event.name} to JSON: {error}"
+                    )
+                    continue
+            rows.append({"name": event.name, "data": event_data_json})
+        return rows
+
+    @property
+    def statistics(self) -> EventJournalStatistics:
+        """Return event journal statistics."""
+        return EventJournalStatistics(
+            queued=self._queue.qsize(),
+            max_queued=self._max_queued,
+            written=self._written,
+            dropped=self._dropped,
+            failed=self._failed,
+            retrying=len(self._retry_rows),
+        )
+
+    def log_statistics(self) -> None:
+        """Log the event journal statistics at debug level."""
+        statistics = self.statistics
+        LOGGER.debug(
+            f"Event journal: {statistics.queued} queued, "
+            f"{statistics.max_queued} max queued, {statistics.written} written, "
+            f"{statistics.dropped} dropped, {statistics.failed} failed, "
+            f"{statistics.retrying} retrying"
+        )
+
+    def stop(self) -> None:
+        """Write the queued events and stop the writer thread."""
+        self._kill_received = True
+        self._flush_event.set()
+        self._thread.join()
+        self.flush()
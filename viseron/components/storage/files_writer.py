@@ -0,0 +1,375 @@
+"""Write-behind buffer for the Files table."""
+from __future__ import annotations
+
+import logging
+import os
+import threading
+from collections.abc import Callable
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Any
+
+from sqlalchemy import bindparam, delete, update
+from sqlalchemy.dialects.postgresql import insert
+
+from viseron.components.storage.const import (
+    FILES_WRITER_FLUSH_INTERVAL,
+    FILES_WRITER_MAX_ATTEMPTS,
+    FILES_WRITER_MAX_PENDING,
+)
+from viseron.components.storage.models import Files
+from viseron.components.storage.storage_subprocess import (
+    CreatedFile,
+    DataItemFilesChanged,
+)
+from viseron.components.storage.tier_index import IndexedFile
+from viseron.const import VISERON_SIGNAL_STOPPING
+from viseron.watchdog.thread_watchdog import RestartableThread
+
+if TYPE_CHECKING:
+    from viseron.components.storage import Storage
+    from viseron.components.storage.tier_handler import TierHandler
+
+LOGGER = logging.getLogger(__name__)
+
+
+@dataclass
+class PendingFile:
+    """Coalesced filesystem events for a single path.
+
+    deleted and created can both be set if a file was deleted and then created
+    again before the buffer was flushed. The old row is then deleted before the
+    new one is inserted.
+    """
+
+    handler: TierHandler
+    created: bool = False
+    deleted: bool = False
+    modified: bool = False
+    values: dict[str, Any] = field(default_factory=dict)
+    attempts: int = 0
+
+    def merge_older(self, older: PendingFile) -> None:
+        """Merge the events of older, which happened before the events of this."""
+        self.attempts = max(self.attempts, older.attempts)
+        if self.created or self.deleted:
+            # The older events are replaced, but a row that older deleted must
+            # still be deleted before a new one is inserted
+            self.deleted = self.deleted or older.deleted
+            return
+        self.created = older.created
+        self.deleted = older.deleted
+        self.values = older.values
+        self.modified = not self.created and (self.modified or older.modified)
+
+
+class FilesWriter:
+    """Buffer filesystem events and write them to the Files table in bulk.
+
+    Events are coalesced by path and flushed every FILES_WRITER_FLUSH_INTERVAL
+    seconds, or as soon as FILES_WRITER_MAX_PENDING paths are pending. If the
+    database write fails, each path is written on its own so that one bad row
+    does not hold back the others. The paths that still fail are put back and
+    retried on the next flush, and dropped after FILES_WRITER_MAX_ATTEMPTS tries.
+    Each flush uses one multi-row INSERT, one executemany UPDATE and one DELETE
+    with an IN-list, followed by a single tier check per affected tier handler.
+    The changes are also sent to the tier check worker to update its tier indexes.
+    """
+
+    def __init__(
+        self,
+        storage: Storage,
+        flush_interval: float = FILES_WRITER_FLUSH_INTERVAL,
+        max_pending: int = FILES_WRITER_MAX_PENDING,
+    ) -> None:
+        self._storage = storage
+        self._flush_interval = flush_interval
+        self._max_pending = max_pending
+
+        self._pending: dict[str, PendingFile] = {}
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._flush_event = threading.Event()
+        self._kill_received = False
+
+        self._thread = RestartableThread(
+            target=self._run,
+            daemon=True,
+            name="storage.files_writer",
+            stage=VISERON_SIGNAL_STOPPING,
+        )
+        self._thread.start()
+
+    def file_created(
+        self, handler: TierHandler, path: str, values: dict[str, Any]
+    ) -> None:
+        """Queue insertion of a file.
+
+        values holds the column values of the row, except size which is read when
+        the buffer is flushed.
+        """
+        with self._lock:
+            pending = self._pending.get(path)
+            if pending is None:
+                pending = self._pending[path] = PendingFile(handler)
+            pending.handler = handler
+            pending.created = True
+            pending.modified = False
+            pending.values = values
+        self._maybe_flush()
+
+    def file_modified(self, handler: TierHandler, path: str) -> None:
+        """Queue a size update of a file."""
+        with self._lock:
+            pending = self._pending.get(path)
+            if pending is None:
+                pending = self._pending[path] = PendingFile(handler)
+            # A pending insert reads the size at flush time anyway
+            if not pending.created:
+                pending.modified = True
+        self._maybe_flush()
+
+    def file_deleted(self, handler: TierHandler, path: str) -> None:
+        """Queue deletion of a file."""
+        with self._lock:
+            pending = self._pending.get(path)
+            if pending is None:
+                pending = self._pending[path] = PendingFile(handler)
+            pending.handler = handler
+            pending.created = False
+            pending.modified = False
+            pending.deleted = True
+            pending.values = {}
+        self._maybe_flush()
+
+    def _maybe_flush(self) -> None:
+        if len(self._pending) >= self._max_pending:
+            self._flush_event.set()
+
+    def _run(self) -> None:
+        while not self._kill_received:
+            self._flush_event.wait(self._flush_interval)
+            self._flush_event.clear()
+            try:
+                self.flush()
+            except Exception as error:  # pylint: disable=broad-except
+                LOGGER.error("Failed to write files to database: %s", error)
+
+    def flush(self) -> None:
+        """Write all pending events to the database."""
+        with self._flush_lock:
+            with self._lock:
+                pending, self._pending = self._pending, {}
+            if pending:
+                self._write(pending)
+
+    def _requeue(self, pending: dict[str, PendingFile]) -> None:
+        """Put back events that failed to be written, before any newer events."""
+        dropped: list[str] = []
+        with self._lock:
+            for path, item in pending.items():
+                item.attempts += 1
+                if item.attempts >= FILES_WRITER_MAX_ATTEMPTS:
+                    dropped.append(path)
+                elif (newer := self._pending.get(path)) is None:
+                    self._pending[path] = item
+                else:
+                    newer.merge_older(item)
+        if dropped:
+            LOGGER.error(
+                "Dropping %d files that failed to be written to database %d times: "
+                "%s",
+                len(dropped),
+                FILES_WRITER_MAX_ATTEMPTS,
+                dropped,
+            )
+
+    def _write(self, pending: dict[str, PendingFile]) -> None:
+        deleted, rows, sizes = self._collect(pending)
+        try:
+            inserted = self._execute(deleted, rows, sizes)
+        except Exception as error:
+            if len(pending) == 1:
+                self._requeue(pending)
+                raise
+            LOGGER.debug(
+                "Failed to write %d files, writing them one at a time: %s",
+                len(pending),
+                error,
+            )
+            self._write_separately(pending)
+            return
+        self._handle_written(pending, deleted, rows, inserted, sizes)
+
+    def _write_separately(self, pending: dict[str, PendingFile]) -> None:
+        """Write each path in its own transaction to isolate failing rows."""
+        deleted: list[str] = []
+        rows: list[dict[str, Any]] = []
+        sizes: list[dict[str, Any]] = []
+        inserted: dict[str, int] = {}
+        failed: dict[str, PendingFile] = {}
+        last_error: Exception | None = None
+        for path, item in pending.items():
+            item_deleted, item_rows, item_sizes = self._collect({path: item})
+            try:
+                inserted.update(self._execute(item_deleted, item_rows, item_sizes))
+            except Exception as error:  # pylint: disable=broad-except
+                failed[path] = item
+                last_error = error
+                continue
+            deleted += item_deleted
+            rows += item_rows
+            sizes += item_sizes
+
+        if failed:
+            self._requeue(failed)
+        self._handle_written(
+            {path: item for path, item in pending.items() if path not in failed},
+            deleted,
+            rows,
+            inserted,
+            sizes,
+        )
+        if last_error is not None:
+            raise last_error
+
+    @staticmethod
+    def _collect(
+        pending: dict[str, PendingFile]
+    ) -> tuple[list[str], list[dict[str, Any]], list[dict[str, Any]]]:
+        """Return the paths to delete, the rows to insert and the sizes to update."""
+        deleted: list[str] = []
+        rows: list[dict[str, Any]] = []
+        sizes: list[dict[str, Any]] = []
+        for path, item in pending.items():
+            if item.deleted:
+                deleted.append(path)
+            if item.created:
+                try:
+                    size = os.path.getsize(path)
+                except FileNotFoundError:
+                    LOGGER.debug("File not found: %s", path)
+                    continue
+                rows.append({**item.values, "path": path, "size": size})
+            elif item.modified:
+                try:
+                    sizes.append({"b_path": path, "b_size": os.path.getsize(path)})
+                except FileNotFoundError:
+                    LOGGER.debug("File not found: %s", path)
+        return deleted, rows, sizes
+
+    def _execute(
+        self,
+        deleted: list[str],
+        rows: list[dict[str, Any]],
+        sizes: list[dict[str, Any]],
+    ) -> dict[str, int]:
+        """Write the changes in one transaction and return the inserted ids."""
+        inserted: dict[str, int] = {}
+        if not deleted and not rows and not sizes:
+            return inserted
+        with self._storage.get_session() as session:
+            if deleted:
+                session.execute(delete(Files).where(Files.path.in_(deleted)))
+            if rows:
+                stmt = (
+                    insert(Files)
+                    .values(rows)
+                    .on_conflict_do_nothing(index_elements=[Files.path])
+                    .returning(Files.path, Files.id)
+                )
+                inserted = dict(session.execute(stmt).tuples().all())
+            if sizes:
+                session.connection().execute(
+                    update(Files)
+                    .where(Files.path == bindparam("b_path"))
+                    .values(size=bindparam("b_size")),
+                    sizes,
+                )
+            session.commit()
+        return inserted
+
+    def _handle_written(
+        self,
+        pending: dict[str, PendingFile],
+        deleted: list[str],
+        rows: list[dict[str, Any]],
+        inserted: dict[str, int],
+        sizes: list[dict[str, Any]],
+    ) -> None:
+        """Notify the tier check worker and tier handlers of written changes."""
+        for row in rows:
+            if row["path"] not in inserted:
+                LOGGER.error(
+                    "Failed to insert file %s into database, already exists",
+                    row["path"],
+                )
+        self._send_changes(rows, inserted, sizes, deleted)
+
+        deleted_by_handler: dict[TierHandler, list[str]] = {}
+        for path in deleted:
+            deleted_by_handler.setdefault(pending[path].handler, []).append(path)
+        created_by_handler: dict[TierHandler, list[str]] = {}
+        for path in (row["path"] for row in rows if row["path"] in inserted):
+            created_by_handler.setdefault(pending[path].handler, []).append(path)
+        check_tier: dict[TierHandler, None] = dict.fromkeys(created_by_handler)
+        check_tier.update(
+            (item.handler, None) for item in pending.values() if item.modified
+        )
+
+        for handler, paths in deleted_by_handler.items():
+            self._run_handler(handler.files_deleted, paths)
+        for handler, paths in created_by_handler.items():
+            self._run_handler(handler.files_created, paths)
+        for handler in check_tier:
+            self._run_handler(handler.check_tier)
+
+    def _send_changes(
+        self,
+        rows: list[dict[str, Any]],
+        inserted: dict[str, int],
+        sizes: list[dict[str, Any]],
+        deleted: list[str],
+    ) -> None:
+        """Send the changes to the tier indexes of the tier check worker."""
+        created = [
+            CreatedFile(
+                camera_identifier=row["camera_identifier"],
+                tier_id=row["tier_id"],
+                category=row["category"],
+                subcategory=row["subcategory"],
+                file=IndexedFile(
+                    inserted[row["path"]],
+                    row["size"],
+                    int(row["orig_ctime"].timestamp()),
+                    row["path"],
+                    row["tier_path"],
+                ),
+            )
+            for row in rows
+            if row["path"] in inserted
+        ]
+        modified = [(size["b_path"], size["b_size"]) for size in sizes]
+        if not created and not modified and not deleted:
+            return
+        self._storage.tier_check_worker_send_command(
+            DataItemFilesChanged(
+                cmd="files_changed",
+                created=created,
+                modified=modified,
+                deleted=deleted,
+            )
+        )
+
+    @staticmethod
+    def _run_handler(target: Callable[..., None], *args: Any) -> None:
+        try:
+            target(*args)
+        except Exception as error:  # pylint: disable=broad-except
+            LOGGER.error("Failed to handle written files: %s", error)
+
+    def stop(self) -> None:
+        """Flush pending events and stop the writer thread."""
+        self._kill_received = True
+        self._flush_event.set()
+        self._thread.join()
+        self.flush()
@@ -8,6 +8,7 @@ import os
 import threading
 import time
 from abc import ABC, abstractmethod
+from collections.abc import Callable, Iterator
 from typing import TYPE_CHECKING
 
 import setproctitle
@@ -37,6 +38,8 @@ from viseron.watchdog.process_watchdog import RestartableProcess
 from viseron.watchdog.thread_watchdog import RestartableThread
 
 if TYPE_CHECKING:
+    from sqlalchemy.orm import Session
+
     from viseron import Viseron
     from viseron.components.storage import Storage
     from viseron.domains.camera import AbstractCamera
@@ -45,6 +48,15 @@ LOGGER = logging.getLogger(__name__)
 
 BATCH_SIZE = 100
 
+# Number of files on disk that are compared against the Files table in one query
+ORPHANED_FILES_CHUNK_SIZE = 1000
+# Filesystem operations (directory entries and removals) per second
+ORPHANED_FILES_IO_BUDGET = 2000
+# Database queries per second
+ORPHANED_FILES_DB_BUDGET = 5
+# Files modified more recently than this might not be written to the database yet
+ORPHANED_FILES_MIN_AGE = 300
+
 
 class BaseCleanupJob(ABC):
     """Base class for cleanup jobs."""
@@ -114,6 +126,27 @@ class BaseCleanupJob(ABC):
             self._last_log_time = now
 
 
+class OperationBudget:
+    """Limit the rate of operations of a cleanup job.
+
+    Operations are spent freely until the average rate since the start exceeds
+    the budget, at which point spend() sleeps until it is back within budget.
+    """
+
+    def __init__(self, per_second: float, wait: Callable[[float], object]) -> None:
+        self._per_second = per_second
+        self._wait = wait
+        self._start = time.monotonic()
+        self._spent = 0.0
+
+    def spend(self, amount: float = 1) -> None:
+        """Spend operations, sleeping if the budget is exceeded."""
+        self._spent += amount
+        allowed = (time.monotonic() - self._start) * self._per_second
+        if self._spent > allowed:
+            self._wait((self._spent - allowed) / self._per_second)
+
+
 class BaseTableCleanupJob(BaseCleanupJob):
     """Base class for database table cleanup jobs that use batch processing."""
 
@@ -179,7 +212,10 @@ class OrphanedFilesCleanup(BaseCleanupJob):
     """Cleanup job that removes files with no corresponding database records.
 
     Walks through recordings, segments and snapshots directories to find and delete
-    any files that don't have a matching record in the Files table.
+    any files that don't have a matching record in the Files table. Directory
+    listings are streamed in chunks, and each chunk is checked against the Files
+    table with a single query. Files modified in the last ORPHANED_FILES_MIN_AGE
+    seconds are skipped since they might not have been written to the database yet.
     """
 
     @property
@@ -211,43 +247,34 @@ class OrphanedFilesCleanup(BaseCleanupJob):
                     camera, domain, all_tiers=True
                 )
 
+        # Sleeping is done with kill_event.wait to not delay shutdown
+        io_budget = OperationBudget(ORPHANED_FILES_IO_BUDGET, self.kill_event.wait)
+        db_budget = OperationBudget(ORPHANED_FILES_DB_BUDGET, self.kill_event.wait)
         total_files_processed = 0
+        chunk: list[os.DirEntry] = []
         with self._storage.get_session() as session:
             for path in paths:
                 if self.kill_event.is_set():
                     break
                 LOGGER.debug("%s checking %s", self.name, path)
-                for root, _, files in os.walk(path):
-                    if self.kill_event.is_set():
-                        break
-
-                    files_processed = 0
-                    for file in files:
-                        if self.kill_event.is_set():
-                            break
-
-                        total_files_processed += 1
-                        files_processed += 1
-                        if file in self._storage.ignored_files:
-                            continue
-                        file_path = os.path.join(root, file)
-                        file_exists = session.execute(
-                            select(Files).where(Files.path == file_path)
-                        ).first()
-                        if not file_exists and os.path.exists(file_path):
-                            os.remove(file_path)
-                            LOGGER.debug("%s deleted %s", self.name, file_path)
-                            deleted_count += 1
-                        self.log_progress(
-                            f"{self.name} processed {files_processed}/{len(files)} "
-                            f"files in {root}",
-                        )
-                        if total_files_processed % 100 == 0:
-                            time.sleep(1)
-                    LOGGER.debug(
-                        f"{self.name} processed {files_processed}/{len(files)} "
-                        f"files in {root}",
+                for entry in self._scan_files(path, io_budget):
+                    chunk.append(entry)
+                    if len(chunk) < ORPHANED_FILES_CHUNK_SIZE:
+                        continue
+                    deleted_count += self._delete_orphaned(
+                        session, chunk, io_budget, db_budget
                     )
+                    total_files_processed += len(chunk)
+                    chunk = []
+                    self.log_progress(
+                        f"{self.name} processed {total_files_processed} files"
+                    )
+
+            if chunk and not self.kill_event.is_set():
+                deleted_count += self._delete_orphaned(
+                    session, chunk, io_budget, db_budget
+                )
+                total_files_processed += len(chunk)
 
         LOGGER.debug(
             "%s deleted %d/%d processed files, took %s",
@@ -257,6 +284,56 @@ class OrphanedFilesCleanup(BaseCleanupJob):
             time.time() - now,
         )
 
+    def _scan_files(
+        self, path: str, io_budget: OperationBudget
+    ) -> Iterator[os.DirEntry]:
+        """Yield all files below path, streaming the directory listings."""
+        directories = [path]
+        while directories and not self.kill_event.is_set():
+            try:
+                with os.scandir(directories.pop()) as entries:
+                    for entry in entries:
+                        io_budget.spend()
+                        if entry.is_dir(follow_symlinks=False):
+                            directories.append(entry.path)
+                        elif entry.name not in self._storage.ignored_files:
+                            yield entry
+            except FileNotFoundError:
+                continue
+
+    def _delete_orphaned(
+        self,
+        session: Session,
+        entries: list[os.DirEntry],
+        io_budget: OperationBudget,
+        db_budget: OperationBudget,
+    ) -> int:
+        """Delete the files in entries that have no row in the Files table."""
+        db_budget.spend()
+        known_paths = set(
+            session.execute(
+                select(Files.path).where(
+                    Files.path.in_([entry.path for entry in entries])
+                )
+            ).scalars()
+        )
+
+        cutoff = time.time() - ORPHANED_FILES_MIN_AGE
+        deleted_count = 0
+        for entry in entries:
+            if entry.path in known_paths:
+                continue
+            try:
+                if entry.stat().st_mtime > cutoff:
+                    continue
+                os.remove(entry.path)
+            except FileNotFoundError:
+                continue
+            io_budget.spend()
+            LOGGER.debug("%s deleted %s", self.name, entry.path)
+            deleted_count += 1
+        return deleted_count
+
 
 class OrphanedDatabaseFilesCleanup(BaseCleanupJob):
     """Cleanup job that removes rows from Files with no corresponding files on disk."""
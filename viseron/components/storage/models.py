@@ -9,6 +9,7 @@ from enum import Enum
 from typing import Literal
 
 from sqlalchemy import (
+    DDL,
     ColumnElement,
     DateTime,
     Float,
@@ -17,6 +18,8 @@ from sqlalchemy import (
     Label,
     LargeBinary,
     String,
+    UniqueConstraint,
+    event,
     text,
     types,
 )
@@ -109,6 +112,7 @@ class Files(Base):
     __table_args__ = (
         Index("idx_files_path", "path"),
         Index("idx_files_camera_id", "camera_identifier"),
+        Index("idx_files_camera_filename", "camera_identifier", "filename"),
         Index(
             "idx_files_tier_lookup",
             "camera_identifier",
@@ -140,6 +144,128 @@ class Files(Base):
     )
 
 
+class Segments(Base):
+    """Database model for the segment timeline.
+
+    Holds one row per recorder segment, pointing to the latest tier copy of the
+    file. The table is maintained by the triggers in SEGMENTS_TRIGGERS_DDL, which
+    keeps it consistent no matter which process inserts or deletes the files.
+    """
+
+    __tablename__ = "segments"
+
+    __table_args__ = (
+        UniqueConstraint(
+            "camera_identifier", "filename", name="uq_segments_camera_filename"
+        ),
+        Index("idx_segments_camera_time", "camera_identifier", "orig_ctime"),
+        Index("idx_segments_file_id", "file_id"),
+    )
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
+    file_id: Mapped[int] = mapped_column(Integer)
+    camera_identifier: Mapped[str] = mapped_column(String)
+    tier_id: Mapped[int] = mapped_column(Integer)
+    path: Mapped[str] = mapped_column(String)
+    filename: Mapped[str] = mapped_column(String)
+    duration: Mapped[float] = mapped_column(Float)
+    orig_ctime: Mapped[datetime.datetime] = mapped_column(
+        UTCDateTime(timezone=False), nullable=False
+    )
+    end_time: Mapped[datetime.datetime] = mapped_column(
+        UTCDateTime(timezone=False), nullable=False
+    )
+    created_at: Mapped[datetime.datetime] = mapped_column(
+        UTCDateTime(timezone=False), nullable=True
+    )
+
+
+_SEGMENTS_COLUMNS = (
+    "file_id, camera_identifier, tier_id, path, filename, duration, orig_ctime, "
+    "end_time, created_at"
+)
+_SEGMENTS_VALUES = (
+    "f.id, f.camera_identifier, f.tier_id, f.path, f.filename, f.duration, "
+    "f.orig_ctime, f.orig_ctime + make_interval(secs => f.duration), f.created_at"
+)
+_SEGMENTS_FILTER = (
+    "f.category = 'recorder' AND f.subcategory = 'segments' "
+    "AND f.duration IS NOT NULL"
+)
+_SEGMENTS_LATEST_FIRST = (
+    "ORDER BY f.camera_identifier, f.filename, f.created_at DESC NULLS LAST"
+)
+
+# Statement level triggers with transition tables, so that bulk inserts and
+# deletes of files update the timeline with one statement each.
+SEGMENTS_TRIGGERS_DDL = (
+    f"""
+CREATE OR REPLACE FUNCTION segments_files_inserted() RETURNS trigger AS $$
+BEGIN
+    INSERT INTO segments ({_SEGMENTS_COLUMNS})
+    SELECT DISTINCT ON (f.camera_identifier, f.filename) {_SEGMENTS_VALUES}
+    FROM inserted_files f
+    WHERE {_SEGMENTS_FILTER}
+    {_SEGMENTS_LATEST_FIRST}
+    ON CONFLICT (camera_identifier, filename) DO UPDATE SET
+        file_id = EXCLUDED.file_id,
+        tier_id = EXCLUDED.tier_id,
+        path = EXCLUDED.path,
+        duration = EXCLUDED.duration,
+        orig_ctime = EXCLUDED.orig_ctime,
+        end_time = EXCLUDED.end_time,
+        created_at = EXCLUDED.created_at
+    WHERE COALESCE(EXCLUDED.created_at, '-infinity')
+        >= COALESCE(segments.created_at, '-infinity');
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql
+""",
+    f"""
+CREATE OR REPLACE FUNCTION segments_files_deleted() RETURNS trigger AS $$
+BEGIN
+    WITH removed AS (
+        DELETE FROM segments s
+        USING deleted_files d
+        WHERE s.file_id = d.id
+        RETURNING s.camera_identifier, s.filename
+    )
+    INSERT INTO segments ({_SEGMENTS_COLUMNS})
+    SELECT DISTINCT ON (f.camera_identifier, f.filename) {_SEGMENTS_VALUES}
+    FROM files f
+    JOIN removed r
+        ON r.camera_identifier = f.camera_identifier AND r.filename = f.filename
+    WHERE {_SEGMENTS_FILTER}
+    {_SEGMENTS_LATEST_FIRST}
+    ON CONFLICT (camera_identifier, filename) DO NOTHING;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql
+""",
+    "DROP TRIGGER IF EXISTS segments_files_inserted ON files",
+    """
+CREATE TRIGGER segments_files_inserted
+    AFTER INSERT ON files
+    REFERENCING NEW TABLE AS inserted_files
+    FOR EACH STATEMENT EXECUTE FUNCTION segments_files_inserted()
+""",
+    "DROP TRIGGER IF EXISTS segments_files_deleted ON files",
+    """
+CREATE TRIGGER segments_files_deleted
+    AFTER DELETE ON files
+    REFERENCING OLD TABLE AS deleted_files
+    FOR EACH STATEMENT EXECUTE FUNCTION segments_files_deleted()
+""",
+)
+
+for _statement in SEGMENTS_TRIGGERS_DDL:
+    event.listen(
+        Segments.__table__,  # type: ignore[attr-defined]
+        "after_create",
+        DDL(_statement),
+    )
+
+
 @dataclass
 class FilesMeta:
     """Files meta dataclass.
@@ -5,19 +5,84 @@ import datetime
 import logging
 from collections.abc import Callable
 
-from sqlalchemy import and_, desc, func, or_, select
+from sqlalchemy import ColumnElement, Integer, Select, and_, func, or_, select
 from sqlalchemy.orm import Session
-from sqlalchemy.sql.functions import coalesce
 
-from viseron.components.storage.const import (
-    TIER_CATEGORY_RECORDER,
-    TIER_SUBCATEGORY_SEGMENTS,
-)
-from viseron.components.storage.models import Files, Recordings
+from viseron.components.storage.models import Recordings, Segments
 from viseron.helpers import utcnow
 
 LOGGER = logging.getLogger(__name__)
 
+_FRAGMENT_COLUMNS = (
+    Segments.file_id.label("id"),
+    Segments.tier_id,
+    Segments.camera_identifier,
+    Segments.path,
+    Segments.filename,
+    Segments.duration,
+    Segments.orig_ctime,
+    Segments.end_time,
+    Segments.created_at,
+)
+
+
+def _segments_in_period(
+    camera_identifiers: list[str],
+    start: datetime.datetime,
+    end: datetime.datetime,
+) -> ColumnElement[bool]:
+    """Return a filter for the segments that overlap the time period.
+
+    Segments of a camera do not overlap, so the only segment that can start
+    before the period and still end within it is the last one that starts before
+    it. Both parts are range scans on idx_segments_camera_time.
+    """
+    previous_segments = [
+        select(Segments.id)
+        .where(Segments.camera_identifier == camera_identifier)
+        .where(Segments.orig_ctime < start)
+        .order_by(Segments.orig_ctime.desc())
+        .limit(1)
+        .scalar_subquery()
+        for camera_identifier in camera_identifiers
+    ]
+    return or_(
+        and_(
+            Segments.camera_identifier.in_(camera_identifiers),
+            Segments.orig_ctime.between(start, end),
+        ),
+        and_(
+            Segments.id.in_(previous_segments),
+            Segments.end_time >= start,
+        ),
+    )
+
+
+def _select_fragments(
+    camera_identifiers: list[str],
+    start: datetime.datetime,
+    end: datetime.datetime,
+) -> Select:
+    """Return a select statement for the segments of the time period."""
+    return (
+        select(*_FRAGMENT_COLUMNS)
+        .where(_segments_in_period(camera_identifiers, start, end))
+        .order_by(Segments.orig_ctime.asc())
+    )
+
+
+def _time_period(
+    start_timestamp: int | float,
+    end_timestamp: int | float | None,
+    now: datetime.datetime | None,
+) -> tuple[datetime.datetime, datetime.datetime]:
+    start = datetime.datetime.fromtimestamp(start_timestamp, tz=datetime.timezone.utc)
+    if end_timestamp:
+        end = datetime.datetime.fromtimestamp(end_timestamp, tz=datetime.timezone.utc)
+    else:
+        end = now if now else utcnow()
+    return start, end
+
 
 def get_recording_fragments(
     recording_id,
@@ -32,58 +97,25 @@ def get_recording_fragments(
     it has been recorded. The orig_ctime is the timestamp of the original mp4 file
     and is therefore accurate.
 
-    Only the latest occurrence of each file is selected using the CTE row_number.
+    The segments timeline only holds the latest occurrence of each file.
     This is to accommodate for the case where a file has been copied to a succeeding
     tier but has not been deleted from the original tier yet.
     """
-    row_number = (
-        func.row_number()
-        .over(partition_by=Files.filename, order_by=desc(Files.created_at))
-        .label("row_number")
-    )
-    recording_files = (
-        select(Files)
-        .add_columns(row_number)
-        .join(Recordings, Files.camera_identifier == Recordings.camera_identifier)
-        .where(Recordings.id == recording_id)
-        .where(Files.category == TIER_CATEGORY_RECORDER)
-        .where(Files.subcategory == TIER_SUBCATEGORY_SEGMENTS)
-        .where(Files.duration.isnot(None))
-        .where(
-            or_(
-                # Fetch all files that start within the recording
-                Files.orig_ctime.between(
-                    Recordings.start_time - datetime.timedelta(seconds=lookback),
-                    coalesce(Recordings.end_time, now if now else utcnow()),
-                ),
-                # Fetch the first file that starts before the recording but
-                # ends during the recording
-                and_(
-                    Recordings.start_time - datetime.timedelta(seconds=lookback)
-                    >= Files.orig_ctime,
-                    Recordings.start_time - datetime.timedelta(seconds=lookback)
-                    <= Files.orig_ctime
-                    + func.make_interval(
-                        0,  # years
-                        0,  # months
-                        0,  # days
-                        0,  # hours
-                        0,  # minutes
-                        0,  # seconds
-                        func.round(Files.duration),
-                    ),
-                ),
-            )
-        )
-        .order_by(Files.orig_ctime.asc())
-        .cte("recording_files")
-    )
-    stmt = (
-        select(recording_files)
-        .where(recording_files.c.row_number == 1)
-        .order_by(recording_files.c.orig_ctime.asc())
-    )
     with get_session() as session:
+        recording = session.execute(
+            select(
+                Recordings.camera_identifier,
+                Recordings.start_time,
+                Recordings.end_time,
+            ).where(Recordings.id == recording_id)
+        ).first()
+        if recording is None:
+            return []
+        stmt = _select_fragments(
+            [recording.camera_identifier],
+            recording.start_time - datetime.timedelta(seconds=lookback),
+            recording.end_time or (now if now else utcnow()),
+        )
         fragments = session.execute(stmt).all()
     return fragments
 
@@ -96,54 +128,77 @@ def get_time_period_fragments(
     now=None,
 ):
     """Return a list of files for the requested time period."""
-    start = datetime.datetime.fromtimestamp(start_timestamp, tz=datetime.timezone.utc)
-    if end_timestamp:
-        end = datetime.datetime.fromtimestamp(end_timestamp, tz=datetime.timezone.utc)
-    else:
-        end = now if now else utcnow()
+    start, end = _time_period(start_timestamp, end_timestamp, now)
+    with get_session() as session:
+        fragments = session.execute(
+            _select_fragments(camera_identifiers, start, end)
+        ).all()
+    return fragments
+
 
-    row_number = (
-        func.row_number()
-        .over(partition_by=Files.filename, order_by=desc(Files.created_at))
-        .label("row_number")
+def get_time_period_runs(
+    camera_identifiers: list[str],
+    start_timestamp: int | float,
+    end_timestamp: int | float | None,
+    get_session: Callable[[], Session],
+    now=None,
+):
+    """Return the contiguous runs of segments for the requested time period.
+
+    A segment starts a new run if it starts later than the end of the previous
+    segment plus its own duration. The runs are computed by the database in the
+    same range scan as the segments, so only one row per run is returned.
+    """
+    start, end = _time_period(start_timestamp, end_timestamp, now)
+    order_by = (Segments.orig_ctime, Segments.id)
+    previous_end = func.lag(Segments.end_time).over(order_by=order_by)
+    segments = (
+        select(
+            Segments.id,
+            Segments.orig_ctime,
+            Segments.end_time,
+            func.coalesce(
+                (
+                    Segments.orig_ctime
+                    > previous_end + (Segments.end_time - Segments.orig_ctime)
+                ).cast(Integer),
+                0,
+            ).label("new_run"),
+        )
+        .where(_segments_in_period(camera_identifiers, start, end))
+        .subquery("segments_in_period")
     )
-    files = (
-        select(Files)
-        .add_columns(row_number)
-        .where(Files.camera_identifier.in_(camera_identifiers))
-        .where(Files.category == TIER_CATEGORY_RECORDER)
-        .where(Files.subcategory == TIER_SUBCATEGORY_SEGMENTS)
-        .where(Files.duration.isnot(None))
-        .where(
-            or_(
-                # Fetch all files that start within the recording
-                Files.orig_ctime.between(
-                    start,
-                    end,
-                ),
-                # Fetch the first file that starts before the recording but
-                # ends during the recording
-                and_(
-                    start >= Files.orig_ctime,
-                    start
-                    <= Files.orig_ctime
-                    + func.make_interval(
-                        0,  # years
-                        0,  # months
-                        0,  # days
-                        0,  # hours
-                        0,  # minutes
-                        0,  # seconds
-                        func.round(Files.duration),
-                    ),
-                ),
-            )
+    numbered = select(
+        segments.c.orig_ctime,
+        segments.c.end_time,
+        func.sum(segments.c.new_run)
+        .over(order_by=(segments.c.orig_ctime, segments.c.id))
+        .label("run"),
+    ).subquery("numbered_segments")
+    stmt = (
+        select(
+            func.min(numbered.c.orig_ctime).label("start"),
+            func.max(numbered.c.end_time).label("end"),
         )
-        .order_by(Files.orig_ctime.asc())
-        .cte("files")
+        .group_by(numbered.c.run)
+        .order_by(numbered.c.run)
     )
+    with get_session() as session:
+        runs = session.execute(stmt).all()
+    return runs
+
+
+def get_segment_fragments(
+    camera_identifier: str,
+    filenames: list[str],
+    get_session: Callable[[], Session],
+):
+    """Return the latest tier copy of the given segments."""
     stmt = (
-        select(files).where(files.c.row_number == 1).order_by(files.c.orig_ctime.asc())
+        select(*_FRAGMENT_COLUMNS)
+        .where(Segments.camera_identifier == camera_identifier)
+        .where(Segments.filename.in_(filenames))
+        .order_by(Segments.orig_ctime.asc())
     )
     with get_session() as session:
         fragments = session.execute(stmt).all()
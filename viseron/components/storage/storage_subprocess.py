@@ -5,10 +5,13 @@ import argparse
 import datetime
 import logging
 import multiprocessing as mp
+import os
 import sys
+import threading
 import time
 from collections.abc import Callable
-from dataclasses import dataclass
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, replace
 from queue import Empty, Queue
 from typing import TYPE_CHECKING, Literal
 
@@ -18,6 +21,8 @@ from apscheduler.schedulers.background import BackgroundScheduler
 
 from manager import connect
 from viseron.components.storage.check_tier import Worker
+from viseron.components.storage.tier_index import IndexedFile
+from viseron.const import STATISTICS_LOG_INTERVAL
 from viseron.helpers.subprocess_worker import SubProcessWorker
 from viseron.watchdog.subprocess_watchdog import RestartablePopen
 from viseron.watchdog.thread_watchdog import RestartableThread, ThreadWatchDog
@@ -27,6 +32,9 @@ if TYPE_CHECKING:
 
 LOGGER = logging.getLogger(__name__)
 
+# Number of moves that can be queued per mover worker of a destination device
+MOVER_QUEUED_PER_WORKER = 8
+
 
 @dataclass
 class DataItem:
@@ -83,12 +91,41 @@ class DataItemDeleteFile:
     error: str | None = None
 
 
+@dataclass
+class CreatedFile:
+    """A file inserted into the Files table."""
+
+    camera_identifier: str
+    tier_id: int
+    category: str
+    subcategory: str
+    file: IndexedFile
+
+
+@dataclass
+class DataItemFilesChanged:
+    """Data item with the Files table changes of a files writer flush.
+
+    Used to keep the tier indexes of the worker up to date.
+    """
+
+    cmd: Literal["files_changed"]
+    created: list[CreatedFile]
+    modified: list[tuple[str, int]]
+    deleted: list[str]
+    callback_id: str | None = None
+    error: str | None = None
+
+
 class TierCheckWorker(SubProcessWorker):
     """Check tiers in a separate subprocess."""
 
-    def __init__(self, vis: Viseron, cpulimit: int | None, workers: int) -> None:
+    def __init__(
+        self, vis: Viseron, cpulimit: int | None, workers: int, mover_workers: int
+    ) -> None:
         self._cpulimit = cpulimit
         self._workers = workers
+        self._mover_workers = mover_workers
         self._callbacks: dict[
             str, Callable[[DataItem | DataItemMoveFile | DataItemDeleteFile], None]
         ] = {}
@@ -103,6 +140,7 @@ class TierCheckWorker(SubProcessWorker):
                 f"--manager-authkey {self._authkey_store.authkey} "
                 f"--cpulimit {self._cpulimit} "
                 f"--workers {self._workers} "
+                f"--mover-workers {self._mover_workers} "
                 f"--loglevel DEBUG"
             ).split(" "),
             name=self.subprocess_name,
@@ -112,7 +150,7 @@ class TierCheckWorker(SubProcessWorker):
 
     def send_command(
         self,
-        item: DataItem | DataItemMoveFile | DataItemDeleteFile,
+        item: DataItem | DataItemMoveFile | DataItemDeleteFile | DataItemFilesChanged,
         callback: Callable[[DataItem | DataItemMoveFile | DataItemDeleteFile], None]
         | None,
     ):
@@ -169,6 +207,12 @@ def get_parser() -> argparse.ArgumentParser:
         type=int,
         default=4,
     )
+    parser.add_argument(
+        "--mover-workers",
+        help="Number of concurrent file moves per destination device",
+        type=int,
+        default=2,
+    )
     parser.add_argument(
         "--loglevel",
         help="Loglevel",
@@ -212,6 +256,25 @@ def worker_task_files(
             LOGGER.exception(f"Error in file worker thread: {exc}")
 
 
+def worker_task_tier_index(
+    worker: Worker,
+    index_queue: Queue[DataItemFilesChanged],
+):
+    """Worker thread that applies files writer deltas to the tier indexes.
+
+    A single thread is used so that the deltas are applied in the order they were
+    written to the database.
+    """
+    while True:
+        try:
+            job = index_queue.get(timeout=1)
+            worker.work_input(job)
+        except Empty:
+            continue
+        except Exception as exc:  # pylint: disable=broad-except
+            LOGGER.exception(f"Error in tier index worker thread: {exc}")
+
+
 def worker_task_mixed(
     worker: Worker,
     check_queue: Queue[DataItem],
@@ -238,15 +301,149 @@ def worker_task_mixed(
             LOGGER.exception(f"Error in mixed worker thread {name}: {exc}")
 
 
+@dataclass
+class MoverStats:
+    """Throughput of the moves to a destination device.
+
+    queued includes the moves in flight. skipped counts moves that were not queued
+    since the file was already queued or the queue of the device was full.
+    """
+
+    files: int = 0
+    bytes: int = 0
+    seconds: float = 0.0
+    queued: int = 0
+    in_flight: int = 0
+    skipped: int = 0
+
+
+def get_device(path: str) -> int:
+    """Return the device of path, or of its closest existing parent."""
+    while True:
+        try:
+            return os.stat(path).st_dev
+        except FileNotFoundError:
+            parent = os.path.dirname(path)
+            if parent == path:
+                raise
+            path = parent
+
+
+class FileMover:
+    """Move files concurrently, with a bounded number of moves per device.
+
+    Each destination device gets its own thread pool, so a slow tier like a NAS
+    only limits the moves to that tier, while moves to other devices continue.
+    At most max_in_flight * MOVER_QUEUED_PER_WORKER moves are queued per device.
+    """
+
+    def __init__(
+        self,
+        worker: Worker,
+        output_queue: Queue[DataItem | DataItemDeleteFile | DataItemMoveFile],
+        max_in_flight: int,
+    ) -> None:
+        self._worker = worker
+        self._output_queue = output_queue
+        self._max_in_flight = max_in_flight
+        self._max_queued = max_in_flight * MOVER_QUEUED_PER_WORKER
+        self._executors: dict[int, ThreadPoolExecutor] = {}
+        self._stats: dict[int, MoverStats] = {}
+        self._queued_files: set[str] = set()
+        self._lock = threading.Lock()
+
+    def submit(self, job: DataItemMoveFile) -> None:
+        """Queue a move on the executor of the destination device.
+
+        The move is skipped and reported back as done if the file is already queued
+        or if the queue of the device is full. The file is then still in its current
+        tier, so the next tier check queues it again.
+        """
+        try:
+            device = get_device(os.path.dirname(job.dst))
+        except OSError as error:
+            LOGGER.error("Failed to find device of %s: %s", job.dst, error)
+            device = -1
+
+        with self._lock:
+            if device not in self._executors:
+                self._executors[device] = ThreadPoolExecutor(
+                    max_workers=self._max_in_flight,
+                    thread_name_prefix=f"storage_subprocess.mover.{device}",
+                )
+                self._stats[device] = MoverStats()
+            stats = self._stats[device]
+            skip = job.src in self._queued_files or stats.queued >= self._max_queued
+            if skip:
+                stats.skipped += 1
+            else:
+                self._queued_files.add(job.src)
+                stats.queued += 1
+            executor = self._executors[device]
+
+        if skip:
+            self._output_queue.put(job)
+            return
+        executor.submit(self._move, device, job)
+
+    def _move(self, device: int, job: DataItemMoveFile) -> None:
+        stats = self._stats[device]
+        try:
+            size = os.path.getsize(job.src)
+        except OSError:
+            size = 0
+
+        with self._lock:
+            stats.in_flight += 1
+        start = time.monotonic()
+        try:
+            self._worker.work_input(job)
+        finally:
+            with self._lock:
+                stats.in_flight -= 1
+                stats.queued -= 1
+                self._queued_files.discard(job.src)
+                if not job.error:
+                    stats.files += 1
+                    stats.bytes += size
+                    stats.seconds += time.monotonic() - start
+            self._output_queue.put(job)
+
+    @property
+    def statistics(self) -> dict[int, MoverStats]:
+        """Return a copy of the statistics of each destination device."""
+        with self._lock:
+            return {device: replace(stats) for device, stats in self._stats.items()}
+
+    def log_statistics(self) -> None:
+        """Log the throughput of each destination device at debug level."""
+        for device, stats in self.statistics.items():
+            LOGGER.debug(
+                "Device %s: moved %d files, %.1f MB/s, %d queued, %d in flight, "
+                "%d skipped",
+                device,
+                stats.files,
+                stats.bytes / stats.seconds / 1024 / 1024 if stats.seconds else 0,
+                stats.queued,
+                stats.in_flight,
+                stats.skipped,
+            )
+
+
 def dispatcher_task(
-    process_queue: Queue[DataItem | DataItemDeleteFile | DataItemMoveFile],
+    process_queue: Queue[
+        DataItem | DataItemDeleteFile | DataItemMoveFile | DataItemFilesChanged
+    ],
     check_queue: Queue[DataItem],
     file_queue: Queue[DataItemDeleteFile | DataItemMoveFile],
+    index_queue: Queue[DataItemFilesChanged],
+    mover: FileMover,
 ):
     """Dispatcher thread routing jobs to dedicated queues.
 
     check_tier commands can be slow. File operations should not be blocked by them,
-    so they get their own queue and worker.
+    so they get their own queue and worker. Moves are handed to the FileMover to run
+    concurrently per destination device.
     """
     while True:
         try:
@@ -257,8 +454,12 @@ def dispatcher_task(
         try:
             if job.cmd == "check_tier":
                 check_queue.put(job)
-            elif job.cmd in ("move_file", "delete_file"):
+            elif job.cmd == "move_file":
+                mover.submit(job)
+            elif job.cmd == "delete_file":
                 file_queue.put(job)
+            elif job.cmd == "files_changed":
+                index_queue.put(job)
             else:
                 LOGGER.debug("Unknown command %s", job.cmd)
         except Exception as exc:  # pylint: disable=broad-except
@@ -270,7 +471,9 @@ def main():
     parser = get_parser()
     args = parser.parse_args()
     setup_logger(args.loglevel)
-    process_queue: Queue[DataItem | DataItemDeleteFile | DataItemMoveFile]
+    process_queue: Queue[
+        DataItem | DataItemDeleteFile | DataItemMoveFile | DataItemFilesChanged
+    ]
     output_queue: Queue[DataItem | DataItemDeleteFile | DataItemMoveFile]
     process_queue, output_queue = connect(
         "127.0.0.1", int(args.manager_port), args.manager_authkey
@@ -293,11 +496,30 @@ def main():
 
     check_queue: Queue[DataItem] = Queue()
     file_queue: Queue[DataItemDeleteFile | DataItemMoveFile] = Queue()
+    index_queue: Queue[DataItemFilesChanged] = Queue()
+
+    mover = FileMover(worker, output_queue, args.mover_workers)
+    background_scheduler.add_job(
+        mover.log_statistics,
+        "interval",
+        id="mover_statistics",
+        name="mover_statistics",
+        seconds=STATISTICS_LOG_INTERVAL,
+        max_instances=1,
+        coalesce=True,
+        replace_existing=True,
+    )
 
     dispatcher = RestartableThread(
         name="storage_subprocess.dispatcher",
         target=dispatcher_task,
-        args=(process_queue, check_queue, file_queue),
+        args=(
+            process_queue,
+            check_queue,
+            file_queue,
+            index_queue,
+            mover,
+        ),
         daemon=True,
     )
     dispatcher.start()
@@ -325,6 +547,14 @@ def main():
     )
     thread.start()
 
+    thread = RestartableThread(
+        name="storage_subprocess.tier_index_worker",
+        target=worker_task_tier_index,
+        args=(worker, index_queue),
+        daemon=True,
+    )
+    thread.start()
+
     while True:
         time.sleep(1)
 
@@ -8,12 +8,11 @@ import time
 from collections.abc import Callable
 from datetime import timedelta
 from queue import Queue
-from threading import Timer
 from typing import TYPE_CHECKING, Any, Literal
 
 import numpy as np
-from sqlalchemy import Delete, delete, insert, select, update
-from sqlalchemy.exc import IntegrityError, NoResultFound
+from sqlalchemy import Delete, delete, select, update
+from sqlalchemy.exc import NoResultFound
 from sqlalchemy.orm import Session
 from sqlalchemy.sql.dml import ReturningDelete
 from watchdog.events import (
@@ -90,7 +89,6 @@ from viseron.domains.camera.const import (
 )
 from viseron.events import Event, EventEmptyData
 from viseron.helpers import utcnow
-from viseron.helpers.named_timer import NamedTimer
 from viseron.watchdog.thread_watchdog import RestartableThread
 
 if TYPE_CHECKING:
@@ -143,7 +141,6 @@ class TierHandler(FileSystemEventHandler):
         self._check_tier_lock = threading.Lock()
         self._tier_check_in_progress = False
 
-        self._pending_updates: dict[str, Timer] = {}
         self._event_queue: Queue[FileSystemEvent | None] = Queue()
         self._event_thread = RestartableThread(
             target=self._process_events,
@@ -334,108 +331,75 @@ class TierHandler(FileSystemEventHandler):
         self._event_queue.put(event)
 
     def _on_created(self, event: FileCreatedEvent) -> None:
-        """Insert into database when file is created."""
+        """Queue insertion into database when file is created."""
         self._logger.debug("File created: %s", event.src_path)
         file_meta = self._storage.temporary_files_meta.pop(event.src_path, None)
-        try:
-            with self._storage.get_session() as session:
-                stmt = insert(Files).values(
-                    tier_id=self._tier_id,
-                    tier_path=self._tier[CONFIG_PATH],
+        self._storage.files_writer.file_created(
+            self,
+            event.src_path,
+            {
+                "tier_id": self._tier_id,
+                "tier_path": self._tier[CONFIG_PATH],
+                "camera_identifier": self._camera.identifier,
+                "category": self._category,
+                "subcategory": self._subcategory,
+                "directory": os.path.dirname(event.src_path),
+                "filename": os.path.basename(event.src_path),
+                "orig_ctime": file_meta.orig_ctime if file_meta else utcnow(),
+                "duration": file_meta.duration if file_meta else None,
+            },
+        )
+
+    def _on_modified(self, event: FileModifiedEvent) -> None:
+        """Queue size update in database when file is modified.
+
+        Duplicate events are coalesced by the files writer.
+        """
+        self._storage.files_writer.file_modified(self, event.src_path)
+
+    def _on_deleted(self, event: FileDeletedEvent) -> None:
+        """Queue removal from database when file is deleted."""
+        self._logger.debug("File deleted: %s", event.src_path)
+        self._storage.files_writer.file_deleted(self, event.src_path)
+
+    def files_created(self, paths: list[str]) -> None:
+        """Handle files that have been inserted into the database."""
+        for path in paths:
+            self._vis.dispatch_event(
+                EVENT_FILE_CREATED.format(
                     camera_identifier=self._camera.identifier,
                     category=self._category,
                     subcategory=self._subcategory,
-                    path=event.src_path,
-                    directory=os.path.dirname(event.src_path),
-                    filename=os.path.basename(event.src_path),
-                    size=os.path.getsize(event.src_path),
-                    orig_ctime=file_meta.orig_ctime if file_meta else utcnow(),
-                    duration=file_meta.duration if file_meta else None,
-                )
-                session.execute(stmt)
-                session.commit()
-        except IntegrityError:
-            self._logger.error(
-                "Failed to insert file %s into database, already exists", event.src_path
+                ),
+                EventFileCreated(
+                    camera_identifier=self._camera.identifier,
+                    category=self._category,
+                    subcategory=self._subcategory,
+                    file_name=os.path.basename(path),
+                    path=path,
+                ),
+                store=False,
             )
-        else:
+
+    def files_deleted(self, paths: list[str]) -> None:
+        """Handle files that have been removed from the database."""
+        for path in paths:
             self._vis.dispatch_event(
-                EVENT_FILE_CREATED.format(
+                EVENT_FILE_DELETED.format(
                     camera_identifier=self._camera.identifier,
                     category=self._category,
                     subcategory=self._subcategory,
                 ),
-                EventFileCreated(
+                EventFileDeleted(
                     camera_identifier=self._camera.identifier,
                     category=self._category,
                     subcategory=self._subcategory,
-                    file_name=os.path.basename(event.src_path),
-                    path=event.src_path,
+                    file_name=os.path.basename(path),
+                    path=path,
                 ),
                 store=False,
             )
 
-        self.check_tier()
-
-    def _on_modified(self, event: FileModifiedEvent) -> None:
-        """Update database when file is moved."""
-
-        def _update_size() -> None:
-            """Update the size of a file in the database.
-
-            Runs in a Timer to avoid spamming updates on duplicate events.
-            """
-            self._logger.debug("File modified (delayed event): %s", event.src_path)
-            self._pending_updates.pop(event.src_path, None)
-            try:
-                size = os.path.getsize(event.src_path)
-            except FileNotFoundError:
-                self._logger.debug("File not found: %s", event.src_path)
-                return
-
-            with self._storage.get_session() as session:
-                stmt = (
-                    update(Files).where(Files.path == event.src_path).values(size=size)
-                )
-                session.execute(stmt)
-                session.commit()
-
-            self.check_tier()
-
-        if event.src_path in self._pending_updates:
-            self._pending_updates[event.src_path].cancel()
-        self._pending_updates[event.src_path] = NamedTimer(
-            1,
-            _update_size,
-            name=f"update_size for {event.src_path}",
-            daemon=False,  # We want to wait for the update to finish on shutdown
-        )
-        self._pending_updates[event.src_path].start()
-
-    def _on_deleted(self, event: FileDeletedEvent) -> None:
-        """Remove file from database when it is deleted."""
-        self._logger.debug("File deleted: %s", event.src_path)
-        with self._storage.get_session() as session:
-            stmt = delete(Files).where(Files.path == event.src_path)
-            session.execute(stmt)
-            session.commit()
-
-        self._vis.dispatch_event(
-            EVENT_FILE_DELETED.format(
-                camera_identifier=self._camera.identifier,
-                category=self._category,
-                subcategory=self._subcategory,
-            ),
-            EventFileDeleted(
-                camera_identifier=self._camera.identifier,
-                category=self._category,
-                subcategory=self._subcategory,
-                file_name=os.path.basename(event.src_path),
-                path=event.src_path,
-            ),
-            store=False,
-        )
-
     def _shutdown(self) -> None:
         """Shutdown the observer and event handler."""
         self._logger.debug("Initiating observer shutdown")
@@ -457,10 +421,9 @@ class TierHandler(FileSystemEventHandler):
     def _stop_observer(self) -> None:
         """Stop the observer."""
         self._logger.debug("Stopping observer")
-        for pending_update in self._pending_updates.copy().values():
-            pending_update.join()
         self._event_queue.put(None)
         self._event_thread.join()
+        self._storage.files_writer.flush()
         self._observer.stop()
         self._observer.join()
 
@@ -774,13 +737,14 @@ class SnapshotTierHandler(TierHandler):
         super().initialize()
         self.add_file_handler(self._path, rf"{self._path}/(.*.jpg$)")
 
-    def _on_deleted(self, event: FileDeletedEvent) -> None:
+    def files_deleted(self, paths: list[str]) -> None:
+        """Remove the rows referencing the deleted snapshots."""
         stmt: Delete | ReturningDelete[tuple[int]]
         if self._subcategory == TIER_SUBCATEGORY_MOTION_DETECTOR:
             with self._storage.get_session() as session:
                 stmt = (
                     delete(Motion)
-                    .where(Motion.snapshot_path == event.src_path)
+                    .where(Motion.snapshot_path.in_(paths))
                     .returning(Motion.id)
                 )
                 result = session.execute(stmt)
@@ -796,7 +760,7 @@ class SnapshotTierHandler(TierHandler):
 
         elif self._subcategory == TIER_SUBCATEGORY_OBJECT_DETECTOR:
             with self._storage.get_session() as session:
-                stmt = delete(Objects).where(Objects.snapshot_path == event.src_path)
+                stmt = delete(Objects).where(Objects.snapshot_path.in_(paths))
                 session.execute(stmt)
                 session.commit()
 
@@ -806,12 +770,12 @@ class SnapshotTierHandler(TierHandler):
         ]:
             with self._storage.get_session() as session:
                 stmt = delete(PostProcessorResults).where(
-                    PostProcessorResults.snapshot_path == event.src_path
+                    PostProcessorResults.snapshot_path.in_(paths)
                 )
                 session.execute(stmt)
                 session.commit()
 
-        super()._on_deleted(event)
+        super().files_deleted(paths)
 
 
 class ThumbnailTierHandler(TierHandler):
@@ -1200,20 +1164,22 @@ class TimelapseTierHandler(TierHandler):
         self._interval = calculate_age(self._tier.get(CONFIG_INTERVAL, {}))
         self.add_file_handler(self._path, rf"{self._path}/(.*.jpg$)")
 
-    def _on_created(self, event: FileCreatedEvent) -> None:
+    def files_created(self, paths: list[str]) -> None:
         """Handle file creation with interval-based cleanup."""
-        super()._on_created(event)
+        super().files_created(paths)
 
         # If no interval is set, keep all files
         if not self._interval:
             return
 
-        # Check if there's already a file within the interval
+        for path in paths:
+            self._remove_if_within_interval(path)
+
+    def _remove_if_within_interval(self, path: str) -> None:
+        """Remove file if there's already a file within the interval."""
         try:
             with self._storage.get_session() as session:
-                current_file_stmt = select(Files.orig_ctime).where(
-                    Files.path == event.src_path
-                )
+                current_file_stmt = select(Files.orig_ctime).where(Files.path == path)
                 current_file_result = session.execute(current_file_stmt).scalar_one()
                 current_file_datetime = current_file_result
 
@@ -1225,7 +1191,7 @@ class TimelapseTierHandler(TierHandler):
                     Files.camera_identifier == self._camera.identifier,
                     Files.category == self._category,
                     Files.subcategory == self._subcategory,
-                    Files.path != event.src_path,
+                    Files.path != path,
                     Files.orig_ctime >= interval_start,
                     Files.orig_ctime <= interval_end,
                 )
@@ -1235,11 +1201,11 @@ class TimelapseTierHandler(TierHandler):
                 if result:
                     self._logger.debug(
                         f"File within interval already exists, removing current file: "
-                        f"{event.src_path}"
+                        f"{path}"
                     )
-                    delete_file(self._storage, event.src_path)
+                    delete_file(self._storage, path)
 
-                    delete_stmt = delete(Files).where(Files.path == event.src_path)
+                    delete_stmt = delete(Files).where(Files.path == path)
                     session.execute(delete_stmt)
                     session.commit()
 
@@ -0,0 +1,155 @@
+"""Incremental in-memory index of the files in a tier."""
+from __future__ import annotations
+
+import bisect
+import threading
+import time
+from collections.abc import Iterable
+from typing import NamedTuple
+
+import numpy as np
+
+from viseron.components.storage.const import TIER_INDEX_RELOAD_INTERVAL
+
+FILES_DTYPE = np.dtype(
+    [
+        ("id", np.int64),
+        ("size", np.int64),
+        ("orig_ctime", np.int64),
+        ("path", "U512"),
+        ("tier_path", "U512"),
+    ]
+)
+
+FILES_TO_MOVE_DTYPE = np.dtype(
+    [
+        ("id", np.int64),
+        ("path", "U512"),
+        ("tier_path", "U512"),
+    ]
+)
+
+
+class IndexedFile(NamedTuple):
+    """A file in the tier index."""
+
+    id: int
+    size: int
+    orig_ctime: int
+    path: str
+    tier_path: str
+
+
+class TierIndex:
+    """Files of a tier ordered by age, with a running byte total.
+
+    The index is loaded from the database once and then kept up to date with the
+    created/modified/deleted deltas of the files writer. Since new files are the
+    newest, insertions almost always append to the end of the age order.
+    """
+
+    def __init__(self, reload_interval: float = TIER_INDEX_RELOAD_INTERVAL) -> None:
+        self.lock = threading.Lock()
+        self._reload_interval = reload_interval
+        self._loaded_at: float | None = None
+        self._files: dict[str, IndexedFile] = {}
+        # (orig_ctime, path) sorted ascending, oldest file first
+        self._age_order: list[tuple[int, str]] = []
+        self._total_bytes = 0
+
+    def __len__(self) -> int:
+        """Return number of files in the index."""
+        return len(self._files)
+
+    @property
+    def total_bytes(self) -> int:
+        """Return the total size of all files in the index."""
+        return self._total_bytes
+
+    @property
+    def needs_reload(self) -> bool:
+        """Return if the index has to be (re)loaded from the database.
+
+        The index is reloaded periodically to pick up changes that are not
+        reported as deltas, like rows removed by the cleanup jobs.
+        """
+        return (
+            self._loaded_at is None
+            or time.monotonic() - self._loaded_at > self._reload_interval
+        )
+
+    def load(self, files: Iterable[IndexedFile]) -> None:
+        """Replace the content of the index."""
+        self._files = {file.path: file for file in files}
+        self._age_order = sorted(
+            (file.orig_ctime, file.path) for file in self._files.values()
+        )
+        self._total_bytes = sum(file.size for file in self._files.values())
+        self._loaded_at = time.monotonic()
+
+    def upsert(self, file: IndexedFile) -> None:
+        """Add a file to the index, replacing any previous entry for the path."""
+        if self._loaded_at is None:
+            return
+        self.remove(file.path)
+        self._files[file.path] = file
+        bisect.insort(self._age_order, (file.orig_ctime, file.path))
+        self._total_bytes += file.size
+
+    def update_size(self, path: str, size: int) -> None:
+        """Update the size of a file in the index."""
+        if (file := self._files.get(path)) is None:
+            return
+        self._total_bytes += size - file.size
+        self._files[path] = file._replace(size=size)
+
+    def remove(self, path: str) -> None:
+        """Remove a file from the index."""
+        if (file := self._files.pop(path, None)) is None:
+            return
+        key = (file.orig_ctime, file.path)
+        index = bisect.bisect_left(self._age_order, key)
+        del self._age_order[index]
+        self._total_bytes -= file.size
+
+    def files_to_move(
+        self,
+        max_bytes: int,
+        min_age_timestamp: float,
+        min_bytes: int,
+        max_age_timestamp: float,
+    ) -> np.ndarray:
+        """Return the files that exceed the size or age limits, oldest first.
+
+        Gives the same result as get_files_to_move, but walks the files from the
+        oldest one and stops at the first file that is kept. The bytes of a file
+        and all newer files is the running total minus the bytes of older files, so
+        the cost is proportional to the number of files to move.
+        """
+        rows: list[tuple[int, str, str]] = []
+        cumulative_size = self._total_bytes
+        for orig_ctime, path in self._age_order:
+            move_bytes = (
+                max_bytes > 0
+                and cumulative_size >= max_bytes
+                and orig_ctime <= min_age_timestamp
+            )
+            move_age = (
+                max_age_timestamp > 0
+                and orig_ctime < max_age_timestamp
+                and cumulative_size >= min_bytes
+            )
+            # Both conditions stay false for all newer files
+            if not move_bytes and not move_age:
+                break
+            file = self._files[path]
+            rows.append((file.id, file.path, file.tier_path))
+            cumulative_size -= file.size
+
+        if rows:
+            return np.array(rows, dtype=FILES_TO_MOVE_DTYPE)
+        return np.empty(0, dtype=FILES_DTYPE)
+
+    def to_array(self) -> np.ndarray:
+        """Return all files in the index as a FILES_DTYPE array."""
+        return np.array(list(self._files.values()), dtype=FILES_DTYPE)
@@ -44,6 +44,7 @@ from .const import (
     WEBSOCKET_COMMANDS,
     WEBSOCKET_CONNECTIONS,
 )
+from .hls_playlist_cache import HlsPlaylistCache
 from .stream_handler import DynamicStreamHandler, StaticStreamHandler
 from .websocket_api import WebSocketHandler
 from .websocket_api.commands import (
@@ -217,6 +218,7 @@ class Webserver(threading.Thread):
         if self._config.get(CONFIG_AUTH, False):
             self._auth = Auth(vis, config)
         self._store = WebserverStore(vis)
+        self._hls_playlist_cache = HlsPlaylistCache(vis)
 
         vis.data[COMPONENT] = self
         vis.data[WEBSOCKET_COMMANDS] = {}
@@ -256,6 +258,11 @@ class Webserver(threading.Thread):
         """Return download tokens."""
         return self._vis.data[DOWNLOAD_TOKENS]
 
+    @property
+    def hls_playlist_cache(self) -> HlsPlaylistCache:
+        """Return the live HLS playlist cache."""
+        return self._hls_playlist_cache
+
     def register_websocket_command(self, handler) -> None:
         """Register a websocket command."""
         if handler.command in self._vis.data[WEBSOCKET_COMMANDS]:
@@ -273,6 +280,7 @@ class Webserver(threading.Thread):
     def stop(self) -> None:
         """Stop ioloop."""
         LOGGER.debug("Stopping webserver")
+        self._hls_playlist_cache.stop()
         if self._httpserver:
             LOGGER.debug("Stopping HTTPServer")
             self._httpserver.stop()
@@ -4,7 +4,6 @@ from __future__ import annotations
 import inspect
 import json
 import logging
-from functools import partial
 from http import HTTPStatus
 from re import Match, Pattern
 from typing import TYPE_CHECKING, Any, Literal, TypedDict, cast
@@ -17,7 +16,7 @@ from voluptuous.schema_builder import Schema
 from viseron.components.webserver.api.const import API_BASE
 from viseron.components.webserver.auth import Role
 from viseron.components.webserver.request_handler import ViseronRequestHandler
-from viseron.helpers.json import JSONEncoder
+from viseron.helpers.json import dumps
 
 if TYPE_CHECKING:
     from typing_extensions import NotRequired
@@ -76,9 +75,6 @@ class BaseAPIHandler(ViseronRequestHandler):
     ) -> None:
         """Send successful response."""
 
-        def _json_dumps() -> str:
-            return partial(json.dumps, cls=JSONEncoder, allow_nan=False)(response)
-
         if response is None:
             response = {"success": True}
         self.set_status(status)
@@ -88,7 +84,7 @@ class BaseAPIHandler(ViseronRequestHandler):
                 await self.run_in_executor(self.set_header, header, value)
 
         if isinstance(response, dict):
-            self.finish(await self.run_in_executor(_json_dumps))
+            self.finish(await self.run_in_executor(dumps, response))
             return
 
         self.finish(response)
@@ -2,8 +2,10 @@
 from __future__ import annotations
 
 import datetime
+import hashlib
 import logging
 import os
+import time
 from collections.abc import Callable
 from dataclasses import dataclass
 from http import HTTPStatus
@@ -19,6 +21,7 @@ from viseron.components.storage.const import (
 from viseron.components.storage.models import Files, Recordings
 from viseron.components.storage.queries import get_time_period_fragments
 from viseron.components.webserver.api.handlers import BaseAPIHandler
+from viseron.components.webserver.const import HLS_CLIENT_TIMEOUT, HLS_CLIENTS_MAX
 from viseron.domains.camera.fragmenter import (
     Fragment,
     generate_playlist,
@@ -30,6 +33,7 @@ from viseron.helpers.fixed_size_dict import FixedSizeDict
 if TYPE_CHECKING:
     from sqlalchemy.orm import Session
 
+    from viseron.components.webserver.hls_playlist_cache import LivePlaylist
     from viseron.domains.camera import AbstractCamera, FailedCamera
 
 LOGGER = logging.getLogger(__name__)
@@ -58,12 +62,15 @@ class HlsClient:
     client_id: str
     fragments: list[Fragment]
     media_sequence: int
+    last_seen: float
 
 
 class HlsAPIHandler(BaseAPIHandler):
     """API handler for HLS."""
 
-    hls_client_ids: FixedSizeDict[str, HlsClient] = FixedSizeDict(maxlen=10)
+    hls_client_ids: FixedSizeDict[str, HlsClient] = FixedSizeDict(
+        maxlen=HLS_CLIENTS_MAX
+    )
 
     routes = [
         {
@@ -126,7 +133,11 @@ class HlsAPIHandler(BaseAPIHandler):
             return
 
         playlist = await self.run_in_executor(
-            _generate_playlist, self._get_session, camera, recording_id
+            _generate_playlist,
+            self._get_session,
+            camera,
+            self._webserver.hls_playlist_cache.get(camera.identifier),
+            recording_id,
         )
         if not playlist:
             self.response_error(
@@ -154,10 +165,24 @@ class HlsAPIHandler(BaseAPIHandler):
             return
 
         hls_client_id = self.request.headers.get("Hls-Client-Id", None)
+        live_playlist = self._webserver.hls_playlist_cache.get(camera.identifier)
+        if live_playlist.covers(self.request_arguments["start_timestamp"]):
+            # The version is read before the playlist is generated, so a change
+            # made during generation results in a new ETag on the next request
+            self.set_header("Etag", self._playlist_etag(live_playlist, hls_client_id))
+            if self.check_etag_header():
+                # The client is still polling, keep its media sequence alive
+                if hls_client_id:
+                    touch_hls_client(hls_client_id)
+                self.set_status(HTTPStatus.NOT_MODIFIED)
+                self.finish()
+                return
+
         playlist = await self.run_in_executor(
             _generate_playlist_time_period,
             self._get_session,
             camera,
+            live_playlist,
             hls_client_id,
             self.utc_offset,
             self.request_arguments["start_timestamp"],
@@ -175,6 +200,24 @@ class HlsAPIHandler(BaseAPIHandler):
         self.set_header("Access-Control-Allow-Origin", "*")
         await self.response_success(response=playlist)
 
+    def _playlist_etag(
+        self, live_playlist: LivePlaylist, hls_client_id: str | None
+    ) -> str:
+        """Return an ETag for a playlist sliced from the live playlist cache.
+
+        The playlist only changes if the cached segments change, or if the date
+        of the client changes since that decides if a date playlist has ended.
+        """
+        key = (
+            live_playlist.version,
+            self.request_arguments["start_timestamp"],
+            self.request_arguments["end_timestamp"],
+            self.request_arguments["date"],
+            client_current_datetime(self.utc_offset).date().isoformat(),
+            hls_client_id,
+        )
+        return f'"{hashlib.sha1(repr(key).encode()).hexdigest()}"'
+
     async def get_available_timespans(
         self,
         camera_identifier: str,
@@ -232,9 +275,49 @@ def _get_init_file(
     return None
 
 
+def _get_live_init_file(
+    get_session: Callable[[], Session],
+    camera: AbstractCamera | FailedCamera,
+    live_playlist: LivePlaylist,
+) -> str | None:
+    """Get the init file for a camera, cached in the live playlist cache."""
+    init_file = live_playlist.init_file
+    if init_file is None or not os.path.exists(init_file):
+        init_file = live_playlist.init_file = _get_init_file(get_session, camera)
+    return init_file
+
+
+def _get_fragments(
+    get_session: Callable[[], Session],
+    camera_identifier: str,
+    live_playlist: LivePlaylist,
+    start_timestamp: float,
+    end_timestamp: float | None,
+    now: datetime.datetime | None = None,
+) -> list[Fragment]:
+    """Get fragments from the live playlist cache, or the database if not cached."""
+    fragments = live_playlist.fragments(get_session, start_timestamp, end_timestamp)
+    if fragments is not None:
+        return fragments
+
+    files = get_time_period_fragments(
+        [camera_identifier], start_timestamp, end_timestamp, get_session, now
+    )
+    return [
+        Fragment(
+            file.filename,
+            f"/files{file.path}",
+            file.duration,
+            file.orig_ctime,
+        )
+        for file in files
+    ]
+
+
 def _generate_playlist(
     get_session: Callable[[], Session],
     camera: AbstractCamera | FailedCamera,
+    live_playlist: LivePlaylist,
     recording_id: int,
 ) -> str | None:
     """Generate the HLS playlist for a recording."""
@@ -246,20 +329,14 @@ def _generate_playlist(
         if recording is None:
             return None
 
-    files = recording.get_fragments(
-        camera.recorder.lookback,
+    fragments = _get_fragments(
         get_session,
-        now=now,
+        camera.identifier,
+        live_playlist,
+        recording.start_time.timestamp() - camera.recorder.lookback,
+        (recording.end_time or now).timestamp(),
+        now,
     )
-    fragments = [
-        Fragment(
-            file.filename,
-            f"/files{file.path}",
-            file.duration,
-            file.orig_ctime,
-        )
-        for file in files
-    ]
 
     end: bool = True
     # Recording has not ended yet
@@ -273,13 +350,13 @@ def _generate_playlist(
         LOGGER.debug("Recording ended more than a minute ago")
         end = True
     # Recording has ended but the last file is not finished yet
-    elif len(files) > 0 and recording.end_time.timestamp() > float(
-        files[-1].filename.split(".")[0]
-    ) + float(files[-1].duration):
+    elif len(fragments) > 0 and recording.end_time.timestamp() > float(
+        fragments[-1].filename.split(".")[0]
+    ) + float(fragments[-1].duration):
         LOGGER.debug("Recording has ended but the last file is not finished yet")
         end = False
 
-    init_file = _get_init_file(get_session, camera)
+    init_file = _get_live_init_file(get_session, camera, live_playlist)
     if not init_file or not fragments:
         return None
 
@@ -292,21 +369,38 @@ def _generate_playlist(
     return playlist
 
 
+def touch_hls_client(hls_client_id: str) -> None:
+    """Mark HLS client as seen without changing its media sequence."""
+    if hls_client := HlsAPIHandler.hls_client_ids.get(hls_client_id, None):
+        hls_client.last_seen = time.monotonic()
+
+
 def update_hls_client(
     hls_client_id: str,
     fragments: list[Fragment],
 ) -> int:
-    """Keep track of HLS client media sequence."""
+    """Keep track of HLS client media sequence.
+
+    Clients that have not requested a playlist for HLS_CLIENT_TIMEOUT seconds are
+    evicted.
+    """
+    now = time.monotonic()
+    hls_clients = HlsAPIHandler.hls_client_ids
+    for client_id, client in list(hls_clients.items()):
+        if now - client.last_seen > HLS_CLIENT_TIMEOUT:
+            hls_clients.pop(client_id, None)
+
     media_sequence = 0
-    hls_client = HlsAPIHandler.hls_client_ids.get(hls_client_id, None)
+    hls_client = hls_clients.get(hls_client_id, None)
     if hls_client:
         media_sequence = hls_client.media_sequence
         media_sequence += count_files_removed(hls_client.fragments, fragments)
         hls_client.fragments = fragments
         hls_client.media_sequence = media_sequence
+        hls_client.last_seen = now
     else:
-        HlsAPIHandler.hls_client_ids[hls_client_id] = HlsClient(
-            hls_client_id, fragments, media_sequence
+        hls_clients[hls_client_id] = HlsClient(
+            hls_client_id, fragments, media_sequence, now
         )
     return media_sequence
 
@@ -314,6 +408,7 @@ def update_hls_client(
 def _generate_playlist_time_period(
     get_session: Callable[[], Session],
     camera: AbstractCamera | FailedCamera,
+    live_playlist: LivePlaylist,
     hls_client_id: str | None,
     utc_offset: datetime.timedelta,
     start_timestamp: int,
@@ -332,18 +427,9 @@ def _generate_playlist_time_period(
     elif end_timestamp is not None:
         end_playlist = True
 
-    files = get_time_period_fragments(
-        [camera.identifier], start_timestamp, end_timestamp, get_session
+    fragments = _get_fragments(
+        get_session, camera.identifier, live_playlist, start_timestamp, end_timestamp
     )
-    fragments = [
-        Fragment(
-            file.filename,
-            f"/files{file.path}",
-            file.duration,
-            file.orig_ctime,
-        )
-        for file in files
-    ]
 
     media_sequence = (
         update_hls_client(hls_client_id, fragments)
@@ -351,7 +437,7 @@ def _generate_playlist_time_period(
         else 0
     )
 
-    init_file = _get_init_file(get_session, camera)
+    init_file = _get_live_init_file(get_session, camera, live_playlist)
     if not init_file:
         return None
 
@@ -66,6 +66,13 @@ WS_ERROR_NOT_FOUND = "not_found"
 WS_ERROR_UNAUTHORIZED = "unauthorized"
 
 
+# HLS constants
+HLS_PLAYLIST_CACHE_SPAN: Final = 86400
+HLS_PLAYLIST_CACHE_RELOAD_INTERVAL: Final = 600
+HLS_CLIENT_TIMEOUT: Final = 120
+HLS_CLIENTS_MAX: Final = 100
+
+
 # Viseron data constants
 WEBSOCKET_COMMANDS = "websocket_commands"
 WEBSOCKET_CONNECTIONS = "websocket_connections"
@@ -0,0 +1,240 @@
+"""Cache of recorded segments used to serve live HLS playlists."""
+from __future__ import annotations
+
+import bisect
+import logging
+import threading
+import time
+from collections.abc import Callable
+from typing import TYPE_CHECKING
+
+from viseron.components.storage.const import (
+    COMPONENT as STORAGE_COMPONENT,
+    EVENT_FILE_CREATED,
+    EVENT_FILE_DELETED,
+    TIER_CATEGORY_RECORDER,
+    TIER_SUBCATEGORY_SEGMENTS,
+)
+from viseron.components.storage.queries import (
+    get_segment_fragments,
+    get_time_period_fragments,
+)
+from viseron.components.webserver.const import (
+    HLS_PLAYLIST_CACHE_RELOAD_INTERVAL,
+    HLS_PLAYLIST_CACHE_SPAN,
+)
+from viseron.domains.camera.fragmenter import Fragment
+
+if TYPE_CHECKING:
+    from sqlalchemy.orm import Session
+
+    from viseron import Viseron
+    from viseron.components.storage.util import EventFileCreated, EventFileDeleted
+    from viseron.events import Event
+
+LOGGER = logging.getLogger(__name__)
+
+
+def _to_fragment(file) -> Fragment:
+    return Fragment(
+        file.filename,
+        f"/files{file.path}",
+        file.duration,
+        file.orig_ctime,
+    )
+
+
+class LivePlaylist:
+    """Segments of a camera for the last HLS_PLAYLIST_CACHE_SPAN seconds.
+
+    The segments are loaded from the database once, then appended to on
+    EVENT_FILE_CREATED and trimmed on EVENT_FILE_DELETED. Playlists for any time
+    window inside the cached span are sliced from memory. The cache is reloaded
+    every HLS_PLAYLIST_CACHE_RELOAD_INTERVAL seconds to pick up changes that are
+    not reported as events.
+    """
+
+    def __init__(
+        self,
+        vis: Viseron,
+        camera_identifier: str,
+        span: float = HLS_PLAYLIST_CACHE_SPAN,
+        reload_interval: float = HLS_PLAYLIST_CACHE_RELOAD_INTERVAL,
+    ) -> None:
+        self._vis = vis
+        self._camera_identifier = camera_identifier
+        self._span = span
+        self._reload_interval = reload_interval
+
+        self._lock = threading.Lock()
+        self._loaded_at: float | None = None
+        self._covered_from = float("inf")
+        # Fragments sorted by creation time, with their timestamps in _timestamps
+        self._fragments: list[Fragment] = []
+        self._timestamps: list[float] = []
+        self._version = 0
+        self.init_file: str | None = None
+
+        self._unsubs = [
+            vis.listen_event(
+                event.format(
+                    camera_identifier=camera_identifier,
+                    category=TIER_CATEGORY_RECORDER,
+                    subcategory=TIER_SUBCATEGORY_SEGMENTS,
+                ),
+                callback,
+            )
+            for event, callback in (
+                (EVENT_FILE_CREATED, self._file_created),
+                (EVENT_FILE_DELETED, self._file_deleted),
+            )
+        ]
+
+    @property
+    def version(self) -> int:
+        """Return a number that changes every time the cached segments change."""
+        return self._version
+
+    def covers(self, start_timestamp: float) -> bool:
+        """Return if a time window starting at start_timestamp can be sliced.
+
+        Always False until the cache has been loaded.
+        """
+        return start_timestamp >= self._covered_from
+
+    def fragments(
+        self,
+        get_session: Callable[[], Session],
+        start_timestamp: float,
+        end_timestamp: float | None,
+    ) -> list[Fragment] | None:
+        """Return the fragments of a time window, or None if it is not cached.
+
+        Like get_time_period_fragments, the last fragment that starts before the
+        window is included if it ends within the window.
+        """
+        with self._lock:
+            if (
+                self._loaded_at is None
+                or time.monotonic() - self._loaded_at > self._reload_interval
+            ):
+                self._load(get_session)
+            self._trim()
+            if start_timestamp < self._covered_from:
+                return None
+
+            start = bisect.bisect_left(self._timestamps, start_timestamp)
+            if start > 0:
+                previous = self._fragments[start - 1]
+                if self._timestamps[start - 1] + previous.duration >= start_timestamp:
+                    start -= 1
+            end = (
+                bisect.bisect_right(self._timestamps, end_timestamp)
+                if end_timestamp is not None
+                else len(self._timestamps)
+            )
+            return self._fragments[start:end]
+
+    def _load(self, get_session: Callable[[], Session]) -> None:
+        covered_from = time.time() - self._span
+        files = get_time_period_fragments(
+            [self._camera_identifier], covered_from, None, get_session
+        )
+        self._fragments = [_to_fragment(file) for file in files]
+        self._timestamps = [
+            fragment.creation_time.timestamp() for fragment in self._fragments
+        ]
+        self._covered_from = covered_from
+        self._loaded_at = time.monotonic()
+        self._version += 1
+
+    def _trim(self) -> None:
+        """Drop fragments that ended before the cached span."""
+        covered_from = time.time() - self._span
+        if covered_from <= self._covered_from:
+            return
+        index = 0
+        while (
+            index < len(self._fragments)
+            and self._timestamps[index] + self._fragments[index].duration
+            < covered_from
+        ):
+            index += 1
+        if index:
+            del self._fragments[:index]
+            del self._timestamps[:index]
+            self._version += 1
+        self._covered_from = covered_from
+
+    def _remove(self, filename: str) -> bool:
+        for index, fragment in enumerate(self._fragments):
+            if fragment.filename == filename:
+                del self._fragments[index]
+                del self._timestamps[index]
+                return True
+        return False
+
+    def _refresh(self, filename: str) -> None:
+        """Replace the cached fragment with the latest tier copy of the segment."""
+        files = get_segment_fragments(
+            self._camera_identifier,
+            [filename],
+            self._vis.data[STORAGE_COMPONENT].get_session,
+        )
+        with self._lock:
+            if self._loaded_at is None:
+                return
+            changed = self._remove(filename)
+            for file in files:
+                fragment = _to_fragment(file)
+                timestamp = fragment.creation_time.timestamp()
+                if timestamp + fragment.duration < self._covered_from:
+                    continue
+                index = bisect.bisect_right(self._timestamps, timestamp)
+                self._fragments.insert(index, fragment)
+                self._timestamps.insert(index, timestamp)
+                changed = True
+            if changed:
+                self._version += 1
+
+    def _file_created(self, event_data: Event[EventFileCreated]) -> None:
+        self._refresh(event_data.data.file_name)
+
+    def _file_deleted(self, event_data: Event[EventFileDeleted]) -> None:
+        path = f"/files{event_data.data.path}"
+        with self._lock:
+            cached = any(fragment.path == path for fragment in self._fragments)
+        # Only deletion of the cached tier copy changes the playlist
+        if cached:
+            self._refresh(event_data.data.file_name)
+
+    def stop(self) -> None:
+        """Stop listening to file events."""
+        for unsub in self._unsubs:
+            unsub()
+
+
+class HlsPlaylistCache:
+    """Live playlist caches for the cameras that have been requested."""
+
+    def __init__(self, vis: Viseron) -> None:
+        self._vis = vis
+        self._lock = threading.Lock()
+        self._playlists: dict[str, LivePlaylist] = {}
+
+    def get(self, camera_identifier: str) -> LivePlaylist:
+        """Return the live playlist cache of a camera, creating it if needed."""
+        with self._lock:
+            playlist = self._playlists.get(camera_identifier)
+            if playlist is None:
+                playlist = self._playlists[camera_identifier] = LivePlaylist(
+                    self._vis, camera_identifier
+                )
+            return playlist
+
+    def stop(self) -> None:
+        """Stop all live playlist caches."""
+        with self._lock:
+            for playlist in self._playlists.values():
+                playlist.stop()
+            self._playlists.clear()
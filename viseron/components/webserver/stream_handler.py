@@ -92,18 +92,14 @@ class StreamHandler(ViseronRequestHandler):
         nvr: NVR, processed_frame: DataProcessedFrame, mjpeg_stream_config
     ) -> tuple[bool, np.ndarray]:
         """Return JPG with drawn objects, zones etc."""
-        _frame = processed_frame.frame.copy()
-
         if mjpeg_stream_config["width"] and mjpeg_stream_config["height"]:
             resolution = mjpeg_stream_config["width"], mjpeg_stream_config["height"]
-            frame = cv2.resize(
-                _frame,
-                resolution,
-                interpolation=cv2.INTER_LINEAR,
-            )
+            frame = processed_frame.get_frame(resolution)
         else:
             resolution = nvr.camera.resolution
-            frame = _frame
+            frame = processed_frame.frame
+        if frame is None:
+            return False, np.empty(0)
 
         if nvr.motion_detector and isinstance(
             nvr.motion_detector, AbstractMotionDetectorScanner
@@ -5,7 +5,6 @@ import asyncio
 import json
 import logging
 from collections.abc import Callable
-from functools import partial
 from typing import TYPE_CHECKING, Any
 
 import tornado.websocket
@@ -25,7 +24,7 @@ from viseron.components.webserver.const import (
 )
 from viseron.components.webserver.request_handler import ViseronRequestHandler
 from viseron.exceptions import Unauthorized
-from viseron.helpers.json import JSONEncoder
+from viseron.helpers.json import dumps
 
 from .messages import (
     MINIMAL_MESSAGE_SCHEMA,
@@ -70,9 +69,6 @@ class WebSocketHandler(ViseronRequestHandler, tornado.websocket.WebSocketHandler
     async def _write_message(self) -> None:
         """Write messages to client."""
 
-        def _json_dumps(message):
-            return partial(json.dumps, cls=JSONEncoder, allow_nan=False)(message)
-
         while True:
             if (message := await self._message_queue.get()) is None:
                 break
@@ -81,7 +77,7 @@ class WebSocketHandler(ViseronRequestHandler, tornado.websocket.WebSocketHandler
 
             if isinstance(message, dict):
                 try:
-                    json_message = await self.run_in_executor(_json_dumps, message)
+                    json_message = await self.run_in_executor(dumps, message)
                     await self.write_message(json_message)
                 except (ValueError, TypeError):
                     LOGGER.error(
@@ -42,6 +42,7 @@ from viseron.components.webserver.const import (
     DOWNLOAD_PATH,
     WS_ERROR_NOT_FOUND,
     WS_ERROR_SAVE_CONFIG_FAILED,
+    WS_ERROR_UNKNOWN_ERROR,
 )
 from viseron.components.webserver.download_token import DownloadToken
 from viseron.const import CONFIG_PATH, EVENT_STATE_CHANGED, RESTART_EXIT_CODE
@@ -62,6 +63,7 @@ from .messages import (
     pong_message,
     result_message,
     subscription_error_message,
+    subscription_event_message,
     subscription_result_message,
 )
 
@@ -144,6 +146,31 @@ async def ping(connection: WebSocketHandler, message) -> None:
     await connection.async_send_message(pong_message(message["command_id"]))
 
 
+async def _forward_event(
+    connection: WebSocketHandler, command_id: int, event: Event
+) -> None:
+    """Forward an event to a WebSocket connection as a subscription result.
+
+    The event is serialized in the executor, and only once no matter how many
+    connections it is forwarded to.
+    """
+    try:
+        message = await connection.run_in_executor(
+            subscription_event_message, command_id, event
+        )
+    except (ValueError, TypeError):
+        LOGGER.error(f"Unable to serialize to JSON. Object: {event}", exc_info=True)
+        await connection.async_send_message(
+            error_message(
+                command_id,
+                WS_ERROR_UNKNOWN_ERROR,
+                "Invalid JSON in response",
+            )
+        )
+        return
+    await connection.async_send_message(message)
+
+
 @websocket_command(
     {
         vol.Required("type"): "subscribe_event",
@@ -157,9 +184,7 @@ async def subscribe_event(connection: WebSocketHandler, message) -> None:
 
     async def forward_event(event: Event) -> None:
         """Forward event to WebSocket connection."""
-        await connection.async_send_message(
-            subscription_result_message(message["command_id"], event)
-        )
+        await _forward_event(connection, message["command_id"], event)
 
     @debounce(
         wait=message["debounce"],
@@ -219,19 +244,13 @@ async def subscribe_states(connection: WebSocketHandler, message) -> None:
         """Forward state_changed event to WebSocket connection."""
         if "entity_id" in message:
             if event.data.entity_id == message["entity_id"]:
-                await connection.async_send_message(
-                    subscription_result_message(message["command_id"], event)
-                )
+                await _forward_event(connection, message["command_id"], event)
             return
         if "entity_ids" in message:
             if event.data.entity_id in message["entity_ids"]:
-                await connection.async_send_message(
-                    subscription_result_message(message["command_id"], event)
-                )
+                await _forward_event(connection, message["command_id"], event)
             return
-        await connection.async_send_message(
-            subscription_result_message(message["command_id"], event)
-        )
+        await _forward_event(connection, message["command_id"], event)
 
     connection.subscriptions[message["command_id"]] = connection.vis.listen_event(
         EVENT_STATE_CHANGED,
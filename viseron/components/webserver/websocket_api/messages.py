@@ -112,6 +112,18 @@ def subscription_result_message(
     }
 
 
+def subscription_event_message(command_id: int, event: Event) -> str:
+    """Return a subscription result message for an event as a JSON string.
+
+    The event is embedded using its cached JSON, so an event forwarded to several
+    connections is only serialized once.
+    """
+    return (
+        f'{{"command_id":{command_id},"type":"{TYPE_SUBSCRIPTION_RESULT}",'
+        f'"success":true,"result":{event.as_json()}}}'
+    )
+
+
 def subscription_error_message(
     command_id: int, code: str, message: str
 ) -> dict[str, Any]:
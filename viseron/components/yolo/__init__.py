@@ -2,16 +2,28 @@
 
 from __future__ import annotations
 
+import logging
+from pathlib import Path
 from typing import Any
 
+import numpy as np
 import voluptuous as vol
+from ultralytics import YOLO
 
 from viseron import Viseron
+from viseron.const import VISERON_SIGNAL_SHUTDOWN
 from viseron.domains import RequireDomain, setup_domain
 from viseron.domains.object_detector import (
-    BASE_CONFIG_SCHEMA as OBJECT_DETECTOR_BASE_CONFIG_SCHEMA,
+    BATCHED_BASE_CONFIG_SCHEMA as OBJECT_DETECTOR_BASE_CONFIG_SCHEMA,
 )
-from viseron.domains.object_detector.const import CONFIG_CAMERAS
+from viseron.domains.object_detector.batch_scheduler import BatchScheduler
+from viseron.domains.object_detector.const import (
+    CONFIG_BATCH_SIZE,
+    CONFIG_BATCH_TIMEOUT,
+    CONFIG_CAMERAS,
+)
+from viseron.domains.object_detector.detection_batch import DetectionBatch
+from viseron.exceptions import ComponentNotReady
 from viseron.helpers.schemas import FLOAT_MIN_ZERO_MAX_ONE
 from viseron.helpers.validators import Maybe
 
@@ -37,6 +49,8 @@ from .const import (
     DESC_OBJECT_DETECTOR,
 )
 
+LOGGER = logging.getLogger(__name__)
+
 OBJECT_DETECTOR_SCHEMA = OBJECT_DETECTOR_BASE_CONFIG_SCHEMA.extend(
     {
         vol.Optional(
@@ -86,6 +100,12 @@ def setup(vis: Viseron, config: dict[str, Any]) -> bool:
     config = config[COMPONENT]
 
     if config.get(CONFIG_OBJECT_DETECTOR, None):
+        try:
+            vis.data[COMPONENT] = YOLODetector(vis, config[CONFIG_OBJECT_DETECTOR])
+        except Exception as error:
+            LOGGER.error("YOLO model file not loaded: %s", error)
+            raise ComponentNotReady from error
+
         for camera_identifier in config[CONFIG_OBJECT_DETECTOR][CONFIG_CAMERAS].keys():
             setup_domain(
                 vis,
@@ -102,3 +122,57 @@ def setup(vis: Viseron, config: dict[str, Any]) -> bool:
             )
 
     return True
+
+
+class YOLODetector:
+    """YOLO model shared by all cameras.
+
+    Frames from all cameras are run through the model in batches.
+    """
+
+    def __init__(self, vis: Viseron, config: dict[str, Any]) -> None:
+        self._config = config
+        model = Path(config[CONFIG_MODEL_PATH])
+        self._detector = YOLO(model)
+        LOGGER.info(f"Loaded YOLO model: {model}")
+        LOGGER.info(f"Labels: {self._detector.names}")
+        self._label_array = np.asarray(
+            [self._detector.names[index] for index in range(len(self._detector.names))],
+            dtype=object,
+        )
+
+        self.scheduler = BatchScheduler(
+            f"{COMPONENT}.{CONFIG_OBJECT_DETECTOR}",
+            self._run_batch,
+            config[CONFIG_BATCH_SIZE],
+            config[CONFIG_BATCH_TIMEOUT],
+        )
+        vis.register_signal_handler(VISERON_SIGNAL_SHUTDOWN, self.scheduler.stop)
+
+    def _run_batch(self, frames: list[np.ndarray]) -> list:
+        """Run detection on a batch of frames."""
+        try:
+            return self._detector.predict(
+                frames,
+                conf=self._config[CONFIG_MIN_CONFIDENCE],
+                iou=self._config[CONFIG_IOU],
+                half=self._config[CONFIG_HALF_PRECISION],
+                device=self._config[CONFIG_DEVICE],
+                verbose=False,
+            )
+        except ValueError as error:
+            LOGGER.error(f"Error calling yolo prediction check yolo config: {error}")
+            return [None] * len(frames)
+
+    def post_process(
+        self, result, camera_resolution: tuple[int, int]
+    ) -> DetectionBatch:
+        """Return yolo detections as a DetectionBatch."""
+        boxes = result.boxes
+        return DetectionBatch.from_absolute(
+            self._label_array[boxes.cls.cpu().numpy().astype(int)],
+            boxes.conf.cpu().numpy(),
+            boxes.xyxy.cpu().numpy().astype(int),
+            frame_res=camera_resolution,
+            model_res=result.orig_shape[::-1],
+        )
@@ -1,25 +1,20 @@
 """YOLO object detector."""
+from __future__ import annotations
 
 import logging
-from pathlib import Path
+from queue import Empty, Queue
+from typing import TYPE_CHECKING
 
 import numpy as np
-from ultralytics import YOLO
 
-from viseron import Viseron
 from viseron.domains.object_detector import AbstractObjectDetector
-from viseron.domains.object_detector.detected_object import DetectedObject
-from viseron.exceptions import DomainNotReady
 
-from .const import (
-    COMPONENT,
-    CONFIG_DEVICE,
-    CONFIG_HALF_PRECISION,
-    CONFIG_IOU,
-    CONFIG_MIN_CONFIDENCE,
-    CONFIG_MODEL_PATH,
-    CONFIG_OBJECT_DETECTOR,
-)
+from .const import COMPONENT, CONFIG_OBJECT_DETECTOR
+
+if TYPE_CHECKING:
+    from viseron import Viseron
+    from viseron.components.yolo import YOLODetector
+    from viseron.domains.object_detector.detection_batch import DetectionBatch
 
 LOGGER = logging.getLogger(__name__)
 
@@ -38,61 +33,20 @@ class ObjectDetector(AbstractObjectDetector):
         super().__init__(
             vis, COMPONENT, config[CONFIG_OBJECT_DETECTOR], camera_identifier
         )
-
-        try:
-            model = Path(self._config[CONFIG_MODEL_PATH])
-            self._detector = YOLO(model)
-        except Exception as error:
-            LOGGER.error("YOLO model file not loaded: %s", error)
-            raise DomainNotReady from error
-
-        LOGGER.info(f"Loaded YOLO model: {model}")
-        LOGGER.info(f"Labels: {self._detector.names}")
+        self._yolo: YOLODetector = vis.data[COMPONENT]
+        self._object_result_queue: Queue = Queue(maxsize=1)
 
     def preprocess(self, frame):
         """Preprocess frame before detection."""
 
         return np.array(frame)
 
-    def postprocess(self, results):
-        """Return yolo detections as DetectedObject."""
-
-        objects = []
-
-        for result in results:
-            classes_names = result.names
-
-            for box in result.boxes:
-                cls = int(box.cls[0])
-                [x1, y1, x2, y2] = box.xyxy[0]
-                x1, y1, x2, y2 = int(x1), int(y1), int(x2), int(y2)
-                objects.append(
-                    DetectedObject.from_absolute(
-                        label=classes_names[cls],
-                        confidence=float(box.conf),
-                        x1=x1,
-                        y1=y1,
-                        x2=x2,
-                        y2=y2,
-                        frame_res=self._camera.resolution,
-                        model_res=result.orig_shape[::-1],
-                    )
-                )
-        return objects
-
-    def return_objects(self, frame):
+    def return_objects(self, frame) -> DetectionBatch | None:
         """Perform object detection."""
         try:
-            results = self._detector.predict(
-                frame,
-                conf=self._config[CONFIG_MIN_CONFIDENCE],
-                iou=self._config[CONFIG_IOU],
-                half=self._config[CONFIG_HALF_PRECISION],
-                device=self._config[CONFIG_DEVICE],
-                verbose=False,
-            )
-        except ValueError as error:
-            LOGGER.error(f"Error calling yolo prediction check yolo config: {error}")
+            result = self._yolo.scheduler.request(frame, self._object_result_queue)
+        except Empty:
+            return None
+        if result is None:
             return []
-
-        return self.postprocess(results)
+        return self._yolo.post_process(result, self.frame_resolution)
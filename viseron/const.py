@@ -101,6 +101,7 @@ ENV_JETSON_NANO = "VISERON_JETSON_NANO"
 ENV_PROFILE_MEMORY = "VISERON_PROFILE_MEMORY"
 ENV_LOG_MAX_BYTES = "VISERON_LOG_MAX_BYTES"
 ENV_LOG_BACKUP_COUNT = "VISERON_LOG_BACKUP_COUNT"
+ENV_DATA_STREAM_WORKERS = "VISERON_DATA_STREAM_WORKERS"
 
 
 FONT = cv2.FONT_HERSHEY_SIMPLEX
@@ -129,6 +130,9 @@ VISERON_SIGNAL_SHUTDOWN: Final = "shutdown"
 VISERON_SIGNAL_LAST_WRITE: Final = "last_write"
 VISERON_SIGNAL_STOPPING: Final = "stopping"
 
+# Seconds between debug log lines with the statistics of queues, pools and caches
+STATISTICS_LOG_INTERVAL: Final = 300
+
 # State constants
 STATE_ON = "on"
 STATE_OFF = "off"
@@ -33,22 +33,18 @@ from viseron.components.storage.const import (
 )
 from viseron.components.storage.models import Files
 from viseron.components.webserver.const import COMPONENT as WEBSERVER_COMPONENT
-from viseron.const import TEMP_DIR
+from viseron.const import (
+    STATISTICS_LOG_INTERVAL,
+    TEMP_DIR,
+    VISERON_SIGNAL_LAST_WRITE,
+)
 from viseron.domains import AbstractDomain
 from viseron.domains.camera.const import DOMAIN
 from viseron.domains.camera.entity.sensor import CamerAccessTokenSensor
 from viseron.domains.camera.fragmenter import Fragmenter
 from viseron.domains.camera.recorder import FailedCameraRecorder
 from viseron.events import EventData, EventEmptyData
-from viseron.helpers import (
-    annotate_frame,
-    calculate_absolute_coords,
-    create_directory,
-    draw_objects,
-    escape_string,
-    utcnow,
-    zoom_boundingbox,
-)
+from viseron.helpers import calculate_absolute_coords, escape_string, utcnow
 from viseron.helpers.logs import SensitiveInformationFilter
 from viseron.types import SnapshotDomain
 
@@ -57,6 +53,7 @@ from .const import (
     CONFIG_NAME,
     CONFIG_PASSWORD,
     CONFIG_REFRESH_INTERVAL,
+    CONFIG_SNAPSHOT_JPEG_QUALITY,
     CONFIG_STILL_IMAGE,
     CONFIG_STILL_IMAGE_HEIGHT,
     CONFIG_STILL_IMAGE_WIDTH,
@@ -77,6 +74,7 @@ from .entity.binary_sensor import (
 )
 from .entity.toggle import CameraConnectionToggle
 from .shared_frames import SharedFrames
+from .snapshot_writer import SnapshotJob, SnapshotWriter
 
 if TYPE_CHECKING:
     from viseron import Viseron
@@ -131,6 +129,14 @@ class AbstractCamera(AbstractDomain):
         self._data_stream: DataStream = vis.data[DATA_STREAM_COMPONENT]
         self.current_frame: SharedFrame | None = None
         self.shared_frames = SharedFrames(vis)
+        self._snapshot_writer = SnapshotWriter(
+            self.shared_frames,
+            self._config[CONFIG_SNAPSHOT_JPEG_QUALITY],
+            f"viseron.camera.{self.identifier}",
+        )
+        vis.register_signal_handler(
+            VISERON_SIGNAL_LAST_WRITE, self._snapshot_writer.stop
+        )
         self.frame_bytes_topic = DATA_FRAME_BYTES_TOPIC.format(
             camera_identifier=self.identifier
         )
@@ -149,6 +155,11 @@ class AbstractCamera(AbstractDomain):
         self._vis.background_scheduler.add_job(
             self.update_token, "interval", minutes=UPDATE_TOKEN_INTERVAL_MINUTES
         )
+        self._vis.background_scheduler.add_job(
+            self.log_shared_frames_statistics,
+            "interval",
+            seconds=STATISTICS_LOG_INTERVAL,
+        )
 
         self._storage: Storage = vis.data[STORAGE_COMPONENT]
         self.event_clips_folder: str = self._storage.get_event_clips_path(self)
@@ -216,6 +227,19 @@ class AbstractCamera(AbstractDomain):
         """Generate a new access token."""
         return secrets.token_hex(64)
 
+    def log_shared_frames_statistics(self) -> None:
+        """Log frame pool and derived frame cache statistics at debug level."""
+        pool = self.shared_frames.pool.statistics
+        self._logger.debug(
+            f"Frame pool: {pool.hits} hits, {pool.misses} misses, "
+            f"{pool.live_frames} live frames, {pool.free_buffers} free buffers"
+        )
+        derived = self.shared_frames.derived_frame_statistics
+        self._logger.debug(
+            f"Derived frame cache: {derived.hits} hits, {derived.misses} misses, "
+            f"{derived.hit_rate:.0%} hit rate, {derived.entries} entries"
+        )
+
     def update_token(self) -> None:
         """Update access token."""
         old_access_token = None
@@ -447,17 +471,23 @@ class AbstractCamera(AbstractDomain):
         if self._clear_cache_timer:
             self._clear_cache_timer.cancel()
 
-        decoded_frame = self.shared_frames.get_decoded_frame_rgb(current_frame)
-        if width and height:
-            decoded_frame = cv2.resize(
-                decoded_frame, (width, height), interpolation=cv2.INTER_AREA
-            )
-        elif width or height:
-            decoded_frame = imutils.resize(decoded_frame, width, height)
+        with current_frame:
+            if width and height:
+                decoded_frame = self.shared_frames.get_frame(
+                    current_frame,
+                    size=(width, height),
+                    interpolation=cv2.INTER_AREA,
+                )
+            else:
+                decoded_frame = self.shared_frames.get_decoded_frame_rgb(
+                    current_frame
+                )
+                if width or height:
+                    decoded_frame = imutils.resize(decoded_frame, width, height)
 
-        ret, jpg = cv2.imencode(
-            ".jpg", decoded_frame, [int(cv2.IMWRITE_JPEG_QUALITY), 100]
-        )
+            ret, jpg = cv2.imencode(
+                ".jpg", decoded_frame, [int(cv2.IMWRITE_JPEG_QUALITY), 100]
+            )
 
         # Start a timer to clear the cache after some time.
         # This is done to avoid storing a frame in memory after its no longer valid
@@ -493,26 +523,11 @@ class AbstractCamera(AbstractDomain):
         text: str | None = None,
         subfolder: str | None = None,
     ) -> str:
-        """Save snapshot to disk."""
-        decoded_frame = self.shared_frames.get_decoded_frame_rgb(shared_frame)
-        snapshot_frame = decoded_frame
-
-        if detected_object:
-            draw_objects(snapshot_frame, [detected_object])
-        if bbox:
-            annotate_frame(
-                snapshot_frame,
-                calculate_absolute_coords(bbox, self.resolution),
-                text or None,
-            )
-
-        if zoom_coordinates:
-            snapshot_frame = zoom_boundingbox(
-                decoded_frame,
-                calculate_absolute_coords(zoom_coordinates, self.resolution),
-                crop_correction_factor=1.2,
-            )
+        """Save snapshot to disk.
 
+        Returns the path of the snapshot right away. The snapshot is drawn, encoded
+        and written by the snapshot writer.
+        """
         folder = self._get_folder(domain)
 
         if subfolder:
@@ -521,9 +536,20 @@ class AbstractCamera(AbstractDomain):
         filename = f"{utcnow().strftime('%Y-%m-%d-%H-%M-%S-')}{str(uuid4())}.jpg"
 
         path = os.path.join(folder, filename)
-        self._logger.debug(f"Saving snapshot to {path}")
-        create_directory(folder)
-        cv2.imwrite(path, snapshot_frame, [int(cv2.IMWRITE_JPEG_QUALITY), 100])
+        self._snapshot_writer.submit(
+            shared_frame,
+            SnapshotJob(
+                path=path,
+                zoom_coordinates=(
+                    calculate_absolute_coords(zoom_coordinates, self.resolution)
+                    if zoom_coordinates
+                    else None
+                ),
+                detected_object=detected_object,
+                bbox=calculate_absolute_coords(bbox, self.resolution) if bbox else None,
+                text=text or None,
+            ),
+        )
         return path
 
 
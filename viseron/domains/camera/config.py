@@ -51,6 +51,7 @@ from .const import (
     CONFIG_REFRESH_INTERVAL,
     CONFIG_RETAIN,
     CONFIG_SAVE_TO_DISK,
+    CONFIG_SNAPSHOT_JPEG_QUALITY,
     CONFIG_STILL_IMAGE,
     CONFIG_STILL_IMAGE_HEIGHT,
     CONFIG_STILL_IMAGE_WIDTH,
@@ -82,6 +83,7 @@ from .const import (
     DEFAULT_RECORDER,
     DEFAULT_REFRESH_INTERVAL,
     DEFAULT_SAVE_TO_DISK,
+    DEFAULT_SNAPSHOT_JPEG_QUALITY,
     DEFAULT_STILL_IMAGE,
     DEFAULT_STILL_IMAGE_HEIGHT,
     DEFAULT_STILL_IMAGE_WIDTH,
@@ -122,6 +124,7 @@ from .const import (
     DESC_REFRESH_INTERVAL,
     DESC_RETAIN,
     DESC_SAVE_TO_DISK,
+    DESC_SNAPSHOT_JPEG_QUALITY,
     DESC_STILL_IMAGE,
     DESC_STILL_IMAGE_HEIGHT,
     DESC_STILL_IMAGE_WIDTH,
@@ -341,6 +344,11 @@ BASE_CONFIG_SCHEMA = vol.Schema(
             default=DEFAULT_STILL_IMAGE,
             description=DESC_STILL_IMAGE,
         ): vol.All(CoerceNoneToDict(), STILL_IMAGE_SCHEMA),
+        vol.Optional(
+            CONFIG_SNAPSHOT_JPEG_QUALITY,
+            default=DEFAULT_SNAPSHOT_JPEG_QUALITY,
+            description=DESC_SNAPSHOT_JPEG_QUALITY,
+        ): vol.All(int, vol.Range(min=1, max=100)),
         vol.Optional(
             CONFIG_STORAGE,
             default=DEFAULT_STORAGE,
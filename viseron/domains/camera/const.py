@@ -23,6 +23,8 @@ EVENT_RECORDER_START = "{camera_identifier}/recorder/start"
 EVENT_RECORDER_STOP = "{camera_identifier}/recorder/stop"
 EVENT_RECORDER_COMPLETE = "{camera_identifier}/recorder/complete"
 
+SNAPSHOT_WRITER_WORKERS: Final = 2
+
 EVENT_CAMERA_EVENT_DB_OPERATION = (
     "{camera_identifier}/camera_event/{domain}/{operation}"
 )
@@ -223,14 +225,20 @@ AUTHENTICATION_DIGEST = "digest"
 CONFIG_NAME = "name"
 CONFIG_MJPEG_STREAMS = "mjpeg_streams"
 CONFIG_RECORDER = "recorder"
+CONFIG_SNAPSHOT_JPEG_QUALITY: Final = "snapshot_jpeg_quality"
 
 DEFAULT_NAME: Final = None
 DEFAULT_MJPEG_STREAMS: Final = None
 DEFAULT_RECORDER: Final = None
+DEFAULT_SNAPSHOT_JPEG_QUALITY: Final = 100
 
 DESC_NAME = "Camera friendly name."
 DESC_MJPEG_STREAMS = "MJPEG streams config."
 DESC_RECORDER = "Recorder config."
+DESC_SNAPSHOT_JPEG_QUALITY = (
+    "JPEG quality of the snapshots saved for objects, motion, faces and license "
+    "plates. Lower values give smaller files that are faster to encode."
+)
 DESC_MJPEG_STREAM = (
     "Name of the MJPEG stream. Used to build the URL to access the stream.<br>"
     "Valid characters are lowercase a-z, numbers and underscores."
@@ -19,6 +19,8 @@ class CameraSensor(CameraEntity, SensorEntity):
 class CamerAccessTokenSensor(CameraSensor):
     """Entity that holds the value of the current access token for a camera."""
 
+    store_state_history = False
+
     def __init__(
         self,
         vis: Viseron,
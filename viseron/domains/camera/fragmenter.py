@@ -26,7 +26,7 @@ from viseron.components.storage.const import (
     CleanupJobNames,
 )
 from viseron.components.storage.models import FilesMeta
-from viseron.components.storage.queries import get_time_period_fragments
+from viseron.components.storage.queries import get_time_period_runs
 from viseron.const import CAMERA_SEGMENT_DURATION, TEMP_DIR, VISERON_SIGNAL_SHUTDOWN
 from viseron.domains.camera.const import CONFIG_FFMPEG_LOGLEVEL, CONFIG_RECORDER
 from viseron.events import EventEmptyData
@@ -664,37 +664,12 @@ def get_available_timespans(
     time_to: int | float | None = None,
 ) -> list[Timespan]:
     """Get the available timespans of HLS fragments for a time period."""
-    files = get_time_period_fragments(
-        camera_identifiers, time_from, time_to, get_session
-    )
-    fragments = [
-        Fragment(
-            file.filename,
-            f"/files{file.path}",
-            file.duration,
-            file.orig_ctime,
-        )
-        for file in files
+    runs = get_time_period_runs(camera_identifiers, time_from, time_to, get_session)
+    return [
+        {
+            "start": int(run.start.timestamp()),
+            "end": int(run.end.timestamp()),
+            "duration": int(run.end.timestamp() - run.start.timestamp()),
+        }
+        for run in runs
     ]
-
-    timespans: list[Timespan] = []
-    start = None
-    end = None
-    for fragment in fragments:
-        if start is None:
-            start = fragment.creation_time.timestamp()
-        if end is None:
-            end = fragment.creation_time.timestamp() + fragment.duration
-        if fragment.creation_time.timestamp() > end + fragment.duration:
-            timespans.append(
-                {"start": int(start), "end": int(end), "duration": int(end - start)}
-            )
-            start = None
-            end = None
-        else:
-            end = fragment.creation_time.timestamp() + fragment.duration
-    if start is not None and end is not None:
-        timespans.append(
-            {"start": int(start), "end": int(end), "duration": int(end - start)}
-        )
-    return timespans
@@ -6,8 +6,10 @@ import datetime
 import logging
 import os
 import shutil
+import threading
 from abc import ABC, abstractmethod
 from collections.abc import Callable, Sequence
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
 from time import sleep
 from typing import TYPE_CHECKING, Any, TypedDict
@@ -20,7 +22,7 @@ from sqlalchemy.orm import Session
 from viseron.components.storage.const import COMPONENT as STORAGE_COMPONENT
 from viseron.components.storage.models import Recordings
 from viseron.components.storage.queries import get_recording_fragments
-from viseron.const import CAMERA_SEGMENT_DURATION
+from viseron.const import CAMERA_SEGMENT_DURATION, VISERON_SIGNAL_LAST_WRITE
 from viseron.domains.camera.fragmenter import Fragment
 from viseron.domains.object_detector.detected_object import DetectedObject
 from viseron.events import EventData
@@ -200,6 +202,19 @@ class AbstractRecorder(ABC, RecorderBase):
         self.is_recording = False
         self._active_recording: Recording | None = None
 
+        # Database writes and thumbnails are handled by a single worker per
+        # camera, which keeps them in the order start and stop were called
+        self._persist_executor = ThreadPoolExecutor(
+            max_workers=1,
+            thread_name_prefix=f"viseron.camera.{self._camera.identifier}.recorder",
+        )
+        self._reserved_recording_id: int | None = None
+        self._reserved_recording_id_lock = threading.Lock()
+        # Reserve the id of the first recording up front, so start never waits
+        # for the database
+        self._persist(self._prefetch_recording_id)
+        vis.register_signal_handler(VISERON_SIGNAL_LAST_WRITE, self._shutdown)
+
         create_directory(self._camera.event_clips_folder)
         create_directory(self._camera.segments_folder)
         create_directory(self._camera.temp_segments_folder)
@@ -220,8 +235,7 @@ class AbstractRecorder(ABC, RecorderBase):
     ) -> tuple[np.ndarray, str]:
         """Create thumbnails, sent to MQTT and/or saved to disk based on config."""
         self._logger.debug(f"Saving thumbnail in {self._camera.thumbnails_folder}")
-        thumbnail_name = f"{recording_id}.jpg"
-        thumbnail_path = os.path.join(self._camera.thumbnails_folder, thumbnail_name)
+        thumbnail_path = self._thumbnail_path(recording_id)
 
         if objects:
             draw_objects(
@@ -240,46 +254,72 @@ class AbstractRecorder(ABC, RecorderBase):
                 self._logger.error("Failed saving latest_thumbnail.jpg to disk")
         return frame, thumbnail_path
 
+    def _thumbnail_path(self, recording_id: int) -> str:
+        return os.path.join(self._camera.thumbnails_folder, f"{recording_id}.jpg")
+
+    def _reserve_recording_id(self) -> int:
+        """Reserve the id of a recording from the database sequence."""
+        with self._storage.get_session() as session:
+            return session.execute(
+                select(
+                    func.nextval(
+                        func.pg_get_serial_sequence(Recordings.__tablename__, "id")
+                    )
+                )
+            ).scalar_one()
+
+    def _take_recording_id(self) -> int:
+        """Return the reserved recording id and reserve the next one in the worker.
+
+        The id is only reserved in the caller thread if the worker has not been
+        able to reserve one, for example if the database was unavailable.
+        """
+        with self._reserved_recording_id_lock:
+            recording_id = self._reserved_recording_id
+            self._reserved_recording_id = None
+        if recording_id is None:
+            recording_id = self._reserve_recording_id()
+        self._persist(self._prefetch_recording_id)
+        return recording_id
+
+    def _prefetch_recording_id(self) -> None:
+        recording_id = self._reserve_recording_id()
+        with self._reserved_recording_id_lock:
+            if self._reserved_recording_id is None:
+                self._reserved_recording_id = recording_id
+
+    def _persist(self, target: Callable[..., None], *args: Any) -> None:
+        """Run target in the persistence worker.
+
+        Runs target in the calling thread if the worker has been shut down.
+        """
+        try:
+            self._persist_executor.submit(self._run_persist, target, *args)
+        except RuntimeError:
+            self._run_persist(target, *args)
+
+    def _run_persist(self, target: Callable[..., None], *args: Any) -> None:
+        try:
+            target(*args)
+        except Exception as error:  # pylint: disable=broad-except
+            self._logger.error(f"Failed to persist recording: {error}")
+
     def start(
         self,
         shared_frame: SharedFrame,
         objects_in_fov: list[DetectedObject],
         trigger_type: TriggerTypes,
     ) -> Recording:
-        """Start recording."""
+        """Start recording.
+
+        The recording is started in memory and returned right away. The thumbnail
+        and the database row are written by the persistence worker, which then
+        dispatches EVENT_RECORDER_START with the thumbnail attached.
+        """
         self._logger.info("Starting recorder")
         self.is_recording = True
         start_time = utcnow()
-
-        with self._storage.get_session() as session:
-            stmt = (
-                insert(Recordings)
-                .values(
-                    camera_identifier=self._camera.identifier,
-                    trigger_type=trigger_type,
-                    start_time=start_time,
-                    adjusted_start_time=start_time
-                    - datetime.timedelta(seconds=self.lookback)
-                    - datetime.timedelta(seconds=CAMERA_SEGMENT_DURATION),
-                )
-                .returning(Recordings.id)
-            )
-            result = session.execute(stmt).scalars()
-            recording_id = result.one()
-            thumbnail, thumbnail_path = self.create_thumbnail(
-                recording_id,
-                self._camera.shared_frames.get_decoded_frame_rgb(shared_frame).copy(),
-                objects_in_fov,
-            )
-            stmt2 = (
-                update(Recordings)
-                .values(
-                    thumbnail_path=thumbnail_path,
-                )
-                .where(Recordings.id == recording_id)
-            )
-            session.execute(stmt2)
-            session.commit()
+        recording_id = self._take_recording_id()
 
         recording = Recording(
             id=recording_id,
@@ -288,9 +328,9 @@ class AbstractRecorder(ABC, RecorderBase):
             end_time=None,
             end_timestamp=None,
             date=start_time.date().isoformat(),
-            thumbnail=thumbnail,
+            thumbnail=None,
             thumbnail_path=(
-                thumbnail_path
+                self._thumbnail_path(recording_id)
                 if self._config[CONFIG_RECORDER][CONFIG_THUMBNAIL][CONFIG_SAVE_TO_DISK]
                 else None
             ),
@@ -300,6 +340,48 @@ class AbstractRecorder(ABC, RecorderBase):
 
         self._start(recording, shared_frame, objects_in_fov)
         self._active_recording = recording
+        # Hold the frame until the worker has created the thumbnail from it
+        shared_frame.acquire()
+        self._persist(self._persist_start, recording, shared_frame, trigger_type)
+        return recording
+
+    def _persist_start(
+        self,
+        recording: Recording,
+        shared_frame: SharedFrame,
+        trigger_type: TriggerTypes,
+    ) -> None:
+        """Create the thumbnail and insert the recording."""
+        thumbnail: np.ndarray | None = None
+        thumbnail_path = self._thumbnail_path(recording.id)
+        try:
+            try:
+                frame = self._camera.shared_frames.get_decoded_frame_rgb(
+                    shared_frame
+                ).copy()
+            finally:
+                shared_frame.release()
+            thumbnail, thumbnail_path = self.create_thumbnail(
+                recording.id, frame, recording.objects
+            )
+        except Exception as error:  # pylint: disable=broad-except
+            self._logger.error(f"Failed to create thumbnail: {error}")
+
+        with self._storage.get_session() as session:
+            stmt = insert(Recordings).values(
+                id=recording.id,
+                camera_identifier=self._camera.identifier,
+                trigger_type=trigger_type,
+                start_time=recording.start_time,
+                adjusted_start_time=recording.start_time
+                - datetime.timedelta(seconds=self.lookback)
+                - datetime.timedelta(seconds=CAMERA_SEGMENT_DURATION),
+                thumbnail_path=thumbnail_path,
+            )
+            session.execute(stmt)
+            session.commit()
+
+        recording.thumbnail = thumbnail
         self._vis.dispatch_event(
             EVENT_RECORDER_START.format(camera_identifier=self._camera.identifier),
             EventRecorderData(
@@ -307,7 +389,6 @@ class AbstractRecorder(ABC, RecorderBase):
                 recording=recording,
             ),
         )
-        return recording
 
     @abstractmethod
     def _start(
@@ -319,7 +400,11 @@ class AbstractRecorder(ABC, RecorderBase):
         """Start the recorder."""
 
     def stop(self, recording: Recording | None) -> None:
-        """Stop recording."""
+        """Stop recording.
+
+        The end time is written by the persistence worker after the recording has
+        been inserted, followed by EVENT_RECORDER_STOP.
+        """
         self._logger.info("Stopping recorder")
         if recording is None:
             self._logger.error("No active recording to stop")
@@ -329,6 +414,13 @@ class AbstractRecorder(ABC, RecorderBase):
         recording.end_time = end_time
         recording.end_timestamp = end_time.timestamp()
 
+        self._stop(recording)
+        self._active_recording = None
+        self.is_recording = False
+        self._persist(self._persist_stop, recording)
+
+    def _persist_stop(self, recording: Recording) -> None:
+        """Update the end time of the recording."""
         with self._storage.get_session() as session:
             stmt = (
                 update(Recordings)
@@ -340,8 +432,6 @@ class AbstractRecorder(ABC, RecorderBase):
             session.execute(stmt)
             session.commit()
 
-        self._stop(recording)
-        self._active_recording = None
         self._vis.dispatch_event(
             EVENT_RECORDER_STOP.format(camera_identifier=self._camera.identifier),
             EventRecorderData(
@@ -349,7 +439,6 @@ class AbstractRecorder(ABC, RecorderBase):
                 recording=recording,
             ),
         )
-        self.is_recording = False
 
         if self._config[CONFIG_RECORDER][CONFIG_CREATE_EVENT_CLIP]:
             concat_thread = RestartableThread(
@@ -428,6 +517,10 @@ class AbstractRecorder(ABC, RecorderBase):
     def _stop(self, recording: Recording):
         """Stop the recorder."""
 
+    def _shutdown(self) -> None:
+        """Wait for pending recordings to be written."""
+        self._persist_executor.shutdown(wait=True)
+
     @property
     def idle_timeout(self):
         """Return idle timeout."""
@@ -5,13 +5,17 @@ import logging
 import threading
 import time
 import uuid
-from functools import lru_cache
+from collections import deque
+from collections.abc import Callable
+from dataclasses import dataclass
+from multiprocessing import shared_memory
 from typing import TYPE_CHECKING
 
 import cv2
 import numpy as np
 
-from viseron.helpers.decorators import return_copy
+from viseron.helpers import apply_mask
+from viseron.watchdog.thread_watchdog import RestartableThread
 
 if TYPE_CHECKING:
     from viseron import Viseron
@@ -28,6 +32,23 @@ COLOR_MODEL_GRAY = "gray"
 CONVERTER = "converter"
 CHANNELS = "channels"
 
+SLOT_STATE_FREE = 0
+SLOT_STATE_WRITTEN = 1
+SLOT_STATE_CLAIMED = 2
+
+# Seconds a frame is kept after its owner has released it, allowing subscribers
+# that have the frame queued to acquire it
+FRAME_RELEASE_GRACE_PERIOD = 2
+FRAME_POOL_SWEEP_INTERVAL = 0.25
+FRAME_POOL_MAX_FREE_BUFFERS = 8
+
+# Header layout of SharedFrameRingBuffer, in int64 words
+_HEADER_SEQUENCE = 0
+_HEADER_OVERRUNS = 1
+_HEADER_GENERATION = 2
+_HEADER_RESTART_SEQUENCE = 3
+_HEADER_WORDS = 4
+
 PIXEL_FORMATS = {
     PIXEL_FORMAT_YUV420P: {
         COLOR_MODEL_RGB: {
@@ -70,83 +91,583 @@ class SharedFrame:
         self.resolution = resolution
         self.camera_identifier = camera_identifier
         self.capture_time = time.time()
-        self.reference_count = 0
+        self._reference_count = 0
+        self._lock = threading.Lock()
+        self._pool: FramePool | None = None
+
+    @property
+    def reference_count(self) -> int:
+        """Return number of holders of the frame."""
+        return self._reference_count
+
+    def acquire(self) -> None:
+        """Increase reference count."""
+        with self._lock:
+            self._reference_count += 1
+
+    def release(self) -> None:
+        """Decrease reference count.
+
+        The frame is returned to its pool when the last holder releases it.
+        """
+        with self._lock:
+            self._reference_count -= 1
+            last_reference = self._reference_count == 0
+        if last_reference and self._pool:
+            self._pool.free(self)
 
     def __enter__(self) -> None:
         """Increase reference count."""
-        self.reference_count += 1
+        self.acquire()
 
     def __exit__(self, exc_type, exc_val, exc_tb) -> None:
         """Decrease reference count."""
-        self.reference_count -= 1
+        self.release()
+
+
+@dataclass
+class FramePoolStatistics:
+    """Statistics of a FramePool."""
+
+    hits: int
+    misses: int
+    live_frames: int
+    free_buffers: int
+
+
+class FramePool:
+    """Reference counted pool of frame buffers.
+
+    A frame is acquired by its owner when it is added to the pool. Holders that use
+    the frame acquire and release it, and when the last holder releases it the
+    buffers allocated for the frame are returned to a free list. The next frame of
+    the same geometry reuses a buffer from the free list (a hit) instead of
+    allocating a new one (a miss).
+
+    The owner releases its reference through release_owner. A single sweeper thread
+    defers that release for a grace period, since subscribers might have the frame
+    queued without having acquired it yet.
+    """
+
+    def __init__(
+        self,
+        on_free: Callable[[SharedFrame], None],
+        grace_period: float = FRAME_RELEASE_GRACE_PERIOD,
+        max_free_buffers: int = FRAME_POOL_MAX_FREE_BUFFERS,
+    ) -> None:
+        self._on_free = on_free
+        self._grace_period = grace_period
+        self._max_free_buffers = max_free_buffers
+
+        self._lock = threading.Lock()
+        self._live_frames: dict[uuid.UUID, SharedFrame] = {}
+        self._frame_buffers: dict[uuid.UUID, list[np.ndarray]] = {}
+        self._free_buffers: dict[
+            tuple[tuple[int, ...], np.dtype], list[np.ndarray]
+        ] = {}
+        self._hits = 0
+        self._misses = 0
+
+        self._pending: deque[
+            tuple[float, SharedFrame, Callable[[SharedFrame], bool] | None]
+        ] = deque()
+        self._sweeper: RestartableThread | None = None
+        self._kill_received = threading.Event()
+
+    def add(self, shared_frame: SharedFrame) -> None:
+        """Add frame to the pool, acquiring it on behalf of its owner."""
+        shared_frame._pool = self  # pylint: disable=protected-access
+        with self._lock:
+            self._live_frames[shared_frame.name] = shared_frame
+            self._frame_buffers[shared_frame.name] = []
+        shared_frame.acquire()
+
+        if self._sweeper is None:
+            self._sweeper = RestartableThread(
+                name=f"viseron.camera.{shared_frame.camera_identifier}.frame_pool",
+                target=self._sweep,
+                daemon=True,
+                register=True,
+            )
+            self._sweeper.start()
+
+    def get_buffer(
+        self, shared_frame: SharedFrame, shape: tuple[int, ...], dtype=np.uint8
+    ) -> np.ndarray:
+        """Return a buffer that lives as long as the frame."""
+        key = (shape, np.dtype(dtype))
+        with self._lock:
+            free_buffers = self._free_buffers.get(key)
+            if free_buffers:
+                self._hits += 1
+                buffer = free_buffers.pop()
+            else:
+                self._misses += 1
+                buffer = np.empty(shape, dtype=dtype)
+            if (
+                frame_buffers := self._frame_buffers.get(shared_frame.name)
+            ) is not None:
+                frame_buffers.append(buffer)
+        return buffer
+
+    def free(self, shared_frame: SharedFrame) -> None:
+        """Remove frame and return its buffers to the free list.
+
+        Called when the last holder releases the frame.
+        """
+        with self._lock:
+            if self._live_frames.pop(shared_frame.name, None) is None:
+                return
+            frame_buffers = self._frame_buffers.pop(shared_frame.name, [])
+
+        # Buffers are only returned once the frame can no longer be looked up
+        self._on_free(shared_frame)
+        with self._lock:
+            for buffer in frame_buffers:
+                free_buffers = self._free_buffers.setdefault(
+                    (buffer.shape, buffer.dtype), []
+                )
+                if len(free_buffers) < self._max_free_buffers:
+                    free_buffers.append(buffer)
+
+    def release_owner(
+        self,
+        shared_frame: SharedFrame,
+        keep: Callable[[SharedFrame], bool] | None = None,
+        immediate: bool = False,
+    ) -> None:
+        """Release the owners reference after the grace period.
+
+        If keep returns True when the grace period has passed, the release is
+        postponed for another grace period.
+        """
+        if immediate:
+            shared_frame.release()
+            return
+        self._pending.append(
+            (time.monotonic() + self._grace_period, shared_frame, keep)
+        )
+
+    def _sweep(self) -> None:
+        """Release frames whose grace period has passed."""
+        while not self._kill_received.wait(FRAME_POOL_SWEEP_INTERVAL):
+            now = time.monotonic()
+            while self._pending and self._pending[0][0] <= now:
+                _, shared_frame, keep = self._pending.popleft()
+                if keep and keep(shared_frame):
+                    self._pending.append((now + self._grace_period, shared_frame, keep))
+                    continue
+                shared_frame.release()
+
+    def release_all(self) -> None:
+        """Free all frames regardless of holders and stop the sweeper."""
+        self._kill_received.set()
+        if self._sweeper:
+            self._sweeper.stop()
+        self._pending.clear()
+        with self._lock:
+            live_frames = list(self._live_frames.values())
+        for shared_frame in live_frames:
+            self.free(shared_frame)
+
+    @property
+    def statistics(self) -> FramePoolStatistics:
+        """Return pool statistics."""
+        with self._lock:
+            return FramePoolStatistics(
+                hits=self._hits,
+                misses=self._misses,
+                live_frames=len(self._live_frames),
+                free_buffers=sum(
+                    len(buffers) for buffers in self._free_buffers.values()
+                ),
+            )
+
+
+@dataclass
+class DerivedFrameCacheStatistics:
+    """Statistics of the derived frame cache of SharedFrames."""
+
+    hits: int
+    misses: int
+    entries: int
+    hit_rate: float
+
+
+class SharedFrameRingBuffer:
+    """Ring buffer of preallocated raw frame slots in shared memory.
+
+    The buffer is created by the consuming process and inherited by the process that
+    reads frames from the decoder. The writer reads each frame straight into a free
+    slot and only the slot index and sequence number are passed between the
+    processes.
+
+    Every slot has a state that is owned by one side at a time:
+        - free: only the writer may move it to written.
+        - written: only the consumer may claim it, or free it if it was written by a
+          previous writer and never claimed.
+        - claimed: only the consumer may release it back to free.
+
+    A restarted writer starts a new generation. Messages from the previous writer
+    might have been lost, so when the consumer sees the new generation it frees the
+    slots that were written before the restart and never claimed.
+
+    A slot is never reused while a frame is referencing it. If all slots are in use
+    the frame is read into a scratch buffer and dropped, which is counted as an
+    overrun.
+    """
+
+    def __init__(self, slot_size: int, slots: int) -> None:
+        self.slot_size = slot_size
+        self.slots = slots
+
+        header_size = (_HEADER_WORDS + slots) * 8
+        # Keep the slot data aligned for the consumers
+        self._data_offset = -(-(header_size + slots) // 64) * 64
+        self._shm = shared_memory.SharedMemory(
+            create=True, size=self._data_offset + slot_size * slots
+        )
+        self._header: np.ndarray = np.ndarray(
+            (_HEADER_WORDS,), dtype=np.int64, buffer=self._shm.buf
+        )
+        self._sequences: np.ndarray = np.ndarray(
+            (slots,), dtype=np.int64, buffer=self._shm.buf, offset=_HEADER_WORDS * 8
+        )
+        self._states: np.ndarray = np.ndarray(
+            (slots,), dtype=np.uint8, buffer=self._shm.buf, offset=header_size
+        )
+        self._header[:] = 0
+        self._sequences[:] = -1
+        self._states[:] = SLOT_STATE_FREE
+
+        self._next_slot = 0
+        self._scratch: memoryview | None = None
+
+    @property
+    def name(self) -> str:
+        """Return name of the shared memory block."""
+        return self._shm.name
+
+    @property
+    def overruns(self) -> int:
+        """Return number of frames dropped because all slots were in use."""
+        return int(self._header[_HEADER_OVERRUNS])
+
+    @property
+    def slots_in_use(self) -> int:
+        """Return number of slots that are written or claimed."""
+        return int(np.count_nonzero(self._states))
+
+    def _slot_view(self, slot: int) -> memoryview:
+        start = self._data_offset + slot * self.slot_size
+        return self._shm.buf[start : start + self.slot_size]
+
+    @property
+    def generation(self) -> int:
+        """Return number of times a writer has been started."""
+        return int(self._header[_HEADER_GENERATION])
+
+    def restart(self) -> None:
+        """Start a new writer generation.
+
+        Called by a new writer on start. The writer does not touch the written
+        slots of the previous writer, they are freed by the consumer in reclaim.
+        """
+        self._header[_HEADER_RESTART_SEQUENCE] = self._header[_HEADER_SEQUENCE]
+        self._header[_HEADER_GENERATION] += 1
+
+    def reclaim(self) -> None:
+        """Free slots that were written before the last restart but never claimed.
+
+        Only called by the consumer, so a slot can not be claimed while it is freed.
+        """
+        stale = (self._states == SLOT_STATE_WRITTEN) & (
+            self._sequences <= self._header[_HEADER_RESTART_SEQUENCE]
+        )
+        self._states[stale] = SLOT_STATE_FREE
+
+    def write(self, readinto: Callable[[memoryview], int | None]) -> int | None:
+        """Read a frame into the next free slot.
+
+        Returns the slot index, or None if no complete frame was stored.
+        An incomplete read leaves the slot free.
+        """
+        slot = None
+        for index in range(self.slots):
+            candidate = (self._next_slot + index) % self.slots
+            if self._states[candidate] == SLOT_STATE_FREE:
+                slot = candidate
+                break
+
+        if slot is None:
+            if self._scratch is None:
+                self._scratch = memoryview(bytearray(self.slot_size))
+            if readinto(self._scratch) == self.slot_size:
+                self._header[_HEADER_OVERRUNS] += 1
+            return None
+
+        if readinto(self._slot_view(slot)) != self.slot_size:
+            return None
+
+        self._header[_HEADER_SEQUENCE] += 1
+        self._sequences[slot] = self._header[_HEADER_SEQUENCE]
+        self._states[slot] = SLOT_STATE_WRITTEN
+        self._next_slot = (slot + 1) % self.slots
+        return slot
+
+    def sequence(self, slot: int) -> int:
+        """Return sequence number of the frame stored in slot."""
+        return int(self._sequences[slot])
+
+    def claim(self, slot: int, sequence: int) -> memoryview | None:
+        """Claim a written slot and return a zero-copy view of it.
+
+        Returns None if the slot has been reclaimed or overwritten since the sequence
+        number was handed out. Only called by the consumer.
+        """
+        if (
+            self._states[slot] != SLOT_STATE_WRITTEN
+            or self._sequences[slot] != sequence
+        ):
+            return None
+        self._states[slot] = SLOT_STATE_CLAIMED
+        return self._slot_view(slot)
+
+    def release(self, slot: int) -> None:
+        """Return slot to the writer."""
+        self._states[slot] = SLOT_STATE_FREE
+
+    def close(self) -> None:
+        """Close and unlink the shared memory block.
+
+        Frames that are still referenced keep the memory mapped until they are
+        garbage collected.
+        """
+        self._scratch = None
+        del self._header, self._sequences, self._states
+        try:
+            self._shm.unlink()
+        except FileNotFoundError:
+            pass
+        try:
+            self._shm.close()
+        except BufferError:
+            LOGGER.debug(f"Shared memory {self.name} is still referenced by frames")
 
 
 class SharedFrames:
-    """Byte frame shared in memory."""
+    """Byte frame shared in memory.
+
+    Images derived from a frame, such as color converted, masked and resized
+    versions, are cached per frame and shared by all consumers as read-only arrays.
+    The cache entries and their buffers are freed together with the frame.
+    """
 
     def __init__(self, vis: Viseron) -> None:
         self._vis = vis
-        self._frames: dict[uuid.UUID | str, np.ndarray] = {}
+        self._frames: dict[uuid.UUID, np.ndarray] = {}
+        self._release_callbacks: dict[uuid.UUID, Callable[[], None]] = {}
+        self.pool = FramePool(self._free)
 
-    def create(self, shared_frame: SharedFrame, frame_bytes: bytes) -> None:
-        """Create frame in shared memory."""
-        self._frames[shared_frame.name] = np.frombuffer(frame_bytes, np.uint8).reshape(
+        self._derived_lock = threading.Lock()
+        self._derived_frames: dict[uuid.UUID, dict[tuple, np.ndarray]] = {}
+        self._derived_hits = 0
+        self._derived_misses = 0
+
+    def create(
+        self,
+        shared_frame: SharedFrame,
+        frame_bytes: bytes | memoryview,
+        release: Callable[[], None] | None = None,
+    ) -> None:
+        """Create frame in shared memory.
+
+        frame_bytes is wrapped without copying. If frame_bytes is a view into a
+        buffer that is reused, release is called when the frame is removed.
+        """
+        frame = np.frombuffer(frame_bytes, np.uint8).reshape(
             shared_frame.color_plane_height, shared_frame.color_plane_width
         )
+        frame.flags.writeable = False
+        self._frames[shared_frame.name] = frame
+        if release:
+            self._release_callbacks[shared_frame.name] = release
+        self.pool.add(shared_frame)
 
     def get_decoded_frame(self, shared_frame: SharedFrame) -> np.ndarray:
         """Return byte frame in numpy format."""
         return self._frames[shared_frame.name]
 
-    @return_copy
-    @lru_cache(maxsize=2)
     def _color_convert(self, shared_frame: SharedFrame, color_model: str) -> np.ndarray:
-        """Return decoded frame in specified color format."""
-        shared_frame_name = f"{shared_frame.name}_{color_model}"
-        try:
-            return self._frames[shared_frame_name]
-        except KeyError:
-            pass
-
+        """Convert decoded frame to color_model into a buffer from the frame pool."""
         pixel_format = PIXEL_FORMATS[shared_frame.pixel_format]
-        decoded_frame = self.get_decoded_frame(shared_frame)
-        decoded_frame = cv2.cvtColor(
-            decoded_frame, pixel_format[color_model][CONVERTER]
+        channels = pixel_format[color_model][CHANNELS]
+        shape: tuple[int, ...] = (
+            shared_frame.resolution[1],
+            shared_frame.resolution[0],
+        )
+        if channels > 1:
+            shape += (channels,)
+        return cv2.cvtColor(
+            self.get_decoded_frame(shared_frame),
+            pixel_format[color_model][CONVERTER],
+            dst=self.pool.get_buffer(shared_frame, shape),
+        )
+
+    def _resize(
+        self,
+        shared_frame: SharedFrame,
+        frame: np.ndarray,
+        size: tuple[int, int],
+        letterbox: bool,
+        interpolation: int,
+    ) -> np.ndarray:
+        """Resize frame into a buffer from the frame pool."""
+        width, height = size
+        output = self.pool.get_buffer(shared_frame, (height, width, *frame.shape[2:]))
+        if not letterbox:
+            return cv2.resize(frame, size, dst=output, interpolation=interpolation)
+
+        # Same result as viseron.helpers.letterbox_resize
+        frame_height, frame_width = frame.shape[:2]
+        scale = min(height / frame_height, width / frame_width)
+        output_height = int(frame_height * scale)
+        output_width = int(frame_width * scale)
+        top = (height - output_height) // 2
+        left = (width - output_width) // 2
+        output.fill(0)
+        output[top : top + output_height, left : left + output_width] = cv2.resize(
+            frame, (output_width, output_height), interpolation=interpolation
+        )
+        return output
+
+    def get_frame(
+        self,
+        shared_frame: SharedFrame,
+        color_model: str = COLOR_MODEL_RGB,
+        size: tuple[int, int] | None = None,
+        letterbox: bool = False,
+        mask: np.ndarray | None = None,
+        interpolation: int = cv2.INTER_LINEAR,
+    ) -> np.ndarray:
+        """Return a read-only image derived from the decoded frame.
+
+        The frame is converted to color_model, masked with mask as created by
+        generate_mask_image, and resized to size (width, height). If letterbox is
+        True the aspect ratio is kept and the image is padded with black pixels.
+
+        Each image is cached until the frame is freed, and the intermediate images
+        are reused, so a masked frame is only computed once for all consumers that
+        resize it to different sizes. The returned array is shared and must be
+        copied before it is modified. Masks are told apart by identity, so the same
+        mask image must be passed on every call.
+
+        Raises KeyError if the frame has been removed.
+        """
+        key = (
+            color_model,
+            None if mask is None else id(mask),
+            size,
+            bool(size and letterbox),
+            interpolation if size else None,
         )
+        with self._derived_lock:
+            if (
+                frame := self._derived_frames.get(shared_frame.name, {}).get(key)
+            ) is not None:
+                self._derived_hits += 1
+                return frame
+            self._derived_misses += 1
+
+        if size:
+            frame = self._resize(
+                shared_frame,
+                self.get_frame(shared_frame, color_model, mask=mask),
+                size,
+                letterbox,
+                interpolation,
+            )
+        elif mask is not None:
+            source = self.get_frame(shared_frame, color_model)
+            frame = apply_mask(
+                source, mask, out=self.pool.get_buffer(shared_frame, source.shape)
+            )
+        else:
+            frame = self._color_convert(shared_frame, color_model)
+        # The pool buffer itself stays writeable so that it can be reused
+        frame = frame.view()
+        frame.flags.writeable = False
 
-        self._frames[shared_frame_name] = decoded_frame
-        return decoded_frame
+        with self._derived_lock:
+            # Frames that were removed while deriving are not cached, since nothing
+            # would free the entry
+            if shared_frame.name in self._frames:
+                frame = self._derived_frames.setdefault(
+                    shared_frame.name, {}
+                ).setdefault(key, frame)
+        return frame
 
     def get_decoded_frame_rgb(self, shared_frame: SharedFrame) -> np.ndarray:
-        """Return decoded frame in rgb numpy format."""
-        return self._color_convert(shared_frame, COLOR_MODEL_RGB)
+        """Return decoded frame in rgb numpy format.
+
+        The frame is read-only, see get_frame.
+        """
+        return self.get_frame(shared_frame, COLOR_MODEL_RGB)
 
     def get_decoded_frame_gray(self, shared_frame: SharedFrame) -> np.ndarray:
-        """Return decoded frame in gray numpy format."""
-        return self._color_convert(shared_frame, COLOR_MODEL_GRAY)
+        """Return decoded frame in gray numpy format.
+
+        The frame is read-only, see get_frame.
+        """
+        return self.get_frame(shared_frame, COLOR_MODEL_GRAY)
+
+    @property
+    def derived_frame_statistics(self) -> DerivedFrameCacheStatistics:
+        """Return derived frame cache statistics."""
+        with self._derived_lock:
+            lookups = self._derived_hits + self._derived_misses
+            return DerivedFrameCacheStatistics(
+                hits=self._derived_hits,
+                misses=self._derived_misses,
+                entries=sum(
+                    len(derived) for derived in self._derived_frames.values()
+                ),
+                hit_rate=self._derived_hits / lookups if lookups else 0.0,
+            )
 
     def _remove(self, name) -> None:
         try:
             del self._frames[name]
         except KeyError:
             pass
+        if release := self._release_callbacks.pop(name, None):
+            release()
+
+    def _free(self, shared_frame: SharedFrame) -> None:
+        """Remove frame and its derived images when the last holder released it."""
+        self._remove(shared_frame.name)
+        with self._derived_lock:
+            self._derived_frames.pop(shared_frame.name, None)
 
     def remove(self, shared_frame: SharedFrame, camera: AbstractCamera) -> None:
-        """Remove frame from shared memory."""
-        if (
-            shared_frame.reference_count > 0
-            or (camera and camera.current_frame == shared_frame)
-        ) and self._vis.shutdown_stage is None:
-            threading.Timer(1, self.remove, args=(shared_frame, camera)).start()
-            return
+        """Remove frame from shared memory.
 
-        self._remove(shared_frame.name)
-        for color_model in PIXEL_FORMATS[PIXEL_FORMAT_YUV420P]:
-            self._remove(f"{shared_frame.name}_{color_model}")
+        Called by the camera right after the frame is created. The frame is released
+        by its owner after a grace period, and removed once no holder references it
+        and it is no longer the current frame of the camera. Frames that are dropped
+        by the data stream before any subscriber acquires them are thereby removed
+        as well.
+        """
+        self.pool.release_owner(
+            shared_frame,
+            keep=lambda frame: bool(camera and camera.current_frame == frame),
+            immediate=self._vis.shutdown_stage is not None,
+        )
 
     def remove_all(self) -> None:
         """Remove all frames still in shared memory."""
+        self.pool.release_all()
         for frame_name in self._frames.copy():
             self._remove(frame_name)
-            for color_model in PIXEL_FORMATS[PIXEL_FORMAT_YUV420P]:
-                self._remove(f"{frame_name}_{color_model}")
+        with self._derived_lock:
+            self._derived_frames.clear()
@@ -0,0 +1,141 @@
+"""Snapshot writer."""
+from __future__ import annotations
+
+import logging
+import os
+import threading
+import uuid
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any
+
+import cv2
+import numpy as np
+
+from viseron.helpers import (
+    annotate_frame,
+    create_directory,
+    draw_objects,
+    zoom_boundingbox,
+)
+
+from .const import SNAPSHOT_WRITER_WORKERS
+
+if TYPE_CHECKING:
+    from viseron.domains.object_detector.detected_object import DetectedObject
+
+    from .shared_frames import SharedFrame, SharedFrames
+
+
+@dataclass
+class SnapshotJob:
+    """Instructions for a snapshot. Coordinates are absolute."""
+
+    path: str
+    zoom_coordinates: tuple[int, int, int, int] | None = None
+    detected_object: DetectedObject | None = None
+    bbox: tuple[int, int, int, int] | None = None
+    text: str | None = None
+
+
+class SnapshotWriter:
+    """Draw, crop, encode and write snapshots in a pool of worker threads.
+
+    Jobs for the same frame that are queued before a worker picks up the frame are
+    handled together, using the shared read-only decoded frame. Each worker draws into
+    its own reusable buffer instead of allocating a new frame per snapshot.
+    """
+
+    def __init__(
+        self,
+        shared_frames: SharedFrames,
+        jpeg_quality: int,
+        name: str,
+        workers: int = SNAPSHOT_WRITER_WORKERS,
+    ) -> None:
+        self._logger = logging.getLogger(f"{__name__}.{name}")
+        self._shared_frames = shared_frames
+        self._encode_params = [int(cv2.IMWRITE_JPEG_QUALITY), jpeg_quality]
+
+        self._executor = ThreadPoolExecutor(
+            max_workers=workers, thread_name_prefix=f"{name}.snapshot_writer"
+        )
+        self._lock = threading.Lock()
+        self._pending: dict[uuid.UUID, list[SnapshotJob]] = {}
+        self._local = threading.local()
+
+    def submit(self, shared_frame: SharedFrame, job: SnapshotJob) -> None:
+        """Queue a snapshot of shared_frame.
+
+        The frame is held until a worker has written the snapshots.
+        """
+        with self._lock:
+            if (jobs := self._pending.get(shared_frame.name)) is not None:
+                jobs.append(job)
+                return
+            self._pending[shared_frame.name] = [job]
+
+        shared_frame.acquire()
+        self._run(self._write, shared_frame)
+
+    def _run(self, target: Callable[..., None], *args: Any) -> None:
+        """Run target in a worker, or in the calling thread after shutdown."""
+        try:
+            self._executor.submit(target, *args)
+        except RuntimeError:
+            target(*args)
+
+    def _write(self, shared_frame: SharedFrame) -> None:
+        try:
+            try:
+                frame = self._shared_frames.get_decoded_frame_rgb(shared_frame)
+            except Exception as error:  # pylint: disable=broad-except
+                self._logger.error(f"Failed to decode frame for snapshot: {error}")
+                frame = None
+            finally:
+                with self._lock:
+                    jobs = self._pending.pop(shared_frame.name)
+
+            if frame is None:
+                return
+            for job in jobs:
+                try:
+                    self._write_job(frame, job)
+                except Exception as error:  # pylint: disable=broad-except
+                    self._logger.error(f"Failed to save snapshot {job.path}: {error}")
+        finally:
+            # The decoded frame is only valid while the frame is held
+            shared_frame.release()
+
+    def _buffer(self, frame: np.ndarray) -> np.ndarray:
+        """Return the buffer of this worker, holding a copy of frame."""
+        buffer: np.ndarray | None = getattr(self._local, "buffer", None)
+        if buffer is None or buffer.shape != frame.shape:
+            buffer = self._local.buffer = np.empty_like(frame)
+        np.copyto(buffer, frame)
+        return buffer
+
+    def _write_job(self, frame: np.ndarray, job: SnapshotJob) -> None:
+        snapshot_frame = frame
+        # Draw on a copy since the decoded frame is shared by all jobs
+        if job.detected_object or job.bbox:
+            snapshot_frame = self._buffer(frame)
+        if job.detected_object:
+            draw_objects(snapshot_frame, [job.detected_object])
+        if job.bbox:
+            annotate_frame(snapshot_frame, job.bbox, job.text)
+
+        if job.zoom_coordinates:
+            snapshot_frame = zoom_boundingbox(
+                snapshot_frame, job.zoom_coordinates, crop_correction_factor=1.2
+            )
+
+        self._logger.debug(f"Saving snapshot to {job.path}")
+        create_directory(os.path.dirname(job.path))
+        if not cv2.imwrite(job.path, snapshot_frame, self._encode_params):
+            self._logger.error(f"Failed saving snapshot {job.path} to disk")
+
+    def stop(self) -> None:
+        """Wait for queued snapshots to be written."""
+        self._executor.shutdown(wait=True)
@@ -3,7 +3,6 @@ from __future__ import annotations
 
 import logging
 from abc import abstractmethod
-from collections.abc import Callable
 from dataclasses import dataclass
 from queue import Empty, Queue
 from typing import TYPE_CHECKING, Any
@@ -337,9 +336,7 @@ class AbstractMotionDetectorScanner(AbstractMotionDetector):
     ) -> None:
         super().__init__(vis, component, config, camera_identifier)
 
-        self._get_frame_function: Callable[[SharedFrame], np.ndarray] = getattr(
-            self, f"_get_decoded_frame_{color_format}"
-        )
+        self._color_format = color_format
         self._data_stream: DataStream = vis.data[DATA_STREAM_COMPONENT]
 
         self._resolution = (
@@ -385,7 +382,7 @@ class AbstractMotionDetectorScanner(AbstractMotionDetector):
 
     def _apply_mask(self, frame: np.ndarray) -> np.ndarray:
         """Apply motion mask to frame."""
-        frame[self._mask_image] = [0]
+        apply_mask(frame, self._mask_image)
         return frame
 
     def _filter_motion(self, shared_frame: SharedFrame, contours: Contours) -> None:
@@ -400,14 +397,6 @@ class AbstractMotionDetectorScanner(AbstractMotionDetector):
             contours,
         )
 
-    def _get_decoded_frame_rgb(self, shared_frame) -> np.ndarray:
-        """Return frame in rgb format."""
-        return self._camera.shared_frames.get_decoded_frame_rgb(shared_frame)
-
-    def _get_decoded_frame_gray(self, shared_frame) -> np.ndarray:
-        """Return frame in gray format."""
-        return self._camera.shared_frames.get_decoded_frame_gray(shared_frame)
-
     def _motion_detection(self) -> None:
         """Perform motion detection and publish the results."""
         while not self._kill_received:
@@ -417,9 +406,11 @@ class AbstractMotionDetectorScanner(AbstractMotionDetector):
                 continue
 
             with shared_frame:
-                decoded_frame = self._get_frame_function(shared_frame).copy()
-                if self._mask:
-                    apply_mask(decoded_frame, self._mask_image)
+                decoded_frame = self._camera.shared_frames.get_frame(
+                    shared_frame,
+                    self._color_format,
+                    mask=self._mask_image if self._mask else None,
+                )
                 preprocessed_frame = self.preprocess(decoded_frame)
 
                 contours = self.return_motion(preprocessed_frame)
@@ -2,12 +2,14 @@
 from __future__ import annotations
 
 import logging
+import threading
 import time
 from abc import abstractmethod
 from collections import deque
 from queue import Empty, Queue
 from typing import TYPE_CHECKING, Any
 
+import numpy as np
 import voluptuous as vol
 from sqlalchemy import insert
 
@@ -25,7 +27,12 @@ from viseron.domains.camera.events import EventCameraEventData
 from viseron.domains.camera.shared_frames import SharedFrame
 from viseron.domains.motion_detector.const import DOMAIN as MOTION_DETECTOR_DOMAIN
 from viseron.exceptions import DomainNotRegisteredError
-from viseron.helpers import apply_mask, generate_mask, generate_mask_image
+from viseron.helpers import (
+    generate_mask,
+    generate_mask_image,
+    generate_zone_map,
+    objects_in_zone_map,
+)
 from viseron.helpers.filter import Filter
 from viseron.helpers.schemas import (
     COORDINATES_SCHEMA,
@@ -41,8 +48,11 @@ from .binary_sensor import (
     ObjectDetectedBinarySensorFoVLabel,
 )
 from .const import (
+    CONFIG_BATCH_SIZE,
+    CONFIG_BATCH_TIMEOUT,
     CONFIG_CAMERAS,
     CONFIG_COORDINATES,
+    CONFIG_CROP_TO_MOTION,
     CONFIG_FPS,
     CONFIG_LABEL_CONFIDENCE,
     CONFIG_LABEL_HEIGHT_MAX,
@@ -59,11 +69,15 @@ from .const import (
     CONFIG_LOG_ALL_OBJECTS,
     CONFIG_MASK,
     CONFIG_MAX_FRAME_AGE,
+    CONFIG_MAX_IN_FLIGHT,
     CONFIG_SCAN_ON_MOTION_ONLY,
     CONFIG_ZONE_NAME,
     CONFIG_ZONES,
     DATA_OBJECT_DETECTOR_RESULT,
     DATA_OBJECT_DETECTOR_SCAN,
+    DEFAULT_BATCH_SIZE,
+    DEFAULT_BATCH_TIMEOUT,
+    DEFAULT_CROP_TO_MOTION,
     DEFAULT_FPS,
     DEFAULT_LABEL_CONFIDENCE,
     DEFAULT_LABEL_HEIGHT_MAX,
@@ -78,11 +92,15 @@ from .const import (
     DEFAULT_LOG_ALL_OBJECTS,
     DEFAULT_MASK,
     DEFAULT_MAX_FRAME_AGE,
+    DEFAULT_MAX_IN_FLIGHT,
     DEFAULT_SCAN_ON_MOTION_ONLY,
     DEFAULT_ZONES,
     DEPRECATED_LABEL_TRIGGER_RECORDER,
+    DESC_BATCH_SIZE,
+    DESC_BATCH_TIMEOUT,
     DESC_CAMERAS,
     DESC_COORDINATES,
+    DESC_CROP_TO_MOTION,
     DESC_FPS,
     DESC_LABEL_CONFIDENCE,
     DESC_LABEL_HEIGHT_MAX,
@@ -99,6 +117,7 @@ from .const import (
     DESC_LOG_ALL_OBJECTS,
     DESC_MASK,
     DESC_MAX_FRAME_AGE,
+    DESC_MAX_IN_FLIGHT,
     DESC_SCAN_ON_MOTION_ONLY,
     DESC_ZONE_NAME,
     DESC_ZONES,
@@ -107,6 +126,9 @@ from .const import (
     WARNING_LABEL_TRIGGER_RECORDER,
 )
 from .detected_object import DetectedObject, EventDetectedObjectsData
+from .detection_batch import DetectionBatch
+from .motion_regions import Region, deduplicate_objects, motion_regions, remap_objects
+from .pipeline import DetectionPipeline, DetectionPipelineStatistics
 from .sensor import ObjectDetectorFPSSensor
 from .zone import Zone
 
@@ -115,6 +137,7 @@ if TYPE_CHECKING:
     from viseron.components.nvr.nvr import EventScanFrames
     from viseron.components.storage import Storage
     from viseron.domains.camera import AbstractCamera
+    from viseron.domains.motion_detector import AbstractMotionDetector
 
 
 def ensure_min_max(label: dict) -> dict:
@@ -211,6 +234,11 @@ CAMERA_SCHEMA = vol.Schema(
             default=DEFAULT_SCAN_ON_MOTION_ONLY,
             description=DESC_SCAN_ON_MOTION_ONLY,
         ): bool,
+        vol.Optional(
+            CONFIG_CROP_TO_MOTION,
+            default=DEFAULT_CROP_TO_MOTION,
+            description=DESC_CROP_TO_MOTION,
+        ): bool,
         vol.Optional(CONFIG_LABELS, default=DEFAULT_LABELS, description=DESC_LABELS): [
             LABEL_SCHEMA
         ],
@@ -246,6 +274,31 @@ BASE_CONFIG_SCHEMA = vol.Schema(
     }
 )
 
+BATCHED_BASE_CONFIG_SCHEMA = BASE_CONFIG_SCHEMA.extend(
+    {
+        vol.Optional(
+            CONFIG_BATCH_SIZE,
+            default=DEFAULT_BATCH_SIZE,
+            description=DESC_BATCH_SIZE,
+        ): vol.All(int, vol.Range(min=1)),
+        vol.Optional(
+            CONFIG_BATCH_TIMEOUT,
+            default=DEFAULT_BATCH_TIMEOUT,
+            description=DESC_BATCH_TIMEOUT,
+        ): FLOAT_MIN_ZERO,
+    }
+)
+
+PIPELINED_BASE_CONFIG_SCHEMA = BASE_CONFIG_SCHEMA.extend(
+    {
+        vol.Optional(
+            CONFIG_MAX_IN_FLIGHT,
+            default=DEFAULT_MAX_IN_FLIGHT,
+            description=DESC_MAX_IN_FLIGHT,
+        ): vol.All(int, vol.Range(min=1)),
+    }
+)
+
 
 class AbstractObjectDetector(AbstractDomain):
     """Abstract Object Detector."""
@@ -266,6 +319,7 @@ class AbstractObjectDetector(AbstractDomain):
         )
         self._logger = logging.getLogger(f"{self.__module__}.{camera_identifier}")
 
+        self._local = threading.local()
         self._objects_in_fov: list[DetectedObject] = []
         self.object_filters: dict[str, Filter] = {}
 
@@ -299,6 +353,10 @@ class AbstractObjectDetector(AbstractDomain):
         self.zones: list[Zone] = []
         for zone in config[CONFIG_CAMERAS][camera_identifier][CONFIG_ZONES]:
             self.zones.append(Zone(vis, component, camera_identifier, zone, self._mask))
+        if self.zones:
+            self._zone_map = generate_zone_map(
+                [zone.coordinates for zone in self.zones], self._camera.resolution
+            )
 
         if not self.zones and not self.object_filters:
             self._logger.warning(
@@ -310,8 +368,21 @@ class AbstractObjectDetector(AbstractDomain):
             default=1.0,
         )
 
+        self._max_in_flight = config.get(CONFIG_MAX_IN_FLIGHT, DEFAULT_MAX_IN_FLIGHT)
+        self._pipeline: DetectionPipeline | None = None
+        if self._max_in_flight > 1:
+            self._pipeline = DetectionPipeline(
+                f"{camera_identifier}.object_detection",
+                lambda shared_frame: self._infer(shared_frame, time.time()),
+                lambda shared_frame, result: self._publish(shared_frame, *result),
+                self._max_in_flight,
+                config[CONFIG_CAMERAS][camera_identifier][CONFIG_MAX_FRAME_AGE],
+            )
+
         self._kill_received = False
-        self.object_detection_queue: Queue[SharedFrame] = Queue(maxsize=1)
+        self.object_detection_queue: Queue[SharedFrame] = Queue(
+            maxsize=self._max_in_flight
+        )
         self._object_detection_thread = RestartableThread(
             target=self._object_detection,
             name=f"{camera_identifier}.object_detection",
@@ -335,15 +406,22 @@ class AbstractObjectDetector(AbstractDomain):
         self._scan_on_motion_only = self._config[CONFIG_CAMERAS][
             self._camera.identifier
         ][CONFIG_SCAN_ON_MOTION_ONLY]
+        self._motion_detector: AbstractMotionDetector | None = None
         if self.scan_on_motion_only:
             try:
-                vis.get_registered_domain(MOTION_DETECTOR_DOMAIN, camera_identifier)
+                self._motion_detector = vis.get_registered_domain(
+                    MOTION_DETECTOR_DOMAIN, camera_identifier
+                )
             except DomainNotRegisteredError:
                 self._logger.warning(
                     "scan_on_motion_only is enabled but no motion detector is "
                     "configured. Disabling scan_on_motion_only"
                 )
                 self._scan_on_motion_only = False
+        self._crop_to_motion = (
+            self._scan_on_motion_only
+            and self._config[CONFIG_CAMERAS][camera_identifier][CONFIG_CROP_TO_MOTION]
+        )
 
         vis.register_signal_handler(VISERON_SIGNAL_SHUTDOWN, self.stop)
         vis.add_entity(component, ObjectDetectedBinarySensorFoV(vis, self._camera))
@@ -471,8 +549,13 @@ class AbstractObjectDetector(AbstractDomain):
         self, shared_frame: SharedFrame, objects: list[DetectedObject]
     ) -> None:
         """Filter all zones."""
-        for zone in self.zones:
-            zone.filter_zone(shared_frame, objects)
+        if not self.zones:
+            return
+        zone_bits = objects_in_zone_map(
+            self._zone_map, objects, self._camera.resolution
+        )
+        for index, zone in enumerate(self.zones):
+            zone.filter_zone(shared_frame, objects, (zone_bits >> index) & 1 == 1)
 
     @abstractmethod
     def preprocess(self, frame):
@@ -493,6 +576,10 @@ class AbstractObjectDetector(AbstractDomain):
                 self._logger.debug(f"Frame is {frame_age} seconds old. Discarding")
                 continue
 
+            if self._pipeline:
+                self._pipeline.submit(shared_frame)
+                continue
+
             with shared_frame:
                 self._detect(shared_frame, frame_time)
 
@@ -500,19 +587,45 @@ class AbstractObjectDetector(AbstractDomain):
 
     def _detect(self, shared_frame: SharedFrame, frame_time: float):
         """Perform object detection and publish data."""
-        decoded_frame = self._camera.shared_frames.get_decoded_frame_rgb(shared_frame)
-        if self._mask:
-            apply_mask(decoded_frame, self._mask_image)
-        preprocessed_frame = self.preprocess(decoded_frame)
-        self._preproc_fps.append(1 / (time.time() - frame_time))
-
-        frame_time = time.time()
-        objects = self.return_objects(preprocessed_frame)
+        if (result := self._infer(shared_frame, frame_time)) is not None:
+            self._publish(shared_frame, *result)
+
+    def _infer(
+        self, shared_frame: SharedFrame, frame_time: float
+    ) -> tuple[list[DetectedObject], float] | None:
+        """Perform object detection.
+
+        Returns the objects and the time inference started, or None on failure.
+        """
+        decoded_frame = self._camera.shared_frames.get_frame(
+            shared_frame, mask=self._mask_image if self._mask else None
+        )
+
+        regions = self._motion_regions()
+        if regions:
+            frame_time = time.time()
+            objects = self._detect_regions(decoded_frame, regions)
+        else:
+            preprocessed_frame = self.preprocess(decoded_frame)
+            self._preproc_fps.append(1 / (time.time() - frame_time))
+
+            frame_time = time.time()
+            objects = self.return_objects(preprocessed_frame)
+            if isinstance(objects, DetectionBatch):
+                objects = self._objects_from_batch(objects)
         if objects is None:
-            return
+            return None
 
         self._inference_fps.append(1 / (time.time() - frame_time))
+        return objects, frame_time
 
+    def _publish(
+        self,
+        shared_frame: SharedFrame,
+        objects: list[DetectedObject],
+        frame_time: float,
+    ) -> None:
+        """Filter objects and publish the result."""
         self.filter_fov(shared_frame, objects)
         self.filter_zones(shared_frame, objects)
         self._insert_objects(shared_frame, objects)
@@ -524,15 +637,97 @@ class AbstractObjectDetector(AbstractDomain):
         )
         self._theoretical_max_fps.append(1 / (time.time() - frame_time))
 
+    def _motion_regions(self) -> list[Region]:
+        """Return regions with motion to detect on, if cropping is enabled."""
+        if not self._crop_to_motion or not self._motion_detector:
+            return []
+        contours = self._motion_detector.motion_contours
+        if not contours:
+            return []
+        return motion_regions(contours.rel_contours, self._camera.resolution)
+
+    def _detect_regions(
+        self, decoded_frame, regions: list[Region]
+    ) -> list[DetectedObject] | None:
+        """Perform object detection on each region and map objects to the frame."""
+        objects: list[DetectedObject] = []
+        failed_regions = 0
+        for region in regions:
+            self._local.frame_resolution = (
+                region[2] - region[0],
+                region[3] - region[1],
+            )
+            try:
+                preprocessed_frame = self.preprocess(
+                    np.ascontiguousarray(
+                        decoded_frame[region[1] : region[3], region[0] : region[2]]
+                    )
+                )
+                region_objects = self.return_objects(preprocessed_frame)
+            finally:
+                del self._local.frame_resolution
+
+            if region_objects is None:
+                failed_regions += 1
+                continue
+            if isinstance(region_objects, DetectionBatch):
+                region_objects = region_objects.to_objects()
+            objects += remap_objects(region_objects, region, self._camera.resolution)
+
+        if failed_regions == len(regions):
+            return None
+        return deduplicate_objects(objects)
+
+    def _objects_from_batch(self, batch: DetectionBatch) -> list[DetectedObject]:
+        """Return objects for the detections that can pass any label filter.
+
+        Detections that no filter in the field of view or in a zone would keep are
+        dropped before any DetectedObject is created, unless all objects are logged.
+        """
+        if not self._config[CONFIG_CAMERAS][self._camera.identifier][
+            CONFIG_LOG_ALL_OBJECTS
+        ]:
+            batch = batch.select(batch.filter_mask(self.concat_labels()))
+        return batch.to_objects()
+
+    @property
+    def frame_resolution(self) -> tuple[int, int]:
+        """Return resolution of the frame that detection is performed on.
+
+        This is the camera resolution, or the size of the region when detecting on
+        regions with motion. The region is tracked per thread, since frames can be
+        detected concurrently.
+        """
+        return getattr(self._local, "frame_resolution", self._camera.resolution)
+
     @abstractmethod
-    def return_objects(self, frame) -> list[DetectedObject] | None:
-        """Perform object detection."""
+    def return_objects(self, frame) -> list[DetectedObject] | DetectionBatch | None:
+        """Perform object detection.
+
+        Detectors that can build a DetectionBatch should return it instead of a list
+        of objects, so that label filters are applied to all detections at once.
+        """
 
     @property
     def fps(self):
         """Return object detector fps."""
         return self._config[CONFIG_CAMERAS][self._camera_identifier][CONFIG_FPS]
 
+    @property
+    def max_in_flight(self) -> int:
+        """Return max number of frames that are detected concurrently."""
+        return self._max_in_flight
+
+    @property
+    def max_frame_age(self) -> float:
+        """Return age in seconds after which frames are dropped instead of detected.
+
+        Frames that are dropped do not publish a result.
+        """
+        return self._config[CONFIG_CAMERAS][self._camera_identifier][
+            CONFIG_MAX_FRAME_AGE
+        ]
+
     @property
     def scan_on_motion_only(self):
         """Return if scanning should only be done when there is motion."""
@@ -570,6 +765,13 @@ class AbstractObjectDetector(AbstractDomain):
         """Return the theoretical max average fps."""
         return self._avg_fps(self._theoretical_max_fps)
 
+    @property
+    def pipeline_statistics(self) -> DetectionPipelineStatistics | None:
+        """Return pipeline statistics, or None if pipelining is disabled."""
+        if self._pipeline:
+            return self._pipeline.statistics
+        return None
+
     def handle_stop_scan(self, event_data: Event[EventScanFrames]) -> None:
         """Handle event when stopping frame scans."""
         if event_data.data.scan is False:
@@ -588,3 +790,5 @@ class AbstractObjectDetector(AbstractDomain):
         """Stop object detector."""
         self._kill_received = True
         self._object_detection_thread.join()
+        if self._pipeline:
+            self._pipeline.stop()
@@ -0,0 +1,237 @@
+"""Batch frames from several cameras into a single inference call."""
+from __future__ import annotations
+
+import itertools
+import logging
+import time
+from collections import deque
+from collections.abc import Callable
+from dataclasses import dataclass
+from queue import Empty, Queue
+from typing import Any
+
+from viseron.const import STATISTICS_LOG_INTERVAL
+from viseron.helpers import pop_if_full
+from viseron.watchdog.thread_watchdog import RestartableThread
+
+LOGGER = logging.getLogger(__name__)
+
+# Number of batches to calculate occupancy and latency over
+STATISTICS_WINDOW = 50
+# Max time to wait for a batch to be processed by a worker
+BATCH_RESULT_TIMEOUT = 3
+
+
+@dataclass
+class BatchSchedulerStatistics:
+    """Statistics of a BatchScheduler.
+
+    occupancy is the average fraction of the max batch size that was used.
+    queue_latency is the average time in seconds a frame waited for its batch.
+    """
+
+    batch_size: int
+    batches: int
+    frames: int
+    occupancy: float
+    queue_latency: float
+    max_queue_latency: float
+
+
+class BatchScheduler:
+    """Collect detection requests from all cameras and run them in batches.
+
+    A batch is run when batch_size requests have been collected, or when
+    batch_timeout seconds have passed since the first request of the batch arrived.
+    While a batch is running new requests queue up, so a busy detector naturally
+    gets fuller batches.
+
+    run_batch is called with a list of items and should return a list of results in
+    the same order, or None on failure. Each result is put in the result queue of the
+    request it belongs to, tagged with the id of the request. request waits for the
+    result and discards results of earlier requests that arrived too late. If the
+    number of results does not match the number of items, the whole batch fails.
+
+    The statistics are logged every STATISTICS_LOG_INTERVAL seconds at debug level.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        run_batch: Callable[[list[Any]], list[Any] | None],
+        batch_size: int,
+        batch_timeout: float,
+    ) -> None:
+        self._name = name
+        self._run_batch = run_batch
+        self._batch_size = batch_size
+        self._batch_timeout = batch_timeout
+        self._queue: Queue[tuple[Any, Queue, float, int]] = Queue(maxsize=100)
+        self._request_ids = itertools.count()
+
+        self._batches = 0
+        self._frames = 0
+        self._occupancy: deque[float] = deque(maxlen=STATISTICS_WINDOW)
+        self._queue_latency: deque[float] = deque(maxlen=STATISTICS_WINDOW)
+        self._next_statistics_log = time.monotonic() + STATISTICS_LOG_INTERVAL
+
+        self._kill_received = False
+        self._scheduler_thread = RestartableThread(
+            target=self._scheduler,
+            name=f"{name}.batch_scheduler",
+            register=True,
+            daemon=True,
+        )
+        self._scheduler_thread.start()
+
+    def submit(self, item: Any, result_queue: Queue) -> int:
+        """Queue item for the next batch.
+
+        Returns the request id. The result is put in result_queue as a tuple of the
+        request id and the result.
+        """
+        request_id = next(self._request_ids)
+        pop_if_full(self._queue, (item, result_queue, time.monotonic(), request_id))
+        return request_id
+
+    def request(
+        self, item: Any, result_queue: Queue, timeout: float = BATCH_RESULT_TIMEOUT
+    ) -> Any:
+        """Queue item for the next batch and wait for its result.
+
+        Late results of earlier requests using the same result_queue are discarded.
+        Raises Empty if the result does not arrive within timeout.
+        """
+        request_id = self.submit(item, result_queue)
+        deadline = time.monotonic() + timeout
+        while True:
+            result_id, result = result_queue.get(
+                timeout=max(0, deadline - time.monotonic())
+            )
+            if result_id == request_id:
+                return result
+
+    def _collect(self) -> list[tuple[Any, Queue, float, int]]:
+        """Return the next batch."""
+        try:
+            request = self._queue.get(timeout=1)
+        except Empty:
+            return []
+
+        batch = [request]
+        deadline = request[2] + self._batch_timeout
+        while len(batch) < self._batch_size:
+            try:
+                batch.append(self._queue.get_nowait())
+                continue
+            except Empty:
+                pass
+
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(self._queue.get(timeout=remaining))
+            except Empty:
+                break
+        return batch
+
+    def _scheduler(self) -> None:
+        """Form batches and scatter the results."""
+        while not self._kill_received:
+            if time.monotonic() >= self._next_statistics_log:
+                self._next_statistics_log += STATISTICS_LOG_INTERVAL
+                self.log_statistics()
+
+            batch = self._collect()
+            if not batch:
+                continue
+
+            now = time.monotonic()
+            self._batches += 1
+            self._frames += len(batch)
+            self._occupancy.append(len(batch) / self._batch_size)
+            self._queue_latency.extend(
+                now - submitted for _, _, submitted, _ in batch
+            )
+
+            try:
+                results = self._run_batch([item for item, _, _, _ in batch])
+            except Exception:  # pylint: disable=broad-except
+                LOGGER.exception(f"Error running batch in {self._name}")
+                continue
+            if results is None:
+                continue
+            if len(results) != len(batch):
+                LOGGER.error(
+                    f"Batch in {self._name} returned {len(results)} results for "
+                    f"{len(batch)} frames, discarding batch"
+                )
+                continue
+
+            for (_, result_queue, _, request_id), result in zip(batch, results):
+                pop_if_full(result_queue, (request_id, result))
+
+    def stop(self) -> None:
+        """Stop the scheduler."""
+        self._kill_received = True
+        self._scheduler_thread.stop()
+
+    @property
+    def statistics(self) -> BatchSchedulerStatistics:
+        """Return scheduler statistics."""
+        occupancy = list(self._occupancy)
+        queue_latency = list(self._queue_latency)
+        return BatchSchedulerStatistics(
+            batch_size=self._batch_size,
+            batches=self._batches,
+            frames=self._frames,
+            occupancy=sum(occupancy) / len(occupancy) if occupancy else 0.0,
+            queue_latency=(
+                sum(queue_latency) / len(queue_latency) if queue_latency else 0.0
+            ),
+            max_queue_latency=max(queue_latency, default=0.0),
+        )
+
+    def log_statistics(self) -> None:
+        """Log scheduler statistics at debug level."""
+        statistics = self.statistics
+        LOGGER.debug(
+            f"Batch scheduler {self._name}: {statistics.batches} batches, "
+            f"{statistics.frames} frames, "
+            f"{statistics.occupancy:.0%} occupancy of {statistics.batch_size}, "
+            f"queue latency {statistics.queue_latency * 1000:.1f} ms "
+            f"(max {statistics.max_queue_latency * 1000:.1f} ms)"
+        )
+
+
+class WorkerBatchRunner:
+    """Run batches in a ChildProcessWorker or SubProcessWorker.
+
+    Used as run_batch of a BatchScheduler. The batch is put on the input queue of the
+    worker, and work_output of the worker is expected to call put_result with the
+    item it got back.
+    """
+
+    def __init__(self, input_queue: Queue) -> None:
+        self._input_queue = input_queue
+        self._results: Queue[dict[str, Any]] = Queue(maxsize=1)
+        self._batch_id = 0
+
+    def __call__(self, items: list[Any]) -> list[Any] | None:
+        """Run batch and wait for the result."""
+        self._batch_id += 1
+        pop_if_full(self._input_queue, {"batch_id": self._batch_id, "items": items})
+        while True:
+            try:
+                item = self._results.get(timeout=BATCH_RESULT_TIMEOUT)
+            except Empty:
+                LOGGER.debug(f"Timed out waiting for batch {self._batch_id}")
+                return None
+            # Discard results of batches that timed out
+            if item["batch_id"] == self._batch_id:
+                return item["results"]
+
+    def put_result(self, item: dict[str, Any]) -> None:
+        """Put result of a batch returned from the worker."""
+        pop_if_full(self._results, item)
@@ -6,7 +6,11 @@ from typing import TYPE_CHECKING
 from viseron.components.nvr.const import EVENT_SCAN_FRAMES, OBJECT_DETECTOR
 from viseron.domains.camera.entity.binary_sensor import CameraBinarySensor
 
-from .const import EVENT_OBJECTS_IN_FOV, EVENT_OBJECTS_IN_ZONE
+from .const import (
+    EVENT_OBJECTS_IN_FOV,
+    EVENT_OBJECTS_IN_ZONE,
+    OBJECT_DETECTED_STATE_COALESCE_INTERVAL,
+)
 
 if TYPE_CHECKING:
     from viseron import Event, Viseron
@@ -21,6 +25,8 @@ if TYPE_CHECKING:
 class ObjectDetectedBinarySensor(CameraBinarySensor):
     """Entity that keeps track of object detection."""
 
+    state_coalesce_interval = OBJECT_DETECTED_STATE_COALESCE_INTERVAL
+
     def __init__(
         self,
         vis: Viseron,
@@ -17,6 +17,10 @@ DATA_OBJECT_DETECTOR_RESULT = "object_detector/{camera_identifier}/result"
 EVENT_OBJECTS_IN_FOV = "{camera_identifier}/objects"
 EVENT_OBJECTS_IN_ZONE = "{camera_identifier}/zone/{zone_name}/objects"
 
+# Seconds over which state changes of the object detected binary sensors are
+# merged, since the object coordinates in their attributes change every frame
+OBJECT_DETECTED_STATE_COALESCE_INTERVAL: Final = 1.0
+
 
 # LABEL_SCHEMA
 CONFIG_LABEL_LABEL = "label"
@@ -88,11 +92,41 @@ DESC_LABEL_STORE_INTERVAL = (
     "If set to 0, the label will be stored every time it is detected."
 )
 
+# BATCHED_BASE_CONFIG_SCHEMA constants
+CONFIG_BATCH_SIZE = "batch_size"
+CONFIG_BATCH_TIMEOUT = "batch_timeout"
+
+DEFAULT_BATCH_SIZE = 4
+DEFAULT_BATCH_TIMEOUT = 0.0
+
+DESC_BATCH_SIZE = (
+    "Max number of frames, from all cameras, to run detection on in a single "
+    "inference call."
+)
+DESC_BATCH_TIMEOUT = (
+    "Max time in seconds to wait for more frames before running a batch that is not "
+    "full.<br>With the default of <code>0</code>, a batch is run as soon as the "
+    "detector is available, containing the frames that queued up while it was busy."
+)
+
+# PIPELINED_BASE_CONFIG_SCHEMA constants
+CONFIG_MAX_IN_FLIGHT = "max_in_flight"
+
+DEFAULT_MAX_IN_FLIGHT = 1
+
+DESC_MAX_IN_FLIGHT = (
+    "Max number of frames per camera that are sent for detection at the same time."
+    "<br>Values above <code>1</code> let a camera keep scanning while it waits for "
+    "the server to respond. Results are still published in the order the frames "
+    "were captured, and results older than <code>max_frame_age</code> are dropped."
+)
+
 # CAMERA_SCHEMA constants
 CONFIG_CAMERAS = "cameras"
 
 CONFIG_FPS = "fps"
 CONFIG_SCAN_ON_MOTION_ONLY = "scan_on_motion_only"
+CONFIG_CROP_TO_MOTION = "crop_to_motion"
 CONFIG_LABELS = "labels"
 CONFIG_MAX_FRAME_AGE = "max_frame_age"
 CONFIG_LOG_ALL_OBJECTS = "log_all_objects"
@@ -102,6 +136,7 @@ CONFIG_COORDINATES = "coordinates"
 
 DEFAULT_FPS = 1
 DEFAULT_SCAN_ON_MOTION_ONLY = True
+DEFAULT_CROP_TO_MOTION = False
 DEFAULT_LABELS: list[dict[str, str]] = []
 DEFAULT_MAX_FRAME_AGE = 2
 DEFAULT_LOG_ALL_OBJECTS = False
@@ -121,6 +156,13 @@ DESC_SCAN_ON_MOTION_ONLY = (
     "When set to <code>true</code> and a <code>motion_detector</code> is configured, "
     "the object detector will only scan while motion is detected."
 )
+DESC_CROP_TO_MOTION = (
+    "When set to <code>true</code> and <code>scan_on_motion_only</code> is enabled, "
+    "object detection only runs on the regions of the image where motion is "
+    "detected.<br>This improves detection of small objects on high resolution "
+    "cameras. If the motion covers a large part of the image, the full image is "
+    "used."
+)
 DESC_LABELS = "A list of labels (objects) to track."
 DESC_MAX_FRAME_AGE = (
     "Drop frames that are older than the given number. Specified in seconds."
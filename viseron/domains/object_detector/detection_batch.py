@@ -0,0 +1,191 @@
+"""Columnar batch of detections."""
+from __future__ import annotations
+
+from collections.abc import Sequence
+from typing import TYPE_CHECKING
+
+import numpy as np
+
+from .detected_object import DetectedObject
+
+if TYPE_CHECKING:
+    from viseron.helpers.filter import Filter
+
+
+def _round(values: np.ndarray) -> np.ndarray:
+    """Round to the precision used by DetectedObject."""
+    return np.round(values, 3)
+
+
+def _convert_letterboxed_boxes(
+    boxes: np.ndarray, frame_res: tuple[int, int], model_res: tuple[int, int]
+) -> np.ndarray:
+    """Convert absolute boxes from a letterboxed image to relative frame boxes.
+
+    Vectorized version of viseron.helpers.convert_letterboxed_bbox.
+    """
+    frame_width, frame_height = frame_res
+    model_width, model_height = model_res
+    if model_width != model_height:
+        raise ValueError(
+            "Can only convert bbox from a letterboxed image for models of equal "
+            f"width and height, got {model_width}x{model_height}",
+        )
+
+    scale = min(model_height / frame_height, model_width / frame_width)
+    converted = boxes.astype(np.float64)
+    if int(frame_width * scale) > int(frame_height * scale):  # Horizontal padding
+        converted[:, [0, 2]] = converted[:, [0, 2]] / model_width * frame_width
+        converted[:, [1, 3]] = (
+            (
+                converted[:, [1, 3]]
+                - 1 / 2 * (model_height - frame_height / frame_width * model_height)
+            )
+            * frame_width
+            / model_width
+        )
+    else:  # Vertical padding
+        converted[:, [0, 2]] = (
+            (
+                converted[:, [0, 2]]
+                - 1 / 2 * (model_height - frame_width / frame_height * model_height)
+            )
+            * frame_height
+            / model_width
+        )
+        converted[:, [1, 3]] = converted[:, [1, 3]] / model_height * frame_height
+    return _round(np.round(converted) / np.array(frame_res * 2))
+
+
+class DetectionBatch:
+    """All detections of a frame stored in NumPy arrays.
+
+    labels, confidences and boxes are columns with one row per detection. Boxes are
+    relative (x1, y1, x2, y2) coordinates in the frame, rounded the same way as in
+    DetectedObject.
+
+    Filters are applied to all detections at once as boolean masks, and
+    DetectedObject instances are only created for the detections that remain.
+    """
+
+    def __init__(
+        self,
+        labels: Sequence[str] | np.ndarray,
+        confidences: Sequence[float] | np.ndarray,
+        boxes: Sequence[Sequence[float]] | np.ndarray,
+        frame_res: tuple[int, int],
+    ) -> None:
+        self.labels = np.asarray(labels, dtype=object).reshape(-1)
+        self.confidences = _round(np.asarray(confidences, dtype=np.float64)).reshape(-1)
+        self.boxes = _round(np.asarray(boxes, dtype=np.float64)).reshape(-1, 4)
+        self.frame_res = frame_res
+
+    @classmethod
+    def from_relative(
+        cls,
+        labels: Sequence[str] | np.ndarray,
+        confidences: Sequence[float] | np.ndarray,
+        boxes: Sequence[Sequence[float]] | np.ndarray,
+        frame_res: tuple[int, int],
+    ) -> DetectionBatch:
+        """Create batch from relative boxes."""
+        return cls(labels, confidences, boxes, frame_res)
+
+    @classmethod
+    def from_absolute(
+        cls,
+        labels: Sequence[str] | np.ndarray,
+        confidences: Sequence[float] | np.ndarray,
+        boxes: Sequence[Sequence[float]] | np.ndarray,
+        frame_res: tuple[int, int],
+        model_res: tuple[int, int],
+    ) -> DetectionBatch:
+        """Create batch from absolute boxes."""
+        boxes = np.asarray(boxes, dtype=np.float64).reshape(-1, 4)
+        return cls(labels, confidences, boxes / np.array(model_res * 2), frame_res)
+
+    @classmethod
+    def from_relative_letterboxed(
+        cls,
+        labels: Sequence[str] | np.ndarray,
+        confidences: Sequence[float] | np.ndarray,
+        boxes: Sequence[Sequence[float]] | np.ndarray,
+        frame_res: tuple[int, int],
+        model_res: tuple[int, int],
+    ) -> DetectionBatch:
+        """Create batch from relative boxes when frame is letterboxed."""
+        boxes = np.floor(
+            np.asarray(boxes, dtype=np.float64).reshape(-1, 4) * np.array(model_res * 2)
+        )
+        return cls(
+            labels,
+            confidences,
+            _convert_letterboxed_boxes(boxes, frame_res, model_res),
+            frame_res,
+        )
+
+    @classmethod
+    def from_absolute_letterboxed(
+        cls,
+        labels: Sequence[str] | np.ndarray,
+        confidences: Sequence[float] | np.ndarray,
+        boxes: Sequence[Sequence[float]] | np.ndarray,
+        frame_res: tuple[int, int],
+        model_res: tuple[int, int],
+    ) -> DetectionBatch:
+        """Create batch from absolute boxes when frame is letterboxed."""
+        boxes = np.asarray(boxes, dtype=np.float64).reshape(-1, 4)
+        return cls(
+            labels,
+            confidences,
+            _convert_letterboxed_boxes(boxes, frame_res, model_res),
+            frame_res,
+        )
+
+    def __len__(self) -> int:
+        """Return number of detections."""
+        return len(self.confidences)
+
+    @property
+    def widths(self) -> np.ndarray:
+        """Return relative widths of the detections."""
+        return _round(self.boxes[:, 2] - self.boxes[:, 0])
+
+    @property
+    def heights(self) -> np.ndarray:
+        """Return relative heights of the detections."""
+        return _round(self.boxes[:, 3] - self.boxes[:, 1])
+
+    def select(self, mask: np.ndarray) -> DetectionBatch:
+        """Return a new batch with the detections where mask is True."""
+        batch = DetectionBatch.__new__(DetectionBatch)
+        batch.labels = self.labels[mask]
+        batch.confidences = self.confidences[mask]
+        batch.boxes = self.boxes[mask]
+        batch.frame_res = self.frame_res
+        return batch
+
+    def filter_mask(self, filters: Sequence[Filter]) -> np.ndarray:
+        """Return mask of the detections that pass at least one of the filters."""
+        mask = np.zeros(len(self), dtype=bool)
+        if not len(self):
+            return mask
+
+        widths = self.widths
+        heights = self.heights
+        for object_filter in filters:
+            mask |= (self.labels == object_filter.label) & object_filter.filter_mask(
+                self.confidences, widths, heights
+            )
+        return mask
+
+    def to_objects(self) -> list[DetectedObject]:
+        """Return a DetectedObject for each detection."""
+        return [
+            DetectedObject(
+                label, confidence, box[0], box[1], box[2], box[3], self.frame_res
+            )
+            for label, confidence, box in zip(
+                self.labels.tolist(), self.confidences.tolist(), self.boxes.tolist()
+            )
+        ]
@@ -0,0 +1,185 @@
+"""Regions of interest around motion, used to run object detection on crops."""
+from __future__ import annotations
+
+import numpy as np
+
+from .detected_object import DetectedObject
+
+# Max number of regions to run detection on per frame
+MAX_REGIONS = 4
+# Padding added to each side of a motion bounding box, relative to the box size
+REGION_PADDING = 0.25
+# Min width and height of a region, relative to the frame size
+REGION_MIN_SIZE = 0.2
+# If the regions cover more than this part of the frame, the full frame is used
+MAX_REGION_COVERAGE = 0.5
+# Objects of the same label overlapping more than this are considered duplicates.
+# Overlap is measured as intersection over the area of the smallest object, to also
+# catch objects cut in half by the edge of a region
+DUPLICATE_OVERLAP = 0.6
+
+Region = tuple[int, int, int, int]
+
+
+def _area(region: Region) -> int:
+    """Return area of region."""
+    return (region[2] - region[0]) * (region[3] - region[1])
+
+
+def _union(region_a: Region, region_b: Region) -> Region:
+    """Return the smallest region containing both regions."""
+    return (
+        min(region_a[0], region_b[0]),
+        min(region_a[1], region_b[1]),
+        max(region_a[2], region_b[2]),
+        max(region_a[3], region_b[3]),
+    )
+
+
+def _overlaps(region_a: Region, region_b: Region) -> bool:
+    """Return True if the regions overlap."""
+    return (
+        region_a[0] < region_b[2]
+        and region_b[0] < region_a[2]
+        and region_a[1] < region_b[3]
+        and region_b[1] < region_a[3]
+    )
+
+
+def _expand(
+    box: tuple[float, float, float, float], frame_res: tuple[int, int]
+) -> Region:
+    """Pad box, enforce the min region size and keep it inside the frame."""
+    coordinates = []
+    for start, end, frame_size in (
+        (box[0], box[2], frame_res[0]),
+        (box[1], box[3], frame_res[1]),
+    ):
+        padding = (end - start) * REGION_PADDING
+        size = min(
+            max(end - start + 2 * padding, frame_size * REGION_MIN_SIZE), frame_size
+        )
+        center = (start + end) / 2
+        new_start = min(max(center - size / 2, 0), frame_size - size)
+        coordinates.append((int(new_start), int(new_start + size)))
+    return (coordinates[0][0], coordinates[1][0], coordinates[0][1], coordinates[1][1])
+
+
+def _merge(regions: list[Region], max_regions: int) -> list[Region]:
+    """Merge overlapping regions, then the closest ones until max_regions is met."""
+    regions = list(regions)
+    while True:
+        merged = False
+        for index_a, region_a in enumerate(regions):
+            for index_b in range(index_a + 1, len(regions)):
+                if _overlaps(region_a, regions[index_b]):
+                    regions[index_a] = _union(region_a, regions.pop(index_b))
+                    merged = True
+                    break
+            if merged:
+                break
+        if merged:
+            continue
+
+        if len(regions) <= max_regions:
+            return regions
+
+        # Merge the pair that adds the least extra area
+        _, index_a, index_b = min(
+            (
+                _area(_union(regions[index_a], regions[index_b]))
+                - _area(regions[index_a])
+                - _area(regions[index_b]),
+                index_a,
+                index_b,
+            )
+            for index_a in range(len(regions))
+            for index_b in range(index_a + 1, len(regions))
+        )
+        regions[index_a] = _union(regions[index_a], regions.pop(index_b))
+
+
+def motion_regions(
+    rel_contours: list[np.ndarray],
+    frame_res: tuple[int, int],
+    max_regions: int = MAX_REGIONS,
+) -> list[Region]:
+    """Return regions in absolute frame coordinates covering the motion contours.
+
+    Returns an empty list if there is no motion or if the regions would cover so much
+    of the frame that detecting on the full frame is cheaper.
+    """
+    regions = []
+    for contour in rel_contours:
+        points = np.asarray(contour).reshape(-1, 2)
+        rel_x1, rel_y1 = points.min(axis=0)
+        rel_x2, rel_y2 = points.max(axis=0)
+        regions.append(
+            _expand(
+                (
+                    rel_x1 * frame_res[0],
+                    rel_y1 * frame_res[1],
+                    rel_x2 * frame_res[0],
+                    rel_y2 * frame_res[1],
+                ),
+                frame_res,
+            )
+        )
+
+    regions = _merge(regions, max_regions)
+    if sum(_area(region) for region in regions) > (
+        MAX_REGION_COVERAGE * frame_res[0] * frame_res[1]
+    ):
+        return []
+    return regions
+
+
+def remap_objects(
+    objects: list[DetectedObject], region: Region, frame_res: tuple[int, int]
+) -> list[DetectedObject]:
+    """Map objects detected on a region back to the full frame."""
+    region_width = region[2] - region[0]
+    region_height = region[3] - region[1]
+    return [
+        DetectedObject.from_absolute(
+            obj.label,
+            obj.confidence,
+            region[0] + obj.rel_x1 * region_width,
+            region[1] + obj.rel_y1 * region_height,
+            region[0] + obj.rel_x2 * region_width,
+            region[1] + obj.rel_y2 * region_height,
+            frame_res=frame_res,
+            model_res=frame_res,
+        )
+        for obj in objects
+    ]
+
+
+def _overlap(obj_a: DetectedObject, obj_b: DetectedObject) -> float:
+    """Return intersection over the area of the smallest object."""
+    width = min(obj_a.rel_x2, obj_b.rel_x2) - max(obj_a.rel_x1, obj_b.rel_x1)
+    height = min(obj_a.rel_y2, obj_b.rel_y2) - max(obj_a.rel_y1, obj_b.rel_y1)
+    if width <= 0 or height <= 0:
+        return 0.0
+    smallest_area = min(
+        obj_a.rel_width * obj_a.rel_height, obj_b.rel_width * obj_b.rel_height
+    )
+    if smallest_area <= 0:
+        return 0.0
+    return width * height / smallest_area
+
+
+def deduplicate_objects(objects: list[DetectedObject]) -> list[DetectedObject]:
+    """Remove objects found in more than one overlapping region.
+
+    The object with the highest confidence is kept.
+    """
+    kept: list[DetectedObject] = []
+    for obj in sorted(objects, key=lambda obj: obj.confidence, reverse=True):
+        if any(
+            kept_obj.label == obj.label and _overlap(kept_obj, obj) > DUPLICATE_OVERLAP
+            for kept_obj in kept
+        ):
+            continue
+        kept.append(obj)
+    return kept
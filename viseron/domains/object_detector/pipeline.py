@@ -0,0 +1,151 @@
+"""Keep several frames of a camera in detection at once."""
+from __future__ import annotations
+
+import logging
+import threading
+import time
+from collections import deque
+from collections.abc import Callable
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from viseron.domains.camera.shared_frames import SharedFrame
+
+
+@dataclass
+class DetectionPipelineStatistics:
+    """Statistics of a DetectionPipeline.
+
+    dropped is the number of frames and results that were discarded because they
+    were older than max_frame_age.
+    """
+
+    max_in_flight: int
+    in_flight: int
+    published: int
+    dropped: int
+    failed: int
+
+
+class DetectionPipeline:
+    """Run detection on up to max_in_flight frames concurrently.
+
+    Meant for detectors that spend most of their time waiting on a remote server.
+    detect is called in a worker thread and should return a result, or None on
+    failure. publish is called with the results in the order the frames were
+    submitted, so a slow frame holds back the results of the frames after it.
+    Frames that are older than max_frame_age when a worker is free, and results that
+    are older than max_frame_age when it is their turn to be published, are dropped.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        detect: Callable[[SharedFrame], Any],
+        publish: Callable[[SharedFrame, Any], None],
+        max_in_flight: int,
+        max_frame_age: float,
+    ) -> None:
+        self._logger = logging.getLogger(f"{__name__}.{name}")
+        self._detect = detect
+        self._publish = publish
+        self._max_in_flight = max_in_flight
+        self._max_frame_age = max_frame_age
+
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_in_flight, thread_name_prefix=f"{name}.pipeline"
+        )
+        self._slots = threading.BoundedSemaphore(max_in_flight)
+        self._lock = threading.Lock()
+        self._publish_lock = threading.Lock()
+        self._pending: deque[tuple[SharedFrame, Future]] = deque()
+
+        self._published = 0
+        self._dropped = 0
+        self._failed = 0
+
+    def _too_old(self, shared_frame: SharedFrame) -> bool:
+        if (frame_age := time.time() - shared_frame.capture_time) > (
+            self._max_frame_age
+        ):
+            self._logger.debug(f"Frame is {frame_age} seconds old. Discarding")
+            self._dropped += 1
+            return True
+        return False
+
+    def submit(self, shared_frame: SharedFrame, timeout: float = 1) -> bool:
+        """Start detection on shared_frame once a worker is free.
+
+        Returns False if no worker was freed within timeout, or if the frame got too
+        old while waiting.
+        """
+        if not self._slots.acquire(timeout=timeout):
+            return False
+        if self._too_old(shared_frame):
+            self._slots.release()
+            return False
+
+        shared_frame.acquire()
+        with self._lock:
+            try:
+                future = self._executor.submit(self._detect, shared_frame)
+            except RuntimeError:
+                shared_frame.release()
+                self._slots.release()
+                return False
+            self._pending.append((shared_frame, future))
+        future.add_done_callback(self._publish_ready)
+        return True
+
+    def _publish_ready(self, _future: Future) -> None:
+        """Publish the finished results at the head of the pipeline."""
+        with self._publish_lock:
+            while True:
+                with self._lock:
+                    if not self._pending or not self._pending[0][1].done():
+                        return
+                    shared_frame, future = self._pending.popleft()
+                try:
+                    self._publish_result(shared_frame, future)
+                finally:
+                    shared_frame.release()
+                    self._slots.release()
+
+    def _publish_result(self, shared_frame: SharedFrame, future: Future) -> None:
+        try:
+            result = future.result()
+        except Exception:  # pylint: disable=broad-except
+            self._logger.exception("Error running object detection")
+            self._failed += 1
+            return
+        if result is None:
+            self._failed += 1
+            return
+        if self._too_old(shared_frame):
+            return
+
+        try:
+            self._publish(shared_frame, result)
+        except Exception:  # pylint: disable=broad-except
+            self._logger.exception("Error publishing object detection result")
+            return
+        self._published += 1
+
+    @property
+    def statistics(self) -> DetectionPipelineStatistics:
+        """Return pipeline statistics."""
+        with self._lock:
+            in_flight = len(self._pending)
+        return DetectionPipelineStatistics(
+            max_in_flight=self._max_in_flight,
+            in_flight=in_flight,
+            published=self._published,
+            dropped=self._dropped,
+            failed=self._failed,
+        )
+
+    def stop(self) -> None:
+        """Wait for the frames in flight to be published."""
+        self._executor.shutdown(wait=True)
@@ -17,6 +17,8 @@ UPDATE_INTERVAL = 30
 class ObjectDetectorFPSSensor(CameraSensor):
     """Entity that keeps track of object detection FPS."""
 
+    store_state_history = False
+
     def __init__(
         self,
         vis: Viseron,
@@ -4,10 +4,12 @@ from __future__ import annotations
 import logging
 from typing import TYPE_CHECKING, Any
 
+import numpy as np
+
 from viseron.domains.camera.const import DOMAIN as CAMERA_DOMAIN
 from viseron.domains.object_detector.const import CONFIG_LABEL_LABEL
 from viseron.domains.object_detector.detected_object import EventDetectedObjectsData
-from viseron.helpers import generate_numpy_from_coordinates, object_in_polygon
+from viseron.helpers import generate_numpy_from_coordinates
 from viseron.helpers.filter import Filter
 
 from .binary_sensor import (
@@ -50,7 +52,6 @@ class Zone:
         self._coordinates = generate_numpy_from_coordinates(
             zone_config[CONFIG_COORDINATES]
         )
-        self._camera_resolution = self._camera.resolution
 
         self._name: str = zone_config[CONFIG_ZONE_NAME]
         self._objects_in_zone: list[DetectedObject] = []
@@ -80,15 +81,22 @@ class Zone:
         )
 
     def filter_zone(
-        self, shared_frame: SharedFrame, objects: list[DetectedObject]
+        self,
+        shared_frame: SharedFrame,
+        objects: list[DetectedObject],
+        in_zone: np.ndarray,
     ) -> None:
-        """Filter out objects to see if they are within the zone."""
+        """Filter out objects to see if they are within the zone.
+
+        in_zone holds one bool per object telling if its bottom center is inside the
+        zone, looked up from the zone map of the object detector.
+        """
         objects_in_zone = []
-        for obj in objects:
+        for obj, obj_in_zone in zip(objects, in_zone.tolist()):
             if self._object_filters.get(obj.label) and self._object_filters[
                 obj.label
             ].filter_object(obj):
-                if object_in_polygon(self._camera_resolution, obj, self._coordinates):
+                if obj_in_zone:
                     obj.relevant = True
                     objects_in_zone.append(obj)
 
@@ -25,7 +25,7 @@ from viseron.domains.object_detector.detected_object import (
     DetectedObject,
     EventDetectedObjectsData,
 )
-from viseron.helpers import apply_mask, generate_mask, generate_mask_image
+from viseron.helpers import generate_mask, generate_mask_image
 from viseron.helpers.schemas import COORDINATES_SCHEMA
 from viseron.helpers.validators import CameraIdentifier, CoerceNoneToDict
 from viseron.types import SupportedDomains
@@ -142,14 +142,14 @@ class AbstractPostProcessor(AbstractDomain):
         """Return post processor mask."""
         return self._mask
 
+    @property
+    def mask_image(self) -> np.ndarray | None:
+        """Return the mask image applied to frames, or None if there is no mask."""
+        return self._mask_image if self._mask else None
+
     def apply_mask(self, shared_frame: SharedFrame) -> np.ndarray:
-        """Apply mask to frame."""
-        decoded_frame = self._camera.shared_frames.get_decoded_frame_rgb(
-            shared_frame
-        ).copy()
-        if self._mask:
-            apply_mask(decoded_frame, self._mask_image)
-        return decoded_frame
+        """Return the read-only frame with the mask applied."""
+        return self._camera.shared_frames.get_frame(shared_frame, mask=self.mask_image)
 
     def post_process(self) -> None:
         """Post processor loop."""
@@ -2,14 +2,12 @@
 
 from __future__ import annotations
 
-import json
-from dataclasses import dataclass
-from functools import partial
+from dataclasses import dataclass, field
 from typing import Any, Generic
 
 from typing_extensions import TypeVar
 
-from viseron.helpers.json import JSONEncoder
+from viseron.helpers.json import dumps
 
 T = TypeVar("T")
 
@@ -21,6 +19,8 @@ class Event(Generic[T]):
     name: str
     data: T
     timestamp: float
+    _data_json: str | None = field(default=None, init=False, repr=False, compare=False)
+    _json: str | None = field(default=None, init=False, repr=False, compare=False)
 
     def as_dict(self) -> dict[str, Any]:
         """Convert Event to dict."""
@@ -30,9 +30,24 @@ class Event(Generic[T]):
             "timestamp": self.timestamp,
         }
 
+    def data_as_json(self) -> str:
+        """Convert event data to JSON string.
+
+        The result is cached so that an event sent to several consumers is only
+        serialized once.
+        """
+        if self._data_json is None:
+            self._data_json = dumps(self.data)
+        return self._data_json
+
     def as_json(self) -> str:
-        """Convert Event to JSON string."""
-        return partial(json.dumps, cls=JSONEncoder, allow_nan=False)(self.as_dict())
+        """Convert Event to JSON string, reusing the cached JSON of the data."""
+        if self._json is None:
+            self._json = (
+                f'{{"name":{dumps(self.name)},"data":{self.data_as_json()},'
+                f'"timestamp":{dumps(self.timestamp)}}}'
+            )
+        return self._json
 
 
 class EventData:
@@ -115,3 +115,7 @@ class DomainNotRegisteredError(ViseronError):
 
 class Unauthorized(ViseronError):
     """Raised when an unauthorized action is attempted."""
+
+
+class HTTPRequestError(ViseronError):
+    """Raised when a request to a remote server fails."""
@@ -417,9 +417,19 @@ def draw_post_processor_mask(frame, domain: Domain, mask_points) -> None:
     )
 
 
-def apply_mask(frame: np.ndarray, mask_image) -> None:
-    """Apply mask to frame."""
-    frame[mask_image] = [0]
+def apply_mask(
+    frame: np.ndarray, mask_image: np.ndarray, out: np.ndarray | None = None
+) -> np.ndarray:
+    """Apply mask to frame, in place unless out is given, and return the result.
+
+    mask_image is created by generate_mask_image and is 255 where the frame is kept
+    and 0 where it is masked. It is broadcast over the channels of color frames.
+    """
+    return np.bitwise_and(
+        frame,
+        mask_image if frame.ndim == 2 else mask_image[..., np.newaxis],
+        out=frame if out is None else out,
+    )
 
 
 def pop_if_full(
@@ -479,20 +489,57 @@ def generate_mask(coordinates):
     return mask
 
 
-def generate_mask_image(mask, resolution):
-    """Return an image with the mask drawn on it."""
-    mask_image = np.zeros(
-        (
-            resolution[1],
-            resolution[0],
-            3,
-        ),
-        np.uint8,
-    )
-    mask_image[:] = 255
+def generate_mask_image(mask, resolution) -> np.ndarray:
+    """Return a single channel image with the mask drawn on it.
+
+    Pixels inside the mask are 0 and all other pixels are 255, see apply_mask.
+    """
+    mask_image = np.full((resolution[1], resolution[0]), 255, np.uint8)
+    cv2.fillPoly(mask_image, pts=mask, color=0)
+    return mask_image
+
+
+def generate_zone_map(zones_coordinates: list[np.ndarray], resolution) -> np.ndarray:
+    """Return an image where bit n is set for pixels inside zone n.
 
-    cv2.fillPoly(mask_image, pts=mask, color=(0, 0, 0))
-    return np.where(mask_image[:, :, 0] == [0])
+    All zones are rasterized once so that the zones a point is in can be found with
+    a single lookup instead of a polygon test per zone.
+    """
+    for dtype in (np.uint8, np.uint16, np.uint32, np.uint64):
+        if len(zones_coordinates) <= np.iinfo(dtype).bits:
+            break
+    else:
+        raise ValueError(
+            f"At most 64 zones are supported, got {len(zones_coordinates)}"
+        )
+
+    zone_map = np.zeros((resolution[1], resolution[0]), dtype)
+    zone_image = np.zeros((resolution[1], resolution[0]), np.uint8)
+    for index, coordinates in enumerate(zones_coordinates):
+        zone_image[:] = 0
+        cv2.fillPoly(zone_image, pts=[coordinates.astype(np.int32)], color=1)
+        zone_map |= zone_image.astype(dtype) << dtype(index)
+    return zone_map
+
+
+def objects_in_zone_map(
+    zone_map: np.ndarray, objects: list[DetectedObject], resolution
+) -> np.ndarray:
+    """Return the zone bits of the bottom center point of each object.
+
+    Vectorized version of object_in_polygon for all objects and zones at once.
+    """
+    if not objects:
+        return np.zeros(0, zone_map.dtype)
+
+    coordinates = np.floor(
+        np.array([obj.rel_coordinates for obj in objects], dtype=np.float64)
+        * np.array((resolution[0], resolution[1]) * 2)
+    )
+    middle = (coordinates[:, 2] - coordinates[:, 0]) / 2 + coordinates[:, 0]
+    x = np.clip(middle.astype(np.intp), 0, zone_map.shape[1] - 1)
+    y = np.clip(coordinates[:, 3].astype(np.intp), 0, zone_map.shape[0] - 1)
+    return zone_map[y, x]
 
 
 def object_in_polygon(resolution, obj: DetectedObject, coordinates):
@@ -665,7 +712,7 @@ def zoom_boundingbox(
         0, min(int((y2 - y1) / 2.0 + y1 - size / 2.0), frame.shape[0] - size)
     )
 
-    return frame.copy()[y_offset : y_offset + size, x_offset : x_offset + size]
+    return frame[y_offset : y_offset + size, x_offset : x_offset + size].copy()
 
 
 def get_free_port(port=1024, max_port=65535) -> int:
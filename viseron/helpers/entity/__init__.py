@@ -25,6 +25,13 @@ class Entity(ABC):
     name: str = NotImplemented
     object_id: str | None = None
     _state: Any = "unknown"
+    # Set to False to not store state changes in the database
+    store_state_history: bool = True
+    # Set to False to dispatch updates that do not change state or attributes
+    suppress_unchanged_state: bool = True
+    # State changes within this many seconds of the last dispatched change are
+    # merged, and only the latest one is dispatched when the interval has passed
+    state_coalesce_interval: float = 0
 
     # Used by Home Assistant, safe to override
     availability: list[dict[str, str]] | None = None
@@ -14,6 +14,9 @@ class ImageEntity(Entity):
     """Base image entity class."""
 
     domain = DOMAIN
+    # The image is not part of the state, so an unchanged state can still
+    # carry a new image
+    suppress_unchanged_state = False
 
     _state = "unknown"
     _image: np.ndarray | None = None
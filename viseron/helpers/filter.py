@@ -4,6 +4,8 @@ from __future__ import annotations
 from datetime import timedelta
 from typing import TYPE_CHECKING, Any
 
+import numpy as np
+
 from viseron.domains.object_detector.const import (
     CONFIG_LABEL_CONFIDENCE,
     CONFIG_LABEL_HEIGHT_MAX,
@@ -81,6 +83,21 @@ class Filter:
             and self.filter_height(obj)
         )
 
+    def filter_mask(
+        self, confidences: np.ndarray, widths: np.ndarray, heights: np.ndarray
+    ) -> np.ndarray:
+        """Return mask of the detections where all filters are met.
+
+        Vectorized version of filter_object used on a DetectionBatch.
+        """
+        return (
+            (confidences > self._confidence)
+            & (self._width_max > widths)
+            & (widths > self._width_min)
+            & (self._height_max > heights)
+            & (heights > self._height_min)
+        )
+
     def should_store(self, obj: DetectedObject) -> bool:
         """Return True if object should be stored."""
         # Only store if store interval has passed
@@ -92,6 +109,11 @@ class Filter:
         obj.store = False
         return False
 
+    @property
+    def label(self) -> str:
+        """Return label of filter."""
+        return self._label
+
     @property
     def confidence(self) -> bool:
         """Return configured confidence of filter."""
@@ -0,0 +1,216 @@
+"""Encode frames that are sent to remote servers."""
+from __future__ import annotations
+
+import threading
+from collections import OrderedDict
+from collections.abc import Callable, Hashable
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Final
+
+import cv2
+import numpy as np
+
+if TYPE_CHECKING:
+    from viseron.domains.camera.shared_frames import SharedFrame
+
+FRAME_FORMAT_JPG: Final = "jpg"
+FRAME_FORMAT_PNG: Final = "png"
+FRAME_FORMAT_WEBP: Final = "webp"
+FRAME_FORMAT_BMP: Final = "bmp"
+FRAME_FORMATS: Final = (
+    FRAME_FORMAT_JPG,
+    FRAME_FORMAT_PNG,
+    FRAME_FORMAT_WEBP,
+    FRAME_FORMAT_BMP,
+)
+
+DEFAULT_FRAME_FORMAT: Final = FRAME_FORMAT_JPG
+# Same as the OpenCV default
+DEFAULT_FRAME_QUALITY: Final = 95
+# Fastest zlib level, PNG is lossless so this only trades size for speed
+PNG_COMPRESSION: Final = 1
+ENCODED_FRAME_CACHE_SIZE: Final = 64
+
+
+def _encode_params(frame_format: str, quality: int) -> list[int]:
+    if frame_format == FRAME_FORMAT_JPG:
+        return [int(cv2.IMWRITE_JPEG_QUALITY), quality]
+    if frame_format == FRAME_FORMAT_WEBP:
+        return [int(cv2.IMWRITE_WEBP_QUALITY), quality]
+    if frame_format == FRAME_FORMAT_PNG:
+        return [int(cv2.IMWRITE_PNG_COMPRESSION), PNG_COMPRESSION]
+    return []
+
+
+@dataclass
+class EncodedFrameCacheStatistics:
+    """Encoded frame cache statistics."""
+
+    size: int
+    hits: int
+    misses: int
+
+
+class EncodedFrameCache:
+    """Least recently used cache of encoded frames.
+
+    Keys start with the name of the SharedFrame the image was taken from, which is
+    unique, so entries of frames that have been freed are never hit again and are
+    evicted as new frames are encoded.
+    """
+
+    def __init__(self, max_size: int = ENCODED_FRAME_CACHE_SIZE) -> None:
+        self._max_size = max_size
+        self._lock = threading.Lock()
+        self._cache: OrderedDict[Hashable, bytes] = OrderedDict()
+        self._hits = 0
+        self._misses = 0
+
+    def get(self, key: Hashable, encode: Callable[[], bytes]) -> bytes:
+        """Return the cached image for key, calling encode on a miss."""
+        with self._lock:
+            if (encoded := self._cache.get(key)) is not None:
+                self._cache.move_to_end(key)
+                self._hits += 1
+                return encoded
+            self._misses += 1
+
+        encoded = encode()
+        with self._lock:
+            self._cache[key] = encoded
+            if len(self._cache) > self._max_size:
+                self._cache.popitem(last=False)
+        return encoded
+
+    @property
+    def statistics(self) -> EncodedFrameCacheStatistics:
+        """Return cache statistics."""
+        with self._lock:
+            return EncodedFrameCacheStatistics(
+                size=len(self._cache), hits=self._hits, misses=self._misses
+            )
+
+
+_cache = EncodedFrameCache()
+
+
+def get_encoded_frame_cache_statistics() -> EncodedFrameCacheStatistics:
+    """Return statistics of the shared encoded frame cache."""
+    return _cache.statistics
+
+
+class FrameEncoder:
+    """Letterbox and encode frames in a configurable format.
+
+    Letterboxing resizes into a canvas that is allocated once per thread and size,
+    instead of allocating and copying a new image for every frame. The returned
+    canvas is overwritten by the next call in the same thread, so it should be
+    encoded right away.
+
+    Crops of a SharedFrame can be encoded through encode_crop, which caches the
+    result so that every component asking for the same crop, size and format
+    shares one encode.
+    """
+
+    def __init__(
+        self,
+        frame_format: str = DEFAULT_FRAME_FORMAT,
+        quality: int = DEFAULT_FRAME_QUALITY,
+    ) -> None:
+        self._extension = f".{frame_format}"
+        self._params = _encode_params(frame_format, quality)
+        self._local = threading.local()
+
+    def _buffer(self, name: str, shape: tuple[int, ...]) -> np.ndarray:
+        """Return a zeroed buffer of this thread, reallocated if shape changed."""
+        buffers: dict[str, np.ndarray] = self._local.__dict__.setdefault(
+            "buffers", {}
+        )
+        buffer = buffers.get(name)
+        if buffer is None or buffer.shape != shape:
+            buffer = buffers[name] = np.zeros(shape, dtype=np.uint8)
+        return buffer
+
+    def letterbox(self, frame: np.ndarray, width: int, height: int) -> np.ndarray:
+        """Resize frame to width x height, keeping aspect ratio and padding black.
+
+        Same result as viseron.helpers.letterbox_resize.
+        """
+        frame_height, frame_width = frame.shape[:2]
+        scale = min(height / frame_height, width / frame_width)
+        output_height = int(frame_height * scale)
+        output_width = int(frame_width * scale)
+        top = (height - output_height) // 2
+        left = (width - output_width) // 2
+
+        canvas = self._buffer("canvas", (height, width, 3))
+        # The padding is only cleared when the placement of the image changes
+        if getattr(self._local, "placement", None) != (
+            canvas.shape,
+            top,
+            left,
+        ):
+            canvas.fill(0)
+            self._local.placement = (canvas.shape, top, left)
+
+        if output_width == width:
+            # Full rows of the canvas are contiguous, so resize straight into it
+            cv2.resize(
+                frame,
+                (output_width, output_height),
+                dst=canvas[top : top + output_height],
+                interpolation=cv2.INTER_AREA,
+            )
+            return canvas
+
+        resized = self._buffer("resized", (output_height, output_width, 3))
+        cv2.resize(
+            frame,
+            (output_width, output_height),
+            dst=resized,
+            interpolation=cv2.INTER_AREA,
+        )
+        canvas[top : top + output_height, left : left + output_width] = resized
+        return canvas
+
+    def encode(self, frame: np.ndarray) -> bytes:
+        """Encode frame."""
+        ret, encoded = cv2.imencode(self._extension, frame, self._params)
+        if not ret:
+            raise ValueError(f"Failed to encode frame as {self._extension}")
+        return encoded.tobytes()
+
+    def encode_crop(
+        self,
+        shared_frame: SharedFrame,
+        frame: np.ndarray,
+        box: tuple[int, int, int, int],
+        letterbox: tuple[int, int] | None = None,
+        mask: np.ndarray | None = None,
+    ) -> bytes:
+        """Encode the absolute box (x1, y1, x2, y2) of frame, cached per frame.
+
+        frame is the decoded shared_frame, masked with mask if given. Masks are told
+        apart by identity, so crops of frames with different masks are cached
+        separately. If letterbox is given, the crop is letterboxed to that width and
+        height before encoding.
+        """
+        x1, y1, x2, y2 = box
+
+        def encode() -> bytes:
+            crop = frame[y1:y2, x1:x2]
+            if letterbox:
+                return self.encode(self.letterbox(crop, *letterbox))
+            return self.encode(crop)
+
+        return _cache.get(
+            (
+                shared_frame.name,
+                None if mask is None else id(mask),
+                box,
+                letterbox,
+                self._extension,
+                *self._params,
+            ),
+            encode,
+        )
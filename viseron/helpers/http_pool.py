@@ -0,0 +1,222 @@
+"""Shared keep-alive HTTP clients for remote servers.
+
+Components that send requests to the same host share one client, so that
+connections are kept alive and reused instead of being set up for every request.
+"""
+from __future__ import annotations
+
+import bisect
+import logging
+import threading
+import time
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any, Final
+from urllib.parse import urlsplit
+
+import httpx
+
+from viseron.const import STATISTICS_LOG_INTERVAL, VISERON_SIGNAL_SHUTDOWN
+from viseron.exceptions import HTTPRequestError
+
+if TYPE_CHECKING:
+    from viseron import Viseron
+
+try:
+    import h2  # noqa: F401  # pylint: disable=unused-import
+except ImportError:
+    HTTP2 = False
+else:
+    HTTP2 = True
+
+LOGGER = logging.getLogger(__name__)
+
+DEFAULT_MAX_CONNECTIONS: Final = 4
+# Upper bounds in milliseconds of the latency histogram buckets
+LATENCY_BUCKETS: Final = (5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000)
+DATA_HTTP_CLIENTS: Final = "http_clients"
+
+HTTP_OK = 200
+BAD_URL = 404
+
+
+@dataclass
+class HTTPClientStatistics:
+    """HTTP client statistics.
+
+    latency_histogram maps the upper bound in milliseconds of each bucket to the
+    number of requests that completed within it. The last bucket is unbounded.
+    """
+
+    requests: int
+    errors: int
+    in_flight: int
+    latency_histogram: dict[str, int]
+
+
+class HTTPClient:
+    """Keep-alive HTTP client for a single host.
+
+    At most max_connections requests are sent concurrently. HTTP/2 is used if the
+    h2 package is installed and the server negotiates it over TLS, otherwise the
+    requests are spread over pooled HTTP/1.1 keep-alive connections.
+    """
+
+    def __init__(
+        self, max_connections: int = DEFAULT_MAX_CONNECTIONS, verify: bool = True
+    ) -> None:
+        self._client = httpx.Client(
+            http2=HTTP2,
+            verify=verify,
+            limits=httpx.Limits(
+                max_connections=max_connections,
+                max_keepalive_connections=max_connections,
+            ),
+        )
+        self._lock = threading.Lock()
+        self._requests = 0
+        self._errors = 0
+        self._in_flight = 0
+        self._latency_counts = [0] * (len(LATENCY_BUCKETS) + 1)
+
+    def request(
+        self, method: str, url: str, timeout: float, **kwargs: Any
+    ) -> httpx.Response:
+        """Send a request.
+
+        timeout applies to acquiring a connection as well as to connecting,
+        sending and receiving. Raises HTTPRequestError on timeouts and connection
+        errors.
+        """
+        with self._lock:
+            self._in_flight += 1
+        start = time.monotonic()
+        failed = True
+        try:
+            response = self._client.request(
+                method, url, timeout=httpx.Timeout(timeout), **kwargs
+            )
+            failed = False
+            return response
+        except httpx.TimeoutException as error:
+            raise HTTPRequestError(
+                f"Timeout connecting to {url}, the current timeout is {timeout} "
+                "seconds, try increasing this value"
+            ) from error
+        except httpx.HTTPError as error:
+            raise HTTPRequestError(
+                f"Connection error, check your host and port: {error}"
+            ) from error
+        finally:
+            bucket = bisect.bisect_left(
+                LATENCY_BUCKETS, (time.monotonic() - start) * 1000
+            )
+            with self._lock:
+                self._in_flight -= 1
+                self._requests += 1
+                self._errors += failed
+                self._latency_counts[bucket] += 1
+
+    def post_json(self, url: str, timeout: float, **kwargs: Any) -> Any:
+        """Send a POST request and return the decoded JSON response.
+
+        Raises HTTPRequestError if the request fails or the status is not 200.
+        """
+        response = self.request("POST", url, timeout, **kwargs)
+        if response.status_code == HTTP_OK:
+            return response.json()
+        if response.status_code == BAD_URL:
+            raise HTTPRequestError(
+                f"Bad url supplied, url {url} raised error {BAD_URL}"
+            )
+        raise HTTPRequestError(
+            f"Error from request to {url}, status code: {response.status_code}"
+        )
+
+    @property
+    def statistics(self) -> HTTPClientStatistics:
+        """Return client statistics."""
+        with self._lock:
+            return HTTPClientStatistics(
+                requests=self._requests,
+                errors=self._errors,
+                in_flight=self._in_flight,
+                latency_histogram={
+                    str(bound): count
+                    for bound, count in zip(
+                        (*LATENCY_BUCKETS, "inf"), self._latency_counts
+                    )
+                },
+            )
+
+    def close(self) -> None:
+        """Close all connections."""
+        self._client.close()
+
+
+_clients: dict[tuple[str, bool], HTTPClient] = {}
+_clients_lock = threading.Lock()
+
+
+def get_http_client(
+    url: str, max_connections: int = DEFAULT_MAX_CONNECTIONS, verify: bool = True
+) -> HTTPClient:
+    """Return the shared client for the host of url, creating it if needed.
+
+    The client is created with the max_connections of the first caller.
+    """
+    parts = urlsplit(url)
+    key = (f"{parts.scheme}://{parts.netloc}", verify)
+    with _clients_lock:
+        if (client := _clients.get(key)) is None:
+            LOGGER.debug(f"Creating HTTP client for {key[0]}")
+            client = _clients[key] = HTTPClient(max_connections, verify)
+        return client
+
+
+def get_http_clients_statistics() -> dict[str, HTTPClientStatistics]:
+    """Return the statistics of all shared clients, keyed by host."""
+    with _clients_lock:
+        clients = dict(_clients)
+    return {host: client.statistics for (host, _verify), client in clients.items()}
+
+
+def log_http_clients_statistics() -> None:
+    """Log the statistics of all shared clients at debug level."""
+    for host, statistics in get_http_clients_statistics().items():
+        LOGGER.debug(
+            f"HTTP client for {host}: {statistics.requests} requests, "
+            f"{statistics.errors} errors, {statistics.in_flight} in flight, "
+            f"latency histogram (ms): {statistics.latency_histogram}"
+        )
+
+
+def setup_http_clients(vis: Viseron) -> None:
+    """Log the client statistics periodically and close the clients on shutdown.
+
+    Called by every component that uses the shared clients, the setup is only
+    done once.
+    """
+    if vis.data.get(DATA_HTTP_CLIENTS):
+        return
+    vis.data[DATA_HTTP_CLIENTS] = True
+    vis.background_scheduler.add_job(
+        log_http_clients_statistics,
+        "interval",
+        id="http_clients_statistics",
+        name="http_clients_statistics",
+        seconds=STATISTICS_LOG_INTERVAL,
+        max_instances=1,
+        coalesce=True,
+        replace_existing=True,
+    )
+    vis.register_signal_handler(VISERON_SIGNAL_SHUTDOWN, close_http_clients)
+
+
+def close_http_clients() -> None:
+    """Log the final statistics, then close and remove all shared clients."""
+    log_http_clients_statistics()
+    with _clients_lock:
+        clients = list(_clients.values())
+        _clients.clear()
+    for client in clients:
+        client.close()
@@ -1,29 +1,82 @@
-"""JSON helpers."""
+"""JSON helpers.
+
+dumps uses orjson if it is installed, and falls back to the stdlib json module.
+Both backends produce the same compact string for the types handled by
+JSONEncoder, except for NaN and Infinity which orjson serializes as null while
+the stdlib fallback raises ValueError.
+"""
 import dataclasses
 import datetime
 import json
 from enum import Enum
+from functools import partial
 from typing import Any
 
 import numpy as np
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 
 class JSONEncoder(json.JSONEncoder):
     """Helper to convert objects to JSON."""
 
     def default(self, o: Any) -> Any:
         """Convert objects."""
-        if isinstance(o, datetime.datetime):
-            return o.replace(tzinfo=datetime.timezone.utc).isoformat()
-        if hasattr(o, "as_dict"):
-            return o.as_dict()
-        if dataclasses.is_dataclass(o):
-            return dataclasses.asdict(o)  # type: ignore[arg-type]
-        if isinstance(o, datetime.timedelta):
-            return int(o.total_seconds())
-        if isinstance(o, Enum):
-            return o.value
-        if isinstance(o, np.ndarray):
-            return o.tolist()
-
-        return json.JSONEncoder.default(self, o)
+        return _default(o)
+
+
+def _default(o: Any) -> Any:
+    """Convert objects that the JSON backends can not serialize by themselves."""
+    if isinstance(o, datetime.datetime):
+        return o.replace(tzinfo=datetime.timezone.utc).isoformat()
+    if hasattr(o, "as_dict"):
+        return o.as_dict()
+    if dataclasses.is_dataclass(o):
+        return dataclasses.asdict(o)  # type: ignore[arg-type]
+    if isinstance(o, datetime.timedelta):
+        return int(o.total_seconds())
+    if isinstance(o, Enum):
+        return o.value
+    if isinstance(o, np.ndarray):
+        return o.tolist()
+
+    raise TypeError(f"Object of type {type(o).__name__} is not JSON serializable")
+
+
+# Match the compact, non-escaped output of orjson
+_stdlib_dumps = partial(
+    json.dumps,
+    cls=JSONEncoder,
+    allow_nan=False,
+    ensure_ascii=False,
+    separators=(",", ":"),
+)
+
+if orjson is not None:
+    # Datetimes and dataclasses are passed to _default to give the same
+    # output as JSONEncoder, which prefers as_dict and always labels datetimes UTC
+    _ORJSON_OPTIONS = (
+        orjson.OPT_SERIALIZE_NUMPY
+        | orjson.OPT_NON_STR_KEYS
+        | orjson.OPT_PASSTHROUGH_DATETIME
+        | orjson.OPT_PASSTHROUGH_DATACLASS
+    )
+
+    def dumps(obj: Any) -> str:
+        """Serialize obj to a JSON string using orjson.
+
+        NaN and Infinity are serialized as null.
+        """
+        return orjson.dumps(obj, default=_default, option=_ORJSON_OPTIONS).decode()
+
+else:
+
+    def dumps(obj: Any) -> str:
+        """Serialize obj to a JSON string using the stdlib json module.
+
+        Raises ValueError for NaN and Infinity.
+        """
+        return _stdlib_dumps(obj)
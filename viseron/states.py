@@ -4,7 +4,7 @@ from __future__ import annotations
 import logging
 import threading
 import time
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from typing import TYPE_CHECKING, Any
 
 from viseron.const import EVENT_ENTITY_ADDED, EVENT_STATE_CHANGED
@@ -47,6 +47,40 @@ class EventEntityAddedData(EventData):
     entity: Entity
 
 
+@dataclass
+class StatesStatistics:
+    """States statistics.
+
+    suppressed counts updates that did not change state or attributes, coalesced
+    counts updates that were merged into a later update of the same entity.
+    """
+
+    dispatched: int
+    suppressed: int
+    coalesced: int
+
+
+@dataclass
+class _PendingState:
+    """State change waiting for the coalescing window of its entity to end."""
+
+    entity: Entity
+    state: Any
+    attributes: dict
+    timer: threading.Timer | None = field(default=None, repr=False)
+
+
+def _state_unchanged(previous: State | None, state: Any, attributes: dict) -> bool:
+    """Return True if state and attributes equal the previous state."""
+    if previous is None:
+        return False
+    try:
+        return bool(previous.state == state and previous.attributes == attributes)
+    except (TypeError, ValueError):
+        # Values that can not be compared, like NumPy arrays, count as changed
+        return False
+
+
 class State:
     """Hold the state of a single entity."""
 
@@ -84,6 +118,13 @@ class States:
         self._registry_lock = threading.Lock()
 
         self._current_states: dict[str, State] = {}
+        self._states_lock = threading.Lock()
+        self._pending_states: dict[str, _PendingState] = {}
+        self._last_dispatched: dict[str, float] = {}
+
+        self._dispatched = 0
+        self._suppressed = 0
+        self._coalesced = 0
 
     @property
     def current(self) -> dict[str, State]:
@@ -91,22 +132,78 @@ class States:
         return self._current_states
 
     def set_state(self, entity: Entity) -> None:
-        """Set the state in the states registry."""
+        """Set the state in the states registry.
+
+        Updates that do not change state or attributes are suppressed. If the
+        entity has a state_coalesce_interval, changes within the interval of the
+        last dispatched change are merged and only the latest one is dispatched
+        when the interval has passed.
+        """
+        state = entity.state
+        attributes = entity.attributes
         LOGGER.debug(
             "Setting state of %s to state: %s, attributes %s",
             entity.entity_id,
-            entity.state,
-            entity.attributes,
+            state,
+            attributes,
         )
 
+        with self._states_lock:
+            if (pending := self._pending_states.get(entity.entity_id)) is not None:
+                pending.state = state
+                pending.attributes = attributes
+                self._coalesced += 1
+                return
+
+            if entity.suppress_unchanged_state and _state_unchanged(
+                self._current_states.get(entity.entity_id), state, attributes
+            ):
+                self._suppressed += 1
+                return
+
+            if entity.state_coalesce_interval:
+                wait = (
+                    self._last_dispatched.get(entity.entity_id, float("-inf"))
+                    + entity.state_coalesce_interval
+                    - time.monotonic()
+                )
+                if wait > 0:
+                    pending = self._pending_states[entity.entity_id] = _PendingState(
+                        entity, state, attributes
+                    )
+                    pending.timer = threading.Timer(
+                        wait, self._set_pending_state, args=(entity.entity_id,)
+                    )
+                    pending.timer.daemon = True
+                    pending.timer.start()
+                    return
+
+            self._dispatch_state(entity, state, attributes)
+
+    def _set_pending_state(self, entity_id: str) -> None:
+        """Dispatch the latest state change at the end of a coalescing window."""
+        with self._states_lock:
+            pending = self._pending_states.pop(entity_id)
+            if pending.entity.suppress_unchanged_state and _state_unchanged(
+                self._current_states.get(entity_id),
+                pending.state,
+                pending.attributes,
+            ):
+                self._suppressed += 1
+                return
+            self._dispatch_state(pending.entity, pending.state, pending.attributes)
+
+    def _dispatch_state(self, entity: Entity, state: Any, attributes: dict) -> None:
         previous_state = self._current_states.get(entity.entity_id, None)
         current_state = State(
             entity.entity_id,
-            entity.state,
-            entity.attributes,
+            state,
+            attributes,
         )
 
         self._current_states[entity.entity_id] = current_state
+        self._last_dispatched[entity.entity_id] = time.monotonic()
+        self._dispatched += 1
         self._vis.dispatch_event(
             EVENT_STATE_CHANGED,
             EventStateChangedData(
@@ -114,6 +211,25 @@ class States:
                 previous_state=previous_state,
                 current_state=current_state,
             ),
+            store=entity.store_state_history,
+        )
+
+    @property
+    def statistics(self) -> StatesStatistics:
+        """Return states statistics."""
+        with self._states_lock:
+            return StatesStatistics(
+                dispatched=self._dispatched,
+                suppressed=self._suppressed,
+                coalesced=self._coalesced,
+            )
+
+    def log_statistics(self) -> None:
+        """Log states statistics at debug level."""
+        statistics = self.statistics
+        LOGGER.debug(
+            f"State updates: {statistics.dispatched} dispatched, "
+            f"{statistics.suppressed} suppressed, {statistics.coalesced} coalesced"
         )
 
     def add_entity(self, component: Component, entity: Entity):